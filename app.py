@@ -2,6 +2,7 @@ import atexit
 import base64
 import copy
 import hashlib
+import io
 import json
 import logging
 import os
@@ -9,9 +10,11 @@ import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from functools import lru_cache, partial, wraps
 from pathlib import Path
@@ -23,6 +26,7 @@ import yaml
 from dotenv import load_dotenv
 from flask import (
     Flask,
+    Response,
     jsonify,
     redirect,
     request,
@@ -32,12 +36,61 @@ from flask import (
 )
 from flask_compress import Compress
 from flask_cors import CORS
-from jinja2 import Environment, FileSystemLoader
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 
+import resume_generator
 from supabase import Client, create_client
+from utils.fragment_cache import fragment_cache_stats, render_fragment, section_key
+from utils.icon_derivatives import (
+    ICON_RENDER_PREFIX,
+    icon_content_hash,
+    make_render_derivative,
+)
+from utils.icon_resolver import IconResolver
+from utils.inline_assets import inline_local_assets
+from utils.jinja_envs import get_environment, warm_environment
+from utils.layout_estimate import estimate_layout
+from utils.page_images import (
+    PageImageCache,
+    count_pdf_pages,
+    page_content_hashes,
+    rasterize_pdf_page,
+)
+from utils.pdf_cache import PdfCache, directory_fingerprint, make_cache_key
+from utils.pdf_jobs import (
+    JOB_DONE,
+    JOB_RUNNING,
+    TERMINAL_STATES,
+    PdfJobStore,
+    PdfJobStoreFullError,
+)
+from utils.pdf_linearize import PDF_LINEARIZE, linearize_pdf
+from utils.pdf_optimize import PDF_OPTIMIZE, maybe_optimize_pdf
+from utils.render_cancel import (
+    DEADLINES,
+    CancelToken,
+    RenderCancelledError,
+    RenderTimeoutError,
+    SupersedeRegistry,
+    run_cancellable,
+)
+from utils.render_memory import RenderMemoryBudget, read_memory_limit_mb
+from utils.render_pool import RendererPool
+from utils.render_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RenderQueueFullError,
+    RenderScheduler,
+)
+from utils.resume_schema import (
+    ResumeValidationError,
+    migrate_linkedin_to_social_links,
+    normalize_section_type,
+    validate_resume,
+)
 from utils.yaml_converter import fast_yaml_load
+from utils.zip_stream import iter_zip
 
 # Load environment variables from .env file
 load_dotenv()
@@ -158,7 +211,12 @@ def classify_thumbnail_error(error):
 
 
 def pdf_generation_worker(
-    template_name, yaml_path, output_path, session_icons_dir, session_id
+    template_name,
+    yaml_path,
+    output_path,
+    session_icons_dir,
+    session_id,
+    cancel_token=None,
 ):
     """
     Worker function for process pool PDF generation.
@@ -171,6 +229,10 @@ def pdf_generation_worker(
     - Fresh Qt state for each request (no contamination)
     - Complete isolation from Flask's threading model
     - Reliable PDF generation without Qt concurrency issues
+
+    When the persistent renderer pool is running, the job goes to one of its
+    warm workers; otherwise a one-off resume_generator.py subprocess is spawned.
+    Either way, cancelling cancel_token kills the process doing the render.
     """
     try:
         import logging
@@ -182,6 +244,38 @@ def pdf_generation_worker(
             level=logging.INFO, format="%(asctime)s [WORKER] %(message)s"
         )
 
+        if PDF_RENDER_POOL is not None:
+            result = PDF_RENDER_POOL.render(
+                {
+                    "template": template_name,
+                    "input": str(yaml_path),
+                    "output": str(output_path),
+                    "session_icons_dir": str(session_icons_dir),
+                    "session_id": session_id,
+                },
+                cancel_token=cancel_token,
+            )
+            if not result.get("success"):
+                logging.error(
+                    f"Renderer pool job failed: {result.get('error')} "
+                    f"(template: {template_name}, session: {session_id})"
+                )
+                return {
+                    "success": False,
+                    "error": f"Renderer worker failed: {result.get('error')}",
+                }
+
+            pdf_path = Path(output_path)
+            if not pdf_path.exists() or pdf_path.stat().st_size == 0:
+                logging.error(f"Renderer pool produced no PDF at: {output_path}")
+                return {
+                    "success": False,
+                    "error": "PDF file was not created by renderer worker",
+                }
+
+            logging.info("Worker PDF generation completed successfully")
+            return {"success": True, "output": str(output_path)}
+
         cmd = [
             "python",
             "resume_generator.py",
@@ -202,9 +296,7 @@ def pdf_generation_worker(
         # Get the project root (worker process needs proper cwd)
         project_root = Path(__file__).parent.resolve()
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, cwd=str(project_root)
-        )
+        result = run_cancellable(cmd, cancel_token, cwd=str(project_root))
 
         if result.returncode != 0:
             # Enhanced error logging for subprocess failures
@@ -245,8 +337,171 @@ def pdf_generation_worker(
         return {"success": False, "error": error_msg}
 
 
+def pdf_bytes_generation_worker(
+    template_name, yaml_data, session_icons_dir, session_id, cancel_token=None
+):
+    """
+    Worker function for in-memory HTML PDF generation.
+
+    Sends the resume data inline to a persistent renderer worker, which pipes
+    the HTML through wkhtmltopdf's stdin/stdout and streams the PDF bytes back.
+    No YAML, HTML or PDF files are written.
+    """
+    result = PDF_RENDER_POOL.render(
+        {
+            "template": template_name,
+            "data": yaml_data,
+            "output": None,
+            "session_icons_dir": str(session_icons_dir),
+            "session_id": session_id,
+        },
+        cancel_token=cancel_token,
+    )
+    if not result.get("success"):
+        logging.error(
+            f"Renderer pool job failed: {result.get('error')} "
+            f"(template: {template_name}, session: {session_id})"
+        )
+        return {
+            "success": False,
+            "error": f"Renderer worker failed: {result.get('error')}",
+        }
+
+    if not result.get("pdf"):
+        logging.error(f"Renderer pool returned an empty PDF (session: {session_id})")
+        return {"success": False, "error": "Renderer worker returned an empty PDF"}
+
+    return {"success": True, "pdf": result["pdf"]}
+
+
+def backend_pdf_generation_worker(
+    template_name, yaml_data, session_icons_dir, session_id, cancel_token=None
+):
+    """
+    Worker function for backends that render inside the Flask process.
+
+    Used when PDF_RENDER_BACKEND is not wkhtmltopdf: Chromium already runs in
+    its own processes and the backend is thread-safe, so the dispatch thread
+    renders directly on the shared warm page pool instead of going through a
+    renderer worker. A cancelled token stops the job before it starts only.
+    """
+    try:
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        pdf_bytes = resume_generator.render_job(
+            {
+                "template": template_name,
+                "data": copy.deepcopy(yaml_data),
+                "output": None,
+                "session_icons_dir": str(session_icons_dir),
+                "session_id": session_id,
+                "backend": PDF_RENDER_BACKEND,
+            }
+        )
+    except Exception as e:
+        logging.error(
+            f"{PDF_RENDER_BACKEND} render failed: {e} "
+            f"(template: {template_name}, session: {session_id})"
+        )
+        return {"success": False, "error": f"{PDF_RENDER_BACKEND} render failed: {e}"}
+
+    return {"success": True, "pdf": pdf_bytes}
+
+
+def _count_orphaned_render(render_fn, cancel_token):
+    """
+    Wrap a scheduled render so a result produced after its deadline is counted.
+
+    Renders that cannot be killed (in-process backends, LaTeX template
+    preparation) run to completion after the request gave up on them; the
+    orphaned counter shows how often that work is thrown away.
+    """
+    if cancel_token is None:
+        return render_fn
+
+    @wraps(render_fn)
+    def run(*args, **kwargs):
+        result = render_fn(*args, **kwargs)
+        succeeded = not isinstance(result, dict) or result.get("success")
+        if cancel_token.timed_out and succeeded:
+            DEADLINES.record_orphaned()
+            logging.warning("Render finished after its request timed out")
+        return result
+
+    return run
+
+
+def _within_memory_budget(render_fn, cancel_token):
+    """
+    Wrap a scheduled render so it only starts once RENDER_MEMORY admits it.
+
+    A render that cannot fit yet waits in its dispatch thread for a running
+    one to finish (or until its deadline), instead of pushing the instance
+    past its memory limit.
+    """
+
+    @wraps(render_fn)
+    def run(*args, **kwargs):
+        RENDER_MEMORY.acquire(cancel_token)
+        try:
+            return render_fn(*args, **kwargs)
+        finally:
+            RENDER_MEMORY.release()
+
+    return run
+
+
+def _run_on_pdf_pool(
+    worker_fn,
+    *args,
+    template,
+    session_id,
+    priority=PRIORITY_INTERACTIVE,
+    cancel_token=None,
+):
+    """
+    Submit a PDF worker to the render scheduler and return its result dict.
+
+    RenderQueueFullError from submit() propagates unchanged so the endpoint can
+    answer 429. If cancel_token is cancelled the queued job is dropped (or the
+    worker kills its render) and RenderCancelledError is raised; if its
+    deadline passes the same happens with RenderTimeoutError.
+    """
+    future = PDF_THREAD_POOL.submit(
+        _count_orphaned_render(
+            _within_memory_budget(worker_fn, cancel_token), cancel_token
+        ),
+        *args,
+        cancel_token=cancel_token,
+        priority=priority,
+    )
+
+    try:
+        result = wait_for_render(future, cancel_token)
+
+        if not result["success"]:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            logging.error(f"Process pool worker failed: {result['error']}")
+            logging.error(f"Failed template: {template}, session: {session_id}")
+            raise RuntimeError(f"Failed to generate PDF: {result['error']}")
+        return result
+    except RuntimeError:
+        raise
+    except Exception as e:
+        logging.error(f"Process pool execution failed: {e}")
+        logging.error(f"Failed template: {template}, session: {session_id}")
+        raise RuntimeError(f"Failed to generate PDF: {str(e)}") from e
+
+
 def _dispatch_html_pdf_generation(
-    template, yaml_path, output_path, icons_dir, session_id, timeout=60
+    template,
+    yaml_path,
+    output_path,
+    icons_dir,
+    session_id,
+    priority=PRIORITY_INTERACTIVE,
+    cancel_token=None,
 ):
     """Dispatch HTML-based PDF generation via thread pool or direct subprocess fallback."""
     if PDF_THREAD_POOL is None:
@@ -266,68 +521,508 @@ def _dispatch_html_pdf_generation(
             session_id,
         ]
 
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, cwd=str(PROJECT_ROOT)
-        )
+        result = run_cancellable(cmd, cancel_token, cwd=str(PROJECT_ROOT))
 
         if result.returncode != 0:
             logging.error(f"PDF generation subprocess error: {result.stderr}")
             raise RuntimeError("Failed to generate PDF")
     else:
-        future = PDF_THREAD_POOL.submit(
+        _run_on_pdf_pool(
             pdf_generation_worker,
             template,
             yaml_path,
             output_path,
             icons_dir,
             session_id,
+            template=template,
+            session_id=session_id,
+            priority=priority,
+            cancel_token=cancel_token,
+        )
+
+
+def render_html_pdf(
+    template,
+    yaml_data,
+    icons_dir,
+    session_id,
+    priority=PRIORITY_INTERACTIVE,
+    cancel_token=None,
+):
+    """
+    Render an HTML template to PDF bytes.
+
+    In "memory" mode (PDF_RENDER_MODE, the default) the resume is sent inline
+    to a warm renderer worker and the PDF comes back over its stdout, with no
+    temporary files. The file-based path (YAML file in, PDF file out) is used
+    when PDF_RENDER_MODE=file or when the renderer pool is unavailable.
+    Backends other than wkhtmltopdf (PDF_RENDER_BACKEND) render in-process.
+
+    The render is stopped (process group killed) once RENDER_TIMEOUT_SECONDS
+    pass, or at the earlier deadline already set on cancel_token.
+    """
+    cancel_token = with_render_deadline(cancel_token)
+    if PDF_RENDER_BACKEND != "wkhtmltopdf" and PDF_THREAD_POOL is not None:
+        result = _run_on_pdf_pool(
+            backend_pdf_generation_worker,
+            template,
+            yaml_data,
+            icons_dir,
+            session_id,
+            template=template,
+            session_id=session_id,
+            priority=priority,
+            cancel_token=cancel_token,
+        )
+        return result["pdf"]
+
+    if (
+        PDF_RENDER_MODE == "memory"
+        and PDF_RENDER_POOL is not None
+        and PDF_THREAD_POOL is not None
+    ):
+        result = _run_on_pdf_pool(
+            pdf_bytes_generation_worker,
+            template,
+            yaml_data,
+            icons_dir,
+            session_id,
+            template=template,
+            session_id=session_id,
+            priority=priority,
+            cancel_token=cancel_token,
+        )
+        return result["pdf"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yaml_path = Path(temp_dir) / "resume.yaml"
+        output_path = Path(temp_dir) / "resume.pdf"
+        with open(yaml_path, "w") as f:
+            yaml.dump(yaml_data, f)
+
+        _dispatch_html_pdf_generation(
+            template,
+            yaml_path,
+            output_path,
+            icons_dir,
+            session_id,
+            priority=priority,
+            cancel_token=cancel_token,
+        )
+
+        if not output_path.exists():
+            logging.error(f"Expected output file at: {output_path}")
+            raise FileNotFoundError("The generated resume file was not found")
+        return output_path.read_bytes()
+
+
+def render_resume_pdf(
+    actual_template,
+    yaml_data,
+    icons_dir,
+    session_id,
+    priority=PRIORITY_INTERACTIVE,
+    cancel_token=None,
+):
+    """
+    Render a resume to PDF bytes with the engine its template needs.
+
+    LaTeX renders go through the render scheduler too, so they count against
+    the same queue limit and priority lanes as HTML renders. A cancel_token
+    (utils/render_cancel.py) lets a newer request abort this render. Every
+    render carries a deadline (RENDER_TIMEOUT_SECONDS unless the token has an
+    earlier one) and fails with RenderTimeoutError when it passes.
+    """
+    cancel_token = with_render_deadline(cancel_token)
+    if actual_template != "classic":
+        pdf_bytes = render_html_pdf(
+            actual_template,
+            yaml_data,
+            icons_dir,
+            session_id,
+            priority=priority,
+            cancel_token=cancel_token,
         )
+    elif PDF_THREAD_POOL is None:
+        pdf_bytes = generate_latex_pdf(
+            yaml_data, str(icons_dir), None, actual_template, cancel_token
+        )
+    else:
+        future = PDF_THREAD_POOL.submit(
+            _count_orphaned_render(
+                _within_memory_budget(generate_latex_pdf, cancel_token), cancel_token
+            ),
+            yaml_data,
+            str(icons_dir),
+            None,
+            actual_template,
+            cancel_token,
+            priority=priority,
+        )
+        pdf_bytes = wait_for_render(future, cancel_token)
+    return pdf_bytes
+
+
+def with_render_deadline(cancel_token=None):
+    """
+    Return cancel_token (or a new CancelToken) with the render deadline set.
+
+    The deadline is RENDER_TIMEOUT_SECONDS from now; a token that already has
+    an earlier deadline keeps it.
+    """
+    if cancel_token is None:
+        cancel_token = CancelToken()
+    cancel_token.set_deadline(time.monotonic() + RENDER_TIMEOUT_SECONDS)
+    return cancel_token
+
+
+def wait_for_render(future, cancel_token=None, timeout=None):
+    """
+    future.result() for a scheduled render that cancel_token may abort.
+
+    Cancelling the token drops the job if it is still queued; either way the
+    waiter gets RenderCancelledError instead of a result. Without an explicit
+    timeout the wait ends at the token's deadline with RenderTimeoutError.
+    """
+    if cancel_token is None:
+        return future.result(timeout=timeout)
+    if timeout is None:
+        timeout = cancel_token.remaining()
+    unregister = cancel_token.on_cancel(future.cancel)
+    try:
+        return future.result(timeout=timeout)
+    except CancelledError as e:
+        cancel_token.raise_if_cancelled()
+        raise RenderCancelledError("Render superseded by a newer request") from e
+    except TimeoutError as e:
+        # Stop the work as the watchdog would, in case it has not fired yet
+        cancel_token.cancel(timed_out=True)
+        cancel_token.raise_if_cancelled()
+        raise RenderTimeoutError("Render exceeded its request deadline") from e
+    finally:
+        unregister()
+
+
+def _resume_validation_response(error):
+    """400 response listing every field of the resume that failed validation."""
+    logging.warning(f"Rejecting resume: {error}")
+    return (
+        jsonify({"success": False, "error": str(error), "errors": error.errors}),
+        400,
+    )
+
+
+def _render_queue_full_response(error):
+    """429 response telling the client when to retry a rejected render."""
+    logging.warning(f"Rejecting render: {error}")
+    response = jsonify(
+        {
+            "success": False,
+            "error": "The server is busy generating other PDFs. Please retry shortly.",
+            "retryable": True,
+            "retry_after": error.retry_after,
+        }
+    )
+    response.status_code = 429
+    response.headers["Retry-After"] = str(error.retry_after)
+    return response
+
+
+def _render_timeout_response(error):
+    """504 response for a render stopped at its deadline."""
+    logging.warning(f"Render timed out: {error}")
+    return (
+        jsonify(
+            {
+                "success": False,
+                "error": "Generating the PDF took too long. Please try again.",
+                "retryable": True,
+            }
+        ),
+        504,
+    )
+
+
+def render_when_queue_allows(render, deadline, on_state=None):
+    """
+    Call render(), waiting out RenderQueueFullError until a monotonic deadline.
 
+    For background work (PDF jobs, exports) that has no client waiting on an
+    immediate answer: instead of failing, sleep for the scheduler's
+    Retry-After hint and try again. on_state("waiting"/"rendering") is called
+    around each wait.
+    """
+    while True:
         try:
-            result = future.result(timeout=timeout)
-
-            if not result["success"]:
-                logging.error(f"Process pool worker failed: {result['error']}")
-                logging.error(f"Failed template: {template}, session: {session_id}")
-                raise RuntimeError(f"Failed to generate PDF: {result['error']}")
-        except RuntimeError:
-            raise
-        except Exception as e:
-            logging.error(f"Process pool execution failed: {e}")
-            logging.error(f"Failed template: {template}, session: {session_id}")
-            raise RuntimeError(f"Failed to generate PDF: {str(e)}") from e
+            return render()
+        except RenderQueueFullError as e:
+            if time.monotonic() + e.retry_after > deadline:
+                raise
+            if on_state:
+                on_state("waiting")
+            time.sleep(e.retry_after)
+            if on_state:
+                on_state("rendering")
 
 
 # Initialize thread pool for PDF generation dispatch
 #
-# Architecture: ThreadPoolExecutor dispatches to subprocess.run() calls
-# - subprocess.run() spawns fresh Python processes for each PDF generation
-# - This provides complete isolation (fresh Python interpreter + Qt state)
-# - ThreadPoolExecutor is lightweight for dispatching I/O-bound work
+# Architecture: RenderScheduler threads dispatch to out-of-process renderers
+# - Jobs go to a warm renderer worker (PDF_RENDER_POOL) or, as a fallback,
+#   subprocess.run() spawns a fresh Python process for the PDF
+# - Either way wkhtmltopdf runs outside Flask (fresh Qt state per job)
+# - Dispatch threads are lightweight since they only wait on I/O
 # - Avoids ProcessPoolExecutor overhead since subprocess already provides isolation
 #
-# Configuration:
-# - max_workers=5: Threads are cheap since they just wait on subprocess I/O
-# - Each worker dispatches a subprocess that runs wkhtmltopdf (~100-200MB RAM each)
-# - Additional requests queue until a worker is available
+# Configuration (see utils/render_scheduler.py):
+# - max_workers: one per render slot of RENDER_MEMORY (below); each worker
+#   dispatches a wkhtmltopdf/xelatex render (~100-200MB RAM each)
+# - RENDER_QUEUE_MAX: jobs allowed to wait for a worker; beyond that the API
+#   answers 429 with Retry-After instead of queueing until gunicorn times out
+# - RENDER_BACKGROUND_QUEUE_MAX: share of the queue thumbnails may occupy
+#   (default half); interactive downloads/previews always run first
 # - Cloud Run horizontal scaling handles additional concurrency across instances
 PDF_THREAD_POOL = None
+RENDER_QUEUE_MAX = int(os.getenv("RENDER_QUEUE_MAX", "20"))
+RENDER_BACKGROUND_QUEUE_MAX = int(
+    os.getenv("RENDER_BACKGROUND_QUEUE_MAX", str(RENDER_QUEUE_MAX // 2))
+)
+
+# Render deadline (see utils/render_cancel.py): time a render may spend queued
+# plus running. When it passes, queued renders are dropped and running ones
+# have their process group (renderer worker/wkhtmltopdf, xelatex) killed;
+# the request answers 504. Timed-out and orphaned renders are counted in
+# /api/render/stats under "deadlines".
+RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "60"))
+
+# Memory-aware render concurrency (see utils/render_memory.py)
+#
+# Concurrent renders = (memory limit - RENDER_MEMORY_RESERVE_MB) / per-render
+# peak, clamped to 1..RENDER_MAX_CONCURRENCY. The limit is the container's
+# cgroup limit (RENDER_MEMORY_LIMIT_MB overrides it); the per-render peak
+# starts at RENDER_MEMORY_PER_RENDER_MB and then follows what renderer
+# workers report. A render only starts while the cgroup has room for one
+# more, otherwise it waits in the queue (bounded by its deadline), so a
+# saturated queue slows down instead of getting the instance OOM-killed.
+# Render processes are capped at resume_generator.RENDER_PROCESS_MAX_AS_MB.
+RENDER_MAX_CONCURRENCY = int(os.getenv("RENDER_MAX_CONCURRENCY", "5"))
+RENDER_MEMORY_RESERVE_MB = int(os.getenv("RENDER_MEMORY_RESERVE_MB", "320"))
+RENDER_MEMORY_PER_RENDER_MB = int(os.getenv("RENDER_MEMORY_PER_RENDER_MB", "200"))
+RENDER_MEMORY = RenderMemoryBudget(
+    limit_mb=(
+        float(os.environ["RENDER_MEMORY_LIMIT_MB"])
+        if os.getenv("RENDER_MEMORY_LIMIT_MB")
+        else read_memory_limit_mb()
+    ),
+    reserve_mb=RENDER_MEMORY_RESERVE_MB,
+    render_mb=RENDER_MEMORY_PER_RENDER_MB,
+    max_slots=RENDER_MAX_CONCURRENCY,
+)
+PDF_THREAD_POOL_WORKERS = RENDER_MEMORY.slots()
+
+# Persistent renderer workers (see utils/render_pool.py)
+#
+# The dispatch threads above hand HTML jobs to a pool of long-lived
+# `resume_generator.py --serve` processes instead of spawning a fresh Python
+# interpreter per PDF. Workers are recycled after RENDER_WORKER_MAX_JOBS jobs
+# or once their RSS exceeds RENDER_WORKER_MAX_RSS_MB. The pool defaults to one
+# worker per render slot. Set RENDER_POOL_SIZE=0 to fall back to one
+# subprocess per PDF.
+RENDER_POOL_SIZE = int(os.getenv("RENDER_POOL_SIZE", str(PDF_THREAD_POOL_WORKERS)))
+RENDER_WORKER_MAX_JOBS = int(os.getenv("RENDER_WORKER_MAX_JOBS", "50"))
+RENDER_WORKER_MAX_RSS_MB = int(os.getenv("RENDER_WORKER_MAX_RSS_MB", "300"))
+PDF_RENDER_POOL = None
+
+# HTML -> PDF engine (see utils/pdf_backends.py)
+# - "wkhtmltopdf" (default): renders go to the renderer workers above
+# - "chromium": a headless Chromium with a warm page pool runs in this process
+#   and renders on the dispatch threads; the renderer workers are not started.
+#   Falls back to wkhtmltopdf if Chromium cannot be launched.
+PDF_RENDER_BACKEND = resume_generator.PDF_RENDER_BACKEND
+
+# "memory": render HTML->PDF through stdin/stdout with no temp files (default)
+# "file": legacy path writing YAML/HTML/PDF to disk (also the automatic
+#         fallback when the renderer pool is unavailable)
+PDF_RENDER_MODE = os.getenv("PDF_RENDER_MODE", "memory").lower()
+
+# Rendered-PDF cache for saved resumes (see utils/pdf_cache.py)
+#
+# Keyed by template directory fingerprint, resume content hash, icon
+# identities and pdf_renderer_version(); checked before any icon download or
+# render. Bump PDF_RENDERER_VERSION when a code change alters PDF output
+# without touching the template files (settings that do so, like the render
+# backend, are part of pdf_renderer_version()). Set PDF_CACHE_MAX_MB=0 to
+# disable.
+# Entries are stored as rendered; GET /api/resumes/<id>/pdf linearizes one the
+# first time it is viewed and stores that copy in its place.
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "/tmp/pdf-cache")
+PDF_CACHE_MAX_MB = int(os.getenv("PDF_CACHE_MAX_MB", "256"))
+# 2: optimizer stage, render-size icon derivatives
+PDF_RENDERER_VERSION = "2"
+PDF_CACHE = None
+
+# Saved-resume PDFs GET /api/resumes/<id>/pdf may serve: (user id, resume id)
+# -> (PDF cache key, resume title), recorded by the POST that rendered or
+# found the PDF and dropped when the resume is saved, renamed or deleted.
+# pdf.js sends many range GETs per document; each is answered from PDF_CACHE
+# alone, without loading the resume or rendering.
+SAVED_PDF_KEYS_MAX = 4096
+_saved_pdf_keys = OrderedDict()
+_saved_pdf_keys_lock = threading.Lock()
+
+# Asynchronous saved-resume PDF jobs (see utils/pdf_jobs.py)
+#
+# POST /api/resumes/<id>/pdf-jobs returns a job id immediately and renders on
+# PDF_JOB_EXECUTOR threads, so no request thread waits on wkhtmltopdf/xelatex.
+# Finished PDFs are kept in PDF_JOBS_DIR for PDF_JOB_TTL_SECONDS. At most
+# PDF_JOBS_MAX_ACTIVE jobs may be queued or running; beyond that the API
+# answers 429. A job that hits a full render queue waits and retries for up to
+# PDF_JOB_QUEUE_WAIT_SECONDS before failing as retryable.
+PDF_JOBS_DIR = os.getenv("PDF_JOBS_DIR", "/tmp/pdf-jobs")
+PDF_JOB_WORKERS = int(os.getenv("PDF_JOB_WORKERS", "4"))
+PDF_JOB_TTL_SECONDS = int(os.getenv("PDF_JOB_TTL_SECONDS", "900"))
+PDF_JOBS_MAX_ACTIVE = int(os.getenv("PDF_JOBS_MAX_ACTIVE", "50"))
+PDF_JOB_QUEUE_WAIT_SECONDS = int(os.getenv("PDF_JOB_QUEUE_WAIT_SECONDS", "120"))
+# Event streams send the current state and close at once rather than holding
+# one of gunicorn's sync workers; EventSource reconnects after this many ms
+PDF_JOB_EVENTS_RETRY_MS = 2000
+PDF_JOB_RETRY_AFTER = 5
+PDF_JOB_STORE = None
+PDF_JOB_EXECUTOR = None
+
+# Batch export (POST /api/resumes/export)
+#
+# Renders up to EXPORT_MAX_ITEMS (resume, template) pairs into one streamed
+# ZIP. At most EXPORT_RENDER_CONCURRENCY items render at once so a single
+# export never takes every render slot from interactive requests.
+EXPORT_MAX_ITEMS = int(os.getenv("EXPORT_MAX_ITEMS", "10"))
+EXPORT_RENDER_CONCURRENCY = int(os.getenv("EXPORT_RENDER_CONCURRENCY", "3"))
+
+# Superseded editor previews (see utils/render_cancel.py)
+#
+# The editor posts /api/generate?preview=true on every edit with the same
+# session_id. A new preview cancels the one still queued or rendering for
+# that session (killing its wkhtmltopdf/xelatex process); the old request
+# answers 409 so the pool only spends time on PDFs the user will see.
+PREVIEW_RENDERS = SupersedeRegistry()
+
+# Single-page PNG previews: /api/generate?format=png&page=N&width=W
+#
+# Pages are rasterized in memory with pdftoppm (see utils/page_images.py).
+# The PDF and every page image made from it are kept in a process-wide LRU
+# keyed by the resume's content key, so flipping between pages re-renders
+# nothing. After an edit, pages whose content hash is unchanged keep their
+# images from the previous version for the same session (previews) or saved
+# resume (thumbnails); only edited pages are rasterized again.
+# Set PAGE_IMAGE_CACHE_MAX_MB=0 to disable the cache.
+PAGE_IMAGE_CACHE_MAX_MB = int(os.getenv("PAGE_IMAGE_CACHE_MAX_MB", "64"))
+PAGE_IMAGE_DEFAULT_WIDTH = 800
+PAGE_IMAGE_MAX_WIDTH = 2000
+THUMBNAIL_WIDTH = 400
+PAGE_IMAGE_CACHE = (
+    PageImageCache(PAGE_IMAGE_CACHE_MAX_MB * 1024 * 1024)
+    if PAGE_IMAGE_CACHE_MAX_MB > 0
+    else None
+)
+
+# Startup
+#
+# Every startup step is timed and logged; the timings are in
+# /api/render/stats. With STARTUP_WARMUP=true a background thread renders one
+# modern and one classic sample after startup, so the first user request
+# after a scale-up does not pay for the first wkhtmltopdf/xelatex run (font
+# lookups, renderer workers, template and asset caches). /health answers 503
+# until the warm-up has finished, so a startup probe on /health only routes
+# traffic to a warm instance.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "false").lower() == "true"
+WARMUP_TEMPLATES = ("modern-with-icons", "classic-jane-doe")
+STARTUP_TIMINGS = {}
+STARTUP_READY = threading.Event()
+
+
+def initialize_pdf_backend():
+    """
+    Start an in-process PDF backend (PDF_RENDER_BACKEND=chromium).
+
+    Failure is not fatal: renders fall back to wkhtmltopdf.
+    """
+    global PDF_RENDER_BACKEND
+    if PDF_RENDER_BACKEND == "wkhtmltopdf":
+        return
+    try:
+        resume_generator.get_pdf_backend(PDF_RENDER_BACKEND).start()
+        atexit.register(cleanup_pdf_backend)
+    except Exception as e:
+        logging.error(
+            f"Failed to start {PDF_RENDER_BACKEND} PDF backend, "
+            f"falling back to wkhtmltopdf: {e}"
+        )
+        PDF_RENDER_BACKEND = "wkhtmltopdf"
+
+
+def cleanup_pdf_backend():
+    """Stop in-process PDF backends on app shutdown."""
+    logging.info("Shutting down PDF backends")
+    resume_generator.close_pdf_backends()
+
+
+def initialize_renderer_pool():
+    """
+    Start the persistent renderer worker pool.
+
+    Failure is not fatal: pdf_generation_worker falls back to spawning one
+    subprocess per PDF when the pool is unavailable.
+    """
+    global PDF_RENDER_POOL
+    if RENDER_POOL_SIZE < 1:
+        logging.info("Renderer pool disabled (RENDER_POOL_SIZE=0)")
+        return
+    if PDF_RENDER_BACKEND != "wkhtmltopdf":
+        logging.info(f"Renderer pool not started ({PDF_RENDER_BACKEND} backend)")
+        return
+    try:
+        PDF_RENDER_POOL = RendererPool(
+            size=RENDER_POOL_SIZE,
+            max_jobs_per_worker=RENDER_WORKER_MAX_JOBS,
+            max_rss_mb=RENDER_WORKER_MAX_RSS_MB,
+            on_render_peak=RENDER_MEMORY.observe,
+        )
+        atexit.register(cleanup_renderer_pool)
+    except Exception as e:
+        logging.error(f"Failed to start renderer pool: {e}")
+        PDF_RENDER_POOL = None
+
+
+def cleanup_renderer_pool():
+    """Stop the persistent renderer workers on app shutdown."""
+    global PDF_RENDER_POOL
+    if PDF_RENDER_POOL:
+        logging.info("Shutting down renderer pool")
+        PDF_RENDER_POOL.shutdown()
+        PDF_RENDER_POOL = None
 
 
 def initialize_pdf_pool():
     """
-    Initialize the thread pool for PDF generation dispatch.
+    Initialize the render scheduler for PDF generation dispatch.
 
-    Uses ThreadPoolExecutor to dispatch subprocess calls that handle PDF generation.
-    The subprocess provides process isolation (fresh Python + Qt state), so threads
-    are sufficient for the dispatch layer.
+    Uses RenderScheduler threads to dispatch subprocess calls that handle PDF
+    generation. The subprocess provides process isolation (fresh Python + Qt
+    state), so threads are sufficient for the dispatch layer.
     """
     global PDF_THREAD_POOL
     try:
-        # 5 workers - threads are I/O-bound (waiting on subprocess)
-        # Limit is primarily memory: each wkhtmltopdf subprocess uses ~100-200MB
-        PDF_THREAD_POOL = ThreadPoolExecutor(max_workers=5)
-        logging.info("PDF thread pool initialized with 5 workers")
+        # Threads are I/O-bound (waiting on subprocess); the limit is memory,
+        # so there is one per render slot that fits in the container
+        PDF_THREAD_POOL = RenderScheduler(
+            max_workers=PDF_THREAD_POOL_WORKERS,
+            max_queue=RENDER_QUEUE_MAX,
+            max_background_queue=RENDER_BACKGROUND_QUEUE_MAX,
+        )
+        logging.info(
+            f"PDF render scheduler initialized with {PDF_THREAD_POOL_WORKERS} workers "
+            f"({RENDER_MEMORY.stats()})"
+        )
 
         # Register cleanup function
         atexit.register(cleanup_pdf_pool)
@@ -345,6 +1040,99 @@ def cleanup_pdf_pool():
         PDF_THREAD_POOL = None
 
 
+def initialize_pdf_cache():
+    """Open the on-disk rendered-PDF cache. Failure only disables caching."""
+    global PDF_CACHE
+    if PDF_CACHE_MAX_MB < 1:
+        logging.info("PDF cache disabled (PDF_CACHE_MAX_MB=0)")
+        return
+    try:
+        PDF_CACHE = PdfCache(PDF_CACHE_DIR, PDF_CACHE_MAX_MB * 1024 * 1024)
+    except Exception as e:
+        logging.error(f"Failed to initialize PDF cache: {e}")
+        PDF_CACHE = None
+
+
+def initialize_pdf_jobs():
+    """Open the PDF job store and start its executor. Failure disables jobs."""
+    global PDF_JOB_STORE, PDF_JOB_EXECUTOR
+    if PDF_JOB_WORKERS < 1:
+        logging.info("PDF jobs disabled (PDF_JOB_WORKERS=0)")
+        return
+    try:
+        PDF_JOB_STORE = PdfJobStore(
+            PDF_JOBS_DIR,
+            ttl_seconds=PDF_JOB_TTL_SECONDS,
+            max_active=PDF_JOBS_MAX_ACTIVE,
+        )
+        PDF_JOB_EXECUTOR = ThreadPoolExecutor(
+            max_workers=PDF_JOB_WORKERS, thread_name_prefix="pdf-job"
+        )
+        atexit.register(cleanup_pdf_jobs)
+    except Exception as e:
+        logging.error(f"Failed to initialize PDF jobs: {e}")
+        PDF_JOB_STORE = None
+        PDF_JOB_EXECUTOR = None
+
+
+def cleanup_pdf_jobs():
+    """Stop the PDF job executor on app shutdown."""
+    global PDF_JOB_EXECUTOR
+    if PDF_JOB_EXECUTOR:
+        logging.info("Shutting down PDF job executor")
+        PDF_JOB_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        PDF_JOB_EXECUTOR = None
+
+
+def pdf_renderer_version():
+    """
+    PDF_RENDERER_VERSION plus the settings that change the PDF bytes rendered
+    for the same input: the active HTML backend (after any fallback), the
+    optimizer preset and linearization.
+    """
+    return (
+        f"{PDF_RENDERER_VERSION}:backend={PDF_RENDER_BACKEND}:"
+        f"optimize={PDF_OPTIMIZE}:linearize={PDF_LINEARIZE}"
+    )
+
+
+def saved_resume_cache_key(resume, icon_rows, actual_template):
+    """
+    Build the PDF cache key for a saved resume without downloading anything.
+
+    The content hash is recomputed from the stored contact_info/sections
+    rather than trusting json_hash, which is only refreshed by save_resume.
+    User icons are identified by their resume_icons row (paths, size and
+    upload time); base icons and template files by a content fingerprint.
+    """
+    content_hash = hashlib.sha256(
+        json.dumps(
+            {
+                "contact_info": resume.get("contact_info"),
+                "sections": resume.get("sections"),
+            },
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+    icon_hashes = [
+        f"user:{row.get('filename')}:{row.get('storage_path')}:"
+        f"{row.get('file_size')}:{row.get('created_at')}:"
+        f"{row.get('render_storage_path')}"
+        for row in icon_rows
+    ]
+    icon_hashes.append(f"base:{directory_fingerprint(ICONS_DIR)}")
+
+    template_dir = PROJECT_ROOT / "templates" / actual_template
+    return make_cache_key(
+        f"{actual_template}:{directory_fingerprint(template_dir)}",
+        content_hash,
+        icon_hashes,
+        pdf_renderer_version(),
+    )
+
+
 # Resume Generation Helper Functions
 # These functions support both HTML and LaTeX template generation
 def get_social_media_handle(url, platform="linkedin"):
@@ -384,39 +1172,6 @@ def get_social_media_handle(url, platform="linkedin"):
     return url.split("/")[-1]
 
 
-def migrate_linkedin_to_social_links(contact_info):
-    """
-    Migrate old 'linkedin' field to new 'social_links' array format.
-
-    Args:
-        contact_info (dict): Contact information dictionary
-
-    Returns:
-        dict: Updated contact_info with social_links array
-    """
-    # If already has social_links, no migration needed
-    if contact_info.get("social_links"):
-        return contact_info
-
-    # Check if old linkedin field exists
-    linkedin_url = contact_info.get("linkedin", "")
-    if linkedin_url and linkedin_url.strip():
-        # Create social_links array with migrated LinkedIn
-        contact_info["social_links"] = [
-            {
-                "platform": "linkedin",
-                "url": linkedin_url,
-                "display_text": contact_info.get("linkedin_display", ""),
-            }
-        ]
-        app.logger.info("Migrated old 'linkedin' field to 'social_links' array")
-    else:
-        # Initialize empty social_links array
-        contact_info["social_links"] = []
-
-    return contact_info
-
-
 def generate_linkedin_display_text(linkedin_url, contact_name=None):
     """
     Generates smart display text for a LinkedIn profile with quality analysis.
@@ -518,36 +1273,12 @@ def _escape_latex(text):
 
 def normalize_sections(data):
     """
-    Add type attributes to sections for backward compatibility.
+    Give untyped sections a type from their name (backward compatibility).
 
-    Converts old name-based format to new type-based format:
-    - Sections named "Experience" (case-insensitive) get type="experience"
-    - Sections named "Education" (case-insensitive) get type="education"
-
-    This allows old YAML files to work without modification while supporting
-    multiple experience/education sections with custom names.
+    Delegates to utils.resume_schema.normalize_section_type for each section.
     """
-    if "sections" not in data:
-        return data
-
-    for section in data["sections"]:
-        # Skip if section already has a type attribute
-        if "type" in section and section["type"]:
-            continue
-
-        # Check section name and add appropriate type
-        section_name_lower = section.get("name", "").lower()
-
-        if section_name_lower == "experience":
-            section["type"] = "experience"
-            logging.debug(
-                f"Normalized section '{section.get('name')}' to type='experience'"
-            )
-        elif section_name_lower == "education":
-            section["type"] = "education"
-            logging.debug(
-                f"Normalized section '{section.get('name')}' to type='education'"
-            )
+    for section in data.get("sections") or []:
+        normalize_section_type(section)
 
     return data
 
@@ -638,27 +1369,27 @@ def _escape_remaining_latex_chars(text):
     return text
 
 
+def _escape_latex_recursive(item, current_key=None):
+    """Return a copy of item with every string except "type" values LaTeX-escaped."""
+    if isinstance(item, str):
+        if current_key == "type":
+            return item
+        return _escape_latex(item)
+    elif isinstance(item, dict):
+        return {k: _escape_latex_recursive(v, k) for k, v in item.items()}
+    elif isinstance(item, list):
+        return [_escape_latex_recursive(elem) for elem in item]
+    else:
+        return item
+
+
 def _prepare_latex_data(data):
     """Recursively applies LaTeX escaping to all string values in the data dictionary."""
     logging.info(
         "Preparing data for LaTeX rendering, applying escaping and deriving fields."
     )
 
-    prepared_data = copy.deepcopy(data)
-
-    def apply_escaping_recursive(item, current_key=None):
-        if isinstance(item, str):
-            if current_key == "type":
-                return item
-            return _escape_latex(item)
-        elif isinstance(item, dict):
-            return {k: apply_escaping_recursive(v, k) for k, v in item.items()}
-        elif isinstance(item, list):
-            return [apply_escaping_recursive(elem) for elem in item]
-        else:
-            return item
-
-    prepared_data = apply_escaping_recursive(prepared_data)
+    prepared_data = _escape_latex_recursive(copy.deepcopy(data))
 
     contact_info = prepared_data.get("contact_info", {})
     if contact_info:
@@ -725,48 +1456,93 @@ def _process_social_links(contact_info):
     return contact_info
 
 
-def generate_latex_pdf(yaml_data, icons_dir, output_path, template_name="classic"):
-    """
-    Generate PDF from YAML data using LaTeX template and XeLaTeX compilation.
-    Used for classic templates that require LaTeX formatting.
-    """
-    # Generate session ID for tracking this request
-    session_id = str(uuid.uuid4())
+def get_latex_environment(template_name):
+    """Return the shared Jinja environment for a LaTeX template directory."""
+    return get_environment(
+        PROJECT_ROOT / "templates" / template_name,
+        filters={
+            "markdown_links": convert_markdown_links_to_latex,
+            "markdown_formatting": convert_markdown_formatting_to_latex,
+        },
+        block_start_string="\\BLOCK{",
+        block_end_string="}",
+        variable_start_string="\\VAR{",
+        variable_end_string="}",
+        comment_start_string="\\#{",
+        comment_end_string="}",
+        line_statement_prefix="%%",
+        line_comment_prefix="%#",
+        trim_blocks=True,
+        autoescape=False,
+    )
 
-    logging.info(f"Starting LaTeX PDF generation for template: {template_name}")
 
-    try:
-        # Normalize sections for backward compatibility
-        yaml_data = normalize_sections(yaml_data)
+def warm_latex_environments():
+    """Precompile the LaTeX templates so the first classic render skips it."""
+    for template_name in sorted(set(TEMPLATE_DIR_MAP.values())):
+        template_dir = PROJECT_ROOT / "templates" / template_name
+        if not (template_dir / "resume.tex").exists():
+            continue
+        count = warm_environment(
+            get_latex_environment(template_name), extensions=["tex"]
+        )
+        logging.info(f"Precompiled {count} LaTeX templates for '{template_name}'")
 
-        # Load and prepare data
-        prepared_data = _prepare_latex_data(yaml_data)
 
-        # Setup template directory and Jinja2 environment
-        template_dir = PROJECT_ROOT / "templates" / template_name
+def render_latex_source(yaml_data, template_name="classic"):
+    """
+    Render the LaTeX source of a resume.
+
+    Each section is escaped and rendered once per content through the
+    section fragment cache (utils/fragment_cache.py); resume.tex assembles
+    the fragments.
+    """
+    # Normalize sections for backward compatibility
+    yaml_data = normalize_sections(yaml_data)
+
+    # Sections are escaped per fragment, everything else up front
+    sections = yaml_data.get("sections", [])
+    prepared_data = _prepare_latex_data(
+        {key: value for key, value in yaml_data.items() if key != "sections"}
+    )
+
+    # Shared Jinja2 environment with LaTeX-compatible delimiters
+    latex_env = get_latex_environment(template_name)
+    section_template = latex_env.get_template("section.tex")
+    template_dir = PROJECT_ROOT / "templates" / template_name
+    namespace = f"latex:{template_dir}:{directory_fingerprint(template_dir)}"
 
-        # Configure Jinja2 with LaTeX-compatible delimiters
-        latex_env = Environment(
-            loader=FileSystemLoader(template_dir),
-            block_start_string="\\BLOCK{",
-            block_end_string="}",
-            variable_start_string="\\VAR{",
-            variable_end_string="}",
-            comment_start_string="\\#{",
-            comment_end_string="}",
-            line_statement_prefix="%%",
-            line_comment_prefix="%#",
-            trim_blocks=True,
-            autoescape=False,
+    def render_section(section):
+        return render_fragment(
+            section_key(namespace, section),
+            lambda _: section_template.render(section=_escape_latex_recursive(section)),
         )
 
-        # Register custom filters for markdown links and formatting
-        latex_env.filters["markdown_links"] = convert_markdown_links_to_latex
-        latex_env.filters["markdown_formatting"] = convert_markdown_formatting_to_latex
+    template = latex_env.get_template("resume.tex")
+    return template.render(
+        **prepared_data, sections=sections, render_section=render_section
+    )
+
+
+def generate_latex_pdf(
+    yaml_data, icons_dir, output_path, template_name="classic", cancel_token=None
+):
+    """
+    Generate PDF from YAML data using LaTeX template and XeLaTeX compilation.
+    Used for classic templates that require LaTeX formatting.
+
+    When output_path is None the PDF bytes are returned instead of being
+    written to a file (xelatex itself still needs a scratch directory). The
+    PDF goes through the optional size optimizer (utils/pdf_optimize.py).
+    Cancelling cancel_token kills xelatex and raises RenderCancelledError.
+    """
+    # Generate session ID for tracking this request
+    session_id = str(uuid.uuid4())
+
+    logging.info(f"Starting LaTeX PDF generation for template: {template_name}")
 
-        # Render the LaTeX template
-        template = latex_env.get_template("resume.tex")
-        latex_content = template.render(**prepared_data)
+    try:
+        latex_content = render_latex_source(yaml_data, template_name)
 
         # Create unique temporary file for LaTeX using existing session_id
         temp_dir = Path(tempfile.gettempdir())
@@ -790,8 +1566,11 @@ def generate_latex_pdf(yaml_data, icons_dir, output_path, template_name="classic
 
         logging.debug(f"Running LaTeX compilation: {' '.join(compile_command)}")
 
-        result = subprocess.run(
-            compile_command, capture_output=True, text=True, cwd=str(temp_dir)
+        result = run_cancellable(
+            compile_command,
+            cancel_token,
+            cwd=str(temp_dir),
+            max_address_space_mb=resume_generator.RENDER_PROCESS_MAX_AS_MB,
         )
 
         # Check if PDF was generated successfully (primary success indicator)
@@ -813,21 +1592,24 @@ def generate_latex_pdf(yaml_data, icons_dir, output_path, template_name="classic
             )
             logging.warning(f"LaTeX stdout: {result.stdout}")
 
-        # Copy the generated PDF to the output location
-        shutil.copy2(temp_pdf_file, output_path)
-        logging.info(f"PDF successfully generated at: {output_path}")
-
-        # Clean up temporary files
-        for pattern in [f"resume_{session_id}.*"]:
-            for temp_file in temp_dir.glob(pattern):
-                try:
-                    temp_file.unlink()
-                    logging.debug(f"Cleaned up temporary file: {temp_file}")
-                except Exception as e:
-                    logging.warning(f"Could not remove temporary file {temp_file}: {e}")
+        pdf_bytes = maybe_optimize_pdf(temp_pdf_file.read_bytes())
+        if output_path is None:
+            logging.info(f"PDF successfully generated ({len(pdf_bytes)} bytes)")
+        else:
+            # Write the generated PDF to the output location
+            Path(output_path).write_bytes(pdf_bytes)
+            logging.info(f"PDF successfully generated at: {output_path}")
 
+        if output_path is None:
+            return pdf_bytes
         return str(output_path)
 
+    except RenderCancelledError:
+        logging.info(f"LaTeX PDF generation cancelled, Session: {session_id}")
+        raise
+    except RenderTimeoutError:
+        logging.warning(f"LaTeX PDF generation timed out, Session: {session_id}")
+        raise
     except Exception as e:
         # Complete error context for debugging - ONLY on actual errors
         logging.error(
@@ -836,6 +1618,17 @@ def generate_latex_pdf(yaml_data, icons_dir, output_path, template_name="classic
         logging.error(f"Error: {str(e)}")
         logging.error(f"YAML data for reproduction: {yaml_data}")
         raise e
+    finally:
+        # Clean up the .tex/.pdf/.aux/.log scratch files, including those of a
+        # failed, cancelled or killed xelatex run
+        for temp_file in Path(tempfile.gettempdir()).glob(f"resume_{session_id}.*"):
+            try:
+                temp_file.unlink()
+                logging.debug(f"Cleaned up temporary file: {temp_file}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.warning(f"Could not remove temporary file {temp_file}: {e}")
 
 
 def load_resume_data(yaml_file_path):
@@ -975,6 +1768,34 @@ def upload_icon_to_storage(
         raise
 
 
+def _upload_icon_render_derivative(user_id, resume_id, filename, file_data, mime_type):
+    """
+    Store the render-size copy of an uploaded icon next to the original.
+
+    Returns:
+        tuple: (storage_path, file_size), or (None, None) when the original is
+        rendered as is (no derivative, or its upload failed)
+    """
+    derivative = make_render_derivative(file_data, filename)
+    if derivative is None:
+        return None, None
+    try:
+        storage_path, _ = upload_icon_to_storage(
+            user_id,
+            resume_id,
+            f"{ICON_RENDER_PREFIX}/{filename}",
+            derivative,
+            mime_type,
+        )
+    except Exception as e:
+        logging.warning(f"Rendering the original of {filename}: {e}")
+        return None, None
+    logging.debug(
+        f"Icon {filename}: {len(file_data)} bytes, render copy {len(derivative)}"
+    )
+    return storage_path, len(derivative)
+
+
 def check_resume_limit(user_id):
     """
     Check if user has reached the 5-resume limit.
@@ -1054,12 +1875,95 @@ def download_icon_from_storage(storage_path, dest_path, max_retries=2):
     return False
 
 
-def generate_thumbnail_from_pdf(pdf_path, user_id, resume_id):
+def render_pdf_first_page_png(pdf_source, width=THUMBNAIL_WIDTH):
+    """
+    Rasterize the first page of a PDF to PNG bytes.
+
+    Args:
+        pdf_source (str | bytes): Path to a PDF file, or the PDF bytes
+        width (int): Output width in pixels; height keeps the page aspect ratio
+
+    Returns:
+        bytes: PNG data, or None if the PDF produced no page
+
+    Raises:
+        ImportError: pdf2image or Pillow is not installed
+    """
+    from pdf2image import convert_from_bytes, convert_from_path
+    from PIL import Image
+
+    # Convert first page of PDF to image at 150 DPI
+    if isinstance(pdf_source, (bytes, bytearray)):
+        logging.debug(f"Converting in-memory PDF to PNG ({len(pdf_source)} bytes)")
+        images = convert_from_bytes(pdf_source, first_page=1, last_page=1, dpi=150)
+    else:
+        logging.debug(f"Converting PDF to PNG: {pdf_source}")
+        images = convert_from_path(pdf_source, first_page=1, last_page=1, dpi=150)
+
+    if not images:
+        return None
+
+    # Get the first (and only) page
+    page_image = images[0]
+
+    # Resize to the target width, maintaining aspect ratio
+    # A4 aspect ratio is approximately 1:1.414
+    aspect_ratio = page_image.height / page_image.width
+    target_height = int(width * aspect_ratio)
+
+    image = page_image.resize((width, target_height), Image.Resampling.LANCZOS)
+
+    # Encode in memory
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True, quality=85)
+    return buffer.getvalue()
+
+
+def render_thumbnail_png(pdf_source, user_id, resume_id):
+    """
+    Rasterize a resume's thumbnail, reusing it while page 1 is unchanged.
+
+    Saving a resume regenerates its thumbnail, but most edits happen past
+    the first page. In-memory PDFs go through PAGE_IMAGE_CACHE scoped to the
+    resume, so the previous thumbnail is reused when page 1 hashes the same.
+
+    Returns:
+        bytes: PNG data, or None if the PDF produced no page
+
+    Raises:
+        ImportError: pdf2image or Pillow is not installed
+    """
+    if PAGE_IMAGE_CACHE is None or not isinstance(pdf_source, (bytes, bytearray)):
+        return render_pdf_first_page_png(pdf_source)
+
+    pdf_bytes = bytes(pdf_source)
+    cache_key = f"thumbnail:{hashlib.sha256(pdf_bytes).hexdigest()}"
+    cached = PAGE_IMAGE_CACHE.get_page(cache_key, 1, THUMBNAIL_WIDTH)
+    if cached is None:
+        PAGE_IMAGE_CACHE.put_pdf(
+            cache_key,
+            pdf_bytes,
+            count_pdf_pages(pdf_bytes),
+            page_hashes=page_content_hashes(pdf_bytes),
+            scope=f"thumbnail:{user_id}:{resume_id}",
+        )
+        cached = PAGE_IMAGE_CACHE.get_page(cache_key, 1, THUMBNAIL_WIDTH)
+    if cached is not None:
+        logging.debug(f"Reusing unchanged thumbnail for resume {resume_id}")
+        return cached[0]
+
+    thumbnail_data = render_pdf_first_page_png(pdf_bytes)
+    if thumbnail_data is not None:
+        PAGE_IMAGE_CACHE.put_page(cache_key, 1, THUMBNAIL_WIDTH, thumbnail_data)
+    return thumbnail_data
+
+
+def generate_thumbnail_from_pdf(pdf_source, user_id, resume_id):
     """
     Convert first page of PDF to PNG thumbnail and upload to Supabase.
 
     Args:
-        pdf_path (str): Path to the generated PDF file
+        pdf_source (str | bytes): Path to the generated PDF file, or the PDF bytes
         user_id (str): UUID of the user
         resume_id (str): UUID of the resume
 
@@ -1073,78 +1977,40 @@ def generate_thumbnail_from_pdf(pdf_path, user_id, resume_id):
         return None
 
     try:
-        import tempfile
-
-        from pdf2image import convert_from_path
-        from PIL import Image
-
-        # Convert first page of PDF to image at 150 DPI
-        logging.debug(f"Converting PDF to thumbnail: {pdf_path}")
-        images = convert_from_path(pdf_path, first_page=1, last_page=1, dpi=150)
-
-        if not images:
+        thumbnail_data = render_thumbnail_png(pdf_source, user_id, resume_id)
+        if thumbnail_data is None:
             logging.error("No images generated from PDF")
             return None
 
-        # Get the first (and only) page
-        page_image = images[0]
+        # Upload to Supabase Storage: resume-thumbnails/{user_id}/{resume_id}/thumbnail.png
+        storage_path = f"{user_id}/{resume_id}/thumbnail.png"
 
-        # Resize to thumbnail size (width=400px, maintain aspect ratio)
-        # A4 aspect ratio is approximately 1:1.414
-        target_width = 400
-        aspect_ratio = page_image.height / page_image.width
-        target_height = int(target_width * aspect_ratio)
-
-        thumbnail = page_image.resize(
-            (target_width, target_height), Image.Resampling.LANCZOS
+        logging.debug(f"Uploading thumbnail to storage: {storage_path}")
+        supabase.storage.from_("resume-thumbnails").upload(
+            storage_path,
+            thumbnail_data,
+            file_options={
+                "content-type": "image/png",
+                "upsert": "true",
+                "cacheControl": "public, max-age=31536000, immutable",
+            },
         )
 
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-            thumbnail.save(tmp_file.name, "PNG", optimize=True, quality=85)
-            tmp_path = tmp_file.name
-
-        try:
-            # Read the thumbnail data
-            with open(tmp_path, "rb") as f:
-                thumbnail_data = f.read()
-
-            # Upload to Supabase Storage: resume-thumbnails/{user_id}/{resume_id}/thumbnail.png
-            storage_path = f"{user_id}/{resume_id}/thumbnail.png"
-
-            logging.debug(f"Uploading thumbnail to storage: {storage_path}")
-            supabase.storage.from_("resume-thumbnails").upload(
-                storage_path,
-                thumbnail_data,
-                file_options={
-                    "content-type": "image/png",
-                    "upsert": "true",
-                    "cacheControl": "public, max-age=31536000, immutable",
-                },
-            )
-
-            # Get public URL and add cache-busting timestamp
-            thumbnail_url = supabase.storage.from_("resume-thumbnails").get_public_url(
-                storage_path
-            )
-
-            # Add cache-busting parameter to force browser to fetch new thumbnails
-            timestamp = int(time.time() * 1000)  # Unix timestamp in milliseconds
-            url_parts = list(urlparse(thumbnail_url))
-            query = parse_qs(url_parts[4])
-            query["v"] = [str(timestamp)]
-            url_parts[4] = urlencode(query, doseq=True)
-            thumbnail_url = urlunparse(url_parts)
+        # Get public URL and add cache-busting timestamp
+        thumbnail_url = supabase.storage.from_("resume-thumbnails").get_public_url(
+            storage_path
+        )
 
-            logging.info(
-                f"Successfully generated and uploaded thumbnail: {storage_path}"
-            )
-            return thumbnail_url
+        # Add cache-busting parameter to force browser to fetch new thumbnails
+        timestamp = int(time.time() * 1000)  # Unix timestamp in milliseconds
+        url_parts = list(urlparse(thumbnail_url))
+        query = parse_qs(url_parts[4])
+        query["v"] = [str(timestamp)]
+        url_parts[4] = urlencode(query, doseq=True)
+        thumbnail_url = urlunparse(url_parts)
 
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        logging.info(f"Successfully generated and uploaded thumbnail: {storage_path}")
+        return thumbnail_url
 
     except ImportError as e:
         logging.error(f"Missing dependencies for thumbnail generation: {e}")
@@ -1152,7 +2018,8 @@ def generate_thumbnail_from_pdf(pdf_path, user_id, resume_id):
         return None
     except Exception as e:
         logging.error(f"Failed to generate thumbnail from PDF: {e}")
-        logging.error(f"PDF path: {pdf_path}")
+        if not isinstance(pdf_source, (bytes, bytearray)):
+            logging.error(f"PDF path: {pdf_source}")
         return None
 
 
@@ -1201,7 +2068,15 @@ CORS(
         r"/api/*": {
             "origins": ALLOWED_ORIGINS,
             "methods": ["GET", "POST", "PUT", "PATCH", "DELETE"],
-            "allow_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "Range", "If-Range"],
+            # Range responses for pdf.js's progressive loading of PDFs
+            "expose_headers": [
+                "X-Page-Count",
+                "Accept-Ranges",
+                "Content-Range",
+                "Content-Length",
+                "ETag",
+            ],
             "supports_credentials": True,
         }
     },
@@ -1212,10 +2087,44 @@ app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16 MB
 
 @app.route("/health", methods=["GET"])
 def health():
-    """Liveness check for docker-compose healthcheck and CI smoke tests."""
+    """
+    Health check for docker-compose, CI smoke tests and startup probes.
+
+    Answers 503 while the startup warm-up (STARTUP_WARMUP) is still running.
+    """
+    if not STARTUP_READY.is_set():
+        return jsonify(status="warming"), 503
     return jsonify(status="ok"), 200
 
 
+@app.route("/api/render/stats", methods=["GET"])
+def render_stats():
+    """Render queue, renderer pool, PDF backend and cache counters for monitoring."""
+    return (
+        jsonify(
+            {
+                "scheduler": PDF_THREAD_POOL.stats() if PDF_THREAD_POOL else None,
+                "render_pool": PDF_RENDER_POOL.stats() if PDF_RENDER_POOL else None,
+                "pdf_backend": resume_generator.get_pdf_backend(
+                    PDF_RENDER_BACKEND
+                ).stats(),
+                "pdf_cache": PDF_CACHE.stats() if PDF_CACHE else None,
+                "pdf_jobs": PDF_JOB_STORE.stats() if PDF_JOB_STORE else None,
+                "preview_renders": PREVIEW_RENDERS.stats(),
+                "page_images": PAGE_IMAGE_CACHE.stats() if PAGE_IMAGE_CACHE else None,
+                "deadlines": DEADLINES.stats(),
+                "render_memory": RENDER_MEMORY.stats(),
+                "section_fragments": fragment_cache_stats(),
+                "startup": {
+                    "ready": STARTUP_READY.is_set(),
+                    "timings_ms": STARTUP_TIMINGS,
+                },
+            }
+        ),
+        200,
+    )
+
+
 # =============================================================================
 # Jobs pSEO Renderer — initialized once at startup
 # =============================================================================
@@ -1275,8 +2184,23 @@ def canonicalize_host():
     return None
 
 
+def run_startup_step(name, step):
+    """Run one startup step and log how long it took."""
+    start = time.perf_counter()
+    try:
+        return step()
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        STARTUP_TIMINGS[name] = round(elapsed_ms, 1)
+        logging.info(f"Startup: {name} took {elapsed_ms:.0f}ms")
+
+
 # Initialize PDF process pool on app startup
-initialize_pdf_pool()
+run_startup_step("pdf_pool", initialize_pdf_pool)
+run_startup_step("pdf_backend", initialize_pdf_backend)
+run_startup_step("renderer_pool", initialize_renderer_pool)
+run_startup_step("pdf_cache", initialize_pdf_cache)
+run_startup_step("pdf_jobs", initialize_pdf_jobs)
 
 # Define paths for the project
 PROJECT_ROOT = Path(__file__).parent.resolve()
@@ -1309,6 +2233,53 @@ TEMPLATE_DIR_MAP = {
     "classic-jane-doe": "classic",  # LaTeX template (marketing)
 }
 
+# Precompile LaTeX templates at startup (HTML templates are warmed by each
+# renderer worker; see utils/jinja_envs.py)
+run_startup_step("latex_templates", warm_latex_environments)
+
+
+def warm_up_renders():
+    """
+    Render the WARMUP_TEMPLATES samples once, then mark the app ready.
+
+    A failed warm-up render is logged and does not keep the app from
+    becoming ready: it only means the first real render is a cold one.
+    """
+    try:
+        for template_id in WARMUP_TEMPLATES:
+            actual_template = TEMPLATE_DIR_MAP[template_id]
+
+            def render(template_id=template_id, actual_template=actual_template):
+                yaml_data = normalize_sections(
+                    get_template_config(TEMPLATE_FILE_MAP[template_id])
+                )
+                if actual_template == "classic":
+                    yaml_data = _without_content_icons(yaml_data)
+                render_resume_pdf(
+                    actual_template,
+                    yaml_data,
+                    ICONS_DIR,
+                    f"warmup-{template_id}",
+                    priority=PRIORITY_BACKGROUND,
+                )
+
+            try:
+                run_startup_step(f"warmup_{actual_template}", render)
+            except Exception as e:
+                logging.warning(f"Warm-up render of {template_id} failed: {e}")
+    finally:
+        STARTUP_READY.set()
+        logging.info(f"Startup timings (ms): {STARTUP_TIMINGS}")
+
+
+def start_warm_up():
+    """Warm up in the background when STARTUP_WARMUP is set; else be ready now."""
+    if not STARTUP_WARMUP:
+        STARTUP_READY.set()
+        logging.info(f"Startup timings (ms): {STARTUP_TIMINGS}")
+        return
+    threading.Thread(target=warm_up_renders, name="warm-up", daemon=True).start()
+
 
 # Authentication Middleware
 def require_auth(f):
@@ -1971,282 +2942,711 @@ def _is_preview_request():
     return request.args.get("preview", "false").lower() == "true"
 
 
-@app.route("/api/generate", methods=["POST"])
-def generate_resume():
-    """
-    Generate a resume PDF from the uploaded YAML and optional icons.
+def _send_pdf(pdf_bytes, download_name):
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            # Paths for YAML and output
-            temp_dir_path = Path(temp_dir)
-            yaml_path = temp_dir_path / "input.yaml"
-            timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
-            output_path = temp_dir_path / f"Resume_{timestamp}.pdf"
-
-            # Validate and save YAML file
-            yaml_file = request.files.get("yaml_file")
-            if not yaml_file or yaml_file.filename == "":
-                raise ValueError("No YAML file uploaded")
-
-            yaml_file.save(yaml_path)
-
-            # Parse YAML to extract icon references
-            with open(yaml_path, "r", encoding="utf-8") as f:
-                yaml_data = fast_yaml_load(f)
-
-            # Normalize sections for backward compatibility
-            yaml_data = normalize_sections(yaml_data)
-
-            # Get session ID for icon isolation
-            session_id = request.form.get("session_id")
-            if not session_id:
-                raise ValueError("No session ID provided")
-
-            # Create session-specific icon directory
-            session_icons_dir = Path("/tmp") / "sessions" / session_id / "icons"
-            session_icons_dir.mkdir(parents=True, exist_ok=True)
-
-            # Select the template and determine if it uses icons
-            template = request.form.get("template", "modern")
-            uses_icons = (
-                template == "modern-with-icons"
-            )  # Only modern-with-icons template needs icons
-
-            # Always copy base contact icons that are hardcoded in templates
-            # Include all social platform icons for new social_links feature
-            base_contact_icons = [
-                "location.png",
-                "email.png",
-                "phone.png",
-                "linkedin.png",
-                "github.png",
-                "twitter.png",
-                "website.png",
-                "pinterest.png",
-                "medium.png",
-                "youtube.png",
-                "stackoverflow.png",
-                "behance.png",
-                "dribbble.png",
-            ]
-            for icon_name in base_contact_icons:
-                default_icon_path = ICONS_DIR / icon_name
-                if default_icon_path.exists():
-                    session_icon_path = session_icons_dir / icon_name
-                    shutil.copy2(default_icon_path, session_icon_path)
-                    logging.debug(
-                        f"Copied base contact icon: {icon_name} to session directory"
-                    )
-                else:
-                    logging.warning(
-                        f"Base contact icon not found: {icon_name} at {default_icon_path}"
-                    )
+    Send PDF bytes inline for previews or as an attachment for downloads.
 
-            # Copy additional icons referenced in YAML content (only for icon-supporting templates)
-            if uses_icons:
-                referenced_icons = extract_icons_from_yaml(yaml_data)
-                logging.debug(
-                    f"Found {len(referenced_icons)} referenced icons: {referenced_icons}"
-                )
-                for icon_name in referenced_icons:
-                    # Skip if already copied as base contact icon
-                    if icon_name in base_contact_icons:
-                        continue
+    Range requests get 206 Partial Content and the content hash is the ETag,
+    so pdf.js can fetch a linearized PDF progressively and check with
+    If-Range that every range comes from the same file. Only the cached PDFs
+    served by get_saved_resume_pdf are linearized; POST responses are not
+    range-requested.
+    """
+    return send_file(
+        io.BytesIO(pdf_bytes),
+        as_attachment=not _is_preview_request(),
+        mimetype="application/pdf",
+        download_name=download_name,
+        etag=hashlib.sha256(pdf_bytes).hexdigest(),
+        conditional=True,
+    )
 
-                    default_icon_path = ICONS_DIR / icon_name
-                    if default_icon_path.exists():
-                        session_icon_path = session_icons_dir / icon_name
-                        shutil.copy2(default_icon_path, session_icon_path)
-                        logging.debug(
-                            f"Copied default icon: {icon_name} to session directory"
-                        )
-                    else:
-                        logging.warning(
-                            f"Default icon not found: {icon_name} at {default_icon_path}"
-                        )
-            else:
-                logging.debug("Skipping referenced icons for no-icons template variant")
 
-            # Handle icon files if provided - save to session directory (only for icon-supporting templates)
-            if uses_icons:
-                icon_files = request.files.getlist("icons")
-                for icon_file in icon_files:
-                    if icon_file.filename == "":
-                        continue
+def _without_content_icons(yaml_data):
+    """
+    Return a copy of resume data with the section "icon" fields removed.
 
-                    # Validate icon file type
-                    allowed_extensions = {"png", "jpg", "jpeg", "svg"}
-                    if (
-                        "." not in icon_file.filename
-                        or icon_file.filename.rsplit(".", 1)[1].lower()
-                        not in allowed_extensions
-                    ):
-                        raise ValueError(
-                            f"Invalid icon file type: {icon_file.filename}"
-                        )
+    Used for templates without content icons: the icon resolver can see every
+    default icon, so references must be dropped rather than left unstaged.
+    """
 
-                    # Save icon to the session-specific icons directory
-                    icon_path = session_icons_dir / icon_file.filename
-                    icon_file.save(icon_path)
-            else:
-                logging.debug(
-                    "Skipping user uploaded icons for no-icons template variant"
-                )
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k != "icon"}
+        if isinstance(value, list):
+            return [strip(item) for item in value]
+        return copy.deepcopy(value)
 
-            # Validate template ID against known templates
-            if template not in TEMPLATE_DIR_MAP:
-                raise ValueError(
-                    f"Invalid template: {template}. Available templates: {', '.join(TEMPLATE_DIR_MAP.keys())}"
-                )
+    stripped = dict(yaml_data)
+    stripped["sections"] = strip(yaml_data.get("sections", []))
+    return stripped
 
-            # Use the mapped template directory
-            actual_template = TEMPLATE_DIR_MAP[template]
 
-            if actual_template == "classic":
-                generate_latex_pdf(
-                    yaml_data, str(session_icons_dir), str(output_path), actual_template
-                )
-            else:
-                _dispatch_html_pdf_generation(
-                    actual_template,
-                    yaml_path,
-                    output_path,
-                    session_icons_dir,
-                    session_id,
-                )
+def _stage_request_icons(yaml_data, session_icons_dir, uses_icons, icon_files):
+    """
+    Save the icons uploaded with a request into a session icon directory.
 
-            if not output_path.exists():
-                logging.error(f"Expected output file at: {output_path}")
-                raise FileNotFoundError("The generated resume file was not found")
+    Only user uploads are written, as render-size derivatives when they are
+    larger (utils/icon_derivatives.py); base contact icons and default content
+    icons are resolved straight from ICONS_DIR at render time (see
+    utils/icon_resolver.py). Templates without content icons get no uploads.
 
-            # Clean up session directory after successful PDF generation
-            try:
-                session_dir = Path("/tmp") / "sessions" / session_id
-                if session_dir.exists():
-                    shutil.rmtree(session_dir)
-                    logging.debug(f"Cleaned up session directory: {session_dir}")
-            except Exception as cleanup_error:
-                logging.warning(f"Failed to cleanup session directory: {cleanup_error}")
-
-            # Send the generated PDF file
-            return send_file(
-                output_path,
-                as_attachment=not _is_preview_request(),  # inline for preview, attachment for download
-                mimetype="application/pdf",
-                download_name=output_path.name,
-            )
+    Raises:
+        ValueError: An uploaded icon has an unsupported file type
+    """
+    session_icons_dir.mkdir(parents=True, exist_ok=True)
 
-        except ValueError as ve:
-            logging.warning("Validation error: %s", ve)
-            return jsonify({"success": False, "error": str(ve)}), 400
-        except FileNotFoundError as fnfe:
-            logging.error("File error: %s", fnfe)
-            return jsonify({"success": False, "error": str(fnfe)}), 500
-        except Exception as e:
-            logging.error("Unexpected error: %s", e)
-            return (
-                jsonify({"success": False, "error": "An unexpected error occurred"}),
-                500,
-            )
+    if not uses_icons:
+        logging.debug("Skipping user uploaded icons for no-icons template variant")
+        return
 
+    for icon_file in icon_files:
+        if icon_file.filename == "":
+            continue
 
-def _validate_and_serve_file(filename, base_dir, file_type="file"):
-    """Validate filename against path traversal and check existence.
+        # Validate icon file type
+        allowed_extensions = {"png", "jpg", "jpeg", "svg"}
+        if (
+            "." not in icon_file.filename
+            or icon_file.filename.rsplit(".", 1)[1].lower() not in allowed_extensions
+        ):
+            raise ValueError(f"Invalid icon file type: {icon_file.filename}")
+        if Path(icon_file.filename).name != icon_file.filename:
+            raise ValueError(f"Invalid icon file name: {icon_file.filename}")
+
+        # Save icon to the session-specific icons directory, downscaled to
+        # render size when it is larger
+        icon_data = icon_file.read()
+        derivative = make_render_derivative(icon_data, icon_file.filename)
+        icon_path = session_icons_dir / icon_file.filename
+        icon_path.write_bytes(derivative if derivative is not None else icon_data)
+
+    resolver = IconResolver(ICONS_DIR, session_icons_dir)
+    for icon_name in extract_icons_from_yaml(yaml_data):
+        if resolver.resolve(icon_name) is None:
+            logging.warning(f"Icon not found in uploads or {ICONS_DIR}: {icon_name}")
+
+
+def _parse_page_image_args():
+    """
+    Read the page and width query parameters of a ?format=png request.
 
-    Returns:
-        (file_path, None) on success, or (None, error_response) on failure.
+    Raises:
+        ValueError: page or width out of range
     """
-    if ".." in filename or filename.startswith("/"):
-        logging.warning(f"Path traversal attempt in {file_type} request: {filename}")
-        return None, (jsonify({"success": False, "error": "Invalid path"}), 400)
+    page = request.args.get("page", 1, type=int)
+    width = request.args.get("width", PAGE_IMAGE_DEFAULT_WIDTH, type=int)
+    if page < 1:
+        raise ValueError("page must be 1 or greater")
+    if not 1 <= width <= PAGE_IMAGE_MAX_WIDTH:
+        raise ValueError(f"width must be between 1 and {PAGE_IMAGE_MAX_WIDTH}")
+    return page, width
+
+
+def render_resume_page_png(
+    actual_template,
+    yaml_data,
+    icons_dir,
+    session_id,
+    page,
+    width,
+    cancel_token=None,
+):
+    """
+    Render one page of a resume as PNG, reusing cached PDFs and page images.
 
-    safe_filename = secure_filename(filename)
-    if not safe_filename or safe_filename != filename:
-        logging.warning(f"Invalid {file_type} filename attempt: {filename}")
-        return None, (jsonify({"success": False, "error": "Invalid filename"}), 400)
+    The cache key covers the template files, the resume content, the
+    uploaded icons and the base icons, so any edit produces a new key. The
+    new PDF takes over the images of unchanged pages from the session's
+    previous version, so an edit only re-rasterizes the pages it touched.
 
-    file_path = base_dir / safe_filename
+    Returns:
+        tuple: (png_bytes, page_count)
 
-    try:
-        if not file_path.resolve().is_relative_to(base_dir.resolve()):
-            logging.warning(
-                f"{file_type.capitalize()} path traversal attempt: {filename}"
-            )
-            return None, (jsonify({"success": False, "error": "Access denied"}), 403)
-    except ValueError:
-        logging.warning(
-            f"{file_type.capitalize()} path validation failed for: {filename}"
-        )
-        return None, (jsonify({"success": False, "error": "Access denied"}), 403)
+    Raises:
+        ValueError: page is past the end of the document
+        PageRasterizationError: pdftoppm failed
+    """
+    template_dir = PROJECT_ROOT / "templates" / actual_template
+    cache_key = make_cache_key(
+        f"{actual_template}:{directory_fingerprint(template_dir)}",
+        hashlib.sha256(
+            json.dumps(yaml_data, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest(),
+        [
+            f"staged:{directory_fingerprint(icons_dir, memoize=False)}",
+            f"base:{directory_fingerprint(ICONS_DIR)}",
+        ],
+        pdf_renderer_version(),
+    )
 
-    if not file_path.exists():
-        return None, (
-            jsonify({"success": False, "error": f"{file_type.capitalize()} not found"}),
-            404,
+    if PAGE_IMAGE_CACHE is not None:
+        cached_page = PAGE_IMAGE_CACHE.get_page(cache_key, page, width)
+        if cached_page is not None:
+            logging.debug(f"Page image cache hit: {cache_key} page {page}")
+            return cached_page
+
+    cached_pdf = PAGE_IMAGE_CACHE.get_pdf(cache_key) if PAGE_IMAGE_CACHE else None
+    if cached_pdf is not None:
+        pdf_bytes, page_count = cached_pdf
+    else:
+        pdf_bytes = render_resume_pdf(
+            actual_template,
+            yaml_data,
+            icons_dir,
+            session_id,
+            cancel_token=cancel_token,
         )
+        page_count = count_pdf_pages(pdf_bytes)
+        if PAGE_IMAGE_CACHE is not None:
+            PAGE_IMAGE_CACHE.put_pdf(
+                cache_key,
+                pdf_bytes,
+                page_count,
+                page_hashes=page_content_hashes(pdf_bytes),
+                scope=f"{session_id}:{actual_template}",
+            )
+            unchanged_page = PAGE_IMAGE_CACHE.get_page(cache_key, page, width)
+            if unchanged_page is not None:
+                logging.debug(f"Page {page} unchanged since the last preview")
+                return unchanged_page
 
-    return file_path, None
+    # page_count is 0 if the page objects could not be found; pdftoppm decides
+    if page_count and page > page_count:
+        raise ValueError(f"page {page} is out of range (document has {page_count})")
 
+    png_bytes = rasterize_pdf_page(pdf_bytes, page, width)
+    if PAGE_IMAGE_CACHE is not None:
+        PAGE_IMAGE_CACHE.put_page(cache_key, page, width, png_bytes)
+    return png_bytes, page_count
 
-@app.route("/download/<filename>")
-@require_auth
-def download_file(filename):
-    """
-    Download a generated resume PDF.
 
-    Security:
-    - Requires authentication (@require_auth decorator)
-    - Validates filename to prevent path traversal attacks
-    - Ensures file is within OUTPUT_DIR
+@app.route("/api/generate", methods=["POST"])
+def generate_resume():
     """
-    file_path, error = _validate_and_serve_file(filename, OUTPUT_DIR, "file")
-    if error:
-        return error
-
-    return send_file(file_path, as_attachment=True)
-
+    Generate a resume PDF from the uploaded YAML and optional icons.
 
-@app.route("/icons/<filename>")
-def serve_icon(filename):
-    """
-    Serve icons from the icons directory for frontend display.
+    Preview requests (?preview=true) supersede the preview still in flight
+    for the same session_id; the superseded request answers 409.
 
-    Security:
-    - Validates filename to prevent path traversal attacks
-    - Ensures file is within ICONS_DIR
+    With ?format=png&page=N&width=W (defaults: page 1, 800px) the response is
+    a PNG of that single page instead, with the document's page count in the
+    X-Page-Count header.
     """
+    session_id = None
+    cancel_token = None
     try:
-        file_path, error = _validate_and_serve_file(filename, ICONS_DIR, "icon")
-        if error:
-            return error
+        timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
+        download_name = f"Resume_{timestamp}.pdf"
+
+        output_format = request.args.get("format", "pdf").lower()
+        if output_format not in ("pdf", "png"):
+            raise ValueError(f"Unsupported format: {output_format}")
+        if output_format == "png":
+            page, width = _parse_page_image_args()
+
+        # Validate and parse the YAML upload straight from the request stream
+        yaml_file = request.files.get("yaml_file")
+        if not yaml_file or yaml_file.filename == "":
+            raise ValueError("No YAML file uploaded")
+
+        yaml_data = fast_yaml_load(yaml_file.stream)
+        if not isinstance(yaml_data, dict):
+            raise ValueError("Invalid YAML format: Root must be a dictionary")
+
+        # Reject malformed resumes before anything is staged or rendered; this
+        # also normalizes sections and migrates the old linkedin field
+        template = request.form.get("template", "modern")
+        validate_resume(
+            yaml_data, require_contact_info=TEMPLATE_DIR_MAP.get(template) != "classic"
+        )
 
-        return send_file(file_path)
-    except Exception as e:
-        logging.error(f"Error serving icon {filename}: {e}")
-        return jsonify({"success": False, "error": "Icon not found"}), 404
+        # Get session ID for icon isolation
+        session_id = request.form.get("session_id")
+        if not session_id:
+            raise ValueError("No session ID provided")
 
+        if _is_preview_request():
+            cancel_token = PREVIEW_RENDERS.begin(session_id)
 
-@app.route("/docs/templates/<path:filename>")
-def serve_templates(filename):
-    """
-    Serve template images for display in the frontend.
+        # Create session-specific icon directory
+        session_icons_dir = Path("/tmp") / "sessions" / session_id / "icons"
+        session_icons_dir.mkdir(parents=True, exist_ok=True)
 
-    Security:
-    - Validates filename to prevent path traversal attacks
-    - Ensures file is within docs/templates directory
-    - Rejects paths containing '..' or starting with '/'
-    """
-    try:
-        template_image_dir = PROJECT_ROOT / "docs" / "templates"
-        file_path, error = _validate_and_serve_file(
-            filename, template_image_dir, "image"
+        # Determine if the template uses icons
+        uses_icons = (
+            template == "modern-with-icons"
+        )  # Only modern-with-icons template needs icons
+
+        _stage_request_icons(
+            yaml_data,
+            session_icons_dir,
+            uses_icons,
+            request.files.getlist("icons"),
         )
-        if error:
-            return error
+        if not uses_icons:
+            yaml_data = _without_content_icons(yaml_data)
 
-        response = send_file(file_path)
-        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        # Validate template ID against known templates
+        if template not in TEMPLATE_DIR_MAP:
+            raise ValueError(
+                f"Invalid template: {template}. Available templates: {', '.join(TEMPLATE_DIR_MAP.keys())}"
+            )
+
+        # Use the mapped template directory
+        actual_template = TEMPLATE_DIR_MAP[template]
+
+        if output_format == "png":
+            png_bytes, page_count = render_resume_page_png(
+                actual_template,
+                yaml_data,
+                session_icons_dir,
+                session_id,
+                page,
+                width,
+                cancel_token=cancel_token,
+            )
+        else:
+            pdf_bytes = render_resume_pdf(
+                actual_template,
+                yaml_data,
+                session_icons_dir,
+                session_id,
+                cancel_token=cancel_token,
+            )
+
+        # Clean up session directory after successful PDF generation, unless a
+        # newer preview for this session is already using it
+        superseded = cancel_token is not None and cancel_token.cancelled
+        try:
+            session_dir = Path("/tmp") / "sessions" / session_id
+            if not superseded and session_dir.exists():
+                shutil.rmtree(session_dir)
+                logging.debug(f"Cleaned up session directory: {session_dir}")
+        except Exception as cleanup_error:
+            logging.warning(f"Failed to cleanup session directory: {cleanup_error}")
+
+        if output_format == "png":
+            response = send_file(io.BytesIO(png_bytes), mimetype="image/png")
+            response.headers["X-Page-Count"] = str(page_count)
+            return response
+
+        # Send the generated PDF straight from memory
+        return _send_pdf(pdf_bytes, download_name)
+
+    except RenderCancelledError:
+        PREVIEW_RENDERS.finish(session_id, cancel_token, cancelled=True)
+        cancel_token = None
+        logging.info(f"Preview render superseded (session: {session_id})")
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": "Superseded by a newer preview request",
+                    "superseded": True,
+                }
+            ),
+            409,
+        )
+    except RenderQueueFullError as e:
+        return _render_queue_full_response(e)
+    except RenderTimeoutError as e:
+        return _render_timeout_response(e)
+    except ResumeValidationError as e:
+        return _resume_validation_response(e)
+    except ValueError as ve:
+        logging.warning("Validation error: %s", ve)
+        return jsonify({"success": False, "error": str(ve)}), 400
+    except FileNotFoundError as fnfe:
+        logging.error("File error: %s", fnfe)
+        return jsonify({"success": False, "error": str(fnfe)}), 500
+    except Exception as e:
+        logging.error("Unexpected error: %s", e)
+        return (
+            jsonify({"success": False, "error": "An unexpected error occurred"}),
+            500,
+        )
+    finally:
+        if cancel_token is not None:
+            PREVIEW_RENDERS.finish(session_id, cancel_token)
+
+
+# Preview image width bounds for /api/generate/multi (pixels)
+MULTI_PREVIEW_DEFAULT_WIDTH = 400
+MULTI_PREVIEW_MAX_WIDTH = 800
+
+
+@app.route("/api/generate/multi", methods=["POST"])
+def generate_multi_template_previews():
+    """
+    Render one resume in several templates at once and return first-page PNGs.
+
+    Form fields (same as /api/generate, plus):
+        templates: Comma-separated template IDs (default: every template)
+        width: Preview width in pixels (default 400, max 800)
+
+    The YAML is parsed and normalized once and icons are staged once per icon
+    mode. Template IDs that render identically (same template directory and
+    icon set, e.g. classic and classic-jane-doe) share a single render; the
+    distinct renders, HTML and LaTeX alike, run in parallel through the render
+    scheduler.
+
+    Returns:
+        {
+            "success": true,
+            "previews": {"modern-with-icons": "data:image/png;base64,...", ...},
+            "errors": {"classic": "Failed to generate preview"}
+        }
+    """
+    try:
+        yaml_file = request.files.get("yaml_file")
+        if not yaml_file or yaml_file.filename == "":
+            raise ValueError("No YAML file uploaded")
+
+        yaml_data = fast_yaml_load(yaml_file.stream)
+        if not isinstance(yaml_data, dict):
+            raise ValueError("Invalid YAML format: Root must be a dictionary")
+
+        session_id = request.form.get("session_id")
+        if not session_id:
+            raise ValueError("No session ID provided")
+
+        requested = request.form.get("templates", "")
+        template_ids = [t.strip() for t in requested.split(",") if t.strip()]
+        template_ids = list(dict.fromkeys(template_ids)) or list(TEMPLATE_DIR_MAP)
+        invalid = [t for t in template_ids if t not in TEMPLATE_DIR_MAP]
+        if invalid:
+            raise ValueError(
+                f"Invalid template: {', '.join(invalid)}. "
+                f"Available templates: {', '.join(TEMPLATE_DIR_MAP.keys())}"
+            )
+
+        # Validated (and normalized) once for every template
+        validate_resume(
+            yaml_data,
+            require_contact_info=any(
+                TEMPLATE_DIR_MAP[t] != "classic" for t in template_ids
+            ),
+        )
+
+        width = request.form.get("width", MULTI_PREVIEW_DEFAULT_WIDTH, type=int)
+        if not 1 <= width <= MULTI_PREVIEW_MAX_WIDTH:
+            raise ValueError(f"width must be between 1 and {MULTI_PREVIEW_MAX_WIDTH}")
+
+        # Identical outputs share one render: (template directory, uses icons)
+        renders = {}
+        for template_id in template_ids:
+            key = (TEMPLATE_DIR_MAP[template_id], template_id == "modern-with-icons")
+            renders.setdefault(key, []).append(template_id)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            icon_dirs = {}
+            icon_files = request.files.getlist("icons")
+            for uses_icons in sorted({key[1] for key in renders}):
+                icons_dir = Path(temp_dir) / ("icons" if uses_icons else "base-icons")
+                _stage_request_icons(yaml_data, icons_dir, uses_icons, icon_files)
+                icon_dirs[uses_icons] = icons_dir
+
+            def render_preview(key):
+                actual_template, uses_icons = key
+                pdf_bytes = render_resume_pdf(
+                    actual_template,
+                    # Renderers annotate the data, so each render gets a copy
+                    copy.deepcopy(yaml_data)
+                    if uses_icons
+                    else _without_content_icons(yaml_data),
+                    icon_dirs[uses_icons],
+                    session_id,
+                )
+                png_bytes = render_pdf_first_page_png(pdf_bytes, width=width)
+                if png_bytes is None:
+                    raise RuntimeError("No images generated from PDF")
+                return png_bytes
+
+            previews = {}
+            errors = {}
+            queue_full = None
+            with ThreadPoolExecutor(
+                max_workers=len(renders), thread_name_prefix="multi-preview"
+            ) as executor:
+                futures = {executor.submit(render_preview, key): key for key in renders}
+                for future in as_completed(futures):
+                    template_group = renders[futures[future]]
+                    try:
+                        png_bytes = future.result()
+                    except RenderQueueFullError as e:
+                        queue_full = e
+                        message = "The server is busy, please retry"
+                        errors.update({t: message for t in template_group})
+                        continue
+                    except Exception as e:
+                        logging.error(f"Preview failed for {template_group}: {e}")
+                        message = "Failed to generate preview"
+                        errors.update({t: message for t in template_group})
+                        continue
+                    image = "data:image/png;base64," + base64.b64encode(
+                        png_bytes
+                    ).decode("ascii")
+                    previews.update({t: image for t in template_group})
+
+        if not previews and queue_full is not None:
+            return _render_queue_full_response(queue_full)
+
+        # Keep the requested order in the response
+        return (
+            jsonify(
+                {
+                    "success": bool(previews),
+                    "previews": {t: previews[t] for t in template_ids if t in previews},
+                    "errors": {t: errors[t] for t in template_ids if t in errors},
+                }
+            ),
+            200 if previews else 500,
+        )
+
+    except ResumeValidationError as e:
+        return _resume_validation_response(e)
+    except ValueError as ve:
+        logging.warning("Validation error: %s", ve)
+        return jsonify({"success": False, "error": str(ve)}), 400
+    except Exception as e:
+        logging.error("Unexpected error: %s", e)
+        return (
+            jsonify({"success": False, "error": "An unexpected error occurred"}),
+            500,
+        )
+
+
+# The preview HTML carries resume data unescaped, so it is served sandboxed:
+# no scripts, no network, only inline styles and data: images/fonts
+PREVIEW_HTML_CSP = (
+    "default-src 'none'; style-src 'unsafe-inline'; img-src data:; "
+    "font-src data:; sandbox"
+)
+
+
+@app.route("/api/preview/html", methods=["POST"])
+def preview_resume_html():
+    """
+    Render a live preview of an HTML template as self-contained HTML.
+
+    Takes the same form fields as /api/generate (yaml_file, template, icons)
+    and runs the same data preparation as a PDF render
+    (resume_generator.render_html), but stops at the HTML: the stylesheet and
+    icons are inlined as data (utils/inline_assets.py), and nothing goes
+    through the render pool, so a preview takes milliseconds. wkhtmltopdf
+    only runs when the user downloads.
+
+    LaTeX templates have no HTML stage and answer 400; preview them with
+    /api/generate?preview=true.
+    """
+    try:
+        yaml_file = request.files.get("yaml_file")
+        if not yaml_file or yaml_file.filename == "":
+            raise ValueError("No YAML file uploaded")
+
+        yaml_data = fast_yaml_load(yaml_file.stream)
+        if not isinstance(yaml_data, dict):
+            raise ValueError("Invalid YAML format: Root must be a dictionary")
+
+        validate_resume(yaml_data)
+
+        template = request.form.get("template", "modern")
+        if template not in TEMPLATE_DIR_MAP:
+            raise ValueError(
+                f"Invalid template: {template}. "
+                f"Available templates: {', '.join(TEMPLATE_DIR_MAP.keys())}"
+            )
+        actual_template = TEMPLATE_DIR_MAP[template]
+        if actual_template not in resume_generator.HTML_TEMPLATE_DIRS:
+            raise ValueError(
+                f"Template {template} has no HTML preview; "
+                "use /api/generate?preview=true"
+            )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            icons_dir = Path(temp_dir) / "icons"
+            uses_icons = template == "modern-with-icons"
+            _stage_request_icons(
+                yaml_data, icons_dir, uses_icons, request.files.getlist("icons")
+            )
+            if not uses_icons:
+                yaml_data = _without_content_icons(yaml_data)
+            html = resume_generator.render_html(
+                actual_template, yaml_data, icons_dir, offline=True
+            )
+            html = inline_local_assets(
+                html,
+                [PROJECT_ROOT / "templates" / actual_template, icons_dir, ICONS_DIR],
+                transient_dirs=[icons_dir],
+            )
+
+        response = Response(html, mimetype="text/html")
+        response.headers["Content-Security-Policy"] = PREVIEW_HTML_CSP
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    except ResumeValidationError as e:
+        return _resume_validation_response(e)
+    except ValueError as ve:
+        logging.warning("Validation error: %s", ve)
+        return jsonify({"success": False, "error": str(ve)}), 400
+    except Exception as e:
+        logging.error("Unexpected error rendering HTML preview: %s", e)
+        return (
+            jsonify({"success": False, "error": "An unexpected error occurred"}),
+            500,
+        )
+
+
+@app.route("/api/layout/estimate", methods=["POST"])
+def estimate_resume_layout():
+    """
+    Estimate a resume's page count and section heights without rendering.
+
+    Takes the same form fields as /api/generate (yaml_file, template) and
+    answers in milliseconds from the layout model in utils/layout_estimate.py,
+    so the editor can show "fits on one page" / overflow on every edit and
+    only render when the user asks for the PDF. The estimate is calibrated
+    against real renders, not exact: near a page boundary, render to be sure.
+    """
+    try:
+        yaml_file = request.files.get("yaml_file")
+        if not yaml_file or yaml_file.filename == "":
+            raise ValueError("No YAML file uploaded")
+
+        yaml_data = fast_yaml_load(yaml_file.stream)
+        if not isinstance(yaml_data, dict):
+            raise ValueError("Invalid YAML format: Root must be a dictionary")
+
+        template = request.form.get("template", "modern")
+        if template not in TEMPLATE_DIR_MAP:
+            raise ValueError(
+                f"Invalid template: {template}. "
+                f"Available templates: {', '.join(TEMPLATE_DIR_MAP.keys())}"
+            )
+        validate_resume(
+            yaml_data, require_contact_info=TEMPLATE_DIR_MAP[template] != "classic"
+        )
+        if template != "modern-with-icons":
+            yaml_data = _without_content_icons(yaml_data)
+
+        started = time.perf_counter()
+        estimate = estimate_layout(
+            TEMPLATE_DIR_MAP[template], yaml_data, resume_generator.calculate_columns
+        )
+        estimate["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return jsonify({"success": True, "template": template, **estimate})
+
+    except ResumeValidationError as e:
+        return _resume_validation_response(e)
+    except ValueError as ve:
+        logging.warning("Validation error: %s", ve)
+        return jsonify({"success": False, "error": str(ve)}), 400
+    except Exception as e:
+        logging.error("Unexpected error estimating layout: %s", e)
+        return (
+            jsonify({"success": False, "error": "An unexpected error occurred"}),
+            500,
+        )
+
+
+def _validate_and_serve_file(filename, base_dir, file_type="file"):
+    """Validate filename against path traversal and check existence.
+
+    Returns:
+        (file_path, None) on success, or (None, error_response) on failure.
+    """
+    if ".." in filename or filename.startswith("/"):
+        logging.warning(f"Path traversal attempt in {file_type} request: {filename}")
+        return None, (jsonify({"success": False, "error": "Invalid path"}), 400)
+
+    safe_filename = secure_filename(filename)
+    if not safe_filename or safe_filename != filename:
+        logging.warning(f"Invalid {file_type} filename attempt: {filename}")
+        return None, (jsonify({"success": False, "error": "Invalid filename"}), 400)
+
+    file_path = base_dir / safe_filename
+
+    try:
+        if not file_path.resolve().is_relative_to(base_dir.resolve()):
+            logging.warning(
+                f"{file_type.capitalize()} path traversal attempt: {filename}"
+            )
+            return None, (jsonify({"success": False, "error": "Access denied"}), 403)
+    except ValueError:
+        logging.warning(
+            f"{file_type.capitalize()} path validation failed for: {filename}"
+        )
+        return None, (jsonify({"success": False, "error": "Access denied"}), 403)
+
+    if not file_path.exists():
+        return None, (
+            jsonify({"success": False, "error": f"{file_type.capitalize()} not found"}),
+            404,
+        )
+
+    return file_path, None
+
+
+@app.route("/download/<filename>")
+@require_auth
+def download_file(filename):
+    """
+    Download a generated resume PDF.
+
+    Security:
+    - Requires authentication (@require_auth decorator)
+    - Validates filename to prevent path traversal attacks
+    - Ensures file is within OUTPUT_DIR
+    """
+    file_path, error = _validate_and_serve_file(filename, OUTPUT_DIR, "file")
+    if error:
+        return error
+
+    return send_file(file_path, as_attachment=True)
+
+
+@app.route("/icons/<filename>")
+def serve_icon(filename):
+    """
+    Serve icons from the icons directory for frontend display.
+
+    Security:
+    - Validates filename to prevent path traversal attacks
+    - Ensures file is within ICONS_DIR
+    """
+    try:
+        file_path, error = _validate_and_serve_file(filename, ICONS_DIR, "icon")
+        if error:
+            return error
+
+        return send_file(file_path)
+    except Exception as e:
+        logging.error(f"Error serving icon {filename}: {e}")
+        return jsonify({"success": False, "error": "Icon not found"}), 404
+
+
+@app.route("/docs/templates/<path:filename>")
+def serve_templates(filename):
+    """
+    Serve template images for display in the frontend.
+
+    Security:
+    - Validates filename to prevent path traversal attacks
+    - Ensures file is within docs/templates directory
+    - Rejects paths containing '..' or starting with '/'
+    """
+    try:
+        template_image_dir = PROJECT_ROOT / "docs" / "templates"
+        file_path, error = _validate_and_serve_file(
+            filename, template_image_dir, "image"
+        )
+        if error:
+            return error
+
+        response = send_file(file_path)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
         return response
     except Exception as e:
         logging.error(f"Error serving template image {filename}: {e}")
@@ -2420,6 +3820,8 @@ def save_resume():
 
         user_id = request.user_id
         resume_id = data.get("id")
+        if resume_id:
+            _forget_saved_pdf(user_id, resume_id)
         title = data.get("title", "Untitled Resume")
         template_id = data.get("template_id")
         contact_info = data.get("contact_info", {})
@@ -2549,7 +3951,10 @@ def save_resume():
         if is_update:
             existing_result = (
                 supabase.table("resume_icons")
-                .select("filename, file_size, storage_path, storage_url, mime_type")
+                .select(
+                    "filename, file_size, storage_path, storage_url, mime_type, "
+                    "content_hash"
+                )
                 .eq("resume_id", resume_id)
                 .execute()
             )
@@ -2573,11 +3978,17 @@ def save_resume():
                     data_b64.split(",")[1] if "," in data_b64 else data_b64
                 )
                 new_size = len(file_data)
+                new_hash = icon_content_hash(file_data)
 
-                # Check if icon exists and hasn't changed (size match = content match proxy)
+                # Check if icon exists and hasn't changed (rows saved before
+                # content hashes were stored fall back to comparing sizes)
                 if filename in existing_icons:
                     existing_icon = existing_icons[filename]
-                    if existing_icon["file_size"] == new_size:
+                    if existing_icon.get("content_hash"):
+                        unchanged = existing_icon["content_hash"] == new_hash
+                    else:
+                        unchanged = existing_icon["file_size"] == new_size
+                    if unchanged:
                         # Icon unchanged, reuse existing record
                         icons_to_keep.append(existing_icon)
                         logging.debug(f"Reusing existing icon: {filename}")
@@ -2585,7 +3996,12 @@ def save_resume():
 
                 # Icon is new or changed, needs upload
                 icons_to_upload.append(
-                    {"filename": filename, "data": file_data, "size": new_size}
+                    {
+                        "filename": filename,
+                        "data": file_data,
+                        "size": new_size,
+                        "hash": new_hash,
+                    }
                 )
 
             except Exception as decode_error:
@@ -2620,6 +4036,9 @@ def save_resume():
                 storage_path, storage_url = upload_icon_to_storage(
                     user_id, resume_id, filename, file_data, mime_type
                 )
+                render_path, render_size = _upload_icon_render_derivative(
+                    user_id, resume_id, filename, file_data, mime_type
+                )
 
                 icon_records.append(
                     {
@@ -2631,6 +4050,9 @@ def save_resume():
                         "storage_url": storage_url,
                         "mime_type": mime_type,
                         "file_size": icon_data["size"],
+                        "content_hash": icon_data["hash"],
+                        "render_storage_path": render_path,
+                        "render_file_size": render_size,
                         "created_at": "now()",
                     }
                 )
@@ -2921,6 +4343,7 @@ def delete_resume(resume_id):
         supabase.table("resumes").update({"deleted_at": "now()"}).eq(
             "id", resume_id
         ).execute()
+        _forget_saved_pdf(user_id, resume_id)
 
         logging.info(f"Resume deleted successfully: {resume_id}")
 
@@ -2962,6 +4385,32 @@ def _copy_icon_worker(user_id, new_resume_id, source_icon):
             new_storage_path
         )
 
+        # Copy the render-size copy too; without it the original is rendered
+        new_render_path = None
+        if source_icon.get("render_storage_path"):
+            new_render_path = (
+                f"{user_id}/{new_resume_id}/{ICON_RENDER_PREFIX}/"
+                f"{source_icon['filename']}"
+            )
+            try:
+                render_data = thread_supabase.storage.from_("resume-icons").download(
+                    source_icon["render_storage_path"]
+                )
+                thread_supabase.storage.from_("resume-icons").upload(
+                    new_render_path,
+                    render_data,
+                    file_options={
+                        "content-type": source_icon.get("mime_type", "image/png"),
+                        "upsert": "true",
+                    },
+                )
+            except Exception as render_error:
+                logging.warning(
+                    f"Rendering the original of {source_icon['filename']}: "
+                    f"{render_error}"
+                )
+                new_render_path = None
+
         # Prepare new icon record
         return {
             "id": str(uuid.uuid4()),
@@ -2972,6 +4421,11 @@ def _copy_icon_worker(user_id, new_resume_id, source_icon):
             "storage_url": new_storage_url,
             "mime_type": source_icon.get("mime_type", "image/png"),
             "file_size": source_icon.get("file_size", 0),
+            "content_hash": source_icon.get("content_hash"),
+            "render_storage_path": new_render_path,
+            "render_file_size": (
+                source_icon.get("render_file_size") if new_render_path else None
+            ),
             "created_at": "now()",
         }
     except Exception as icon_error:
@@ -3060,7 +4514,10 @@ def duplicate_resume(resume_id):
         # Fetch source icons
         source_icons_result = (
             supabase.table("resume_icons")
-            .select("filename, storage_path, mime_type, file_size")
+            .select(
+                "filename, storage_path, mime_type, file_size, content_hash, "
+                "render_storage_path, render_file_size"
+            )
             .eq("resume_id", resume_id)
             .execute()
         )
@@ -3249,18 +4706,48 @@ def migrate_anonymous_resumes():
                     new_path
                 )
 
+                icon_update = {
+                    "user_id": new_user_id,
+                    "storage_path": new_path,
+                    "storage_url": new_url,
+                }
+                old_paths = [old_path]
+
+                # Move the render-size copy; without it the original is rendered
+                old_render_path = icon.get("render_storage_path")
+                if old_render_path:
+                    old_paths.append(old_render_path)
+                    new_render_path = (
+                        f"{new_user_id}/{resume_id}/{ICON_RENDER_PREFIX}/{filename}"
+                    )
+                    try:
+                        render_data = supabase.storage.from_("resume-icons").download(
+                            old_render_path
+                        )
+                        supabase.storage.from_("resume-icons").upload(
+                            new_render_path,
+                            render_data,
+                            file_options={
+                                "content-type": icon.get("mime_type", "image/png"),
+                                "upsert": "true",
+                            },
+                        )
+                        icon_update["render_storage_path"] = new_render_path
+                    except Exception as render_error:
+                        logging.warning(
+                            f"Rendering the original of {filename}: {render_error}"
+                        )
+                        icon_update["render_storage_path"] = None
+                        icon_update["render_file_size"] = None
+
                 # Update icon record
-                supabase.table("resume_icons").update(
-                    {
-                        "user_id": new_user_id,
-                        "storage_path": new_path,
-                        "storage_url": new_url,
-                    }
-                ).eq("id", icon["id"]).execute()
+                supabase.table("resume_icons").update(icon_update).eq(
+                    "id", icon["id"]
+                ).execute()
 
-                # Delete old file from storage
+                # Delete old files from storage
                 try:
-                    supabase.storage.from_("resume-icons").remove([old_path])
+                    supabase.storage.from_("resume-icons").remove(old_paths)
                 except Exception as delete_error:
                     logging.warning(
                         f"Failed to delete old icon file {old_path}: {delete_error}"
@@ -3369,6 +4856,7 @@ def update_resume_partial(resume_id):
             .execute()
         )
         updated_at = result.data[0]["updated_at"] if result.data else None
+        _forget_saved_pdf(user_id, resume_id)
 
         logging.info(f"Resume title updated: {resume_id} -> {new_title}")
 
@@ -3385,230 +4873,356 @@ def update_resume_partial(resume_id):
         )
 
 
-@app.route("/api/resumes/<resume_id>/pdf", methods=["POST"])
-@require_auth
-@retry_on_connection_error(max_retries=3, backoff_factor=0.5)
-def generate_pdf_for_saved_resume(resume_id):
-    """
-    Generate PDF on-demand for a saved resume.
+def _refresh_resume_thumbnail(pdf_bytes, user_id, resume_id):
+    """Regenerate a resume's thumbnail from its PDF; never raises."""
+    try:
+        thumbnail_url = generate_thumbnail_from_pdf(pdf_bytes, user_id, resume_id)
+        if thumbnail_url:
+            # Update resume with thumbnail URL and generation timestamp.
+            # updated_at is NOT included — without the DB trigger, it is
+            # preserved automatically for metadata-only changes.
+            current_time = datetime.now(timezone.utc).isoformat()
+            supabase.table("resumes").update(
+                {
+                    "thumbnail_url": thumbnail_url,
+                    "pdf_generated_at": current_time,
+                }
+            ).eq("id", resume_id).execute()
+            logging.info(f"Thumbnail generated and saved for resume {resume_id}")
+        else:
+            logging.warning(
+                f"Thumbnail generation failed for resume {resume_id}, but continuing with PDF"
+            )
+    except Exception as thumb_error:
+        # Don't fail PDF generation if thumbnail fails
+        logging.error(f"Error during thumbnail generation: {thumb_error}")
 
-    Returns: PDF blob (same as /api/generate)
-    """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            user_id = request.user_id
-            temp_dir_path = Path(temp_dir)
 
-            # Load resume data
-            result = (
-                supabase.table("resumes")
-                .select("*")
-                .eq("id", resume_id)
-                .eq("user_id", user_id)
-                .is_("deleted_at", "null")
-                .execute()
-            )
+def _saved_resume_download_name(resume):
+    """Download file name for a saved resume's PDF."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
+    return f"{resume.get('title', 'Resume')}_{timestamp}.pdf"
 
-            if not result.data:
-                return jsonify({"success": False, "error": "Resume not found"}), 404
 
-            resume = result.data[0]
+def _send_saved_resume_pdf(pdf_bytes, resume):
+    """Send a saved resume's PDF bytes as a download or inline preview."""
+    return _send_pdf(pdf_bytes, _saved_resume_download_name(resume))
 
-            # Load icons
-            icons_result = (
-                supabase.table("resume_icons")
-                .select("filename, storage_path")
-                .eq("resume_id", resume_id)
-                .execute()
-            )
 
-            # Create session directory for icons
-            session_id = str(uuid.uuid4())
-            session_icons_dir = temp_dir_path / "icons"
-            session_icons_dir.mkdir(parents=True, exist_ok=True)
-
-            # Download icons from storage
-            failed_icons = []
-            for icon in icons_result.data:
-                icon_path = session_icons_dir / icon["filename"]
-                success = download_icon_from_storage(
-                    icon["storage_path"], str(icon_path)
-                )
-                if not success:
-                    failed_icons.append(icon["filename"])
-                    logging.error(
-                        f"Failed to download icon: {icon['filename']} from {icon['storage_path']}"
-                    )
+def _remember_saved_pdf(user_id, resume_id, cache_key, resume):
+    """Let GET requests serve this cached PDF for the user's resume."""
+    with _saved_pdf_keys_lock:
+        _saved_pdf_keys[(user_id, resume_id)] = (cache_key, resume.get("title"))
+        _saved_pdf_keys.move_to_end((user_id, resume_id))
+        while len(_saved_pdf_keys) > SAVED_PDF_KEYS_MAX:
+            _saved_pdf_keys.popitem(last=False)
 
-            # Fail fast if any icons missing
-            if failed_icons:
-                error_msg = (
-                    f"Unable to load {len(failed_icons)} icon(s) from cloud storage: {', '.join(failed_icons)}. "
-                    f"Icons may not have been properly saved when the resume was created. "
-                    f"Please edit the resume and re-upload the missing icons."
-                )
-                logging.error(f"Preview generation failed: {error_msg}")
-                return jsonify({"success": False, "error": error_msg}), 500
-
-            # Prepare YAML data
-            yaml_data = {
-                "template": resume.get("template_id"),
-                "contact_info": resume.get("contact_info", {}),
-                "sections": resume.get("sections", []),
+
+def _forget_saved_pdf(user_id, resume_id):
+    """Stop serving GETs for a resume that changed; the next POST re-renders."""
+    with _saved_pdf_keys_lock:
+        _saved_pdf_keys.pop((user_id, resume_id), None)
+
+
+def _thumbnail_response(pdf_bytes, user_id, resume_id):
+    """Generate, store and return the thumbnail for the thumbnail endpoint."""
+    thumbnail_url = generate_thumbnail_from_pdf(pdf_bytes, user_id, resume_id)
+
+    if not thumbnail_url:
+        return (
+            jsonify({"success": False, "error": "Failed to generate thumbnail"}),
+            500,
+        )
+
+    # Update resume with thumbnail URL and generation timestamp.
+    # updated_at is NOT included — without the DB trigger, it is
+    # preserved automatically for metadata-only changes.
+    current_time = datetime.now(timezone.utc).isoformat()
+    supabase.table("resumes").update(
+        {
+            "thumbnail_url": thumbnail_url,
+            "pdf_generated_at": current_time,
+        }
+    ).eq("id", resume_id).execute()
+
+    logging.info(f"Thumbnail generated successfully for resume {resume_id}")
+    logging.debug(f"Thumbnail endpoint response - pdf_generated_at: {current_time}")
+    logging.debug(f"Database update successful for resume {resume_id}")
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "thumbnail_url": thumbnail_url,
+                "pdf_generated_at": current_time,
             }
+        ),
+        200,
+    )
 
-            # Normalize sections
-            yaml_data = normalize_sections(yaml_data)
 
-            # Icon validation and copying for icon-supporting templates
-            template_id = resume.get("template_id", "modern")
-            uses_icons = template_id == "modern-with-icons"
-
-            # Always copy base contact icons that are hardcoded in templates
-            # These are required for all modern template variants (with and without content icons)
-            base_contact_icons = [
-                "location.png",
-                "email.png",
-                "phone.png",
-                "linkedin.png",
-                "github.png",
-                "twitter.png",
-                "website.png",
-                "pinterest.png",
-                "medium.png",
-                "youtube.png",
-                "stackoverflow.png",
-                "behance.png",
-                "dribbble.png",
-            ]
+class SavedResumeRenderError(Exception):
+    """A saved resume cannot be rendered; carries the HTTP status to answer with."""
 
-            for icon_name in base_contact_icons:
-                default_icon_path = ICONS_DIR / icon_name
-                if default_icon_path.exists():
-                    session_icon_path = session_icons_dir / icon_name
-                    shutil.copy2(default_icon_path, session_icon_path)
-                    logging.debug(f"Copied base contact icon: {icon_name}")
-                else:
-                    logging.warning(f"Base contact icon not found: {icon_name}")
-
-            # Extract content icons (from Experience, Education, Certifications, etc.) only for icon-supporting templates
-            if uses_icons:
-                referenced_icons = extract_icons_from_yaml(yaml_data)
-                logging.debug(
-                    f"Found {len(referenced_icons)} referenced icons in resume data"
-                )
+    def __init__(self, message, status_code, details=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.details = details or {}
 
-                # Validate and copy default icons
-                missing_icons = []
-                for icon_name in referenced_icons:
-                    # Skip if already copied as base contact icon
-                    if icon_name in base_contact_icons:
-                        continue
+    def to_response(self):
+        return (
+            jsonify({"success": False, "error": self.message, **self.details}),
+            self.status_code,
+        )
 
-                    # Check if user uploaded this icon (already downloaded from storage above)
-                    user_icon_path = session_icons_dir / icon_name
-                    if user_icon_path.exists():
-                        logging.debug(
-                            f"Icon already in session: {icon_name} (user-uploaded)"
-                        )
-                        continue
 
-                    # Try to copy from default icons directory
-                    default_icon_path = ICONS_DIR / icon_name
-                    if default_icon_path.exists():
-                        session_icon_path = session_icons_dir / icon_name
-                        shutil.copy2(default_icon_path, session_icon_path)
-                        logging.debug(f"Copied default icon: {icon_name}")
-                    else:
-                        # Icon not found in storage or /icons/ directory
-                        missing_icons.append(icon_name)
-                        logging.error(
-                            f"Icon not found: {icon_name} (not in storage or /icons/)"
-                        )
+def _download_saved_resume_icons(icon_rows, session_icons_dir, strict_icons=True):
+    """
+    Download a saved resume's uploaded icons from storage into session_icons_dir.
 
-                # Return error if any icons are missing
-                if missing_icons:
-                    error_msg = (
-                        f"Missing {len(missing_icons)} icon(s) required for PDF generation: {', '.join(missing_icons)}. "
-                        f"These icons were referenced in your resume but are not available. "
-                        f"Please edit this resume to either upload the missing icons or remove them from your sections."
-                    )
-                    logging.error(f"PDF generation blocked: {error_msg}")
-                    return (
-                        jsonify(
-                            {
-                                "success": False,
-                                "error": error_msg,
-                                "missing_icons": missing_icons,
-                            }
-                        ),
-                        400,
-                    )
+    Icons saved with a render derivative (utils/icon_derivatives.py) are
+    downloaded as that smaller copy, under the original file name.
+
+    With strict_icons=False (thumbnails) icons that fail to download are
+    skipped instead of failing the render.
+
+    Raises:
+        SavedResumeRenderError: An icon could not be downloaded (strict mode)
+    """
+    session_icons_dir.mkdir(parents=True, exist_ok=True)
+
+    # Download icons from storage, preferring the render-size copy
+    failed_icons = []
+    for icon in icon_rows:
+        icon_path = session_icons_dir / icon["filename"]
+        storage_path = icon.get("render_storage_path") or icon["storage_path"]
+        success = download_icon_from_storage(storage_path, str(icon_path))
+        if not success:
+            failed_icons.append(icon["filename"])
+            logging.error(
+                f"Failed to download icon: {icon['filename']} from {storage_path}"
+            )
+
+    # Fail fast if any icons missing (thumbnails degrade gracefully instead)
+    if failed_icons and strict_icons:
+        error_msg = (
+            f"Unable to load {len(failed_icons)} icon(s) from cloud storage: {', '.join(failed_icons)}. "
+            f"Icons may not have been properly saved when the resume was created. "
+            f"Please edit the resume and re-upload the missing icons."
+        )
+        logging.error(f"Preview generation failed: {error_msg}")
+        raise SavedResumeRenderError(error_msg, 500)
+    if failed_icons:
+        warning_msg = (
+            f"Unable to load {len(failed_icons)} icon(s) from cloud storage: {', '.join(failed_icons)}. "
+            f"Continuing with available icons. PDF will be generated with missing icons."
+        )
+        logging.warning(f"Thumbnail generation degraded: {warning_msg}")
+
+
+def _prepare_saved_resume_yaml(resume, session_icons_dir, template_id=None):
+    """
+    Build the render data for a saved resume and check its icons resolve.
+
+    Uploaded icons must already be in session_icons_dir; base and default
+    icons are resolved from ICONS_DIR at render time, so nothing is copied.
+    template_id overrides the resume's own template.
+
+    Raises:
+        SavedResumeRenderError: The resume references icons that do not exist
+    """
+    template_id = template_id or resume.get("template_id", "modern")
+
+    # Prepare YAML data
+    yaml_data = {
+        "template": template_id,
+        "contact_info": resume.get("contact_info", {}),
+        "sections": resume.get("sections", []),
+    }
+
+    # Normalize sections
+    yaml_data = normalize_sections(yaml_data)
+
+    # Content icons (Experience, Education, Certifications, etc.) are only
+    # rendered by icon-supporting templates
+    if template_id != "modern-with-icons":
+        return _without_content_icons(yaml_data)
+
+    referenced_icons = extract_icons_from_yaml(yaml_data)
+    logging.debug(f"Found {len(referenced_icons)} referenced icons in resume data")
+
+    # Each icon must be a user upload (downloaded above) or a default icon
+    resolver = IconResolver(ICONS_DIR, session_icons_dir)
+    missing_icons = []
+    for icon_name in sorted(referenced_icons):
+        if resolver.resolve(icon_name) is None:
+            # Icon not found in storage or /icons/ directory
+            missing_icons.append(icon_name)
+            logging.error(f"Icon not found: {icon_name} (not in storage or /icons/)")
+
+    # Return error if any icons are missing
+    if missing_icons:
+        error_msg = (
+            f"Missing {len(missing_icons)} icon(s) required for PDF generation: {', '.join(missing_icons)}. "
+            f"These icons were referenced in your resume but are not available. "
+            f"Please edit this resume to either upload the missing icons or remove them from your sections."
+        )
+        logging.error(f"PDF generation blocked: {error_msg}")
+        raise SavedResumeRenderError(error_msg, 400, {"missing_icons": missing_icons})
+
+    return yaml_data
+
+
+def _render_saved_resume_pdf(
+    resume,
+    icon_rows,
+    actual_template,
+    work_dir,
+    strict_icons=True,
+    priority=PRIORITY_INTERACTIVE,
+):
+    """
+    Download a saved resume's icons into work_dir and render it to PDF bytes.
+
+    Shared by the synchronous PDF and thumbnail endpoints and by background
+    PDF jobs.
+
+    Raises:
+        SavedResumeRenderError: Icons are missing or could not be loaded
+        RenderQueueFullError: The render scheduler is at capacity
+    """
+    # Create session directory for icons
+    session_id = str(uuid.uuid4())
+    session_icons_dir = work_dir / "icons"
+
+    _download_saved_resume_icons(icon_rows, session_icons_dir, strict_icons)
+    yaml_data = _prepare_saved_resume_yaml(resume, session_icons_dir)
+
+    # Generate PDF (in memory; the work dir only holds icons)
+    return render_resume_pdf(
+        actual_template, yaml_data, session_icons_dir, session_id, priority=priority
+    )
+
+
+@app.route("/api/resumes/<resume_id>/pdf", methods=["GET"])
+@require_auth
+def get_saved_resume_pdf(resume_id):
+    """
+    Serve a saved resume's PDF that a POST already rendered, with byte ranges.
+
+    For pdf.js loading the preview by URL: every range request is answered
+    from PDF_CACHE without loading the resume, rendering or touching the
+    thumbnail, and the bytes (and so the ETag) stay the same across ranges.
+    Answers 409 when there is nothing to serve (not rendered yet, the resume
+    changed since, evicted, or the cache is disabled): POST to render it.
+
+    The first GET linearizes the cached PDF (so pdf.js can paint page 1
+    before the rest arrives) and stores that copy in its place; later GETs
+    and their range requests are served as they are.
+    """
+    with _saved_pdf_keys_lock:
+        entry = _saved_pdf_keys.get((request.user_id, resume_id))
+    pdf_bytes = None
+    if entry is not None and PDF_CACHE is not None:
+        pdf_bytes = PDF_CACHE.get(entry[0])
+    if pdf_bytes is None:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": "PDF not rendered yet; POST to this URL to render it",
+                    "render_required": True,
+                }
+            ),
+            409,
+        )
+    linearized = linearize_pdf(pdf_bytes)
+    if linearized is not pdf_bytes:
+        PDF_CACHE.put(entry[0], linearized)
+    return _send_saved_resume_pdf(linearized, {"title": entry[1]})
+
+
+@app.route("/api/resumes/<resume_id>/pdf", methods=["POST"])
+@require_auth
+@retry_on_connection_error(max_retries=3, backoff_factor=0.5)
+def generate_pdf_for_saved_resume(resume_id):
+    """
+    Generate PDF on-demand for a saved resume.
 
-            # Write YAML to temp file
-            yaml_path = temp_dir_path / "resume.yaml"
-            with open(yaml_path, "w") as f:
-                yaml.dump(yaml_data, f)
+    The PDF is cached, so GET on the same URL can then serve it to pdf.js
+    with range requests.
 
-            # Generate PDF
-            timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
-            output_path = temp_dir_path / f"Resume_{timestamp}.pdf"
+    Returns: PDF blob (same as /api/generate)
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            user_id = request.user_id
+            temp_dir_path = Path(temp_dir)
+
+            # Load resume data
+            result = (
+                supabase.table("resumes")
+                .select("*")
+                .eq("id", resume_id)
+                .eq("user_id", user_id)
+                .is_("deleted_at", "null")
+                .execute()
+            )
+
+            if not result.data:
+                return jsonify({"success": False, "error": "Resume not found"}), 404
+
+            resume = result.data[0]
+
+            # Load icons
+            icons_result = (
+                supabase.table("resume_icons")
+                .select(
+                    "filename, storage_path, file_size, created_at, "
+                    "render_storage_path"
+                )
+                .eq("resume_id", resume_id)
+                .execute()
+            )
 
             template_id = resume.get("template_id", "modern")
             actual_template = TEMPLATE_DIR_MAP.get(template_id, "modern")
 
-            # Generate PDF using appropriate method
-            if actual_template == "classic":
-                generate_latex_pdf(
-                    yaml_data, str(session_icons_dir), str(output_path), actual_template
-                )
-            else:
-                _dispatch_html_pdf_generation(
-                    actual_template,
-                    yaml_path,
-                    output_path,
-                    session_icons_dir,
-                    session_id,
+            # Unchanged resumes are served from the rendered-PDF cache before
+            # any icon download or render
+            cache_key = None
+            if PDF_CACHE is not None:
+                cache_key = saved_resume_cache_key(
+                    resume, icons_result.data, actual_template
                 )
-
-            if not output_path.exists():
-                raise FileNotFoundError("PDF file was not generated")
+                cached_pdf = PDF_CACHE.get(cache_key)
+                if cached_pdf is not None:
+                    logging.debug(f"PDF cache hit for resume {resume_id}")
+                    _remember_saved_pdf(user_id, resume_id, cache_key, resume)
+                    if not resume.get("thumbnail_url"):
+                        _refresh_resume_thumbnail(cached_pdf, user_id, resume_id)
+                    return _send_saved_resume_pdf(cached_pdf, resume)
+
+            pdf_bytes = _render_saved_resume_pdf(
+                resume, icons_result.data, actual_template, temp_dir_path
+            )
+            if cache_key is not None:
+                PDF_CACHE.put(cache_key, pdf_bytes)
+                _remember_saved_pdf(user_id, resume_id, cache_key, resume)
 
             # Generate thumbnail from PDF (piggyback strategy)
-            try:
-                thumbnail_url = generate_thumbnail_from_pdf(
-                    str(output_path), user_id, resume_id
-                )
-                if thumbnail_url:
-                    # Update resume with thumbnail URL and generation timestamp.
-                    # updated_at is NOT included — without the DB trigger, it is
-                    # preserved automatically for metadata-only changes.
-                    current_time = datetime.now(timezone.utc).isoformat()
-                    supabase.table("resumes").update(
-                        {
-                            "thumbnail_url": thumbnail_url,
-                            "pdf_generated_at": current_time,
-                        }
-                    ).eq("id", resume_id).execute()
-                    logging.info(
-                        f"Thumbnail generated and saved for resume {resume_id}"
-                    )
-                else:
-                    logging.warning(
-                        f"Thumbnail generation failed for resume {resume_id}, but continuing with PDF"
-                    )
-            except Exception as thumb_error:
-                # Don't fail PDF generation if thumbnail fails
-                logging.error(f"Error during thumbnail generation: {thumb_error}")
+            _refresh_resume_thumbnail(pdf_bytes, user_id, resume_id)
 
             # Return PDF
-            return send_file(
-                output_path,
-                as_attachment=not _is_preview_request(),  # inline for preview, attachment for download
-                mimetype="application/pdf",
-                download_name=f"{resume.get('title', 'Resume')}_{timestamp}.pdf",
-            )
-
+            return _send_saved_resume_pdf(pdf_bytes, resume)
+
+        except SavedResumeRenderError as e:
+            return e.to_response()
+        except RenderQueueFullError as e:
+            return _render_queue_full_response(e)
+        except RenderTimeoutError as e:
+            return _render_timeout_response(e)
         except Exception as e:
             logging.error(f"Error generating PDF for saved resume: {e}")
             return jsonify({"success": False, "error": "Failed to generate PDF"}), 500
@@ -3654,204 +5268,48 @@ def generate_thumbnail_for_resume(resume_id):
             # Load icons
             icons_result = (
                 supabase.table("resume_icons")
-                .select("filename, storage_path")
+                .select(
+                    "filename, storage_path, file_size, created_at, "
+                    "render_storage_path"
+                )
                 .eq("resume_id", resume_id)
                 .execute()
             )
 
-            # Create session directory for icons
-            session_id = str(uuid.uuid4())
-            session_icons_dir = temp_dir_path / "icons"
-            session_icons_dir.mkdir(parents=True, exist_ok=True)
-
-            # Download icons from storage
-            failed_icons = []
-            for icon in icons_result.data:
-                icon_path = session_icons_dir / icon["filename"]
-                success = download_icon_from_storage(
-                    icon["storage_path"], str(icon_path)
-                )
-                if not success:
-                    failed_icons.append(icon["filename"])
-                    logging.error(
-                        f"Failed to download icon: {icon['filename']} from {icon['storage_path']}"
-                    )
-
-            # Log warning if any icons failed, but continue with graceful degradation
-            if failed_icons:
-                warning_msg = (
-                    f"Unable to load {len(failed_icons)} icon(s) from cloud storage: {', '.join(failed_icons)}. "
-                    f"Continuing with available icons. PDF will be generated with missing icons."
-                )
-                logging.warning(f"Thumbnail generation degraded: {warning_msg}")
-                # Continue execution - don't fail fast
-                # Icons will be missing from PDF, but thumbnail will still generate
-
-            # Prepare YAML data
-            yaml_data = {
-                "template": resume.get("template_id"),
-                "contact_info": resume.get("contact_info", {}),
-                "sections": resume.get("sections", []),
-            }
-
-            # Normalize sections
-            yaml_data = normalize_sections(yaml_data)
-
-            # Icon validation and copying for icon-supporting templates
-            template_id = resume.get("template_id", "modern")
-            uses_icons = template_id == "modern-with-icons"
-
-            # Always copy base contact icons that are hardcoded in templates
-            # These are required for all modern template variants (with and without content icons)
-            base_contact_icons = [
-                "location.png",
-                "email.png",
-                "phone.png",
-                "linkedin.png",
-                "github.png",
-                "twitter.png",
-                "website.png",
-                "pinterest.png",
-                "medium.png",
-                "youtube.png",
-                "stackoverflow.png",
-                "behance.png",
-                "dribbble.png",
-            ]
-
-            for icon_name in base_contact_icons:
-                default_icon_path = ICONS_DIR / icon_name
-                if default_icon_path.exists():
-                    session_icon_path = session_icons_dir / icon_name
-                    shutil.copy2(default_icon_path, session_icon_path)
-                    logging.debug(f"Copied base contact icon: {icon_name}")
-                else:
-                    logging.warning(f"Base contact icon not found: {icon_name}")
-
-            # Extract content icons (from Experience, Education, Certifications, etc.) only for icon-supporting templates
-            if uses_icons:
-                referenced_icons = extract_icons_from_yaml(yaml_data)
-                logging.debug(
-                    f"Found {len(referenced_icons)} referenced icons in resume data"
-                )
-
-                # Validate and copy default icons
-                missing_icons = []
-                for icon_name in referenced_icons:
-                    # Skip if already copied as base contact icon
-                    if icon_name in base_contact_icons:
-                        continue
-
-                    # Check if user uploaded this icon (already downloaded from storage above)
-                    user_icon_path = session_icons_dir / icon_name
-                    if user_icon_path.exists():
-                        logging.debug(
-                            f"Icon already in session: {icon_name} (user-uploaded)"
-                        )
-                        continue
-
-                    # Try to copy from default icons directory
-                    default_icon_path = ICONS_DIR / icon_name
-                    if default_icon_path.exists():
-                        session_icon_path = session_icons_dir / icon_name
-                        shutil.copy2(default_icon_path, session_icon_path)
-                        logging.debug(f"Copied default icon: {icon_name}")
-                    else:
-                        # Icon not found in storage or /icons/ directory
-                        missing_icons.append(icon_name)
-                        logging.error(
-                            f"Icon not found: {icon_name} (not in storage or /icons/)"
-                        )
-
-                # Return error if any icons are missing
-                if missing_icons:
-                    error_msg = (
-                        f"Missing {len(missing_icons)} icon(s) required for PDF generation: {', '.join(missing_icons)}. "
-                        f"These icons were referenced in your resume but are not available. "
-                        f"Please edit this resume to either upload the missing icons or remove them from your sections."
-                    )
-                    logging.error(f"PDF generation blocked: {error_msg}")
-                    return (
-                        jsonify(
-                            {
-                                "success": False,
-                                "error": error_msg,
-                                "missing_icons": missing_icons,
-                            }
-                        ),
-                        400,
-                    )
-
-            # Write YAML to temp file
-            yaml_path = temp_dir_path / "resume.yaml"
-            with open(yaml_path, "w") as f:
-                yaml.dump(yaml_data, f)
-
-            # Generate PDF
-            timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
-            output_path = temp_dir_path / f"Resume_{timestamp}.pdf"
-
             template_id = resume.get("template_id", "modern")
             actual_template = TEMPLATE_DIR_MAP.get(template_id, "modern")
 
-            # Generate PDF using appropriate method
-            if actual_template == "classic":
-                generate_latex_pdf(
-                    yaml_data, str(session_icons_dir), str(output_path), actual_template
+            # Unchanged resumes are served from the rendered-PDF cache before
+            # any icon download or render
+            cache_key = None
+            if PDF_CACHE is not None:
+                cache_key = saved_resume_cache_key(
+                    resume, icons_result.data, actual_template
                 )
-            else:
-                _dispatch_html_pdf_generation(
-                    actual_template,
-                    yaml_path,
-                    output_path,
-                    session_icons_dir,
-                    session_id,
-                )
-
-            if not output_path.exists():
-                raise FileNotFoundError("PDF file was not generated")
-
-            # Generate thumbnail from PDF
-            thumbnail_url = generate_thumbnail_from_pdf(
-                str(output_path), user_id, resume_id
+                cached_pdf = PDF_CACHE.get(cache_key)
+                if cached_pdf is not None:
+                    logging.debug(f"PDF cache hit for resume {resume_id} thumbnail")
+                    return _thumbnail_response(cached_pdf, user_id, resume_id)
+
+            # Thumbnails are background work: they queue behind downloads and
+            # previews and are the first to be turned away when busy
+            pdf_bytes = _render_saved_resume_pdf(
+                resume,
+                icons_result.data,
+                actual_template,
+                temp_dir_path,
+                strict_icons=False,
+                priority=PRIORITY_BACKGROUND,
             )
+            if cache_key is not None:
+                PDF_CACHE.put(cache_key, pdf_bytes)
 
-            if not thumbnail_url:
-                return (
-                    jsonify(
-                        {"success": False, "error": "Failed to generate thumbnail"}
-                    ),
-                    500,
-                )
-
-            # Update resume with thumbnail URL and generation timestamp.
-            # updated_at is NOT included — without the DB trigger, it is
-            # preserved automatically for metadata-only changes.
-            current_time = datetime.now(timezone.utc).isoformat()
-            supabase.table("resumes").update(
-                {
-                    "thumbnail_url": thumbnail_url,
-                    "pdf_generated_at": current_time,
-                }
-            ).eq("id", resume_id).execute()
-
-            logging.info(f"Thumbnail generated successfully for resume {resume_id}")
-            logging.debug(
-                f"Thumbnail endpoint response - pdf_generated_at: {current_time}"
-            )
-            logging.debug(f"Database update successful for resume {resume_id}")
-
-            return (
-                jsonify(
-                    {
-                        "success": True,
-                        "thumbnail_url": thumbnail_url,
-                        "pdf_generated_at": current_time,
-                    }
-                ),
-                200,
-            )
+            return _thumbnail_response(pdf_bytes, user_id, resume_id)
 
+        except SavedResumeRenderError as e:
+            return e.to_response()
+        except RenderQueueFullError as e:
+            return _render_queue_full_response(e)
         except Exception as e:
             error_classification = classify_thumbnail_error(e)
             logging.error(
@@ -3887,6 +5345,517 @@ def generate_thumbnail_for_resume(resume_id):
                 )
 
 
+# =============================================================================
+# Asynchronous PDF jobs for saved resumes
+# =============================================================================
+
+
+def _pdf_job_view(job):
+    """Public JSON view of a job, with the URLs the client should use next."""
+    base_url = f"/api/resumes/{job['resume_id']}/pdf-jobs/{job['id']}"
+    view = {
+        "id": job["id"],
+        "resume_id": job["resume_id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "retryable": job["retryable"],
+        "created_at": datetime.fromtimestamp(
+            job["created_at"], timezone.utc
+        ).isoformat(),
+        "updated_at": datetime.fromtimestamp(
+            job["updated_at"], timezone.utc
+        ).isoformat(),
+        "status_url": base_url,
+        "events_url": f"{base_url}/events",
+        "download_url": f"{base_url}/download" if job["status"] == JOB_DONE else None,
+    }
+    view.update(job["details"])
+    return view
+
+
+def _run_saved_resume_pdf_job(
+    job_id, user_id, resume_id, resume, icon_rows, actual_template, cache_key
+):
+    """
+    Render a saved resume for a PDF job and record the outcome in the store.
+
+    Runs on PDF_JOB_EXECUTOR. A full render queue is not an error here: the
+    job waits Retry-After seconds and tries again until
+    PDF_JOB_QUEUE_WAIT_SECONDS have passed.
+    """
+    store = PDF_JOB_STORE
+    deadline = time.monotonic() + PDF_JOB_QUEUE_WAIT_SECONDS
+    try:
+        store.update(job_id, status=JOB_RUNNING, stage="rendering", progress=25)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_bytes = render_when_queue_allows(
+                lambda: _render_saved_resume_pdf(
+                    resume, icon_rows, actual_template, Path(temp_dir)
+                ),
+                deadline,
+                on_state=lambda stage: store.update(
+                    job_id, stage=stage, progress=10 if stage == "waiting" else 25
+                ),
+            )
+
+        if cache_key is not None:
+            PDF_CACHE.put(cache_key, pdf_bytes)
+        store.complete(job_id, pdf_bytes)
+        logging.info(f"PDF job {job_id} finished for resume {resume_id}")
+
+        # Thumbnail refresh happens after the job is marked done so it never
+        # delays the download
+        _refresh_resume_thumbnail(pdf_bytes, user_id, resume_id)
+    except SavedResumeRenderError as e:
+        store.fail(job_id, e.message, details=e.details)
+    except RenderQueueFullError:
+        store.fail(
+            job_id,
+            "The server is busy generating other PDFs. Please retry shortly.",
+            retryable=True,
+        )
+    except Exception as e:
+        logging.error(f"PDF job {job_id} failed for resume {resume_id}: {e}")
+        store.fail(job_id, "Failed to generate PDF", retryable=True)
+
+
+def _get_pdf_job_or_404(resume_id, job_id):
+    """Look up the caller's job for this resume; returns (job, error_response)."""
+    if PDF_JOB_STORE is None:
+        return None, (
+            jsonify({"success": False, "error": "PDF jobs are not available"}),
+            503,
+        )
+    job = PDF_JOB_STORE.get(job_id, request.user_id)
+    if job is None or job["resume_id"] != resume_id:
+        return None, (jsonify({"success": False, "error": "PDF job not found"}), 404)
+    return job, None
+
+
+@app.route("/api/resumes/<resume_id>/pdf-jobs", methods=["POST"])
+@require_auth
+@retry_on_connection_error(max_retries=3, backoff_factor=0.5)
+def create_pdf_job(resume_id):
+    """
+    Start rendering a saved resume's PDF in the background.
+
+    Returns immediately with the job; poll status_url (or listen on
+    events_url) until status is "done", then fetch download_url.
+
+    Returns (202):
+        {
+            "success": true,
+            "job": {"id": "...", "status": "queued", "status_url": "...", ...}
+        }
+    """
+    if PDF_JOB_STORE is None or PDF_JOB_EXECUTOR is None:
+        return jsonify({"success": False, "error": "PDF jobs are not available"}), 503
+
+    try:
+        user_id = request.user_id
+
+        # Load resume data
+        result = (
+            supabase.table("resumes")
+            .select("*")
+            .eq("id", resume_id)
+            .eq("user_id", user_id)
+            .is_("deleted_at", "null")
+            .execute()
+        )
+
+        if not result.data:
+            return jsonify({"success": False, "error": "Resume not found"}), 404
+
+        resume = result.data[0]
+
+        # Load icons
+        icons_result = (
+            supabase.table("resume_icons")
+            .select(
+                "filename, storage_path, file_size, created_at, "
+                "render_storage_path"
+            )
+            .eq("resume_id", resume_id)
+            .execute()
+        )
+
+        template_id = resume.get("template_id", "modern")
+        actual_template = TEMPLATE_DIR_MAP.get(template_id, "modern")
+
+        job = PDF_JOB_STORE.create(
+            user_id, resume_id, _saved_resume_download_name(resume)
+        )
+
+        # A cached PDF completes the job before it is even returned
+        cache_key = None
+        if PDF_CACHE is not None:
+            cache_key = saved_resume_cache_key(
+                resume, icons_result.data, actual_template
+            )
+            cached_pdf = PDF_CACHE.get(cache_key)
+            if cached_pdf is not None:
+                logging.debug(f"PDF cache hit for resume {resume_id} job")
+                PDF_JOB_STORE.complete(job["id"], cached_pdf)
+                job = PDF_JOB_STORE.get(job["id"], user_id)
+
+        if job["status"] not in TERMINAL_STATES:
+            PDF_JOB_EXECUTOR.submit(
+                _run_saved_resume_pdf_job,
+                job["id"],
+                user_id,
+                resume_id,
+                resume,
+                icons_result.data,
+                actual_template,
+                cache_key,
+            )
+
+        view = _pdf_job_view(job)
+        response = jsonify({"success": True, "job": view})
+        response.status_code = 202
+        response.headers["Location"] = view["status_url"]
+        return response
+
+    except PdfJobStoreFullError as e:
+        logging.warning(f"Rejecting PDF job: {e}")
+        response = jsonify(
+            {
+                "success": False,
+                "error": "Too many PDFs are being generated. Please retry shortly.",
+                "retryable": True,
+                "retry_after": PDF_JOB_RETRY_AFTER,
+            }
+        )
+        response.status_code = 429
+        response.headers["Retry-After"] = str(PDF_JOB_RETRY_AFTER)
+        return response
+    except Exception as e:
+        logging.error(f"Error creating PDF job for resume {resume_id}: {e}")
+        return jsonify({"success": False, "error": "Failed to start PDF job"}), 500
+
+
+@app.route("/api/resumes/<resume_id>/pdf-jobs/<job_id>", methods=["GET"])
+@require_auth
+def get_pdf_job(resume_id, job_id):
+    """Report a PDF job's status, progress and (once done) its download URL."""
+    job, error_response = _get_pdf_job_or_404(resume_id, job_id)
+    if error_response:
+        return error_response
+    return jsonify({"success": True, "job": _pdf_job_view(job)}), 200
+
+
+@app.route("/api/resumes/<resume_id>/pdf-jobs/<job_id>/events", methods=["GET"])
+@require_auth
+def stream_pdf_job_events(resume_id, job_id):
+    """
+    Server-sent events for a PDF job.
+
+    Sends one event, named after the job status, with the job's current state
+    and closes straight away: a held stream would tie up a sync gunicorn
+    worker for every other request. EventSource reconnects after
+    PDF_JOB_EVENTS_RETRY_MS (stop it on a terminal event), so the stream
+    behaves like polling GET /api/resumes/<id>/pdf-jobs/<job id>.
+    """
+    job, error_response = _get_pdf_job_or_404(resume_id, job_id)
+    if error_response:
+        return error_response
+
+    payload = json.dumps(_pdf_job_view(job))
+    return Response(
+        f"retry: {PDF_JOB_EVENTS_RETRY_MS}\n\n"
+        f"event: {job['status']}\ndata: {payload}\n\n",
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/resumes/<resume_id>/pdf-jobs/<job_id>/download", methods=["GET"])
+@require_auth
+def download_pdf_job(resume_id, job_id):
+    """Send a finished job's PDF (409 while the job is still running)."""
+    job, error_response = _get_pdf_job_or_404(resume_id, job_id)
+    if error_response:
+        return error_response
+
+    pdf_path = PDF_JOB_STORE.pdf_path(job_id, request.user_id)
+    if pdf_path is None:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": "PDF is not ready",
+                    "status": job["status"],
+                }
+            ),
+            409,
+        )
+
+    return send_file(
+        pdf_path,
+        as_attachment=not _is_preview_request(),  # inline for preview, attachment for download
+        mimetype="application/pdf",
+        download_name=job["download_name"],
+    )
+
+
+# =============================================================================
+# Batch export of saved resumes
+# =============================================================================
+
+
+def _export_file_name(resume, template_id, used_names):
+    """Unique archive member name: <title>-<template>.pdf."""
+    stem = secure_filename(resume.get("title") or "") or "Resume"
+    name = f"{stem}-{template_id}.pdf"
+    suffix = 2
+    while name in used_names:
+        name = f"{stem}-{template_id}-{suffix}.pdf"
+        suffix += 1
+    used_names.add(name)
+    return name
+
+
+def _export_members(items, icons_by_resume, deadline):
+    """
+    Render export items concurrently and yield (archive name, PDF bytes).
+
+    PDFs are yielded in completion order. Each resume's uploaded icons are
+    downloaded once into a shared work directory and reused by every template
+    rendered for it; all renders go through the shared render scheduler and
+    warm renderer pool. Cached PDFs are used as they are and misses are
+    cached as rendered, never linearized. Items that fail are listed in
+    export-errors.json at the end of the archive instead of aborting the
+    download.
+    """
+    temp_dir = tempfile.TemporaryDirectory()
+    work_dir = Path(temp_dir.name)
+    staging_locks = {resume_id: threading.Lock() for resume_id in icons_by_resume}
+    staged = {}
+
+    def render_item(item):
+        if item["cache_key"] is not None:
+            cached_pdf = PDF_CACHE.get(item["cache_key"])
+            if cached_pdf is not None:
+                return cached_pdf
+
+        resume_id = item["resume_id"]
+        session_icons_dir = work_dir / resume_id / "icons"
+        with staging_locks[resume_id]:
+            if resume_id not in staged:
+                try:
+                    _download_saved_resume_icons(
+                        icons_by_resume[resume_id], session_icons_dir
+                    )
+                    staged[resume_id] = None
+                except SavedResumeRenderError as e:
+                    staged[resume_id] = e
+            if staged[resume_id] is not None:
+                raise staged[resume_id]
+            yaml_data = _prepare_saved_resume_yaml(
+                copy.deepcopy(item["resume"]), session_icons_dir, item["template_id"]
+            )
+
+        actual_template = TEMPLATE_DIR_MAP[item["template_id"]]
+        session_id = str(uuid.uuid4())
+        pdf_bytes = render_when_queue_allows(
+            lambda: render_resume_pdf(
+                actual_template, yaml_data, session_icons_dir, session_id
+            ),
+            deadline,
+        )
+        if item["cache_key"] is not None:
+            PDF_CACHE.put(item["cache_key"], pdf_bytes)
+        return pdf_bytes
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(len(items), EXPORT_RENDER_CONCURRENCY)),
+        thread_name_prefix="export",
+    )
+    try:
+        futures = {executor.submit(render_item, item): item for item in items}
+        errors = []
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                pdf_bytes = future.result()
+            except SavedResumeRenderError as e:
+                errors.append({**item["summary"], "error": e.message, **e.details})
+                continue
+            except Exception as e:
+                logging.error(
+                    f"Export failed for resume {item['resume_id']} "
+                    f"({item['template_id']}): {e}"
+                )
+                errors.append({**item["summary"], "error": "Failed to generate PDF"})
+                continue
+            yield item["filename"], pdf_bytes
+
+        if errors:
+            yield "export-errors.json", json.dumps(errors, indent=2).encode("utf-8")
+    finally:
+        # Also reached when the client disconnects mid-download
+        executor.shutdown(wait=True, cancel_futures=True)
+        temp_dir.cleanup()
+
+
+@app.route("/api/resumes/export", methods=["POST"])
+@require_auth
+@retry_on_connection_error(max_retries=3, backoff_factor=0.5)
+def export_resumes():
+    """
+    Render several saved resumes (optionally in other templates) into one ZIP.
+
+    Request body:
+        {
+            "resume_ids": ["uuid", ...],
+            "template_overrides": {            // optional
+                "uuid": "classic" | ["modern-with-icons", "classic"]
+            }
+        }
+
+    Resumes without an override are rendered in their own template. The ZIP
+    is streamed as PDFs finish rendering.
+
+    Returns: application/zip stream
+    """
+    try:
+        user_id = request.user_id
+        data = request.get_json(silent=True) or {}
+        resume_ids = data.get("resume_ids")
+        overrides = data.get("template_overrides") or {}
+
+        if (
+            not isinstance(resume_ids, list)
+            or not resume_ids
+            or not all(isinstance(rid, str) for rid in resume_ids)
+        ):
+            return (
+                jsonify(
+                    {"success": False, "error": "resume_ids must be a non-empty list"}
+                ),
+                400,
+            )
+        if not isinstance(overrides, dict):
+            return (
+                jsonify(
+                    {"success": False, "error": "template_overrides must be an object"}
+                ),
+                400,
+            )
+        resume_ids = list(dict.fromkeys(resume_ids))
+
+        # Load all resumes and their icons in one query each
+        result = (
+            supabase.table("resumes")
+            .select("*")
+            .in_("id", resume_ids)
+            .eq("user_id", user_id)
+            .is_("deleted_at", "null")
+            .execute()
+        )
+        resumes = {row["id"]: row for row in result.data or []}
+        missing = [rid for rid in resume_ids if rid not in resumes]
+        if missing:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": "Resume not found",
+                        "missing_resume_ids": missing,
+                    }
+                ),
+                404,
+            )
+
+        icons_result = (
+            supabase.table("resume_icons")
+            .select(
+                "resume_id, filename, storage_path, file_size, created_at, "
+                "render_storage_path"
+            )
+            .in_("resume_id", resume_ids)
+            .execute()
+        )
+        icons_by_resume = {rid: [] for rid in resume_ids}
+        for row in icons_result.data or []:
+            icons_by_resume.setdefault(row["resume_id"], []).append(row)
+
+        # Expand into (resume, template) items
+        items = []
+        used_names = set()
+        for resume_id in resume_ids:
+            resume = resumes[resume_id]
+            template_ids = overrides.get(resume_id) or resume.get(
+                "template_id", "modern"
+            )
+            if isinstance(template_ids, str):
+                template_ids = [template_ids]
+            for template_id in dict.fromkeys(template_ids):
+                if template_id not in TEMPLATE_DIR_MAP:
+                    return (
+                        jsonify(
+                            {
+                                "success": False,
+                                "error": f"Invalid template: {template_id}",
+                            }
+                        ),
+                        400,
+                    )
+                cache_key = None
+                if PDF_CACHE is not None:
+                    cache_key = saved_resume_cache_key(
+                        resume,
+                        icons_by_resume[resume_id],
+                        TEMPLATE_DIR_MAP[template_id],
+                    )
+                items.append(
+                    {
+                        "resume_id": resume_id,
+                        "resume": resume,
+                        "template_id": template_id,
+                        "cache_key": cache_key,
+                        "filename": _export_file_name(resume, template_id, used_names),
+                        "summary": {
+                            "resume_id": resume_id,
+                            "template_id": template_id,
+                        },
+                    }
+                )
+
+        if len(items) > EXPORT_MAX_ITEMS:
+            return (
+                jsonify(
+                    {
+                        "success": False,
+                        "error": f"Too many PDFs requested ({len(items)}); "
+                        f"the limit is {EXPORT_MAX_ITEMS} per export",
+                    }
+                ),
+                400,
+            )
+
+        logging.info(f"Exporting {len(items)} PDF(s) for user {user_id}")
+        deadline = time.monotonic() + PDF_JOB_QUEUE_WAIT_SECONDS
+        timestamp = datetime.now().strftime("%Y%m%d_%H_%M_%S")
+        return Response(
+            iter_zip(_export_members(items, icons_by_resume, deadline)),
+            mimetype="application/zip",
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="Resumes_{timestamp}.zip"'
+                ),
+                "X-Accel-Buffering": "no",
+            },
+        )
+
+    except Exception as e:
+        logging.error(f"Error exporting resumes: {e}")
+        return jsonify({"success": False, "error": "Failed to export resumes"}), 500
+
+
 # User Preferences API Endpoints
 
 
@@ -4313,5 +6282,9 @@ def internal_server_error(e):
     )
 
 
+# Start the warm-up last, once every route and helper it uses is defined
+start_warm_up()
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
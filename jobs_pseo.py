@@ -21,8 +21,6 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader
-
 from job_engine import JobMatchEngine, MatchContext, TITLE_SYNONYMS
 from jobs_content import get_intro_copy, get_faqs, format_salary_insight
 from generate_jobs_matrix import (
@@ -32,6 +30,7 @@ from generate_jobs_matrix import (
     LOCATION_BY_SLUG,
     to_slug,
 )
+from utils.jinja_envs import get_environment, warm_environment
 
 logger = logging.getLogger(__name__)
 
@@ -213,14 +212,14 @@ class PseoRenderer:
         self._role_by_slug = {r["slug"]: r for r in matrix.get("roles", [])}
         self._loc_by_slug = {l["slug"]: l for l in matrix.get("locations", [])}
 
-        # Jinja2 environment (standard delimiters — NOT LaTeX)
+        # Jinja2 environment (standard delimiters — NOT LaTeX), shared and
+        # backed by the on-disk bytecode cache; precompiled up front
         tpl_dir = templates_dir or str(Path(__file__).parent / "templates" / "jobs")
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(tpl_dir),
-            autoescape=True,
-        )
+        self.jinja_env = get_environment(tpl_dir, autoescape=True)
         self.jinja_env.globals["now"] = lambda: datetime.now(timezone.utc)
         self.jinja_env.globals["base_url"] = BASE_URL
+        warmed = warm_environment(self.jinja_env, extensions=["html"])
+        logger.debug("Precompiled %d pSEO templates from %s", warmed, tpl_dir)
 
     # ---- Public API --------------------------------------------------------
 
@@ -1,5 +1,6 @@
 import { vi, describe, it, expect, afterEach } from 'vitest';
-import { fetchTemplate } from '../services/templates';
+import { fetchSavedResumePdf, fetchTemplate } from '../services/templates';
+import { apiClient, ApiError } from '../lib/api-client';
 
 // Using the global Response provided by jsdom
 describe("fetchTemplate", {}, () => {
@@ -77,3 +78,44 @@ describe("fetchTemplate", {}, () => {
     });
   });
 });
+
+describe("fetchSavedResumePdf", () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it("should serve the cached PDF with a GET", async () => {
+    const pdf = new Blob(["%PDF"], { type: "application/pdf" });
+    const getBlob = vi.spyOn(apiClient, 'getBlob').mockResolvedValueOnce(pdf);
+    const postBlob = vi.spyOn(apiClient, 'postBlob');
+
+    const result = await fetchSavedResumePdf("r1", true);
+
+    expect(result).toBe(pdf);
+    expect(getBlob).toHaveBeenCalledWith("/api/resumes/r1/pdf?preview=true", {});
+    expect(postBlob).not.toHaveBeenCalled();
+  });
+
+  it("should POST to render the PDF when the GET answers 409", async () => {
+    const pdf = new Blob(["%PDF"], { type: "application/pdf" });
+    vi.spyOn(apiClient, 'getBlob').mockRejectedValueOnce(
+      new ApiError("PDF not rendered yet", 409, { render_required: true })
+    );
+    const postBlob = vi.spyOn(apiClient, 'postBlob').mockResolvedValueOnce(pdf);
+
+    const result = await fetchSavedResumePdf("r1", false);
+
+    expect(result).toBe(pdf);
+    expect(postBlob).toHaveBeenCalledWith("/api/resumes/r1/pdf", null, {});
+  });
+
+  it("should not retry other errors", async () => {
+    vi.spyOn(apiClient, 'getBlob').mockRejectedValueOnce(
+      new ApiError("Resume not found", 404)
+    );
+    const postBlob = vi.spyOn(apiClient, 'postBlob');
+
+    await expect(fetchSavedResumePdf("r1", false)).rejects.toThrow("Resume not found");
+    expect(postBlob).not.toHaveBeenCalled();
+  });
+});
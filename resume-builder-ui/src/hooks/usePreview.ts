@@ -1,8 +1,7 @@
 import { useState, useCallback, useRef, useEffect } from 'react';
-import { generatePreviewPdf } from '../services/templates';
+import { fetchSavedResumePdf, generatePreviewPdf } from '../services/templates';
 import { getSessionId } from '../utils/session';
 import { extractReferencedIconFilenames } from '../utils/iconExtractor';
-import { apiClient } from '../lib/api-client';
 import yaml from 'js-yaml';
 import { ContactInfo, Section } from '../types';
 
@@ -260,14 +259,10 @@ export function usePreview({
           // Track resume ID for change detection
           lastResumeIdRef.current = resumeId;
 
-          pdfBlob = await apiClient.postBlob(
-            `/api/resumes/${resumeId}/pdf?preview=true`,
-            null,
-            {
-              signal: abortControllerRef.current?.signal,
-              session
-            }
-          );
+          pdfBlob = await fetchSavedResumePdf(resumeId!, true, {
+            signal: abortControllerRef.current?.signal,
+            session
+          });
         } else {
           // Live mode: Generate PDF from current editor state
           // Process sections to clean up icon paths
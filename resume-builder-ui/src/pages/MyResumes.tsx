@@ -14,6 +14,7 @@ import { useThumbnailRefresh } from '../hooks/useThumbnailRefresh';
 import { useResumes } from '../hooks/useResumes';
 import { useAuth } from '../contexts/AuthContext';
 import { usePreview } from '../hooks/usePreview';
+import { fetchSavedResumePdf } from '../services/templates';
 import { InContentAd, AD_CONFIG } from '../components/ads';
 
 export default function MyResumes() {
@@ -217,8 +218,8 @@ export default function MyResumes() {
       try {
         setDownloadingId(id);
 
-        // Download the PDF using apiClient for automatic token refresh
-        const blob = await apiClient.postBlob(`/api/resumes/${id}/pdf`, null, { session });
+        // Download the PDF (cached if unchanged) with automatic token refresh
+        const blob = await fetchSavedResumePdf(id, false, { session });
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;
@@ -128,6 +128,31 @@ export async function generatePreviewPdf(
   }
 }
 
+/**
+ * Fetch the PDF of a saved resume.
+ * GET serves the cached (linearized) PDF without loading the resume; when it
+ * has not been rendered since the resume last changed (409), POST renders it.
+ *
+ * @param {string} resumeId - The ID of the saved resume.
+ * @param {boolean} preview - Request the PDF inline instead of as an attachment.
+ * @returns {Promise<Blob>} The PDF blob.
+ */
+export async function fetchSavedResumePdf(
+  resumeId: string,
+  preview: boolean,
+  options: { session?: { access_token: string } | null; signal?: AbortSignal } = {}
+): Promise<Blob> {
+  const url = `/api/resumes/${resumeId}/pdf${preview ? '?preview=true' : ''}`;
+  try {
+    return await apiClient.getBlob(url, options);
+  } catch (error) {
+    if (error instanceof ApiError && error.status === 409 && error.data?.render_required) {
+      return apiClient.postBlob(url, null, options);
+    }
+    throw error;
+  }
+}
+
 /**
  * Generate thumbnail for a saved resume.
  * Returns structured response with success status and thumbnail data.
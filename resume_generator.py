@@ -1,34 +1,47 @@
 import argparse
+import json
 import logging
 import os
 import re
 import shutil
 import subprocess
-import uuid
+import sys
+import threading
 from pathlib import Path
 
 import pdfkit
 import yaml
-from jinja2 import Environment, FileSystemLoader
-
+from utils.font_registry import DEFAULT_FONT, FONT_DIRS, font_face_css, resolve_font
+from utils.fragment_cache import render_fragment, section_key
+from utils.icon_resolver import IconResolver, icon_url_filter
+from utils.inline_assets import inline_local_assets
+from utils.jinja_envs import get_environment, warm_environment
+from utils.pdf_backends import create_backend
+from utils.pdf_cache import directory_fingerprint
+from utils.pdf_optimize import maybe_optimize_pdf
+from utils.render_memory import apply_render_process_limits, read_children_peak_rss_mb
+from utils.render_pool import read_process_rss_mb
+from utils.resume_schema import migrate_linkedin_to_social_links, normalize_section_type
 from utils.yaml_converter import fast_yaml_load
 
-# Configure logging for the subprocess
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s [GENERATOR] %(levelname)s: %(message)s"
-)
 
-# Check wkhtmltopdf binary availability once per run
-wkhtmltopdf_binary = shutil.which("wkhtmltopdf") or "/usr/bin/wkhtmltopdf"
-try:
-    version_output = subprocess.check_output(
-        [wkhtmltopdf_binary, "-V"], text=True
-    ).strip()
-    logging.debug(f"wkhtmltopdf binary: {wkhtmltopdf_binary}")
-    logging.debug(f"wkhtmltopdf version: {version_output}")
-except Exception as e:
-    logging.warning(f"wkhtmltopdf version check failed: {e}")
-    logging.warning(f"Attempted binary path: {wkhtmltopdf_binary}")
+def log_wkhtmltopdf_version():
+    """
+    Log which wkhtmltopdf binary will be used.
+
+    Called once per process (CLI run or persistent worker start-up) rather than
+    at import time, so importing this module stays cheap.
+    """
+    wkhtmltopdf_binary = shutil.which("wkhtmltopdf") or "/usr/bin/wkhtmltopdf"
+    try:
+        version_output = subprocess.check_output(
+            [wkhtmltopdf_binary, "-V"], text=True
+        ).strip()
+        logging.debug(f"wkhtmltopdf binary: {wkhtmltopdf_binary}")
+        logging.debug(f"wkhtmltopdf version: {version_output}")
+    except Exception as e:
+        logging.warning(f"wkhtmltopdf version check failed: {e}")
+        logging.warning(f"Attempted binary path: {wkhtmltopdf_binary}")
 
 
 def load_resume_data(yaml_file_path):
@@ -44,36 +57,12 @@ def load_resume_data(yaml_file_path):
 
 def normalize_sections(data):
     """
-    Add type attributes to sections for backward compatibility.
-
-    Converts old name-based format to new type-based format:
-    - Sections named "Experience" (case-insensitive) get type="experience"
-    - Sections named "Education" (case-insensitive) get type="education"
+    Give untyped sections a type from their name (backward compatibility).
 
-    This allows old YAML files to work without modification while supporting
-    multiple experience/education sections with custom names.
+    Delegates to utils.resume_schema.normalize_section_type for each section.
     """
-    if "sections" not in data:
-        return data
-
-    for section in data["sections"]:
-        # Skip if section already has a type attribute
-        if "type" in section and section["type"]:
-            continue
-
-        # Check section name and add appropriate type
-        section_name_lower = section.get("name", "").lower()
-
-        if section_name_lower == "experience":
-            section["type"] = "experience"
-            logging.debug(
-                f"Normalized section '{section.get('name')}' to type='experience'"
-            )
-        elif section_name_lower == "education":
-            section["type"] = "education"
-            logging.debug(
-                f"Normalized section '{section.get('name')}' to type='education'"
-            )
+    for section in data.get("sections") or []:
+        normalize_section_type(section)
 
     return data
 
@@ -174,15 +163,120 @@ def calculate_columns(num_items, max_columns=4, min_items_per_column=2):
     return max_columns  # Default to max columns if all checks pass
 
 
-# Generate PDF from HTML file
-def generate_pdf(
-    template_name, data, output_file, session_icons_dir=None, session_id=None
+# wkhtmltopdf options shared by the file-based and in-memory render paths.
+# PDF renders inline the stylesheet, icons and fonts (see render_html), so
+# wkhtmltopdf needs no enable-local-file-access.
+PDFKIT_OPTIONS = {
+    "load-error-handling": "abort",  # fail fast on missing assets
+    "quiet": "",  # keep stderr tidy
+}
+
+# HTML template directories rendered by this module (LaTeX lives in app.py)
+HTML_TEMPLATE_DIRS = ["modern"]
+
+# Network policy for HTML renders:
+# - "offline" (default): fonts come only from the local font registry, and
+#   wkhtmltopdf is pointed at an unroutable proxy so any stray http(s) request
+#   fails immediately instead of reaching the network.
+# - "online": fonts missing from the registry fall back to Google Fonts.
+RENDER_NETWORK_MODE = os.getenv("RENDER_NETWORK_MODE", "offline").lower()
+OFFLINE_PROXY = "http://127.0.0.1:9"
+
+
+def get_pdfkit_options(offline=None):
+    """Return wkhtmltopdf options for the given (or configured) network mode."""
+    if offline is None:
+        offline = RENDER_NETWORK_MODE == "offline"
+    if offline:
+        return {**PDFKIT_OPTIONS, "proxy": OFFLINE_PROXY}
+    return PDFKIT_OPTIONS
+
+
+# HTML -> PDF engine (see utils/pdf_backends.py):
+# - "wkhtmltopdf" (default): one wkhtmltopdf process per render via pdfkit
+# - "chromium": headless Chromium with CHROMIUM_PAGE_POOL_SIZE warm pages,
+#   each replaced after CHROMIUM_MAX_RENDERS_PER_PAGE renders (needs playwright)
+PDF_RENDER_BACKEND = os.getenv("PDF_RENDER_BACKEND", "wkhtmltopdf").lower()
+CHROMIUM_PAGE_POOL_SIZE = int(os.getenv("CHROMIUM_PAGE_POOL_SIZE", "4"))
+CHROMIUM_MAX_RENDERS_PER_PAGE = int(os.getenv("CHROMIUM_MAX_RENDERS_PER_PAGE", "100"))
+
+# Address-space cap (RLIMIT_AS) for render processes and the wkhtmltopdf they
+# spawn, see utils/render_memory.py. Generous on purpose: Qt reserves far more
+# address space than it touches, so this only stops runaway renders. 0 disables.
+RENDER_PROCESS_MAX_AS_MB = int(os.getenv("RENDER_PROCESS_MAX_AS_MB", "2048"))
+
+_pdf_backends = {}
+_pdf_backends_lock = threading.Lock()
+
+
+def get_pdf_backend(name=None):
+    """Return the process-wide backend instance for a name (default: configured)."""
+    name = (name or PDF_RENDER_BACKEND).lower()
+    with _pdf_backends_lock:
+        backend = _pdf_backends.get(name)
+        if backend is None:
+            if name == "chromium":
+                backend = create_backend(
+                    name,
+                    pages=CHROMIUM_PAGE_POOL_SIZE,
+                    max_renders_per_page=CHROMIUM_MAX_RENDERS_PER_PAGE,
+                )
+            else:
+                backend = create_backend(name, options_for=get_pdfkit_options)
+            _pdf_backends[name] = backend
+    return backend
+
+
+def close_pdf_backends():
+    """Shut down every backend started in this process."""
+    with _pdf_backends_lock:
+        backends = list(_pdf_backends.values())
+        _pdf_backends.clear()
+    for backend in backends:
+        backend.close()
+
+
+def get_template_environment(template_dir):
+    """Return the shared Jinja environment for an HTML template directory."""
+    return get_environment(
+        template_dir,
+        filters={
+            "markdown_links": convert_markdown_links_to_html,
+            "markdown_formatting": convert_markdown_formatting_to_html,
+            "icon_url": icon_url_filter,
+        },
+    )
+
+
+def warm_template_environments():
+    """Precompile every HTML template so the first render skips compilation."""
+    templates_base_dir = Path(__file__).parent.resolve() / "templates"
+    for template_name in HTML_TEMPLATE_DIRS:
+        env = get_template_environment(templates_base_dir / template_name)
+        count = warm_environment(env, extensions=["html"])
+        logging.info(f"Precompiled {count} templates for '{template_name}'")
+
+
+# Render the resume HTML for a template
+def render_html(
+    template_name, data, session_icons_dir=None, offline=None, inline=False
 ):
+    """
+    Render the resume to an HTML string for the given HTML template.
+
+    Performs all data preparation (column calculation, social link processing,
+    LinkedIn migration, font resolution) and returns the rendered base.html.
+    With offline=True (the RENDER_NETWORK_MODE default) the HTML references no
+    remote resources. With inline=True the stylesheet, icons and fonts are
+    embedded (see utils/inline_assets.py) instead of linked by file:// URL.
+    """
+    if offline is None:
+        offline = RENDER_NETWORK_MODE == "offline"
+
     # Set up paths using pathlib
     project_root = Path(__file__).parent.resolve()
     templates_base_dir = project_root / "templates"
     default_icons_dir = project_root / "icons"
-    output_dir = project_root / "output"
 
     # Template-specific directory
     template_dir = templates_base_dir / template_name
@@ -193,22 +287,21 @@ def generate_pdf(
 
     css_file = template_dir / "styles.css"
 
-    # Use session icons directory if provided, otherwise default icons
+    # Session icons (user uploads) are layered over the read-only icons/ dir;
+    # templates look icons up through the icon_url filter
     if session_icons_dir and Path(session_icons_dir).exists():
         icon_base_path = Path(session_icons_dir)
+        icon_resolver = IconResolver(default_icons_dir, icon_base_path)
     else:
         icon_base_path = default_icons_dir
+        icon_resolver = IconResolver(default_icons_dir)
 
     # Define paths in data dictionary for Jinja rendering - use file:// URLs for wkhtmltopdf
     data["icon_path"] = f"file://{icon_base_path.as_posix()}"
     data["css_path"] = f"file://{css_file.as_posix()}"
 
-    # Set up Jinja2 environment
-    env = Environment(loader=FileSystemLoader(template_dir))
-
-    # Register custom filters for markdown links and formatting
-    env.filters["markdown_links"] = convert_markdown_links_to_html
-    env.filters["markdown_formatting"] = convert_markdown_formatting_to_html
+    # Shared Jinja2 environment (compiled templates are reused across renders)
+    env = get_template_environment(template_dir)
 
     # Process sections and dynamically calculate column count for dynamic-column-list
     sections = data.get("sections", [])
@@ -300,67 +393,142 @@ def generate_pdf(
     # Render HTML with data
     logging.info(f"Rendering HTML template for: {template_name}")
 
+    # Resolve the font against the local registry; unknown fonts fall back to
+    # the default family offline, or to Google Fonts in online mode
+    font_name = data.get("font") or DEFAULT_FONT
+    font = resolve_font(font_name)
+    if font is None and offline and font_name != DEFAULT_FONT:
+        logging.warning(
+            f"Font '{font_name}' not in local registry, using {DEFAULT_FONT}"
+        )
+        font_name = DEFAULT_FONT
+        font = resolve_font(font_name)
+
+    # Sections are rendered one by one through the fragment cache, so an edit
+    # to one section leaves the others' cached HTML in use
+    section_template = env.get_template("section.html")
+    namespace = f"html:{template_dir}:{directory_fingerprint(template_dir)}"
+
+    def render_section(section):
+        return render_fragment(
+            section_key(namespace, section),
+            lambda resolver: section_template.render(
+                section=section, icon_path=data["icon_path"], icon_resolver=resolver
+            ),
+            icon_resolver,
+        )
+
     template = env.get_template("base.html")
     html_content = template.render(
         contact_info=contact_info,
         sections=sections,
+        render_section=render_section,
         icon_path=data["icon_path"],
+        icon_resolver=icon_resolver,
         css_path=data["css_path"],
-        font=data.get("font", "Arial"),
+        font=font_name,
+        font_faces=font_face_css(font) if font else "",
+        font_generic=font["generic"] if font else "sans-serif",
+        remote_fonts=font is None and not offline,
     )
 
-    # Ensure output directory exists
-    output_dir.mkdir(exist_ok=True)
+    logging.debug(f"CSS path: {css_file}")
+    logging.debug(f"Icon base path: {icon_base_path}")
 
-    # Write HTML content to a temporary file with unique name
-    if session_id:
-        temp_html_file = output_dir / f"temp_{template_name}_{session_id}.html"
-    else:
-        # Use UUID for local runs to avoid conflicts
-        unique_id = str(uuid.uuid4())[:8]
-        temp_html_file = output_dir / f"temp_{template_name}_{unique_id}.html"
+    if inline:
+        html_content = inline_local_assets(
+            html_content,
+            [template_dir, icon_base_path, default_icons_dir]
+            + FONT_DIRS.split(os.pathsep),
+            transient_dirs=(
+                [icon_base_path]
+                if icon_base_path.resolve() != default_icons_dir
+                else []
+            ),
+        )
 
-    with open(temp_html_file, "w") as html_file:
-        html_file.write(html_content)
-    logging.info(f"HTML written to temporary file: {temp_html_file}")
+    return html_content
 
-    # Enhanced debug breadcrumbs
-    logging.debug(f"Working directory: {os.getcwd()}")
-    logging.debug(f"HTML file: {temp_html_file}")
-    logging.debug(f"CSS path: {css_file}")
-    logging.debug(f"Icon base path: {icon_base_path}")
-    logging.debug(f"Output path: {output_file}")
 
-    # Convert the HTML file to PDF with the enable-local-file-access option
-    options = {
-        "enable-local-file-access": "",
-        "load-error-handling": "abort",  # fail fast on missing assets
-        "quiet": "",  # keep stderr tidy
-    }
+# Generate PDF from HTML file
+def generate_pdf(
+    template_name,
+    data,
+    output_file,
+    session_icons_dir=None,
+    session_id=None,
+    offline=None,
+    backend=None,
+):
+    html_content = render_html(
+        template_name, data, session_icons_dir, offline, inline=True
+    )
 
-    logging.info(f"Converting HTML file to PDF using wkhtmltopdf")
+    pdf_backend = get_pdf_backend(backend)
+    if pdf_backend.name != "wkhtmltopdf":
+        logging.info(f"Converting HTML to PDF using {pdf_backend.name}")
+        Path(output_file).write_bytes(
+            maybe_optimize_pdf(
+                pdf_backend.render(html_content, offline=_is_offline(offline))
+            )
+        )
+        logging.info(f"PDF generated successfully at: {output_file}")
+        return
+
+    # The HTML is self-contained, so it is piped to wkhtmltopdf directly; no
+    # scratch HTML file is left behind if this process is killed mid-render
+    options = get_pdfkit_options(offline)
+
+    logging.info(f"Converting HTML to PDF using wkhtmltopdf")
     logging.debug(f"pdfkit options: {options}")
     try:
-        pdfkit.from_file(temp_html_file.as_posix(), output_file, options=options)
+        pdfkit.from_string(html_content, output_file, options=options)
+        pdf_bytes = Path(output_file).read_bytes()
+        optimized = maybe_optimize_pdf(pdf_bytes)
+        if optimized is not pdf_bytes:
+            Path(output_file).write_bytes(optimized)
         logging.info(f"PDF generated successfully at: {output_file}")
     except Exception as e:
         logging.error(f"pdfkit failed to generate PDF: {str(e)}")
-        logging.error(f"Template: {template_name}")
-        logging.error(f"Input HTML file: {temp_html_file}")
+        logging.error(f"Template: {template_name}, Session: {session_id}")
         logging.error(f"Output path: {output_file}")
         logging.error(f"pdfkit options: {options}")
         # Re-raise the exception to make the subprocess fail
         raise
 
-    # Clean up temporary HTML file
+
+# Generate PDF bytes without touching the filesystem
+def generate_pdf_bytes(
+    template_name, data, session_icons_dir=None, offline=None, backend=None
+):
+    """
+    Render the resume and return the PDF as bytes.
+
+    The HTML is handed to the PDF backend in memory (for wkhtmltopdf it is
+    piped over stdin and the PDF read back from stdout), so no temporary HTML
+    or PDF files are written. ``backend`` overrides PDF_RENDER_BACKEND. The
+    PDF goes through the optional size optimizer (utils/pdf_optimize.py).
+    """
+    html_content = render_html(
+        template_name, data, session_icons_dir, offline, inline=True
+    )
+    pdf_backend = get_pdf_backend(backend)
+
+    logging.info(f"Converting HTML to PDF in memory using {pdf_backend.name}")
     try:
-        temp_html_file.unlink()  # Remove temp file
-        logging.debug(f"Temporary HTML file cleaned up: {temp_html_file}")
-    except FileNotFoundError:
-        # File already removed, no issue
-        logging.debug(f"Temporary HTML file already removed: {temp_html_file}")
-    except Exception as e:
-        logging.warning(f"Could not remove temporary file {temp_html_file}: {e}")
+        pdf_bytes = pdf_backend.render(html_content, offline=_is_offline(offline))
+    except Exception:
+        logging.error(f"Template: {template_name}")
+        raise
+
+    logging.info(f"PDF generated in memory ({len(pdf_bytes)} bytes)")
+    return maybe_optimize_pdf(pdf_bytes)
+
+
+def _is_offline(offline):
+    if offline is None:
+        return RENDER_NETWORK_MODE == "offline"
+    return offline
 
 
 def get_social_media_handle(url, platform="linkedin"):
@@ -400,39 +568,6 @@ def get_social_media_handle(url, platform="linkedin"):
     return url.split("/")[-1]
 
 
-def migrate_linkedin_to_social_links(contact_info):
-    """
-    Migrate old 'linkedin' field to new 'social_links' array format.
-
-    Args:
-        contact_info (dict): Contact information dictionary
-
-    Returns:
-        dict: Updated contact_info with social_links array
-    """
-    # If already has social_links, no migration needed
-    if contact_info.get("social_links"):
-        return contact_info
-
-    # Check if old linkedin field exists
-    linkedin_url = contact_info.get("linkedin", "")
-    if linkedin_url and linkedin_url.strip():
-        # Create social_links array with migrated LinkedIn
-        contact_info["social_links"] = [
-            {
-                "platform": "linkedin",
-                "url": linkedin_url,
-                "display_text": contact_info.get("linkedin_display", ""),
-            }
-        ]
-        logging.info("Migrated old 'linkedin' field to 'social_links' array")
-    else:
-        # Initialize empty social_links array
-        contact_info["social_links"] = []
-
-    return contact_info
-
-
 def generate_linkedin_display_text(linkedin_url, contact_name=None):
     """
     Generates smart display text for a LinkedIn profile with quality analysis.
@@ -494,11 +629,97 @@ def generate_linkedin_display_text(linkedin_url, contact_name=None):
         return "LinkedIn Profile"
 
 
-# NOTE: This file now serves as CLI-only tool for development/testing
-# All production resume generation logic has been moved to Flask app.py for:
-# - Unified template dispatch (HTML and LaTeX)
-# - Elimination of subprocess overhead
-# - Better error handling and performance
+def render_job(job):
+    """
+    Render a single PDF job described by a dict.
+
+    Keys mirror the CLI arguments: ``template``, ``input``, ``output``,
+    ``session_icons_dir`` and ``session_id``. The resume may be passed inline
+    as ``data`` instead of an ``input`` YAML path; when ``output`` is empty the
+    PDF is rendered in memory and returned as bytes. An optional ``offline``
+    boolean overrides RENDER_NETWORK_MODE and an optional ``backend`` name
+    overrides PDF_RENDER_BACKEND.
+    """
+    if job.get("data") is not None:
+        resume_data = job["data"]
+        if not isinstance(resume_data, dict):
+            raise ValueError("Invalid resume data: Root must be a dictionary")
+    else:
+        resume_data = load_resume_data(job["input"])
+    # Normalize sections for backward compatibility
+    resume_data = normalize_sections(resume_data)
+
+    if not job.get("output"):
+        return generate_pdf_bytes(
+            job["template"],
+            resume_data,
+            job.get("session_icons_dir"),
+            offline=job.get("offline"),
+            backend=job.get("backend"),
+        )
+
+    generate_pdf(
+        job["template"],
+        resume_data,
+        job["output"],
+        job.get("session_icons_dir"),
+        session_id=job.get("session_id"),
+        offline=job.get("offline"),
+        backend=job.get("backend"),
+    )
+    return None
+
+
+def serve():
+    """
+    Run as a persistent renderer worker.
+
+    Reads one JSON job per line from stdin and answers each with one JSON
+    header line on stdout, ``{"success": true, "size": N}`` or
+    ``{"success": false, "error": "..."}``, followed by N raw PDF bytes when
+    the job was rendered in memory. The process exits when stdin is closed,
+    so a dying parent never leaves workers behind.
+
+    Headers also carry ``peak_rss_mb``, this worker's RSS plus the largest
+    wkhtmltopdf it has run, which the parent uses to size render concurrency
+    (utils/render_memory.py).
+
+    Anything else that writes to stdout (pdfkit, stray prints) is redirected
+    to stderr so it cannot corrupt the protocol stream.
+    """
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    warm_template_environments()
+    logging.info(f"Renderer worker ready (pid={os.getpid()})")
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        pdf_bytes = b""
+        try:
+            job = json.loads(line)
+            pdf_bytes = render_job(job) or b""
+            response = {"success": True, "size": len(pdf_bytes)}
+        except Exception as e:
+            logging.error(f"Renderer worker job failed: {e}")
+            response = {"success": False, "error": str(e)}
+        response["peak_rss_mb"] = round(
+            read_process_rss_mb(os.getpid()) + read_children_peak_rss_mb(), 1
+        )
+
+        protocol_out.write(json.dumps(response).encode("utf-8") + b"\n")
+        if pdf_bytes:
+            protocol_out.write(pdf_bytes)
+        protocol_out.flush()
+
+    close_pdf_backends()
+    logging.info(f"Renderer worker exiting (pid={os.getpid()})")
+
+
+# NOTE: This file serves both as a CLI tool for development/testing and as the
+# persistent renderer worker (--serve) used by utils/render_pool.py.
+# Template dispatch (HTML vs LaTeX) lives in Flask app.py.
 
 
 # Main function to run the generator
@@ -506,19 +727,21 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Generate a resume PDF from YAML data."
     )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a persistent renderer worker reading JSON jobs from stdin.",
+    )
     parser.add_argument(
         "--template",
-        required=True,
         help="The template to use for generating the resume (e.g., 'modern').",
     )
     parser.add_argument(
         "--input",
-        required=True,
         help="The input YAML file containing the resume data.",
     )
     parser.add_argument(
         "--output",
-        required=True,
         help="The output PDF file path to save the generated resume.",
     )
     parser.add_argument(
@@ -533,19 +756,58 @@ if __name__ == "__main__":
         "--session-id",
         help="The session ID for unique temp file naming.",
     )
+    parser.add_argument(
+        "--network-mode",
+        choices=["offline", "online"],
+        help="Override RENDER_NETWORK_MODE for this render.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["wkhtmltopdf", "chromium"],
+        help="Override PDF_RENDER_BACKEND for this render.",
+    )
 
     args = parser.parse_args()
+    apply_render_process_limits(RENDER_PROCESS_MAX_AS_MB)
+
+    if args.serve:
+        log_level = (
+            logging.DEBUG
+            if os.getenv("DEBUG_LOGGING", "false").lower() == "true"
+            else logging.INFO
+        )
+        logging.basicConfig(
+            level=log_level, format="%(asctime)s [RENDERER] %(levelname)s: %(message)s"
+        )
+        log_wkhtmltopdf_version()
+        serve()
+        sys.exit(0)
+
+    if not (args.template and args.input and args.output):
+        parser.error("--template, --input and --output are required")
+
+    # Configure logging for the subprocess
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s [GENERATOR] %(levelname)s: %(message)s",
+    )
+    log_wkhtmltopdf_version()
 
     try:
-        resume_data = load_resume_data(args.input)
-        # Normalize sections for backward compatibility
-        resume_data = normalize_sections(resume_data)
-        generate_pdf(
-            args.template,
-            resume_data,
-            args.output,
-            getattr(args, "session_icons_dir", None),
-            session_id=getattr(args, "session_id", None),
+        render_job(
+            {
+                "template": args.template,
+                "input": args.input,
+                "output": args.output,
+                "session_icons_dir": getattr(args, "session_icons_dir", None),
+                "session_id": getattr(args, "session_id", None),
+                "offline": (
+                    args.network_mode == "offline" if args.network_mode else None
+                ),
+                "backend": args.backend,
+            }
         )
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        close_pdf_backends()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML PDF render time: Google Fonts link vs the local font registry.
+
+Renders every bundled sample YAML with the modern template twice per
+iteration, in-process via resume_generator.generate_pdf_bytes:
+
+- "google":  the pre-registry behaviour, every render links
+             fonts.googleapis.com and wkhtmltopdf waits on that fetch
+- "offline": fonts resolved from utils/font_registry.py with file:// URLs and
+             the unroutable-proxy guard, so no network request is possible
+
+Requires wkhtmltopdf on PATH. The "google" column needs network access; in a
+sandbox without it those renders show up as failures (which is the point).
+
+Usage:
+    python scripts/benchmark_font_loading.py
+    python scripts/benchmark_font_loading.py --iterations 10
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import resume_generator  # noqa: E402
+from resume_generator import (  # noqa: E402
+    generate_pdf_bytes,
+    load_resume_data,
+    normalize_sections,
+)
+
+SAMPLES_DIR = PROJECT_ROOT / "samples"
+TEMPLATE_NAME = "modern"
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s")
+
+
+def sample_yaml_files():
+    """All bundled sample resumes (meta.yml is template metadata, not a resume)."""
+    return sorted(f for f in SAMPLES_DIR.glob("**/*.yml") if f.name != "meta.yml")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def render_google(data):
+    """Force the Google Fonts link by hiding the local registry."""
+    resolve_font = resume_generator.resolve_font
+    resume_generator.resolve_font = lambda name: None
+    try:
+        return generate_pdf_bytes(TEMPLATE_NAME, data, offline=False)
+    finally:
+        resume_generator.resolve_font = resolve_font
+
+
+def render_offline(data):
+    return generate_pdf_bytes(TEMPLATE_NAME, data, offline=True)
+
+
+def run_benchmark(label, render_one, resumes, iterations):
+    """Render every sample `iterations` times and return per-PDF latencies in ms."""
+    latencies = []
+    failures = 0
+    for _ in range(iterations):
+        for yaml_path in resumes:
+            # render_html annotates the dict, so give each render a fresh copy
+            data = normalize_sections(load_resume_data(yaml_path))
+            start = time.perf_counter()
+            try:
+                render_one(data)
+            except Exception as e:
+                failures += 1
+                logging.warning(f"[{label}] {yaml_path.name} failed: {e}")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    resumes = sample_yaml_files()
+    print(f"Samples: {len(resumes)} YAML files x {args.iterations} iterations")
+
+    results = []
+    for label, render_one in (("google", render_google), ("offline", render_offline)):
+        latencies, failures = run_benchmark(label, render_one, resumes, args.iterations)
+        results.append((label, latencies, failures))
+
+    print(f"{'mode':<10} {'n':>4} {'fail':>5} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for label, latencies, failures in results:
+        if not latencies:
+            print(f"{label:<10} {0:>4} {failures:>5} {'-':>9} {'-':>9} {'-':>9}")
+            continue
+        print(
+            f"{label:<10} {len(latencies):>4} {failures:>5} "
+            f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+            f"{statistics.mean(latencies):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark template rendering of a large resume with and without section fragments.
+
+Builds a resume with --jobs experience entries of --bullets markdown bullets
+each, plus skills and certification lists, and times every iteration of the
+editor loop: change one bullet, render the document again. Three modes per
+template:
+
+- "cold":  the fragment cache is cleared before every render (the old
+           behaviour: every section re-rendered, filters and escaping re-run)
+- "edit":  one bullet of one job changes between renders, so one section
+           misses and the rest are assembled from cached fragments
+- "same":  nothing changes (e.g. a preview re-requested after a failed fetch)
+
+HTML goes through resume_generator.render_html (modern); LaTeX through
+app.render_latex_source (classic), which only renders the .tex source, so
+neither needs wkhtmltopdf or xelatex.
+
+Usage:
+    python scripts/benchmark_fragment_cache.py
+    python scripts/benchmark_fragment_cache.py --iterations 200 --jobs 20
+"""
+
+import argparse
+import copy
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import resume_generator  # noqa: E402
+from utils import fragment_cache  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s"
+)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def large_resume(jobs, bullets):
+    """A resume roughly the size of a long senior CV."""
+    return {
+        "contact_info": {
+            "name": "Jane Doe",
+            "location": "Berlin, Germany",
+            "email": "jane@example.com",
+            "phone": "+49 30 1234567",
+            "social_links": [
+                {"platform": "linkedin", "url": "linkedin.com/in/janedoe"},
+                {"platform": "github", "url": "github.com/janedoe"},
+            ],
+        },
+        "sections": [
+            {
+                "name": "Summary",
+                "type": "text",
+                "content": "Engineer with **15 years** of _distributed systems_ "
+                "work & [open source](https://example.com) contributions.",
+            },
+            {
+                "name": "Experience",
+                "type": "experience",
+                "content": [
+                    {
+                        "company": f"Company {j} & Partners",
+                        "title": f"**Staff Engineer** {j}",
+                        "dates": f"{2000 + j} - {2001 + j}",
+                        "description": [
+                            f"Cut p99 latency by {b}0% with **batching** and "
+                            f"[caching](https://example.com/{j}/{b}) for $#{b} team"
+                            for b in range(bullets)
+                        ],
+                    }
+                    for j in range(jobs)
+                ],
+            },
+            {
+                "name": "Skills",
+                "type": "dynamic-column-list",
+                "content": [f"Skill_{i} & more" for i in range(40)],
+            },
+            {
+                "name": "Certifications",
+                "type": "bulleted-list",
+                "content": [f"**Cert {i}** - _Issuer_ {i}" for i in range(15)],
+            },
+            {
+                "name": "Education",
+                "type": "education",
+                "content": [
+                    {"degree": "MSc", "school": f"University {i}", "year": "2010"}
+                    for i in range(3)
+                ],
+            },
+        ],
+    }
+
+
+def time_renders(render, resume, iterations, mode):
+    latencies = []
+    for i in range(iterations):
+        data = copy.deepcopy(resume)
+        if mode == "cold":
+            fragment_cache._cache.clear()
+        if mode in ("cold", "edit"):
+            jobs = data["sections"][1]["content"]
+            job = jobs[i % len(jobs)]
+            job["description"][0] = f"Edited bullet {i}"
+        start = time.perf_counter()
+        render(data)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=12)
+    parser.add_argument("--bullets", type=int, default=8)
+    parser.add_argument(
+        "--skip-latex", action="store_true", help="Only benchmark the HTML template"
+    )
+    args = parser.parse_args()
+
+    resume = large_resume(args.jobs, args.bullets)
+    renderers = [
+        (
+            "modern",
+            lambda data: resume_generator.render_html("modern", data, offline=True),
+        )
+    ]
+    if not args.skip_latex:
+        import app  # noqa: E402 - starts the render pools; only needed for LaTeX
+
+        renderers.append(("classic", lambda data: app.render_latex_source(data)))
+
+    print(
+        f"Resume: {args.jobs} jobs x {args.bullets} bullets, "
+        f"{args.iterations} renders per mode"
+    )
+    print(f"{'template':<10} {'mode':<6} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for template, render in renderers:
+        render(copy.deepcopy(resume))  # compile templates outside the timings
+        for mode in ("cold", "edit", "same"):
+            fragment_cache._cache.clear()
+            render(copy.deepcopy(resume))
+            latencies = time_renders(render, resume, args.iterations, mode)
+            print(
+                f"{template:<10} {mode:<6} {percentile(latencies, 50):>8.2f} "
+                f"{percentile(latencies, 95):>8.2f} {statistics.mean(latencies):>8.2f}"
+            )
+    print(f"fragment cache: {fragment_cache.fragment_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
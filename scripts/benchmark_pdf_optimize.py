@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark the PDF size optimizer on the sample resumes.
+
+Renders every sample resume once with the optimizer off (modern samples with
+wkhtmltopdf, classic samples with xelatex), then runs each PDF_OPTIMIZE
+preset over the rendered bytes --iterations times and reports, per sample
+and preset, the bytes saved and the CPU time the stage adds. PDFs given
+with --pdf are measured as well, e.g. real user downloads with large icons.
+
+Needs pypdf; rendering the samples needs wkhtmltopdf and xelatex (skip them
+with --skip-samples and pass --pdf files instead).
+
+Usage:
+    python scripts/benchmark_pdf_optimize.py
+    python scripts/benchmark_pdf_optimize.py --skip-samples --pdf output/*.pdf
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import yaml  # noqa: E402
+
+import resume_generator  # noqa: E402
+from utils import pdf_optimize  # noqa: E402
+from utils.pdf_optimize import PDF_OPTIMIZE_PRESETS, optimize_pdf  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s"
+)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def render_samples():
+    """(name, pdf bytes) for every sample resume, rendered unoptimized."""
+    import app  # noqa: E402 - starts the render pools; only needed for LaTeX
+
+    for path in sorted(PROJECT_ROOT.glob("samples/*/*.yml")):
+        if path.name == "meta.yml":
+            continue
+        with open(path) as f:
+            data = resume_generator.normalize_sections(yaml.safe_load(f))
+        name = str(path.relative_to(PROJECT_ROOT / "samples"))
+        if path.parent.name == "classic":
+            yield name, app.generate_latex_pdf(data, str(app.ICONS_DIR), None)
+        else:
+            yield name, resume_generator.generate_pdf_bytes("modern", data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--pdf", nargs="*", default=[], help="Extra PDFs to measure")
+    parser.add_argument(
+        "--skip-samples", action="store_true", help="Only measure --pdf files"
+    )
+    args = parser.parse_args()
+
+    # Renders below must produce the unoptimized PDF
+    pdf_optimize.PDF_OPTIMIZE = "off"
+
+    pdfs = [(Path(path).name, Path(path).read_bytes()) for path in args.pdf]
+    if not args.skip_samples:
+        pdfs.extend(render_samples())
+
+    print(
+        f"{'pdf':<32} {'preset':<7} {'bytes':>9} {'optimized':>10} {'saved':>7} "
+        f"{'cpu p50 ms':>11} {'cpu p95 ms':>11}"
+    )
+    totals = {preset: [0, 0, []] for preset in PDF_OPTIMIZE_PRESETS}
+    for name, pdf in pdfs:
+        for preset, settings in PDF_OPTIMIZE_PRESETS.items():
+            cpu_ms = []
+            for _ in range(args.iterations):
+                start = time.process_time()
+                optimized = optimize_pdf(pdf, **settings)
+                cpu_ms.append((time.process_time() - start) * 1000)
+            size = min(len(optimized), len(pdf))  # larger results are discarded
+            totals[preset][0] += len(pdf)
+            totals[preset][1] += size
+            totals[preset][2].extend(cpu_ms)
+            print(
+                f"{name:<32} {preset:<7} {len(pdf):>9} {size:>10} "
+                f"{1 - size / len(pdf):>7.1%} {percentile(cpu_ms, 50):>11.1f} "
+                f"{percentile(cpu_ms, 95):>11.1f}"
+            )
+
+    for preset, (before, after, cpu_ms) in totals.items():
+        if before:
+            print(
+                f"{preset}: {before} -> {after} bytes ({1 - after / before:.1%} "
+                f"saved), mean {statistics.mean(cpu_ms):.1f} ms CPU per PDF"
+            )
+
+
+if __name__ == "__main__":
+    main()
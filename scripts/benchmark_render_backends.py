@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Compare PDF backends (utils/pdf_backends.py) on the bundled sample resumes.
+
+Renders every sample YAML with the modern template through each backend and
+prints per-render latency (p50/p95/mean), output size and renderer memory:
+for wkhtmltopdf the peak RSS of its per-render processes, for Chromium the
+RSS of the browser process tree once all renders are done. The HTML is
+rendered once per sample up front, so only the HTML -> PDF step is timed.
+
+Requires wkhtmltopdf on PATH and, for the chromium backend, playwright with
+a Chromium build (pip install playwright && playwright install chromium).
+
+Usage:
+    python scripts/benchmark_render_backends.py
+    python scripts/benchmark_render_backends.py --iterations 10 --pages 2
+    python scripts/benchmark_render_backends.py --backends chromium
+"""
+
+import argparse
+import copy
+import logging
+import os
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import resume_generator  # noqa: E402
+from utils.pdf_backends import create_backend  # noqa: E402
+from utils.render_pool import read_process_rss_mb  # noqa: E402
+
+SAMPLES_DIR = PROJECT_ROOT / "samples"
+TEMPLATE_NAME = "modern"
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s")
+
+
+def sample_yaml_files():
+    """All bundled sample resumes (meta.yml is template metadata, not a resume)."""
+    return sorted(f for f in SAMPLES_DIR.glob("**/*.yml") if f.name != "meta.yml")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def child_pids(pid):
+    """Direct children of a process, read from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children", "r", encoding="utf-8") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def process_tree_rss_mb(pid):
+    """RSS of every descendant of a process, in MB."""
+    total = 0.0
+    pending = child_pids(pid)
+    while pending:
+        child = pending.pop()
+        total += read_process_rss_mb(child)
+        pending.extend(child_pids(child))
+    return total
+
+
+def render_sample_html(yaml_files):
+    """Render each sample to HTML once, outside the timed section."""
+    documents = []
+    for yaml_path in yaml_files:
+        data = resume_generator.normalize_sections(
+            resume_generator.load_resume_data(yaml_path)
+        )
+        documents.append(
+            (yaml_path.name, resume_generator.render_html(TEMPLATE_NAME, data))
+        )
+    return documents
+
+
+def run_benchmark(backend, documents, iterations):
+    """Render every document `iterations` times; return latencies, sizes, fails."""
+    latencies = []
+    sizes = []
+    failures = 0
+    for _ in range(iterations):
+        for name, html in documents:
+            start = time.perf_counter()
+            try:
+                pdf_bytes = backend.render(html, offline=True)
+            except Exception as e:
+                failures += 1
+                logging.warning(f"[{backend.name}] {name} failed: {e}")
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            sizes.append(len(pdf_bytes))
+    return latencies, sizes, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument(
+        "--backends",
+        default="wkhtmltopdf,chromium",
+        help="Comma-separated backend names to compare.",
+    )
+    parser.add_argument(
+        "--pages", type=int, default=1, help="Warm pages for the chromium backend."
+    )
+    args = parser.parse_args()
+
+    documents = render_sample_html(sample_yaml_files())
+    print(f"Samples: {len(documents)} YAML files x {args.iterations} iterations")
+
+    rows = []
+    for name in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        if name == "chromium":
+            backend = create_backend(name, pages=args.pages)
+        else:
+            backend = create_backend(
+                name, options_for=resume_generator.get_pdfkit_options
+            )
+        try:
+            start = time.perf_counter()
+            backend.start()
+            startup_ms = (time.perf_counter() - start) * 1000
+            latencies, sizes, failures = run_benchmark(
+                backend, copy.deepcopy(documents), args.iterations
+            )
+            if name == "wkhtmltopdf":
+                # Renderer processes have exited; ru_maxrss is their peak (KB)
+                usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+                rss_mb = usage.ru_maxrss / 1024
+            else:
+                rss_mb = process_tree_rss_mb(os.getpid())
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
+            continue
+        finally:
+            backend.close()
+        rows.append((name, startup_ms, latencies, sizes, failures, rss_mb))
+
+    print(
+        f"{'backend':<12} {'n':>4} {'fail':>5} {'start ms':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'mean ms':>9} {'mean KB':>9} {'RSS MB':>8}"
+    )
+    for name, startup_ms, latencies, sizes, failures, rss_mb in rows:
+        if not latencies:
+            print(f"{name:<12} {0:>4} {failures:>5} {startup_ms:>9.1f}")
+            continue
+        print(
+            f"{name:<12} {len(latencies):>4} {failures:>5} {startup_ms:>9.1f} "
+            f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+            f"{statistics.mean(latencies):>9.1f} "
+            f"{statistics.mean(sizes) / 1024:>9.1f} {rss_mb:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML PDF latency: one subprocess per PDF vs the persistent renderer pool.
+
+Renders every bundled sample YAML with the modern template, first by spawning
+`python resume_generator.py` per PDF (the old path), then through
+utils.render_pool.RendererPool (warm workers), and prints p50/p95 latency.
+
+Requires wkhtmltopdf on PATH.
+
+Usage:
+    python scripts/benchmark_render_pool.py
+    python scripts/benchmark_render_pool.py --iterations 10 --pool-size 2
+"""
+
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.render_pool import RendererPool  # noqa: E402
+
+SAMPLES_DIR = PROJECT_ROOT / "samples"
+TEMPLATE_NAME = "modern"
+
+logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s")
+
+
+def sample_yaml_files():
+    """All bundled sample resumes (meta.yml is template metadata, not a resume)."""
+    return sorted(f for f in SAMPLES_DIR.glob("**/*.yml") if f.name != "meta.yml")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def render_with_subprocess(yaml_path, output_path, icons_dir):
+    """The pre-pool path: a fresh interpreter per PDF."""
+    subprocess.run(
+        [
+            sys.executable,
+            "resume_generator.py",
+            "--template",
+            TEMPLATE_NAME,
+            "--input",
+            str(yaml_path),
+            "--output",
+            str(output_path),
+            "--session-icons-dir",
+            str(icons_dir),
+            "--session-id",
+            "bench",
+        ],
+        capture_output=True,
+        text=True,
+        cwd=str(PROJECT_ROOT),
+        check=True,
+    )
+
+
+def run_benchmark(label, render_one, yaml_files, iterations, temp_dir):
+    """Render every sample `iterations` times and return per-PDF latencies in ms."""
+    latencies = []
+    failures = 0
+    for i in range(iterations):
+        for yaml_path in yaml_files:
+            output_path = Path(temp_dir) / f"{label}_{i}_{yaml_path.stem}.pdf"
+            start = time.perf_counter()
+            try:
+                render_one(yaml_path, output_path)
+            except Exception as e:
+                failures += 1
+                logging.warning(f"[{label}] {yaml_path.name} failed: {e}")
+                continue
+            if not output_path.exists():
+                failures += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pool-size", type=int, default=1)
+    args = parser.parse_args()
+
+    yaml_files = sample_yaml_files()
+    print(f"Samples: {len(yaml_files)} YAML files x {args.iterations} iterations")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        icons_dir = PROJECT_ROOT / "icons"
+
+        before, before_failures = run_benchmark(
+            "subprocess",
+            lambda y, o: render_with_subprocess(y, o, icons_dir),
+            yaml_files,
+            args.iterations,
+            temp_dir,
+        )
+
+        pool = RendererPool(size=args.pool_size, max_jobs_per_worker=10_000)
+        try:
+
+            def render_with_pool(yaml_path, output_path):
+                result = pool.render(
+                    {
+                        "template": TEMPLATE_NAME,
+                        "input": str(yaml_path),
+                        "output": str(output_path),
+                        "session_icons_dir": str(icons_dir),
+                        "session_id": "bench",
+                    }
+                )
+                if not result.get("success"):
+                    raise RuntimeError(result.get("error"))
+
+            after, after_failures = run_benchmark(
+                "pool", render_with_pool, yaml_files, args.iterations, temp_dir
+            )
+        finally:
+            pool.shutdown()
+
+    print(f"{'mode':<12} {'n':>4} {'fail':>5} {'p50 ms':>9} {'p95 ms':>9} {'mean ms':>9}")
+    for label, latencies, failures in (
+        ("subprocess", before, before_failures),
+        ("pool", after, after_failures),
+    ):
+        if not latencies:
+            print(f"{label:<12} {0:>4} {failures:>5} {'-':>9} {'-':>9} {'-':>9}")
+            continue
+        print(
+            f"{label:<12} {len(latencies):>4} {failures:>5} "
+            f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+            f"{statistics.mean(latencies):>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Measure the layout estimator against real renders and refit its factors.
+
+Renders every sample resume (and copies with the experience section repeated
+2x and 4x, so multi-page layouts are covered) with the modern and classic
+templates, reads the real page count and how far down the last page the
+content reaches, and compares them with utils/layout_estimate.py:
+
+- exact page-count match rate
+- mean / max error in fractional pages ((pages - 1) + last page fill)
+- p50 latency of the estimate next to p50 latency of the render
+
+With --fit it grid-searches page_scale and height_scale per template and
+prints the pair with the lowest mean error, to be copied into
+TEMPLATE_LAYOUTS. Needs wkhtmltopdf, xelatex and poppler (pdftoppm), i.e.
+run it inside the Docker image.
+
+Usage:
+    python scripts/calibrate_layout_estimate.py
+    python scripts/calibrate_layout_estimate.py --fit --templates classic
+"""
+
+import argparse
+import copy
+import logging
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import yaml  # noqa: E402
+from pdf2image import convert_from_bytes, pdfinfo_from_bytes  # noqa: E402
+
+import resume_generator  # noqa: E402
+from utils.layout_estimate import TEMPLATE_LAYOUTS, estimate_layout  # noqa: E402
+
+logging.basicConfig(
+    level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s"
+)
+
+# Grayscale level below which a pixel counts as ink
+INK_THRESHOLD = 200
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def corpus():
+    """Every sample resume and its longer variants."""
+    for path in sorted(PROJECT_ROOT.glob("samples/**/*.yml")):
+        if path.name == "meta.yml":
+            continue
+        with open(path) as f:
+            data = resume_generator.normalize_sections(yaml.safe_load(f))
+        yield data
+        for repeat in (2, 4):
+            longer = copy.deepcopy(data)
+            for section in longer.get("sections", []):
+                if section.get("type") == "experience":
+                    section["content"] = section["content"] * repeat
+            yield longer
+
+
+def last_page_fill(pdf_bytes, pages, margins):
+    """Fraction of the last page's printable height that has content."""
+    image = convert_from_bytes(
+        pdf_bytes, dpi=50, first_page=pages, last_page=pages, grayscale=True
+    )[0]
+    width, height = image.size
+    top = round(height * margins[0])
+    bottom = height - round(height * margins[1])
+    pixels = image.load()
+    for row in range(bottom - 1, top - 1, -1):
+        if any(pixels[x, row] < INK_THRESHOLD for x in range(width)):
+            return (row + 1 - top) / (bottom - top)
+    return 0.0
+
+
+def measure(app, template_name, data):
+    """Render once; return (pages, last page fill, render ms)."""
+    start = time.perf_counter()
+    pdf = app.render_resume_pdf(
+        template_name, copy.deepcopy(data), app.ICONS_DIR, str(uuid.uuid4())
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    pages = pdfinfo_from_bytes(pdf)["Pages"]
+    margins = TEMPLATE_LAYOUTS[template_name]["margins"]
+    return pages, last_page_fill(pdf, pages, margins), elapsed
+
+
+def fractional_pages(pages, fill):
+    return pages - 1 + fill
+
+
+def evaluate(template_name, renders, layout=None):
+    """Estimate every render; return (match rate, mean error, max error, ms)."""
+    errors, matches, latencies = [], 0, []
+    for data, pages, fill in renders:
+        start = time.perf_counter()
+        estimate = estimate_layout(
+            template_name, data, resume_generator.calculate_columns, layout
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        matches += estimate["pages"] == pages
+        errors.append(
+            abs(
+                fractional_pages(estimate["pages"], estimate["last_page_fill"])
+                - fractional_pages(pages, fill)
+            )
+        )
+    return matches / len(renders), statistics.mean(errors), max(errors), latencies
+
+
+def fit(template_name, renders):
+    """Grid-search page_scale and height_scale for the lowest mean error."""
+    current = TEMPLATE_LAYOUTS[template_name]
+    best = None
+    for page_step in range(-10, 11):
+        page_scale = round(current["page_scale"] * (1 + page_step / 100), 3)
+        for height_step in range(-10, 11):
+            height_scale = round(current["height_scale"] + height_step / 100, 3)
+            layout = {"page_scale": page_scale, "height_scale": height_scale}
+            _, mean_error, _, _ = evaluate(template_name, renders, layout)
+            if best is None or mean_error < best[0]:
+                best = (mean_error, layout)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--templates",
+        nargs="+",
+        default=["modern", "classic"],
+        choices=sorted(TEMPLATE_LAYOUTS),
+    )
+    parser.add_argument(
+        "--fit", action="store_true", help="Search page_scale/height_scale too"
+    )
+    args = parser.parse_args()
+
+    import app  # noqa: E402 - starts the render pools
+
+    resumes = list(corpus())
+    print(f"{len(resumes)} resumes per template")
+    print(
+        f"{'template':<10} {'exact':>7} {'mean err':>9} {'max err':>8} "
+        f"{'est p50 ms':>11} {'render p50 ms':>14}"
+    )
+    for template_name in args.templates:
+        renders, render_ms = [], []
+        for data in resumes:
+            source = data
+            if template_name != "modern":
+                source = app._without_content_icons(data)
+            pages, fill, elapsed = measure(app, template_name, source)
+            renders.append((source, pages, fill))
+            render_ms.append(elapsed)
+
+        match_rate, mean_error, max_error, latencies = evaluate(
+            template_name, renders
+        )
+        print(
+            f"{template_name:<10} {match_rate:>6.0%} {mean_error:>9.3f} "
+            f"{max_error:>8.3f} {percentile(latencies, 50):>11.2f} "
+            f"{percentile(render_ms, 50):>14.0f}"
+        )
+        if args.fit:
+            mean_error, layout = fit(template_name, renders)
+            print(f"  best fit: {layout} (mean err {mean_error:.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Saturate a running instance's render queue and check that it survives.
+
+Fires --concurrency preview renders at /api/generate at once, for --rounds
+rounds, while sampling /api/render/stats. Run it against the docker-compose
+stack (1G memory limit) to see the memory-aware render slots at work: excess
+requests must come back as 429, never as connection errors from an
+OOM-killed container, and /health must answer afterwards.
+
+Usage:
+    python scripts/stress_render_queue.py
+    python scripts/stress_render_queue.py --url http://localhost:5000 --concurrency 40
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+SAMPLES_DIR = PROJECT_ROOT / "samples"
+TEMPLATE_NAME = "modern-no-icons"
+
+
+def sample_yaml_files():
+    """All bundled sample resumes (meta.yml is template metadata, not a resume)."""
+    return sorted(f for f in SAMPLES_DIR.glob("**/*.yml") if f.name != "meta.yml")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def post_render(url, yaml_bytes, i):
+    """One editor preview; returns (status or error name, seconds)."""
+    start = time.perf_counter()
+    try:
+        response = requests.post(
+            f"{url}/api/generate?preview=true",
+            files={"yaml_file": ("resume.yml", yaml_bytes)},
+            data={"session_id": f"stress-{i}", "template": TEMPLATE_NAME},
+            timeout=120,
+        )
+        outcome = response.status_code
+    except requests.RequestException as e:
+        outcome = type(e).__name__
+    return outcome, time.perf_counter() - start
+
+
+def sample_stats(url, stop, samples):
+    while not stop.is_set():
+        try:
+            stats = requests.get(f"{url}/api/render/stats", timeout=5).json()
+            samples.append(stats.get("render_memory") or {})
+        except (requests.RequestException, ValueError):
+            samples.append(None)
+        stop.wait(0.5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    yaml_bytes = [f.read_bytes() for f in sample_yaml_files()]
+    outcomes = Counter()
+    latencies = []
+    samples = []
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_stats, args=(args.url, stop, samples))
+    sampler.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for round_number in range(args.rounds):
+                results = executor.map(
+                    lambda i: post_render(args.url, yaml_bytes[i % len(yaml_bytes)], i),
+                    range(args.concurrency),
+                )
+                for outcome, seconds in results:
+                    outcomes[outcome] += 1
+                    if outcome == 200:
+                        latencies.append(seconds * 1000)
+                print(f"round {round_number + 1}: {dict(outcomes)}")
+    finally:
+        stop.set()
+        sampler.join()
+
+    memory = [s for s in samples if s]
+    if memory:
+        headrooms = [
+            s["headroom_mb"] for s in memory if s.get("headroom_mb") is not None
+        ]
+        print(
+            f"slots={memory[-1].get('slots')} "
+            f"peak_active={max(s.get('peak_active', 0) for s in memory)} "
+            f"throttled={memory[-1].get('throttled')} "
+            f"render_mb={memory[-1].get('render_mb')} "
+            f"min_headroom_mb={min(headrooms) if headrooms else '-'}"
+        )
+    if latencies:
+        print(
+            f"200s: p50 {percentile(latencies, 50):.0f} ms, "
+            f"p95 {percentile(latencies, 95):.0f} ms"
+        )
+
+    try:
+        healthy = requests.get(f"{args.url}/health", timeout=5).status_code == 200
+    except requests.RequestException:
+        healthy = False
+    failures = sum(n for k, n in outcomes.items() if k not in (200, 429))
+    print(f"health after stress: {'ok' if healthy else 'DOWN'}; failures: {failures}")
+    sys.exit(0 if healthy and not failures else 1)
+
+
+if __name__ == "__main__":
+    main()
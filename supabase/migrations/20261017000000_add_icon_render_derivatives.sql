@@ -0,0 +1,23 @@
+-- ==============================================================================
+-- MIGRATION: Add render derivative columns to resume_icons
+-- ==============================================================================
+-- Purpose: Store a render-size copy of each uploaded icon next to the original
+-- Reason: Icons are drawn at 16-20px but uploads can be up to 500KB; decoding
+--         and embedding the originals slowed every render and bloated PDFs
+-- Date: 2026-10-17
+-- ==============================================================================
+
+ALTER TABLE public.resume_icons
+  ADD COLUMN IF NOT EXISTS content_hash TEXT,
+  ADD COLUMN IF NOT EXISTS render_storage_path TEXT,
+  ADD COLUMN IF NOT EXISTS render_file_size INTEGER;
+
+COMMENT ON COLUMN public.resume_icons.content_hash
+  IS 'sha256 of the original upload, used to skip re-uploading unchanged icons';
+COMMENT ON COLUMN public.resume_icons.render_storage_path
+  IS 'Downscaled copy used by the PDF renderers; NULL means render the original';
+COMMENT ON COLUMN public.resume_icons.render_file_size
+  IS 'Size in bytes of the render copy';
+
+-- Note: Existing RLS policies already cover these columns; rows uploaded
+-- before this migration keep rendering their original until re-saved
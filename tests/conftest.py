@@ -110,8 +110,10 @@ def flask_test_client(mock_supabase):
     """
     import app as flask_app
 
-    # Patch the supabase client in the app module
-    with patch.object(flask_app, 'supabase', mock_supabase):
+    # Patch the supabase client in the app module; the rendered-PDF cache is
+    # disabled so results never leak between tests
+    with patch.object(flask_app, 'supabase', mock_supabase), \
+            patch.object(flask_app, 'PDF_CACHE', None):
         flask_app.app.config['TESTING'] = True
         with flask_app.app.test_client() as client:
             yield client, mock_supabase, flask_app
@@ -0,0 +1,130 @@
+"""
+Tests for the local font registry (utils/font_registry.py) and offline renders.
+
+Tests cover:
+1. Resolving YAML font names against installed font files
+2. @font-face CSS generation with file:// URLs
+3. render_html never referencing fonts.googleapis.com in offline mode
+4. Online mode falling back to Google Fonts for unknown fonts
+5. wkhtmltopdf options for each network mode
+
+Run tests:
+    pytest tests/test_font_registry.py -v
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_generator
+from utils import font_registry
+
+
+@pytest.fixture
+def font_dir(tmp_path, monkeypatch):
+    """Point the registry at a temp dir holding DejaVu Sans (Tahoma) files."""
+    for filename in font_registry.DEJAVU_SANS.values():
+        (tmp_path / filename).write_bytes(b"fake-font")
+    monkeypatch.setattr(font_registry, "FONT_DIRS", str(tmp_path))
+    font_registry._font_file_index.cache_clear()
+    font_registry._installed_faces.cache_clear()
+    yield tmp_path
+    font_registry._font_file_index.cache_clear()
+    font_registry._installed_faces.cache_clear()
+
+
+def resume_data(font=None):
+    data = {
+        "contact_info": {"name": "Jane Doe", "email": "jane@example.com"},
+        "sections": [],
+    }
+    if font:
+        data["font"] = font
+    return data
+
+
+class TestResolveFont:
+    """Tests for resolve_font and font_face_css."""
+
+    def test_resolves_registered_font_case_insensitively(self, font_dir):
+        """Verify a YAML font name maps to installed files."""
+        font = font_registry.resolve_font("tahoma")
+
+        assert font["family"] == "tahoma"
+        assert font["generic"] == "sans-serif"
+        assert len(font["faces"]) == 4
+
+    def test_unknown_font_is_unresolved(self, font_dir):
+        """Verify fonts outside the registry return None."""
+        assert font_registry.resolve_font("Comic Neue") is None
+
+    def test_registered_but_missing_font_is_unresolved(self, font_dir):
+        """Verify a registered font without installed files returns None."""
+        assert font_registry.resolve_font("Lato") is None
+
+    def test_font_face_css_uses_file_urls(self, font_dir):
+        """Verify @font-face rules point at local files."""
+        css = font_registry.font_face_css(font_registry.resolve_font("Tahoma"))
+
+        assert css.count("@font-face") == 4
+        assert f"url('file://{font_dir.as_posix()}/DejaVuSans-Bold.ttf')" in css
+        assert "font-weight: bold;" in css
+        assert "font-style: italic;" in css
+
+
+class TestRenderHtmlFonts:
+    """Tests for font handling in resume_generator.render_html."""
+
+    def test_offline_render_uses_local_font_faces(self, font_dir):
+        """Verify a registered font is embedded via @font-face."""
+        html = resume_generator.render_html(
+            "modern", resume_data("Tahoma"), offline=True
+        )
+
+        assert "fonts.googleapis.com" not in html
+        assert "@font-face" in html
+        assert "font-family: 'Tahoma', sans-serif;" in html
+
+    def test_offline_render_never_links_remote_fonts(self, font_dir):
+        """Verify unknown fonts fall back to the default family offline."""
+        html = resume_generator.render_html(
+            "modern", resume_data("Comic Neue"), offline=True
+        )
+
+        assert "fonts.googleapis.com" not in html
+        assert "font-family: 'Arial'" in html
+
+    def test_online_render_links_unknown_fonts(self, font_dir):
+        """Verify online mode keeps the Google Fonts fallback."""
+        html = resume_generator.render_html(
+            "modern", resume_data("Comic Neue"), offline=False
+        )
+
+        assert "fonts.googleapis.com/css?family=Comic+Neue" in html
+
+    def test_online_render_prefers_local_fonts(self, font_dir):
+        """Verify registered fonts are served locally even in online mode."""
+        html = resume_generator.render_html(
+            "modern", resume_data("Tahoma"), offline=False
+        )
+
+        assert "fonts.googleapis.com" not in html
+        assert "@font-face" in html
+
+
+class TestPdfkitOptions:
+    """Tests for network-mode wkhtmltopdf options."""
+
+    def test_offline_options_block_network(self):
+        """Verify offline renders go through the unroutable proxy."""
+        options = resume_generator.get_pdfkit_options(offline=True)
+
+        assert options["proxy"] == resume_generator.OFFLINE_PROXY
+        assert options["load-error-handling"] == "abort"
+
+    def test_online_options_have_no_proxy(self):
+        """Verify online renders use the plain options."""
+        assert "proxy" not in resume_generator.get_pdfkit_options(offline=False)
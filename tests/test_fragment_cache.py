@@ -0,0 +1,164 @@
+"""
+Tests for the per-section fragment cache (utils/fragment_cache.py).
+
+Tests cover:
+1. Unchanged sections reused; an edited section re-rendered alone
+2. Cached HTML identical to a fresh render
+3. Icon URLs revalidated so session uploads never leak between renders
+4. LaTeX sections escaped and rendered once per content
+5. Template changes and LRU bound
+
+Run tests:
+    pytest tests/test_fragment_cache.py -v
+"""
+import copy
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_generator
+from utils import fragment_cache
+from utils.fragment_cache import SectionFragmentCache, section_key
+
+RESUME = {
+    "contact_info": {"name": "Jane Doe", "email": "jane@example.com"},
+    "sections": [
+        {"name": "Summary", "type": "text", "content": "Builds **things**."},
+        {
+            "name": "Experience",
+            "type": "experience",
+            "content": [
+                {
+                    "company": "Acme",
+                    "title": "Engineer",
+                    "dates": "2020 - Present",
+                    "icon": "company_acme.png",
+                    "description": ["Shipped 50% faster", "Led [docs](x.com)"],
+                }
+            ],
+        },
+        {"name": "Skills", "type": "bulleted-list", "content": ["Python", "C&C++"]},
+    ],
+}
+
+
+@pytest.fixture
+def cache():
+    cache = SectionFragmentCache(max_entries=100)
+    with patch.object(fragment_cache, "_cache", cache):
+        yield cache
+
+
+def render(data=RESUME, icons_dir=None):
+    return resume_generator.render_html(
+        "modern", copy.deepcopy(data), icons_dir, offline=True
+    )
+
+
+class TestHtmlFragments:
+    """Tests for section fragments in resume_generator.render_html."""
+
+    def test_edit_rerenders_only_that_section(self, cache):
+        """Verify a one-bullet edit misses once and reuses the other sections."""
+        render()
+        edited = copy.deepcopy(RESUME)
+        edited["sections"][2]["content"].append("Rust")
+
+        html = render(edited)
+
+        assert "Rust" in html
+        assert cache.stats()["misses"] == 4
+        assert cache.stats()["hits"] == 2
+
+    def test_cached_html_matches_fresh_render(self, cache):
+        """Verify assembling cached fragments changes nothing in the output."""
+        first = render()
+        second = render()
+
+        assert first == second
+        assert cache.stats()["hits"] == 3
+        assert "<strong>things</strong>" in second
+
+    def test_session_icons_not_shared(self, cache, tmp_path):
+        """Verify a fragment is re-rendered when an icon resolves elsewhere."""
+        (tmp_path / "company_acme.png").write_bytes(b"user")
+
+        without_upload = render()
+        with_upload = render(icons_dir=tmp_path)
+
+        assert f"file://{tmp_path}/company_acme.png" not in without_upload
+        assert f"file://{tmp_path}/company_acme.png" in with_upload
+        # Summary and Skills look up no icons and are shared
+        assert cache.stats()["hits"] == 2
+
+
+class TestLatexFragments:
+    """Tests for section fragments in app.render_latex_source."""
+
+    def test_sections_escaped_once_per_content(self, cache, flask_test_client):
+        """Verify unchanged sections skip LaTeX escaping on the next render."""
+        _, _, flask_app = flask_test_client
+        flask_app.render_latex_source(copy.deepcopy(RESUME))
+
+        with patch.object(
+            flask_app,
+            "_escape_latex_recursive",
+            wraps=flask_app._escape_latex_recursive,
+        ) as escape:
+            edited = copy.deepcopy(RESUME)
+            edited["sections"][0]["content"] = "Builds more things."
+            latex = flask_app.render_latex_source(edited)
+
+        sections_escaped = [
+            call.args[0]
+            for call in escape.call_args_list
+            if isinstance(call.args[0], dict) and "type" in call.args[0]
+        ]
+        assert [s["name"] for s in sections_escaped] == ["Summary"]
+        assert "Builds more things." in latex
+        assert "C\\&C++" in latex
+
+    def test_matches_uncached_template(self, cache, flask_test_client):
+        """Verify resume.tex renders the same with and without fragments."""
+        _, _, flask_app = flask_test_client
+        data = copy.deepcopy(RESUME)
+        cached = flask_app.render_latex_source(copy.deepcopy(data))
+
+        template = flask_app.get_latex_environment("classic").get_template(
+            "resume.tex"
+        )
+        uncached = template.render(**flask_app._prepare_latex_data(data))
+
+        squash = lambda text: " ".join(text.split())  # noqa: E731
+        assert squash(cached) == squash(uncached)
+
+
+class TestSectionFragmentCache:
+    """Tests for SectionFragmentCache bookkeeping."""
+
+    def test_key_depends_on_template_fingerprint(self):
+        """Verify an edited template never serves fragments of the old one."""
+        section = RESUME["sections"][0]
+
+        assert section_key("html:modern:aaa", section) != section_key(
+            "html:modern:bbb", section
+        )
+        assert section_key("html:modern:aaa", section) == section_key(
+            "html:modern:aaa", copy.deepcopy(section)
+        )
+
+    def test_least_recently_used_evicted(self):
+        """Verify the cache holds at most max_entries fragments."""
+        cache = SectionFragmentCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            cache.render(key, lambda _: key)
+
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["evictions"] == 1
+        assert cache.render("a", lambda _: "fresh") == "a"
+        assert cache.render("b", lambda _: "fresh") == "fresh"
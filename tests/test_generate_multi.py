@@ -0,0 +1,171 @@
+"""
+Tests for the multi-template preview endpoint (POST /api/generate/multi).
+
+Tests cover:
+1. One preview per requested template, all templates by default
+2. Templates with identical output sharing a single render
+3. Icon staging once per icon mode (uploads only for modern-with-icons)
+4. Partial failures, 429 when the render queue is full, validation errors
+
+Run tests:
+    pytest tests/test_generate_multi.py -v
+"""
+import io
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_scheduler import RenderQueueFullError
+
+RESUME_YAML = b"""
+contact_info:
+  name: Jane Doe
+  email: jane@example.com
+sections:
+  - name: Summary
+    type: text
+    content: Builds things.
+"""
+
+
+def form(templates=None, icons=None, **extra):
+    data = {
+        "yaml_file": (io.BytesIO(RESUME_YAML), "resume.yml"),
+        "session_id": "multi-session",
+        **extra,
+    }
+    if templates is not None:
+        data["templates"] = templates
+    if icons:
+        data["icons"] = icons
+    return data
+
+
+@pytest.fixture
+def multi_client(flask_test_client):
+    """Test client with renderers and rasterization stubbed out."""
+    client, _, flask_app = flask_test_client
+    with patch.object(
+        flask_app, "render_html_pdf", return_value=b"%PDF-1.4 html"
+    ) as render_html, patch.object(
+        flask_app, "generate_latex_pdf", return_value=b"%PDF-1.4 tex"
+    ) as render_latex, patch.object(
+        flask_app, "render_pdf_first_page_png", return_value=b"\x89PNG"
+    ) as rasterize:
+        yield client, render_html, render_latex, rasterize
+
+
+class TestGenerateMulti:
+    """Tests for POST /api/generate/multi."""
+
+    def test_previews_every_template_by_default(self, multi_client):
+        """Verify each template gets a PNG and duplicates render once."""
+        client, render_html, render_latex, _ = multi_client
+
+        response = client.post("/api/generate/multi", data=form())
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert set(body["previews"]) == {
+            "modern-with-icons",
+            "modern-no-icons",
+            "modern",
+            "classic",
+            "classic-alex-rivera",
+            "classic-jane-doe",
+        }
+        assert body["previews"]["classic"].startswith("data:image/png;base64,")
+        assert body["errors"] == {}
+        # modern with icons, modern without icons, classic
+        assert render_html.call_count == 2
+        assert render_latex.call_count == 1
+
+    def test_subset_of_templates(self, multi_client):
+        """Verify only the requested templates are rendered, in order."""
+        client, render_html, render_latex, _ = multi_client
+
+        response = client.post(
+            "/api/generate/multi", data=form("classic, modern-no-icons", width="200")
+        )
+
+        assert list(response.get_json()["previews"]) == ["classic", "modern-no-icons"]
+        assert render_html.call_count == 1
+        assert render_latex.call_count == 1
+
+    def test_preview_width_passed_to_rasterizer(self, multi_client):
+        """Verify the width form field controls the preview size."""
+        client, _, _, rasterize = multi_client
+
+        client.post("/api/generate/multi", data=form("modern", width="250"))
+
+        assert rasterize.call_args.kwargs["width"] == 250
+
+    def test_uploaded_icons_only_staged_for_icon_template(self, flask_test_client):
+        """Verify uploads land in the with-icons directory only."""
+        client, _, flask_app = flask_test_client
+        staged = {}
+
+        def fake_render(template, yaml_data, icons_dir, session_id, **kwargs):
+            staged[icons_dir.name] = sorted(os.listdir(icons_dir))
+            return b"%PDF-1.4"
+
+        with patch.object(
+            flask_app, "render_html_pdf", side_effect=fake_render
+        ), patch.object(flask_app, "render_pdf_first_page_png", return_value=b"png"):
+            client.post(
+                "/api/generate/multi",
+                data=form(
+                    "modern-with-icons,modern-no-icons",
+                    icons=[(io.BytesIO(b"icon"), "company.png")],
+                ),
+            )
+
+        # Base icons are resolved from icons/ and never copied
+        assert staged["icons"] == ["company.png"]
+        assert staged["base-icons"] == []
+
+    def test_partial_failure_reports_errors(self, multi_client):
+        """Verify a failing template does not hide the others."""
+        client, _, render_latex, _ = multi_client
+        render_latex.side_effect = RuntimeError("xelatex died")
+
+        response = client.post("/api/generate/multi", data=form("modern,classic"))
+
+        body = response.get_json()
+        assert response.status_code == 200
+        assert list(body["previews"]) == ["modern"]
+        assert body["errors"] == {"classic": "Failed to generate preview"}
+
+    def test_full_queue_returns_429(self, multi_client):
+        """Verify back-pressure when no preview could be scheduled."""
+        client, render_html, _, _ = multi_client
+        render_html.side_effect = RenderQueueFullError("Render queue is full", 4)
+
+        response = client.post("/api/generate/multi", data=form("modern"))
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "4"
+
+    def test_invalid_template_returns_400(self, multi_client):
+        """Verify unknown template IDs are rejected."""
+        client, render_html, _, _ = multi_client
+
+        response = client.post("/api/generate/multi", data=form("modern,nope"))
+
+        assert response.status_code == 400
+        render_html.assert_not_called()
+
+    def test_missing_yaml_returns_400(self, multi_client):
+        """Verify the YAML upload is required."""
+        client, _, _, _ = multi_client
+
+        response = client.post(
+            "/api/generate/multi", data={"session_id": "multi-session"}
+        )
+
+        assert response.status_code == 400
@@ -0,0 +1,409 @@
+"""
+Tests for single-page PNG previews (/api/generate?format=png).
+
+Tests cover:
+1. pdftoppm driven through stdin/stdout with the requested page and width
+2. Page counting and PageImageCache bookkeeping and eviction
+3. Cached pages and PDFs skipping the render when flipping between pages
+4. Query parameter validation and out-of-range pages
+5. Per-page content hashes; after an edit only changed pages (and the
+   thumbnail only when page 1 changed) are rasterized again
+
+Run tests:
+    pytest tests/test_generate_png.py -v
+"""
+import io
+import os
+import sys
+import textwrap
+import zlib
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.page_images import (
+    PageImageCache,
+    PageRasterizationError,
+    count_pdf_pages,
+    page_content_hashes,
+    rasterize_pdf_page,
+)
+
+TWO_PAGE_PDF = (
+    b"%PDF-1.4\n1 0 obj << /Type /Pages /Kids [2 0 R 3 0 R] /Count 2 >>\n"
+    b"2 0 obj << /Type /Page /Parent 1 0 R >>\n"
+    b"3 0 obj <</Type/Page/Parent 1 0 R>>\n"
+)
+
+RESUME_YAML = b"""
+contact_info:
+  name: Jane Doe
+sections: []
+"""
+
+# Stand-in for pdftoppm: echoes its arguments and the PDF it read from stdin
+FAKE_PDFTOPPM = textwrap.dedent(
+    """\
+    #!{python}
+    import sys
+    if "13" in sys.argv:  # width 13 simulates a broken PDF
+        sys.exit(3)
+    pdf = sys.stdin.buffer.read()
+    sys.stdout.buffer.write(
+        b"PNG " + " ".join(sys.argv[1:]).encode() + b" " + pdf[:8]
+    )
+    """
+)
+
+
+def build_pdf(pages, images=None, first_object=3):
+    """
+    A PDF laid out like wkhtmltopdf's: compressed content streams and one
+    resource dictionary shared by every page. pages are content streams,
+    images maps XObject names to image data.
+    """
+    objects = {}
+    number = first_object
+
+    def add(body):
+        nonlocal number
+        objects[number] = body
+        number += 1
+        return number - 1
+
+    xobjects = b" ".join(
+        b"/%s %d 0 R"
+        % (name, add(b"<< /Subtype /Image >>\nstream\n%s\nendstream" % data))
+        for name, data in (images or {}).items()
+    )
+    font = add(b"<< /Type /Font /BaseFont /AAAAAA+Sans >>")
+    resources = add(
+        b"<< /Font << /F1 %d 0 R >> /XObject << %s >> >>" % (font, xobjects)
+    )
+    kids = []
+    for content in pages:
+        stream = zlib.compress(content)
+        contents = add(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+            % (len(stream), stream)
+        )
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                b"/Resources %d 0 R /Contents %d 0 R >>" % (resources, contents)
+            )
+        )
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+    body = b"".join(
+        b"%d 0 obj\n%s\nendobj\n" % (n, objects[n]) for n in sorted(objects)
+    )
+    return b"%PDF-1.4\n" + body + b"trailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+
+@pytest.fixture
+def fake_pdftoppm(tmp_path, monkeypatch):
+    script = tmp_path / "pdftoppm"
+    script.write_text(FAKE_PDFTOPPM.format(python=sys.executable))
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    return script
+
+
+class TestRasterizePdfPage:
+    """Tests for utils/page_images.rasterize_pdf_page."""
+
+    def test_pipes_pdf_through_stdin_and_stdout(self, fake_pdftoppm):
+        """Verify the page and width are passed and the PDF never hits disk."""
+        png = rasterize_pdf_page(TWO_PAGE_PDF, page=2, width=640)
+
+        assert png.startswith(b"PNG -png -f 2 -l 2 -scale-to-x 640")
+        assert b"-singlefile -" in png
+        assert png.endswith(TWO_PAGE_PDF[:8])
+
+    def test_failure_raises(self, fake_pdftoppm):
+        """Verify a non-zero exit is reported, not returned as an image."""
+        with pytest.raises(PageRasterizationError, match="exit 3"):
+            rasterize_pdf_page(TWO_PAGE_PDF, page=1, width=13)
+
+    def test_missing_pdftoppm_raises(self, monkeypatch, tmp_path):
+        """Verify a missing poppler install surfaces a clear error."""
+        monkeypatch.setenv("PATH", str(tmp_path))
+
+        with pytest.raises(PageRasterizationError, match="not installed"):
+            rasterize_pdf_page(TWO_PAGE_PDF, page=1, width=10)
+
+    def test_counts_page_objects(self):
+        """Verify /Type /Page objects are counted and /Pages is not."""
+        assert count_pdf_pages(TWO_PAGE_PDF) == 2
+        assert count_pdf_pages(b"not a pdf") == 0
+
+
+class TestPageImageCache:
+    """Tests for utils/page_images.PageImageCache."""
+
+    def test_pages_are_stored_under_their_pdf(self):
+        """Verify pages are looked up by (page, width) within a content key."""
+        cache = PageImageCache(max_bytes=1000)
+        cache.put_pdf("a", b"pdf", 2)
+        cache.put_page("a", 1, 400, b"png-1")
+
+        assert cache.get_page("a", 1, 400) == (b"png-1", 2)
+        assert cache.get_page("a", 1, 800) is None
+        assert cache.get_pdf("a") == (b"pdf", 2)
+        assert cache.get_pdf("b") is None
+        stats = cache.stats()
+        assert stats["bytes"] == 8
+        assert (stats["page_hits"], stats["pdf_hits"], stats["misses"]) == (1, 1, 1)
+
+    def test_least_recently_used_entry_evicted(self):
+        """Verify the budget is enforced by dropping whole entries."""
+        cache = PageImageCache(max_bytes=10)
+        cache.put_pdf("old", b"12345", 1)
+        cache.put_pdf("new", b"12345", 1)
+
+        cache.put_page("new", 1, 100, b"png")
+
+        assert cache.get_pdf("old") is None
+        assert cache.get_page("new", 1, 100) == (b"png", 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_page_for_evicted_pdf_ignored(self):
+        """Verify a late page image does not resurrect an evicted entry."""
+        cache = PageImageCache(max_bytes=10)
+
+        cache.put_page("gone", 1, 100, b"png")
+
+        assert cache.stats()["entries"] == 0
+
+
+class TestPageContentHashes:
+    """Tests for utils/page_images.page_content_hashes."""
+
+    def test_edit_changes_only_its_page(self):
+        """Verify a page hashes the same when the edit was on another page."""
+        before = build_pdf([b"BT /F1 9 Tf (one) Tj ET", b"BT (two) Tj ET"])
+        after = build_pdf([b"BT /F1 9 Tf (uno) Tj ET", b"BT (two) Tj ET"])
+
+        old, new = page_content_hashes(before), page_content_hashes(after)
+
+        assert len(old) == 2
+        assert old[0] != new[0]
+        assert old[1] == new[1]
+
+    def test_renumbered_objects_hash_the_same(self):
+        """Verify object numbers and unused resources do not matter."""
+        pages = [b"/Im1 Do", b"BT (two) Tj ET"]
+        before = build_pdf(pages, {b"Im1": b"logo", b"Im2": b"old"})
+        after = build_pdf(pages, {b"Im1": b"logo", b"Im2": b"new"}, first_object=9)
+
+        assert page_content_hashes(before) == page_content_hashes(after)
+
+    def test_changed_image_changes_page(self):
+        """Verify an image a page draws is part of its hash."""
+        pages = [b"/Im1 Do", b"BT (two) Tj ET"]
+        old = page_content_hashes(build_pdf(pages, {b"Im1": b"logo"}))
+        new = page_content_hashes(build_pdf(pages, {b"Im1": b"new logo"}))
+
+        assert old[0] != new[0]
+        assert old[1] == new[1]
+
+    def test_unreadable_page_tree(self):
+        """Verify PDFs whose pages cannot be found hash to None."""
+        assert page_content_hashes(TWO_PAGE_PDF) is None
+        assert page_content_hashes(b"not a pdf") is None
+
+
+class TestIncrementalPages:
+    """Tests for carrying unchanged page images over to a new version."""
+
+    def test_unchanged_pages_carried_over(self):
+        """Verify only the edited page is missing from the new version."""
+        cache = PageImageCache(max_bytes=10000)
+        cache.put_pdf("v1", b"pdf-1", 3, ["a", "b", "c"], scope="session")
+        for page in (1, 2, 3):
+            cache.put_page("v1", page, 800, f"png-{page}".encode())
+
+        cache.put_pdf("v2", b"pdf-2", 3, ["a", "B", "c"], scope="session")
+
+        assert cache.get_page("v2", 1, 800) == (b"png-1", 3)
+        assert cache.get_page("v2", 2, 800) is None
+        assert cache.get_page("v2", 3, 800) == (b"png-3", 3)
+        assert cache.get_pdf("v1") is None  # one version per scope
+        assert cache.stats()["pages_reused"] == 2
+
+    def test_moved_page_keeps_its_image(self):
+        """Verify a page pushed down by an inserted page is not re-rasterized."""
+        cache = PageImageCache(max_bytes=10000)
+        cache.put_pdf("v1", b"pdf-1", 2, ["a", "b"], scope="session")
+        cache.put_page("v1", 2, 800, b"png-b")
+
+        cache.put_pdf("v2", b"pdf-2", 3, ["a", "new", "b"], scope="session")
+
+        assert cache.get_page("v2", 3, 800) == (b"png-b", 3)
+
+    def test_scopes_do_not_share_pages(self):
+        """Verify another session never gets this session's images."""
+        cache = PageImageCache(max_bytes=10000)
+        cache.put_pdf("v1", b"pdf-1", 1, ["a"], scope="alice")
+        cache.put_page("v1", 1, 800, b"png-a")
+
+        cache.put_pdf("v2", b"pdf-2", 1, ["a"], scope="bob")
+
+        assert cache.get_page("v2", 1, 800) is None
+        assert cache.get_pdf("v1") is not None
+
+
+class TestGeneratePng:
+    """Tests for /api/generate?format=png."""
+
+    def _post(self, client, query):
+        return client.post(
+            f"/api/generate?{query}",
+            data={
+                "yaml_file": (io.BytesIO(RESUME_YAML), "resume.yml"),
+                "session_id": "png-session",
+                "template": "modern-no-icons",
+            },
+        )
+
+    @pytest.fixture
+    def png_app(self, flask_test_client):
+        client, _, flask_app = flask_test_client
+        cache = PageImageCache(max_bytes=1024 * 1024)
+        with patch.object(
+            flask_app, "render_resume_pdf", return_value=TWO_PAGE_PDF
+        ) as render, patch.object(
+            flask_app,
+            "rasterize_pdf_page",
+            side_effect=lambda pdf, page, width: f"png:{page}:{width}".encode(),
+        ) as rasterize, patch.object(flask_app, "PAGE_IMAGE_CACHE", cache):
+            yield client, render, rasterize, cache
+
+    def test_returns_requested_page(self, png_app):
+        """Verify the PNG for one page is returned with the page count."""
+        client, render, _, _ = png_app
+
+        response = self._post(client, "format=png&page=2&width=600")
+
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        assert response.data == b"png:2:600"
+        assert response.headers["X-Page-Count"] == "2"
+        render.assert_called_once()
+
+    def test_flipping_pages_renders_once(self, png_app):
+        """Verify other pages reuse the PDF and seen pages skip pdftoppm."""
+        client, render, rasterize, cache = png_app
+
+        for page in (1, 2, 1, 2):
+            response = self._post(client, f"format=png&page={page}")
+            assert response.data == f"png:{page}:800".encode()
+
+        render.assert_called_once()
+        assert rasterize.call_count == 2
+        assert cache.stats()["page_hits"] == 2
+
+    def test_edit_invalidates_cache(self, png_app):
+        """Verify different content gets a fresh render."""
+        client, render, _, _ = png_app
+        self._post(client, "format=png")
+
+        response = client.post(
+            "/api/generate?format=png",
+            data={
+                "yaml_file": (
+                    io.BytesIO(RESUME_YAML.replace(b"Jane", b"John")),
+                    "resume.yml",
+                ),
+                "session_id": "png-session",
+                "template": "modern-no-icons",
+            },
+        )
+
+        assert response.status_code == 200
+        assert render.call_count == 2
+
+    @pytest.mark.parametrize(
+        "query", ["format=png&page=0", "format=png&width=5000", "format=gif"]
+    )
+    def test_invalid_parameters_rejected(self, png_app, query):
+        """Verify bad page, width and format values answer 400 before rendering."""
+        client, render, _, _ = png_app
+
+        response = self._post(client, query)
+
+        assert response.status_code == 400
+        render.assert_not_called()
+
+    def test_page_past_end_rejected(self, png_app):
+        """Verify pages beyond the document answer 400 with the page count."""
+        client, _, rasterize, _ = png_app
+
+        response = self._post(client, "format=png&page=3")
+
+        assert response.status_code == 400
+        assert "has 2" in response.get_json()["error"]
+        rasterize.assert_not_called()
+
+    def test_edit_rerasterizes_changed_pages_only(self, png_app):
+        """Verify an edit on page 2 reuses the image of page 1."""
+        client, render, rasterize, cache = png_app
+        render.return_value = build_pdf([b"(one) Tj", b"(two) Tj"])
+        for page in (1, 2):
+            self._post(client, f"format=png&page={page}")
+
+        render.return_value = build_pdf([b"(one) Tj", b"(deux) Tj"])
+        edited = RESUME_YAML.replace(b"Jane", b"John")
+        for page in (1, 2):
+            response = client.post(
+                f"/api/generate?format=png&page={page}",
+                data={
+                    "yaml_file": (io.BytesIO(edited), "resume.yml"),
+                    "session_id": "png-session",
+                    "template": "modern-no-icons",
+                },
+            )
+            assert response.status_code == 200
+
+        assert render.call_count == 2
+        assert [c.args[1] for c in rasterize.call_args_list] == [1, 2, 2]
+        assert cache.stats()["pages_reused"] == 1
+
+    def test_pdf_format_unchanged(self, png_app):
+        """Verify requests without format=png still return the PDF."""
+        client, _, rasterize, _ = png_app
+
+        response = self._post(client, "preview=true")
+
+        assert response.mimetype == "application/pdf"
+        assert response.data == TWO_PAGE_PDF
+        rasterize.assert_not_called()
+
+
+class TestThumbnailReuse:
+    """Tests for app.render_thumbnail_png."""
+
+    def test_thumbnail_reused_while_first_page_unchanged(self, flask_test_client):
+        """Verify edits past page 1 do not rasterize the thumbnail again."""
+        _, _, flask_app = flask_test_client
+        cache = PageImageCache(max_bytes=1024 * 1024)
+        versions = [
+            build_pdf([b"(cover) Tj", b"(two) Tj"]),
+            build_pdf([b"(cover) Tj", b"(deux) Tj"]),
+            build_pdf([b"(new cover) Tj", b"(deux) Tj"]),
+        ]
+        with patch.object(flask_app, "PAGE_IMAGE_CACHE", cache), patch.object(
+            flask_app, "render_pdf_first_page_png", return_value=b"thumb"
+        ) as rasterize:
+            for pdf in versions:
+                png = flask_app.render_thumbnail_png(pdf, "user-1", "resume-1")
+                assert png == b"thumb"
+
+        assert rasterize.call_count == 2
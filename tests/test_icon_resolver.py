@@ -0,0 +1,135 @@
+"""
+Tests for layered icon resolution (utils/icon_resolver.py).
+
+Tests cover:
+1. User uploads taking precedence over the read-only icons/ directory
+2. Icon names with path components or unknown names never resolving
+3. The icon_url filter in rendered modern templates
+4. /api/generate writing only uploaded icons to the session directory
+5. Content icons dropped for templates without icon support
+
+Run tests:
+    pytest tests/test_icon_resolver.py -v
+"""
+import io
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_generator
+from utils.icon_resolver import IconResolver, normalize_icon_name
+
+ICONS_DIR = Path(__file__).parent.parent / "icons"
+
+RESUME_YAML = b"""
+contact_info:
+  name: Jane Doe
+  email: jane@example.com
+sections:
+  - name: Experience
+    type: experience
+    content:
+      - company: Acme
+        title: Engineer
+        dates: 2020 - Present
+        icon: company_acme.png
+        description: Builds things.
+"""
+
+
+class TestIconResolver:
+    """Tests for IconResolver and normalize_icon_name."""
+
+    def test_user_icon_shadows_base_icon(self, tmp_path):
+        """Verify an upload with a base icon's name wins."""
+        (tmp_path / "email.png").write_bytes(b"user")
+        resolver = IconResolver(ICONS_DIR, tmp_path)
+
+        assert resolver.resolve("email.png") == tmp_path / "email.png"
+        assert resolver.resolve("phone.png") == ICONS_DIR / "phone.png"
+
+    def test_unresolvable_names(self, tmp_path):
+        """Verify traversal attempts and unknown icons give no URL."""
+        resolver = IconResolver(ICONS_DIR, tmp_path)
+
+        assert resolver.url("../app.py") == ""
+        assert resolver.url("does-not-exist.png") == ""
+        assert resolver.url(None) == ""
+
+    def test_legacy_icons_prefix_accepted(self):
+        """Verify "/icons/<name>" references resolve like bare names."""
+        assert normalize_icon_name("/icons/email.png") == "email.png"
+        assert normalize_icon_name("/etc/passwd") is None
+
+
+class TestIconUrlFilter:
+    """Tests for icon lookups in rendered HTML."""
+
+    def test_render_html_layers_session_over_base(self, tmp_path):
+        """Verify templates see uploads and base icons without any copies."""
+        (tmp_path / "company_acme.png").write_bytes(b"user")
+        data = {
+            "contact_info": {"name": "Jane Doe", "email": "jane@example.com"},
+            "sections": [
+                {
+                    "name": "Experience",
+                    "type": "experience",
+                    "content": [{"company": "Acme", "icon": "company_acme.png"}],
+                }
+            ],
+        }
+
+        html = resume_generator.render_html("modern", data, tmp_path, offline=True)
+
+        assert f'src="file://{tmp_path}/company_acme.png"' in html
+        assert f'src="file://{ICONS_DIR.resolve()}/email.png"' in html
+        assert os.listdir(tmp_path) == ["company_acme.png"]
+
+
+class TestSessionStaging:
+    """Tests for icon handling in /api/generate."""
+
+    def _post(self, client, template, icons=None):
+        data = {
+            "yaml_file": (io.BytesIO(RESUME_YAML), "resume.yml"),
+            "session_id": "icon-session",
+            "template": template,
+        }
+        if icons:
+            data["icons"] = icons
+        return client.post("/api/generate", data=data)
+
+    def test_only_uploads_are_written(self, flask_test_client):
+        """Verify base icons are no longer copied into the session directory."""
+        client, _, flask_app = flask_test_client
+        staged = []
+
+        def fake_render(template, yaml_data, icons_dir, session_id, **kwargs):
+            staged.extend(os.listdir(icons_dir))
+            return b"%PDF-1.4"
+
+        with patch.object(flask_app, "render_html_pdf", side_effect=fake_render):
+            response = self._post(
+                client,
+                "modern-with-icons",
+                icons=[(io.BytesIO(b"icon"), "company_acme.png")],
+            )
+
+        assert response.status_code == 200
+        assert staged == ["company_acme.png"]
+
+    def test_no_icons_template_drops_content_icons(self, flask_test_client):
+        """Verify default icons are not pulled in for modern-no-icons."""
+        client, _, flask_app = flask_test_client
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4"
+        ) as render:
+            self._post(client, "modern-no-icons")
+
+        yaml_data = render.call_args.args[1]
+        assert "icon" not in yaml_data["sections"][0]["content"][0]
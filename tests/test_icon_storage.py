@@ -5,6 +5,7 @@ Tests cover:
 1. upload_icon_to_storage function
 2. download_icon_from_storage function
 3. Icon handling during resume save
+4. Render-size derivatives made at upload and used by renders
 
 Run tests:
     pytest tests/test_icon_storage.py -v
@@ -14,12 +15,20 @@ from unittest.mock import MagicMock, patch, call
 import sys
 import os
 import base64
+import hashlib
+import io
 import tempfile
 from pathlib import Path
 
+from werkzeug.datastructures import FileStorage
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from PIL import Image
+
+from utils.icon_derivatives import ICON_RENDER_SIZE, make_render_derivative
+
 from conftest import (
     create_mock_supabase, create_mock_response,
     TEST_USER_ID, TEST_RESUME_ID
@@ -311,3 +320,141 @@ class TestSaveResumeWithIcons:
         # Verify delete was called for the old icons
         delete_calls = mock_sb.table.return_value.delete.call_args_list
         assert len(delete_calls) > 0
+
+
+def large_png(size=(800, 600)):
+    """A PNG with transparency, far larger than any icon is drawn."""
+    buffer = io.BytesIO()
+    Image.effect_noise(size, 40).convert('RGBA').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class TestIconRenderDerivatives:
+    """Tests for render-size icon derivatives (utils/icon_derivatives.py)."""
+
+    def test_large_icon_downscaled_in_its_format(self):
+        """Verify a large PNG becomes a small PNG that keeps its alpha channel."""
+        derivative = make_render_derivative(large_png(), 'logo.png', max_size=64)
+
+        image = Image.open(io.BytesIO(derivative))
+        assert image.format == 'PNG'
+        assert image.mode == 'RGBA'
+        assert image.size == (64, 48)
+
+    def test_original_kept_when_not_reducible(self):
+        """Verify SVGs, small icons and unreadable files render as uploaded."""
+        small = large_png((16, 16))
+
+        assert make_render_derivative(b'<svg/>', 'logo.svg') is None
+        assert make_render_derivative(small, 'logo.png') is None
+        assert make_render_derivative(b'not an image', 'logo.png') is None
+
+    def test_save_resume_stores_derivative_next_to_original(
+        self, flask_test_client, auth_headers
+    ):
+        """Verify save uploads a render copy and records its path and a hash."""
+        client, mock_sb, _ = flask_test_client
+        mock_user = MagicMock()
+        mock_user.id = TEST_USER_ID
+        mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([{'id': TEST_RESUME_ID, 'json_hash': 'old-hash'}]),
+            create_mock_response([]),  # get existing icons (none)
+            create_mock_response([]),  # upsert resume
+            create_mock_response([]),  # insert new icons
+            create_mock_response([]),  # upsert prefs
+        ]
+        icon = large_png()
+
+        response = client.post(
+            '/api/resumes',
+            json={
+                'id': TEST_RESUME_ID,
+                'title': 'Test Resume',
+                'template_id': 'modern-with-icons',
+                'contact_info': {'name': 'John'},
+                'sections': [],
+                'icons': [
+                    {'filename': 'logo.png', 'data': base64.b64encode(icon).decode()}
+                ],
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        uploads = mock_sb.storage.from_.return_value.upload.call_args_list
+        paths = [upload[0][0] for upload in uploads]
+        assert paths == [
+            f'{TEST_USER_ID}/{TEST_RESUME_ID}/logo.png',
+            f'{TEST_USER_ID}/{TEST_RESUME_ID}/render/logo.png',
+        ]
+        assert len(uploads[1][0][1]) < len(icon)
+        record = mock_sb.table.return_value.insert.call_args[0][0][0]
+        assert record['content_hash'] == hashlib.sha256(icon).hexdigest()
+        assert record['render_storage_path'] == paths[1]
+        assert record['render_file_size'] == len(uploads[1][0][1])
+
+    def test_same_size_icon_with_new_content_reuploaded(
+        self, flask_test_client, auth_headers, sample_icon_data
+    ):
+        """Verify rows with a content hash are compared by hash, not size."""
+        client, mock_sb, _ = flask_test_client
+        mock_user = MagicMock()
+        mock_user.id = TEST_USER_ID
+        mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+        existing = dict(sample_icon_data, content_hash='0' * 64)
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([{'id': TEST_RESUME_ID, 'json_hash': 'old-hash'}]),
+            create_mock_response([existing]),  # get existing icons
+            create_mock_response([]),  # upsert resume
+            create_mock_response([]),  # insert icons
+            create_mock_response([]),  # upsert prefs
+        ]
+        icon_content = b'x' * sample_icon_data['file_size']  # Same size
+
+        response = client.post(
+            '/api/resumes',
+            json={
+                'id': TEST_RESUME_ID,
+                'title': 'Test Resume',
+                'template_id': 'modern-with-icons',
+                'contact_info': {'name': 'John'},
+                'sections': [],
+                'icons': [
+                    {
+                        'filename': sample_icon_data['filename'],
+                        'data': base64.b64encode(icon_content).decode(),
+                    }
+                ],
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        mock_sb.storage.from_.return_value.upload.assert_called_once()
+
+    def test_saved_resume_renders_with_derivative(self, flask_test_client, tmp_path):
+        """Verify renders download the render copy under the original name."""
+        _, mock_sb, flask_app = flask_test_client
+        rows = [
+            {'filename': 'logo.png', 'storage_path': 'u/r/logo.png',
+             'render_storage_path': 'u/r/render/logo.png'},
+            {'filename': 'old.png', 'storage_path': 'u/r/old.png',
+             'render_storage_path': None},
+        ]
+
+        flask_app._download_saved_resume_icons(rows, tmp_path)
+
+        downloads = mock_sb.storage.from_.return_value.download.call_args_list
+        assert [d[0][0] for d in downloads] == ['u/r/render/logo.png', 'u/r/old.png']
+        assert (tmp_path / 'logo.png').exists()
+
+    def test_request_uploads_staged_as_derivatives(self, flask_test_client, tmp_path):
+        """Verify icons uploaded with /api/generate are downscaled when staged."""
+        _, _, flask_app = flask_test_client
+        upload = FileStorage(io.BytesIO(large_png()), filename='logo.png')
+
+        flask_app._stage_request_icons({}, tmp_path, True, [upload])
+
+        staged = Image.open(tmp_path / 'logo.png')
+        assert max(staged.size) == ICON_RENDER_SIZE
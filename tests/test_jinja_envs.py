@@ -0,0 +1,141 @@
+"""
+Tests for shared Jinja environments and the bytecode cache (utils/jinja_envs.py).
+
+Tests cover:
+1. One environment per template directory, option set and filter set
+2. Bytecode written to JINJA_BYTECODE_CACHE_DIR
+3. Recompilation when a template's mtime changes
+4. Warming (precompiling) all templates
+5. HTML and LaTeX render paths reusing their environments
+
+Run tests:
+    pytest tests/test_jinja_envs.py -v
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import jinja_envs
+
+
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    """A template directory plus an isolated bytecode cache directory."""
+    monkeypatch.setattr(jinja_envs, "BYTECODE_CACHE_DIR", str(tmp_path / "bytecode"))
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "page.html").write_text("Hello {{ name }}")
+    (templates / "other.html").write_text("Other")
+    (templates / "notes.txt").write_text("not a template")
+    return templates
+
+
+class TestGetEnvironment:
+    """Tests for get_environment."""
+
+    def test_same_directory_returns_same_environment(self, template_dir):
+        """Verify environments are created once and shared."""
+        first = jinja_envs.get_environment(template_dir)
+        second = jinja_envs.get_environment(str(template_dir))
+
+        assert first is second
+
+    def test_different_options_get_separate_environments(self, template_dir):
+        """Verify option sets do not share environments or bytecode."""
+        plain = jinja_envs.get_environment(template_dir)
+        escaped = jinja_envs.get_environment(template_dir, autoescape=True)
+
+        assert plain is not escaped
+        assert plain.bytecode_cache.directory != escaped.bytecode_cache.directory
+
+    def test_filters_registered_on_creation(self, template_dir):
+        """Verify filters passed on creation are available."""
+        env = jinja_envs.get_environment(
+            template_dir, filters={"shout": lambda s: s.upper()}, trim_blocks=True
+        )
+
+        assert env.from_string("{{ 'hi' | shout }}").render() == "HI"
+
+    def test_different_filters_get_separate_environments(self, template_dir):
+        """Verify callers passing other filters never get each other's env."""
+        upper = jinja_envs.get_environment(template_dir, filters={"f": str.upper})
+        lower = jinja_envs.get_environment(template_dir, filters={"f": str.lower})
+
+        assert upper is not lower
+        assert lower.from_string("{{ 'Hi' | f }}").render() == "hi"
+        again = jinja_envs.get_environment(template_dir, filters={"f": str.upper})
+        assert again is upper
+
+    def test_bytecode_written_to_cache_dir(self, template_dir):
+        """Verify compiled templates are persisted to disk."""
+        env = jinja_envs.get_environment(template_dir, lstrip_blocks=True)
+
+        env.get_template("page.html").render(name="x")
+
+        cache_dir = env.bytecode_cache.directory
+        assert any(name.endswith(".cache") for name in os.listdir(cache_dir))
+
+    def test_template_recompiled_after_mtime_change(self, template_dir):
+        """Verify an edited template is picked up without a restart."""
+        env = jinja_envs.get_environment(template_dir, keep_trailing_newline=True)
+        assert env.get_template("page.html").render(name="A") == "Hello A"
+
+        page = template_dir / "page.html"
+        page.write_text("Bye {{ name }}")
+        future = time.time() + 5
+        os.utime(page, (future, future))
+
+        assert env.get_template("page.html").render(name="A") == "Bye A"
+
+    def test_unwritable_cache_dir_disables_bytecode(self, template_dir, monkeypatch):
+        """Verify a bad cache directory only disables bytecode caching."""
+        blocker = template_dir.parent / "blocker"
+        blocker.write_text("")
+        monkeypatch.setattr(jinja_envs, "BYTECODE_CACHE_DIR", str(blocker))
+
+        env = jinja_envs.get_environment(template_dir, newline_sequence="\r\n")
+
+        assert env.bytecode_cache is None
+        assert env.get_template("other.html").render() == "Other"
+
+
+class TestWarmEnvironment:
+    """Tests for warm_environment."""
+
+    def test_warms_matching_templates(self, template_dir):
+        """Verify only templates with the requested extensions are compiled."""
+        env = jinja_envs.get_environment(template_dir, optimized=False)
+
+        assert jinja_envs.warm_environment(env, extensions=["html"]) == 2
+
+
+class TestRenderPathsShareEnvironments:
+    """Tests for the HTML and LaTeX render paths."""
+
+    def test_html_environment_is_shared(self):
+        """Verify resume_generator reuses one environment per template dir."""
+        import resume_generator
+
+        template_dir = Path(resume_generator.__file__).parent / "templates" / "modern"
+
+        first = resume_generator.get_template_environment(template_dir)
+        second = resume_generator.get_template_environment(template_dir)
+
+        assert first is second
+        assert "markdown_links" in first.filters
+
+    def test_latex_environment_is_shared(self):
+        """Verify generate_latex_pdf's environment is reused with LaTeX delimiters."""
+        import app
+
+        env = app.get_latex_environment("classic")
+
+        assert env is app.get_latex_environment("classic")
+        assert env.block_start_string == "\\BLOCK{"
+        assert "markdown_formatting" in env.filters
@@ -0,0 +1,213 @@
+"""
+Tests for the layout estimator (utils/layout_estimate.py, /api/layout/estimate).
+
+Tests cover:
+1. Line wrapping with font metrics and markdown stripped
+2. Page count growing with content; keep-together blocks moving whole
+3. Dynamic-column lists laid out with calculate_columns
+4. Classic section headings kept with their first line
+5. The endpoint answering without rendering, and rejecting bad input
+
+Run tests:
+    pytest tests/test_layout_estimate.py -v
+"""
+import copy
+import io
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_generator import calculate_columns, normalize_sections
+from utils.layout_estimate import FontMetrics, _paginate, estimate_layout, plain_text
+
+RESUME = {
+    "contact_info": {"name": "Jane Doe", "location": "Berlin", "email": "j@x.com"},
+    "sections": [
+        {"name": "Summary", "type": "text", "content": "Builds **reliable** systems."},
+        {
+            "name": "Experience",
+            "type": "experience",
+            "content": [
+                {
+                    "company": "Acme",
+                    "title": "Engineer",
+                    "dates": "2020 - Present",
+                    "description": ["Shipped the [billing](x.com) rewrite"] * 4,
+                }
+            ],
+        },
+        {"name": "Skills", "type": "dynamic-column-list", "content": ["Python"] * 8},
+    ],
+}
+
+
+def with_jobs(count):
+    data = copy.deepcopy(RESUME)
+    job = data["sections"][1]["content"][0]
+    data["sections"][1]["content"] = [copy.deepcopy(job) for _ in range(count)]
+    return data
+
+
+class TestFontMetrics:
+    """Tests for FontMetrics line wrapping."""
+
+    def test_wraps_greedily_by_width(self):
+        """Verify words wrap once a line is full (0.5em average, no fonts)."""
+        metrics = FontMetrics({}, average_em=0.5)
+
+        # "aaaa" is 20px at 10px, a space 5px: two words per 50px line
+        assert metrics.lines("aaaa aaaa aaaa aaaa aaaa", 10, 50) == 3
+        assert metrics.lines("", 10, 50) == 0
+
+    def test_markdown_is_not_measured(self):
+        """Verify link targets and emphasis markers take no width."""
+        assert plain_text("**Led** [docs](https://example.com/long) _now_") == (
+            "Led docs now"
+        )
+
+
+class TestEstimateLayout:
+    """Tests for estimate_layout page counts and section heights."""
+
+    @pytest.mark.parametrize("template", ["modern", "classic"])
+    def test_short_resume_fits_one_page(self, template):
+        """Verify a short resume is one page with per-section heights."""
+        estimate = estimate_layout(template, copy.deepcopy(RESUME), calculate_columns)
+
+        assert estimate["pages"] == 1
+        assert estimate["fits_on_one_page"] is True
+        assert estimate["overflow"] == 0
+        assert [s["name"] for s in estimate["sections"]] == [
+            "Summary",
+            "Experience",
+            "Skills",
+        ]
+        assert all(s["height"] > 0 and s["page"] == 1 for s in estimate["sections"])
+
+    @pytest.mark.parametrize("template", ["modern", "classic"])
+    def test_pages_grow_with_content(self, template):
+        """Verify more jobs mean more pages and report the overflow."""
+        pages = [
+            estimate_layout(template, with_jobs(n), calculate_columns)["pages"]
+            for n in (1, 8, 30)
+        ]
+
+        assert pages[0] == 1
+        assert pages[0] < pages[1] < pages[2]
+        estimate = estimate_layout(template, with_jobs(30), calculate_columns)
+        assert estimate["overflow"] > estimate["page_height"]
+        assert estimate["sections"][-1]["page"] == estimate["pages"]
+
+    def test_columns_from_calculate_columns(self):
+        """Verify dynamic-column lists get shorter as columns are added."""
+        data = copy.deepcopy(RESUME)
+        data["sections"] = [data["sections"][2]]
+
+        heights = {}
+        for columns in (1, 4):
+            estimate = estimate_layout("modern", data, lambda n, c=columns: c)
+            heights[columns] = estimate["sections"][0]["height"]
+
+        assert heights[4] < heights[1]
+
+    @pytest.mark.parametrize(
+        "sample",
+        ["samples/classic/jane_doe.yml", "samples/classic/alex_rivera_data.yml"],
+    )
+    def test_reference_samples_fit_one_page(self, sample):
+        """Verify samples whose reference renders are one page estimate one page."""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with open(os.path.join(root, sample)) as f:
+            data = normalize_sections(yaml.safe_load(f))
+
+        estimate = estimate_layout("classic", data, calculate_columns)
+
+        assert estimate["pages"] == 1
+        assert estimate["last_page_fill"] > 0.85
+
+    def test_unknown_template_rejected(self):
+        """Verify templates without a layout model raise ValueError."""
+        with pytest.raises(ValueError, match="No layout model"):
+            estimate_layout("professional", RESUME, calculate_columns)
+
+
+class TestPaginate:
+    """Tests for _paginate."""
+
+    def test_block_moves_to_next_page_whole(self):
+        """Verify a block that does not fit starts the next page."""
+        pages, last, starts = _paginate([(60, False), (50, False)], 100)
+
+        assert (pages, last, starts) == (2, 50, [1, 2])
+
+    def test_glue_dropped_at_page_bottom(self):
+        """Verify spacing never pushes content onto a new page by itself."""
+        pages, last, _ = _paginate([(90, False), (30, True)], 100)
+
+        assert (pages, last) == (1, 100)
+
+    def test_classic_heading_kept_with_first_line(self):
+        """Verify a heading that would end a page moves with its content."""
+        data = with_jobs(1)
+        data["sections"] = [{"name": "Notes", "type": "text", "content": "x"}] * 40
+
+        estimate = estimate_layout("classic", data, calculate_columns)
+
+        # Every section starts on the page its heading is on
+        pages = [section["page"] for section in estimate["sections"]]
+        assert pages == sorted(pages)
+        assert estimate["pages"] > 1
+
+
+class TestLayoutEstimateEndpoint:
+    """Tests for POST /api/layout/estimate."""
+
+    def _post(self, client, data, template="modern-no-icons"):
+        return client.post(
+            "/api/layout/estimate",
+            data={
+                "yaml_file": (io.BytesIO(yaml.safe_dump(data).encode()), "r.yml"),
+                "template": template,
+            },
+        )
+
+    @pytest.mark.parametrize("template", ["modern-with-icons", "classic-jane-doe"])
+    def test_estimates_without_rendering(self, flask_test_client, template):
+        """Verify the estimate is returned and no renderer is involved."""
+        client, _, flask_app = flask_test_client
+
+        with patch.object(flask_app, "render_resume_pdf") as render:
+            response = self._post(client, with_jobs(12), template)
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["success"] is True
+        assert body["template"] == template
+        assert body["pages"] >= 2
+        assert body["fits_on_one_page"] is False
+        assert len(body["sections"]) == 3
+        assert body["elapsed_ms"] < 1000
+        render.assert_not_called()
+
+    def test_invalid_template_rejected(self, flask_test_client):
+        """Verify unknown templates answer 400."""
+        client, _, _ = flask_test_client
+
+        response = self._post(client, RESUME, template="nope")
+
+        assert response.status_code == 400
+        assert "Invalid template" in response.get_json()["error"]
+
+    def test_missing_yaml_rejected(self, flask_test_client):
+        """Verify a request without a YAML file answers 400."""
+        client, _, _ = flask_test_client
+
+        response = client.post("/api/layout/estimate", data={"template": "modern"})
+
+        assert response.status_code == 400
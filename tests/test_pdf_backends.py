@@ -0,0 +1,283 @@
+"""
+Tests for the pluggable PDF backends (utils/pdf_backends.py).
+
+Tests cover:
+1. Backend factory and the wkhtmltopdf backend's pdfkit call
+2. Chromium page pool reuse, recycling and failure handling (fake Playwright)
+3. Offline renders blocking remote requests
+4. resume_generator routing renders through the configured backend
+5. In-process rendering from app.py when PDF_RENDER_BACKEND=chromium
+
+Run tests:
+    pytest tests/test_pdf_backends.py -v
+"""
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_generator
+from utils.pdf_backends import (
+    ChromiumBackend,
+    PdfBackend,
+    PdfBackendUnavailableError,
+    WkhtmltopdfBackend,
+    create_backend,
+)
+
+
+class FakeRoute:
+    def __init__(self, url):
+        self.url = url
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.route_handler = None
+        self.loaded = []
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        if self.browser.fail_next:
+            self.browser.fail_next = False
+            raise RuntimeError("page crashed")
+        with open(url[len("file://"):], encoding="utf-8") as f:
+            self.loaded.append(f.read())
+        for remote in self.browser.remote_requests:
+            route = FakeRoute(remote)
+            await self.route_handler(route)
+            self.browser.route_outcomes.append(route.outcome)
+
+    async def pdf(self, **options):
+        self.browser.pdf_options = options
+        return b"%PDF-1.4 " + self.loaded[-1].encode()
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(self.browser)
+        self.browser.pages_opened.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+        self.browser.contexts_closed += 1
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.pages_opened = []
+        self.contexts_closed = 0
+        self.fail_next = False
+        self.remote_requests = []
+        self.route_outcomes = []
+        self.pdf_options = None
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self):
+        return FakeContext(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self, browser):
+        self.browser = browser
+        self.chromium = self
+        self.stopped = False
+
+    async def start(self):
+        return self
+
+    async def launch(self, args=None):
+        return self.browser
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def chromium():
+    """A ChromiumBackend driving a fake browser."""
+    browser = FakeBrowser()
+    backend = ChromiumBackend(
+        pages=2,
+        max_renders_per_page=3,
+        timeout=5,
+        playwright_factory=lambda: FakePlaywright(browser),
+    )
+    yield backend, browser
+    backend.close()
+
+
+class TestBackendFactory:
+    """Tests for create_backend and WkhtmltopdfBackend."""
+
+    def test_unknown_backend_rejected(self):
+        """Verify a typo in PDF_RENDER_BACKEND fails loudly."""
+        with pytest.raises(ValueError, match="Unknown PDF backend"):
+            create_backend("prince")
+
+    def test_wkhtmltopdf_uses_network_options(self):
+        """Verify the options factory is consulted per render."""
+        backend = create_backend(
+            "wkhtmltopdf", options_for=lambda offline: {"offline": offline}
+        )
+
+        with patch(
+            "utils.pdf_backends.pdfkit.from_string", return_value=b"%PDF-1.4"
+        ) as from_string:
+            assert backend.render("<html></html>", offline=False) == b"%PDF-1.4"
+
+        assert from_string.call_args.kwargs["options"] == {"offline": False}
+
+    def test_wkhtmltopdf_empty_output_raises(self):
+        """Verify an empty PDF is an error, not a success."""
+        with patch("utils.pdf_backends.pdfkit.from_string", return_value=b""):
+            with pytest.raises(RuntimeError, match="empty PDF"):
+                WkhtmltopdfBackend().render("<html></html>")
+
+
+class TestChromiumBackend:
+    """Tests for ChromiumBackend's warm page pool."""
+
+    def test_missing_playwright_is_reported(self):
+        """Verify the optional dependency surfaces a clear error."""
+        with patch.dict(sys.modules, {"playwright.async_api": None}):
+            with pytest.raises(PdfBackendUnavailableError, match="playwright"):
+                ChromiumBackend().start()
+
+    def test_pages_are_reused_across_renders(self, chromium):
+        """Verify renders run on the warm pages opened at start-up."""
+        backend, browser = chromium
+
+        first = backend.render("<p>one</p>")
+        backend.render("<p>two</p>")
+
+        assert first == b"%PDF-1.4 <p>one</p>"
+        assert len(browser.pages_opened) == 2
+        assert browser.pdf_options["format"] == "A4"
+        assert browser.pdf_options["print_background"] is True
+        assert backend.stats()["renders"] == 2
+        assert backend.stats()["idle_pages"] == 2
+
+    def test_page_replaced_after_max_renders(self, chromium):
+        """Verify pages are recycled to contain leaks."""
+        backend, browser = chromium
+
+        for i in range(7):
+            backend.render(f"<p>{i}</p>")
+
+        assert backend.stats()["pages_recycled"] >= 1
+        assert browser.contexts_closed == backend.stats()["pages_recycled"]
+
+    def test_failed_render_replaces_page(self, chromium):
+        """Verify a crashed page is dropped and the pool stays full."""
+        backend, browser = chromium
+        backend.start()
+        browser.fail_next = True
+
+        with pytest.raises(RuntimeError, match="page crashed"):
+            backend.render("<p>boom</p>")
+
+        stats = backend.stats()
+        assert stats["failures"] == 1
+        assert stats["idle_pages"] == 2
+        assert backend.render("<p>ok</p>") == b"%PDF-1.4 <p>ok</p>"
+
+    def test_offline_render_blocks_remote_requests(self, chromium):
+        """Verify http(s) requests are aborted offline and allowed online."""
+        backend, browser = chromium
+        browser.remote_requests = ["https://fonts.googleapis.com/css"]
+
+        backend.render("<p>offline</p>", offline=True)
+        backend.render("<p>online</p>", offline=False)
+
+        assert browser.route_outcomes == ["aborted", "continued"]
+
+    def test_close_stops_browser(self, chromium):
+        """Verify close() shuts the browser down and allows a restart."""
+        backend, browser = chromium
+        backend.render("<p>x</p>")
+
+        backend.close()
+
+        assert browser.closed
+        assert backend.stats()["running"] is False
+
+
+class RecordingBackend(PdfBackend):
+    name = "recording"
+
+    def __init__(self):
+        self.calls = []
+
+    def render(self, html, offline=True):
+        self.calls.append(offline)
+        return b"%PDF-1.4 recorded"
+
+
+class TestBackendSelection:
+    """Tests for backend selection in resume_generator and app.py."""
+
+    def test_generate_pdf_bytes_uses_requested_backend(self):
+        """Verify the HTML goes to the backend named by the caller."""
+        backend = RecordingBackend()
+        data = {"contact_info": {"name": "Jane Doe"}, "sections": []}
+
+        with patch.dict(resume_generator._pdf_backends, {"recording": backend}):
+            pdf_bytes = resume_generator.generate_pdf_bytes(
+                "modern", data, offline=True, backend="recording"
+            )
+
+        assert pdf_bytes == b"%PDF-1.4 recorded"
+        assert backend.calls == [True]
+
+    def test_app_renders_in_process_with_chromium(self, flask_test_client, tmp_path):
+        """Verify render_html_pdf bypasses the renderer workers for chromium."""
+        _, _, flask_app = flask_test_client
+        backend = RecordingBackend()
+        data = {"contact_info": {"name": "Jane Doe"}, "sections": []}
+
+        with patch.object(flask_app, "PDF_RENDER_BACKEND", "chromium"), patch.dict(
+            resume_generator._pdf_backends, {"chromium": backend}
+        ), patch.object(flask_app, "pdf_bytes_generation_worker") as pool_worker:
+            pdf_bytes = flask_app.render_html_pdf("modern", data, tmp_path, "sess")
+
+        assert pdf_bytes == b"%PDF-1.4 recorded"
+        pool_worker.assert_not_called()
+        assert "icon_path" not in data
+
+    def test_chromium_start_failure_falls_back(self, flask_test_client):
+        """Verify the app keeps rendering with wkhtmltopdf if Chromium fails."""
+        _, _, flask_app = flask_test_client
+
+        with patch.object(flask_app, "PDF_RENDER_BACKEND", "chromium"), patch.object(
+            resume_generator,
+            "get_pdf_backend",
+            side_effect=PdfBackendUnavailableError("no playwright"),
+        ):
+            flask_app.initialize_pdf_backend()
+            assert flask_app.PDF_RENDER_BACKEND == "wkhtmltopdf"
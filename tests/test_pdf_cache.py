@@ -0,0 +1,285 @@
+"""
+Tests for the content-addressed rendered-PDF cache (utils/pdf_cache.py).
+
+Tests cover:
+1. PdfCache get/put, hit/miss counters and LRU eviction
+2. Rebuilding the index from disk after a restart
+3. Cache keys (including render settings) and directory fingerprints
+4. Saved-resume PDF/thumbnail endpoints serving hits without icon downloads
+5. GET /api/render/stats
+
+Run tests:
+    pytest tests/test_pdf_cache.py -v
+"""
+import os
+import sys
+import time
+from collections import OrderedDict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import create_mock_response, TEST_USER_ID, TEST_RESUME_ID
+from utils import pdf_cache
+from utils.pdf_cache import PdfCache, directory_fingerprint, make_cache_key
+
+
+class TestPdfCache:
+    """Tests for PdfCache storage and eviction."""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Verify a stored PDF is returned and counted as a hit."""
+        cache = PdfCache(tmp_path, max_bytes=1024)
+
+        assert cache.get("abc") is None
+        cache.put("abc", b"%PDF-1.4 one")
+
+        assert cache.get("abc") == b"%PDF-1.4 one"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Verify the oldest untouched entry is evicted when over budget."""
+        cache = PdfCache(tmp_path, max_bytes=30)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.put("c", b"x" * 10)
+
+        cache.get("a")  # a is now most recently used
+        cache.put("d", b"x" * 10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert not (tmp_path / "b.pdf").exists()
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_entry_not_stored(self, tmp_path):
+        """Verify an entry larger than the whole budget is skipped."""
+        cache = PdfCache(tmp_path, max_bytes=5)
+
+        cache.put("big", b"x" * 10)
+
+        assert cache.stats()["entries"] == 0
+
+    def test_entries_survive_restart(self, tmp_path):
+        """Verify a new instance picks up entries written by a previous one."""
+        PdfCache(tmp_path, max_bytes=1024).put("abc", b"%PDF")
+
+        reopened = PdfCache(tmp_path, max_bytes=1024)
+
+        assert reopened.get("abc") == b"%PDF"
+        assert reopened.stats()["bytes"] == 4
+
+    def test_missing_file_is_a_miss(self, tmp_path):
+        """Verify an entry deleted from disk is dropped from the index."""
+        cache = PdfCache(tmp_path, max_bytes=1024)
+        cache.put("abc", b"%PDF")
+        (tmp_path / "abc.pdf").unlink()
+
+        assert cache.get("abc") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_invalid_budget_rejected(self, tmp_path):
+        """Verify a cache needs a positive size budget."""
+        with pytest.raises(ValueError):
+            PdfCache(tmp_path, max_bytes=0)
+
+
+class TestCacheKeys:
+    """Tests for cache key and fingerprint helpers."""
+
+    def test_key_changes_with_each_input(self):
+        """Verify every key component affects the key."""
+        base = make_cache_key("modern:f1", "h1", ["i1"], "1")
+
+        assert make_cache_key("modern:f2", "h1", ["i1"], "1") != base
+        assert make_cache_key("modern:f1", "h2", ["i1"], "1") != base
+        assert make_cache_key("modern:f1", "h1", ["i2"], "1") != base
+        assert make_cache_key("modern:f1", "h1", ["i1"], "2") != base
+
+    def test_key_ignores_icon_order(self):
+        """Verify icon lists are order-independent."""
+        assert make_cache_key("t", "h", ["a", "b"], "1") == make_cache_key(
+            "t", "h", ["b", "a"], "1"
+        )
+
+    @pytest.mark.parametrize(
+        "setting, value",
+        [
+            ("PDF_RENDER_BACKEND", "chromium"),
+            ("PDF_OPTIMIZE", "screen"),
+            ("PDF_LINEARIZE", False),
+        ],
+    )
+    def test_saved_resume_key_tracks_render_settings(
+        self, flask_test_client, sample_resume_data, setting, value
+    ):
+        """Verify settings that change the PDF bytes change the key."""
+        _, _, flask_app = flask_test_client
+        base = flask_app.saved_resume_cache_key(sample_resume_data, [], "modern")
+
+        with patch.object(flask_app, setting, value):
+            changed = flask_app.saved_resume_cache_key(
+                sample_resume_data, [], "modern"
+            )
+
+        assert changed != base
+
+    def test_fingerprint_tracks_file_changes(self, tmp_path):
+        """Verify editing a file changes the directory fingerprint."""
+        template = tmp_path / "resume.html"
+        template.write_text("<p>v1</p>")
+        before = directory_fingerprint(tmp_path)
+
+        template.write_text("<p>v2 changed</p>")
+        os.utime(template, ns=(time.time_ns() + 10**9, time.time_ns() + 10**9))
+
+        assert directory_fingerprint(tmp_path) != before
+
+    def test_fingerprint_memo_bounded(self, tmp_path):
+        """Verify the memo keeps recent directories only, and no transient ones."""
+        directories = []
+        for i in range(3):
+            directory = tmp_path / f"dir{i}"
+            directory.mkdir()
+            (directory / "icon.png").write_bytes(bytes([i]))
+            directories.append(directory)
+
+        with patch.object(pdf_cache, "FINGERPRINT_MEMO_MAX", 2), patch.object(
+            pdf_cache, "_fingerprint_memo", OrderedDict()
+        ) as memo:
+            for directory in directories:
+                directory_fingerprint(directory)
+            directory_fingerprint(tmp_path, memoize=False)
+
+        assert list(memo) == [str(directories[1]), str(directories[2])]
+
+    def test_fingerprint_of_missing_directory(self, tmp_path):
+        """Verify a missing directory has an empty fingerprint."""
+        assert directory_fingerprint(tmp_path / "missing") == ""
+
+
+@pytest.fixture
+def cached_client(flask_test_client, tmp_path):
+    """Flask test client with a real PdfCache in a temp directory."""
+    client, mock_sb, flask_app = flask_test_client
+    cache = PdfCache(tmp_path / "pdf-cache", max_bytes=1024 * 1024)
+    with patch.object(flask_app, "PDF_CACHE", cache):
+        yield client, mock_sb, flask_app, cache
+
+
+class TestSavedResumeCache:
+    """Tests for cache use in the saved-resume PDF and thumbnail endpoints."""
+
+    def _mock_auth(self, mock_sb):
+        mock_user = MagicMock()
+        mock_user.id = TEST_USER_ID
+        mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+
+    def test_second_request_served_from_cache(
+        self, cached_client, auth_headers, sample_resume_data, sample_icon_data
+    ):
+        """Verify an unchanged resume is rendered and downloads icons only once."""
+        client, mock_sb, flask_app, cache = cached_client
+        self._mock_auth(mock_sb)
+        resume = {**sample_resume_data, "thumbnail_url": "https://x/thumb.png"}
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([resume]),
+            create_mock_response([sample_icon_data]),
+            create_mock_response([resume]),
+            create_mock_response([sample_icon_data]),
+        ]
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4 rendered"
+        ) as render, patch.object(
+            flask_app, "generate_thumbnail_from_pdf", return_value=None
+        ):
+            first = client.post(f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers)
+            downloads_after_first = mock_sb.storage.from_.return_value.download.call_count
+            second = client.post(f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.data == b"%PDF-1.4 rendered"
+        assert render.call_count == 1
+        assert (
+            mock_sb.storage.from_.return_value.download.call_count
+            == downloads_after_first
+        )
+        assert cache.stats()["hits"] == 1
+
+    def test_changed_content_misses_cache(
+        self, cached_client, auth_headers, sample_resume_data
+    ):
+        """Verify edited content is re-rendered."""
+        client, mock_sb, flask_app, cache = cached_client
+        self._mock_auth(mock_sb)
+        edited = {
+            **sample_resume_data,
+            "sections": [{"name": "Summary", "type": "text", "content": "Edited"}],
+        }
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+            create_mock_response([edited]),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4"
+        ) as render, patch.object(
+            flask_app, "generate_thumbnail_from_pdf", return_value=None
+        ):
+            client.post(f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers)
+            client.post(f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers)
+
+        assert render.call_count == 2
+        assert cache.stats()["misses"] == 2
+
+    def test_thumbnail_uses_cached_pdf(
+        self, cached_client, auth_headers, sample_resume_data
+    ):
+        """Verify the thumbnail endpoint reuses a cached PDF without rendering."""
+        client, mock_sb, flask_app, cache = cached_client
+        self._mock_auth(mock_sb)
+        key = flask_app.saved_resume_cache_key(sample_resume_data, [], "modern")
+        cache.put(key, b"%PDF-1.4 cached")
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+            create_mock_response([]),  # thumbnail update
+        ]
+
+        with patch.object(flask_app, "render_html_pdf") as render, patch.object(
+            flask_app,
+            "generate_thumbnail_from_pdf",
+            return_value="https://x/thumb.png",
+        ) as thumbnail:
+            response = client.post(
+                f"/api/resumes/{TEST_RESUME_ID}/thumbnail", headers=auth_headers
+            )
+
+        assert response.status_code == 200
+        assert response.get_json()["thumbnail_url"] == "https://x/thumb.png"
+        render.assert_not_called()
+        assert thumbnail.call_args[0][0] == b"%PDF-1.4 cached"
+
+
+class TestRenderStatsEndpoint:
+    """Tests for GET /api/render/stats."""
+
+    def test_stats_include_cache_counters(self, cached_client):
+        """Verify cache counters are exposed."""
+        client, _, _, cache = cached_client
+        cache.get("missing")
+
+        response = client.get("/api/render/stats")
+
+        assert response.status_code == 200
+        assert response.get_json()["pdf_cache"]["misses"] == 1
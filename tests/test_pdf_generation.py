@@ -8,7 +8,7 @@ Tests cover:
 4. Flask endpoint integration tests
 
 These tests ensure that:
-- The ThreadPoolExecutor is properly initialized
+- The render scheduler is properly initialized
 - PDF generation works correctly for all templates
 - Sample YAML files produce valid PDFs
 - The API endpoint returns valid PDF responses
@@ -35,6 +35,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import after path setup
 import app
+from utils.render_scheduler import RenderScheduler
 
 
 # Check if pdfkit is available
@@ -101,14 +102,14 @@ def flask_test_client():
 class TestThreadPoolInitialization:
     """Tests for thread pool initialization and cleanup."""
 
-    def test_pdf_thread_pool_is_threadpool_executor(self):
-        """Verify PDF_THREAD_POOL is a ThreadPoolExecutor instance."""
+    def test_pdf_thread_pool_is_render_scheduler(self):
+        """Verify PDF_THREAD_POOL is a bounded RenderScheduler instance."""
         # Initialize if not already done
         if app.PDF_THREAD_POOL is None:
             app.initialize_pdf_pool()
 
         assert app.PDF_THREAD_POOL is not None
-        assert isinstance(app.PDF_THREAD_POOL, ThreadPoolExecutor)
+        assert isinstance(app.PDF_THREAD_POOL, RenderScheduler)
 
     def test_initialize_pdf_pool_creates_pool(self, monkeypatch):
         """Verify initialize_pdf_pool creates a working pool."""
@@ -140,14 +141,13 @@ class TestThreadPoolInitialization:
         assert app.PDF_THREAD_POOL is None
 
     def test_pool_has_correct_max_workers(self):
-        """Verify pool is initialized with expected worker count."""
+        """Verify pool has one worker per render slot the memory budget allows."""
         if app.PDF_THREAD_POOL is None:
             app.initialize_pdf_pool()
 
-        # Note: _max_workers is a private attribute of ThreadPoolExecutor.
-        # We access it here because there's no public API to query max_workers,
-        # and we need to verify our configuration is correct.
-        assert app.PDF_THREAD_POOL._max_workers == 5
+        # 5 without a cgroup memory limit, fewer in a constrained container
+        assert app.PDF_THREAD_POOL.max_workers == app.RENDER_MEMORY.slots()
+        assert app.PDF_THREAD_POOL.max_workers <= 5
 
 
 # =============================================================================
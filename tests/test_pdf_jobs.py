@@ -0,0 +1,277 @@
+"""
+Tests for asynchronous saved-resume PDF jobs (utils/pdf_jobs.py and app.py).
+
+Tests cover:
+1. PdfJobStore lifecycle, ownership, capacity and expiry
+2. POST /api/resumes/<id>/pdf-jobs returning immediately and rendering in the background
+3. Polling, server-sent events and downloading a finished job
+4. Failed jobs reporting errors; cache hits completing without a render
+
+Run tests:
+    pytest tests/test_pdf_jobs.py -v
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import create_mock_response, TEST_USER_ID, TEST_RESUME_ID
+from utils.pdf_cache import PdfCache
+from utils.pdf_jobs import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    TERMINAL_STATES,
+    PdfJobStore,
+    PdfJobStoreFullError,
+)
+
+
+class TestPdfJobStore:
+    """Tests for PdfJobStore."""
+
+    def test_job_lifecycle(self, tmp_path):
+        """Verify a job moves from queued to done with its PDF on disk."""
+        store = PdfJobStore(tmp_path)
+        job = store.create("user-1", "resume-1", "Resume.pdf")
+        assert job["status"] == JOB_QUEUED
+        assert store.pdf_path(job["id"], "user-1") is None
+
+        store.complete(job["id"], b"%PDF-1.4 done")
+
+        finished = store.get(job["id"], "user-1")
+        assert finished["status"] == JOB_DONE
+        assert finished["progress"] == 100
+        assert store.pdf_path(job["id"], "user-1").read_bytes() == b"%PDF-1.4 done"
+
+    def test_jobs_are_private_to_their_owner(self, tmp_path):
+        """Verify another user cannot see or download a job."""
+        store = PdfJobStore(tmp_path)
+        job = store.create("user-1", "resume-1", "Resume.pdf")
+        store.complete(job["id"], b"%PDF-1.4")
+
+        assert store.get(job["id"], "user-2") is None
+        assert store.pdf_path(job["id"], "user-2") is None
+
+    def test_create_rejects_when_too_many_active(self, tmp_path):
+        """Verify max_active bounds queued and running jobs."""
+        store = PdfJobStore(tmp_path, max_active=1)
+        job = store.create("user-1", "resume-1", "Resume.pdf")
+
+        with pytest.raises(PdfJobStoreFullError):
+            store.create("user-1", "resume-2", "Resume.pdf")
+
+        store.fail(job["id"], "boom")
+        store.create("user-1", "resume-2", "Resume.pdf")
+
+    def test_finished_jobs_expire(self, tmp_path):
+        """Verify finished jobs and their files are dropped after the TTL."""
+        store = PdfJobStore(tmp_path, ttl_seconds=0)
+        job = store.create("user-1", "resume-1", "Resume.pdf")
+        store.complete(job["id"], b"%PDF-1.4")
+        time.sleep(0.01)
+
+        assert store.get(job["id"], "user-1") is None
+        assert not (tmp_path / f"{job['id']}.pdf").exists()
+
+    def test_wait_returns_on_change(self, tmp_path):
+        """Verify wait() wakes up when the job changes."""
+        store = PdfJobStore(tmp_path)
+        job = store.create("user-1", "resume-1", "Resume.pdf")
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            waiter = executor.submit(store.wait, job["id"], "user-1", 0, 5)
+            store.update(job["id"], stage="rendering")
+            changed = waiter.result(timeout=5)
+
+        assert changed["stage"] == "rendering"
+        assert changed["version"] == 1
+
+
+@pytest.fixture
+def jobs_client(flask_test_client, tmp_path):
+    """Flask test client with a temp job store and a real job executor."""
+    client, mock_sb, flask_app = flask_test_client
+    store = PdfJobStore(tmp_path / "jobs")
+    executor = ThreadPoolExecutor(max_workers=1)
+    mock_user = MagicMock()
+    mock_user.id = TEST_USER_ID
+    mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+    with patch.object(flask_app, "PDF_JOB_STORE", store), patch.object(
+        flask_app, "PDF_JOB_EXECUTOR", executor
+    ):
+        yield client, mock_sb, flask_app, store
+    executor.shutdown(wait=True)
+
+
+def wait_for_job(store, job_id, timeout=5):
+    """Block until a job reaches a terminal state and return it."""
+    deadline = time.monotonic() + timeout
+    version = -1
+    while time.monotonic() < deadline:
+        job = store.wait(job_id, TEST_USER_ID, version, timeout=0.5)
+        if job["status"] in TERMINAL_STATES:
+            return job
+        version = job["version"]
+    raise AssertionError("PDF job did not finish")
+
+
+class TestPdfJobEndpoints:
+    """Tests for the /api/resumes/<id>/pdf-jobs endpoints."""
+
+    def _start_job(self, client, auth_headers):
+        response = client.post(
+            f"/api/resumes/{TEST_RESUME_ID}/pdf-jobs", headers=auth_headers
+        )
+        assert response.status_code == 202
+        return response
+
+    def test_job_renders_in_background_and_downloads(
+        self, jobs_client, auth_headers, sample_resume_data
+    ):
+        """Verify the full flow: create, poll, download."""
+        client, mock_sb, flask_app, store = jobs_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4 job"
+        ), patch.object(flask_app, "generate_thumbnail_from_pdf", return_value=None):
+            response = self._start_job(client, auth_headers)
+            job = response.get_json()["job"]
+            assert response.headers["Location"] == job["status_url"]
+            wait_for_job(store, job["id"])
+
+        status = client.get(job["status_url"], headers=auth_headers).get_json()["job"]
+        assert status["status"] == "done"
+        assert status["download_url"].endswith("/download")
+
+        download = client.get(status["download_url"], headers=auth_headers)
+        assert download.status_code == 200
+        assert download.mimetype == "application/pdf"
+        assert download.data == b"%PDF-1.4 job"
+
+    def test_missing_resume_returns_404(self, jobs_client, auth_headers):
+        """Verify unknown resumes are rejected before a job is created."""
+        client, mock_sb, _, store = jobs_client
+        mock_sb.table.return_value.execute.side_effect = [create_mock_response([])]
+
+        response = client.post(
+            f"/api/resumes/{TEST_RESUME_ID}/pdf-jobs", headers=auth_headers
+        )
+
+        assert response.status_code == 404
+        assert store.stats()["created"] == 0
+
+    def test_failed_render_reports_error(
+        self, jobs_client, auth_headers, sample_resume_data
+    ):
+        """Verify render failures end the job as failed and retryable."""
+        client, mock_sb, flask_app, store = jobs_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app, "render_html_pdf", side_effect=RuntimeError("wkhtmltopdf died")
+        ):
+            job = self._start_job(client, auth_headers).get_json()["job"]
+            finished = wait_for_job(store, job["id"])
+
+        assert finished["status"] == JOB_FAILED
+        assert finished["retryable"] is True
+        download = client.get(f"{job['status_url']}/download", headers=auth_headers)
+        assert download.status_code == 409
+
+    def test_cached_pdf_completes_immediately(
+        self, jobs_client, auth_headers, sample_resume_data, tmp_path
+    ):
+        """Verify a cache hit returns a finished job without rendering."""
+        client, mock_sb, flask_app, store = jobs_client
+        cache = PdfCache(tmp_path / "pdf-cache", max_bytes=1024 * 1024)
+        key = flask_app.saved_resume_cache_key(sample_resume_data, [], "modern")
+        cache.put(key, b"%PDF-1.4 cached")
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+        ]
+
+        with patch.object(flask_app, "PDF_CACHE", cache), patch.object(
+            flask_app, "render_html_pdf"
+        ) as render:
+            job = self._start_job(client, auth_headers).get_json()["job"]
+
+        assert job["status"] == "done"
+        render.assert_not_called()
+
+    def test_other_users_job_is_not_found(self, jobs_client, auth_headers):
+        """Verify jobs are only visible to the user that created them."""
+        client, _, _, store = jobs_client
+        job = store.create("someone-else", TEST_RESUME_ID, "Resume.pdf")
+
+        response = client.get(
+            f"/api/resumes/{TEST_RESUME_ID}/pdf-jobs/{job['id']}", headers=auth_headers
+        )
+
+        assert response.status_code == 404
+
+    def test_full_store_returns_429(
+        self, jobs_client, auth_headers, sample_resume_data
+    ):
+        """Verify job creation is throttled with Retry-After."""
+        client, mock_sb, flask_app, store = jobs_client
+        store.max_active = 0
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+        ]
+
+        response = client.post(
+            f"/api/resumes/{TEST_RESUME_ID}/pdf-jobs", headers=auth_headers
+        )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == str(flask_app.PDF_JOB_RETRY_AFTER)
+
+    def test_event_stream_ends_with_terminal_event(self, jobs_client, auth_headers):
+        """Verify the SSE stream reports the finished job and closes."""
+        client, _, _, store = jobs_client
+        job = store.create(TEST_USER_ID, TEST_RESUME_ID, "Resume.pdf")
+        store.complete(job["id"], b"%PDF-1.4")
+
+        response = client.get(
+            f"/api/resumes/{TEST_RESUME_ID}/pdf-jobs/{job['id']}/events",
+            headers=auth_headers,
+        )
+
+        assert response.mimetype == "text/event-stream"
+        body = response.get_data(as_text=True)
+        assert "event: done" in body
+        assert '"download_url"' in body
+
+    def test_event_stream_does_not_wait_for_running_job(
+        self, jobs_client, auth_headers
+    ):
+        """Verify a running job's stream sends its state and closes at once."""
+        client, _, flask_app, store = jobs_client
+        job = store.create(TEST_USER_ID, TEST_RESUME_ID, "Resume.pdf")
+
+        with patch.object(store, "wait") as wait:
+            response = client.get(
+                f"/api/resumes/{TEST_RESUME_ID}/pdf-jobs/{job['id']}/events",
+                headers=auth_headers,
+            )
+            body = response.get_data(as_text=True)
+
+        assert body.startswith(f"retry: {flask_app.PDF_JOB_EVENTS_RETRY_MS}\n\n")
+        assert "event: queued" in body
+        wait.assert_not_called()
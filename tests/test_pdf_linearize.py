@@ -0,0 +1,227 @@
+"""
+Tests for linearized PDFs and range requests (utils/pdf_linearize.py).
+
+Tests cover:
+1. qpdf linearizing rendered PDFs
+2. PDFs sent as rendered when qpdf is missing, fails or is disabled
+3. Renders and POST responses sent as rendered; cached PDFs linearized on
+   their first GET
+4. Preview PDFs served with Accept-Ranges, 206 ranges and If-Range ETags
+5. GET served from the cache only, 409 until a POST has rendered the PDF
+
+Run tests:
+    pytest tests/test_pdf_linearize.py -v
+"""
+import io
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import pdf_linearize
+from utils.pdf_cache import PdfCache
+from utils.pdf_linearize import is_linearized, linearize_pdf
+
+from conftest import create_mock_response, TEST_USER_ID, TEST_RESUME_ID
+
+PDF = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\n" + b"x" * 4000
+LINEARIZED = b"%PDF-1.4\n1 0 obj\n<< /Linearized 1 >>\nendobj\n"
+
+
+@pytest.fixture
+def fake_qpdf(tmp_path):
+    """A qpdf that puts a linearization dictionary in front of its input."""
+    script = tmp_path / "qpdf"
+    script.write_text(
+        "#!/usr/bin/env python3\n"
+        "import sys\n"
+        "assert sys.argv[1:] == ['--linearize', '-', '-']\n"
+        "data = sys.stdin.buffer.read()\n"
+        "if not data.startswith(b'%PDF'):\n"
+        "    sys.exit(2)\n"
+        f"sys.stdout.buffer.write({LINEARIZED!r} + data[9:])\n"
+    )
+    script.chmod(0o755)
+    with patch.object(pdf_linearize, "QPDF_BINARY", str(script)):
+        yield script
+
+
+class TestLinearizePdf:
+    """Tests for linearize_pdf."""
+
+    def test_linearizes_with_qpdf(self, fake_qpdf):
+        """Verify the PDF comes back with a linearization dictionary first."""
+        result = linearize_pdf(PDF)
+
+        assert is_linearized(result)
+        assert not is_linearized(PDF)
+        assert result.endswith(PDF[9:])
+
+    def test_sent_as_rendered_without_qpdf(self):
+        """Verify a missing qpdf leaves the PDF unchanged."""
+        with patch.object(pdf_linearize, "QPDF_BINARY", "no-such-qpdf"):
+            assert linearize_pdf(PDF) is PDF
+
+    def test_sent_as_rendered_when_qpdf_fails(self, fake_qpdf):
+        """Verify a qpdf error exit leaves the PDF unchanged."""
+        assert linearize_pdf(b"not a pdf") == b"not a pdf"
+
+    def test_disabled_or_already_linearized_skips_qpdf(self, fake_qpdf):
+        """Verify qpdf is not run when disabled or for linearized input."""
+        with patch.object(pdf_linearize.subprocess, "run") as run:
+            assert linearize_pdf(LINEARIZED) is LINEARIZED
+            with patch.object(pdf_linearize, "PDF_LINEARIZE", False):
+                assert linearize_pdf(PDF) is PDF
+
+        run.assert_not_called()
+
+    def test_renders_not_linearized(self, fake_qpdf, flask_test_client):
+        """Verify render_resume_pdf returns the renderer's bytes as they are."""
+        _, _, flask_app = flask_test_client
+
+        with patch.object(flask_app, "render_html_pdf", return_value=PDF):
+            pdf_bytes = flask_app.render_resume_pdf(
+                "modern", {}, flask_app.ICONS_DIR, "session"
+            )
+
+        assert pdf_bytes is PDF
+
+    def test_generate_not_linearized(self, fake_qpdf, flask_test_client):
+        """Verify /api/generate sends the PDF without running qpdf."""
+        client, _, flask_app = flask_test_client
+
+        with patch.object(
+            flask_app, "render_resume_pdf", return_value=PDF
+        ), patch.object(flask_app, "linearize_pdf") as linearize:
+            response = client.post(
+                "/api/generate",
+                data={
+                    "yaml_file": (io.BytesIO(b"sections: []"), "resume.yml"),
+                    "session_id": "linearize",
+                    "template": "classic",
+                },
+            )
+
+        assert response.data == PDF
+        linearize.assert_not_called()
+
+
+class TestPdfRangeRequests:
+    """Tests for range requests on GET /api/resumes/<id>/pdf."""
+
+    @pytest.fixture
+    def rendered(self, flask_test_client, auth_headers, sample_resume_data, tmp_path):
+        """A saved resume POSTed (and so cached) once; yields a GET helper."""
+        client, mock_sb, flask_app = flask_test_client
+        mock_user = MagicMock()
+        mock_user.id = TEST_USER_ID
+        mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+        sample_resume_data["thumbnail_url"] = "https://example.com/t.png"
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),  # icons
+        ]
+        cache = PdfCache(tmp_path / "cache", max_bytes=1024 * 1024)
+
+        with patch.object(flask_app, "PDF_CACHE", cache), patch.object(
+            flask_app, "_render_saved_resume_pdf", return_value=PDF
+        ) as render, patch.object(flask_app, "_refresh_resume_thumbnail") as refresh:
+            post = client.post(
+                f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers
+            )
+            assert post.status_code == 200
+            mock_sb.table.reset_mock()
+
+            def get(headers):
+                return client.get(
+                    f"/api/resumes/{TEST_RESUME_ID}/pdf?preview=true",
+                    headers=dict(auth_headers, **headers),
+                )
+
+            yield get
+            # Range GETs never reach the database, the renderer or storage
+            mock_sb.table.assert_not_called()
+            assert render.call_count == 1
+            assert refresh.call_count == 1
+        flask_app._forget_saved_pdf(TEST_USER_ID, TEST_RESUME_ID)
+
+    def test_full_response_advertises_ranges(self, rendered):
+        """Verify the whole PDF is sent with Accept-Ranges and an ETag."""
+        response = rendered({})
+
+        assert response.status_code == 200
+        assert response.headers["Accept-Ranges"] == "bytes"
+        assert response.headers["ETag"]
+        assert response.headers["Content-Disposition"].startswith("inline")
+        assert response.data == PDF
+
+    def test_range_returns_partial_content(self, rendered):
+        """Verify byte ranges get 206 and If-Range matches across requests."""
+        etag = rendered({}).headers["ETag"]
+
+        response = rendered({"Range": "bytes=0-1023", "If-Range": etag})
+        following = rendered({"Range": "bytes=1024-2047", "If-Range": etag})
+
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == f"bytes 0-1023/{len(PDF)}"
+        assert response.data == PDF[:1024]
+        assert following.status_code == 206
+        assert following.data == PDF[1024:2048]
+
+    def test_stale_if_range_gets_whole_pdf(self, rendered):
+        """Verify a range of a PDF that changed since is answered in full."""
+        response = rendered(
+            {"Range": "bytes=0-1023", "If-Range": '"an-older-pdf"'}
+        )
+
+        assert response.status_code == 200
+        assert response.data == PDF
+
+    def test_first_get_linearizes_cached_pdf(
+        self, fake_qpdf, flask_test_client, rendered
+    ):
+        """Verify the cached PDF is linearized by its first GET, and only then."""
+        _, _, flask_app = flask_test_client
+        cache_key = flask_app._saved_pdf_keys[(TEST_USER_ID, TEST_RESUME_ID)][0]
+        assert flask_app.PDF_CACHE.get(cache_key) == PDF
+
+        first = rendered({})
+        with patch.object(pdf_linearize.subprocess, "run") as run:
+            following = rendered({"Range": "bytes=0-15"})
+
+        assert is_linearized(first.data)
+        assert flask_app.PDF_CACHE.get(cache_key) == first.data
+        assert following.status_code == 206
+        assert following.data == first.data[:16]
+        run.assert_not_called()
+
+    def test_get_before_post_conflicts(self, flask_test_client, auth_headers):
+        """Verify GET answers 409 without rendering when nothing is cached."""
+        client, mock_sb, flask_app = flask_test_client
+        mock_user = MagicMock()
+        mock_user.id = TEST_USER_ID
+        mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+
+        with patch.object(flask_app, "_render_saved_resume_pdf") as render:
+            response = client.get(
+                f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers
+            )
+
+        assert response.status_code == 409
+        assert response.get_json()["render_required"] is True
+        render.assert_not_called()
+
+    def test_changed_resume_not_served(
+        self, flask_test_client, rendered
+    ):
+        """Verify GET answers 409 once a save, rename or delete forgot the PDF."""
+        _, _, flask_app = flask_test_client
+        assert rendered({}).status_code == 200
+
+        flask_app._forget_saved_pdf(TEST_USER_ID, TEST_RESUME_ID)
+
+        assert rendered({}).status_code == 409
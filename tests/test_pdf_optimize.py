@@ -0,0 +1,203 @@
+"""
+Tests for the optional PDF size optimizer (utils/pdf_optimize.py).
+
+Tests cover:
+1. Images downsampled to the preset DPI at the size they are drawn at
+2. Soft masks (transparency) and JPEG encoding kept
+3. Images drawn large, and unplaced images, left alone
+4. maybe_optimize_pdf falling back to the rendered PDF (off, small, no
+   pypdf, failures, no savings)
+
+Run tests:
+    pytest tests/test_pdf_optimize.py -v
+"""
+import io
+import os
+import sys
+import zlib
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import pdf_optimize
+from utils.pdf_optimize import (
+    PdfOptimizerUnavailableError,
+    maybe_optimize_pdf,
+    optimize_pdf,
+)
+
+try:
+    from pypdf import PdfReader
+
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+requires_pypdf = pytest.mark.skipif(not PYPDF_AVAILABLE, reason="pypdf not installed")
+
+LOGO = Image.new("RGB", (1000, 1000), "navy")
+LOGO.putalpha(Image.radial_gradient("L").resize((1000, 1000)))
+PHOTO = Image.effect_noise((1200, 900), 20).convert("RGB")
+
+
+def image_object(image, jpeg=False, smask=None):
+    if jpeg:
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=95)
+        data, image_filter = buffer.getvalue(), b"/DCTDecode"
+    else:
+        data, image_filter = zlib.compress(image.tobytes()), b"/FlateDecode"
+    color_space = b"/DeviceGray" if image.mode == "L" else b"/DeviceRGB"
+    extra = b" /SMask %d 0 R" % smask if smask else b""
+    return b"<< /Type /XObject /Subtype /Image /Width %d /Height %d " % image.size + (
+        b"/ColorSpace %s /BitsPerComponent 8 /Filter %s%s /Length %d >>\n"
+        b"stream\n%s\nendstream" % (color_space, image_filter, extra, len(data), data)
+    )
+
+
+def build_pdf(pages, logo=LOGO, photo=PHOTO):
+    """A PDF with a transparent Flate logo (/Logo) and a JPEG photo (/Photo)."""
+    objects = {
+        3: image_object(logo.getchannel("A")),
+        4: image_object(logo.convert("RGB"), smask=3),
+        5: image_object(photo, jpeg=True),
+        6: b"<< /XObject << /Logo 4 0 R /Photo 5 0 R >> >>",
+    }
+    kids = []
+    for content in pages:
+        number = max(objects) + 1
+        objects[number] = b"<< /Length %d >>\nstream\n%s\nendstream" % (
+            len(content),
+            content,
+        )
+        objects[number + 1] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources 6 0 R /Contents %d 0 R >>" % number
+        )
+        kids.append(number + 1)
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids),
+        len(kids),
+    )
+
+    pdf, offsets = b"%PDF-1.4\n", {}
+    for number in sorted(objects):
+        offsets[number] = len(pdf)
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offsets[n] for n in sorted(objects))
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return pdf
+
+
+def images(pdf):
+    page = PdfReader(io.BytesIO(pdf)).pages[0]
+    return {image.name: image.image for image in page.images}
+
+
+# Logo drawn at 20x20pt, photo at 40x30pt inside a translated group
+ICON_PAGE = b"q 20 0 0 20 50 700 cm /Logo Do Q q 1 0 0 1 100 100 cm " + (
+    b"q 40 0 0 30 0 0 cm /Photo Do Q Q"
+)
+
+
+@requires_pypdf
+class TestOptimizePdf:
+    """Tests for optimize_pdf."""
+
+    def test_images_downsampled_to_drawn_size(self):
+        """Verify images shrink to the DPI at the size they are drawn at."""
+        pdf = build_pdf([ICON_PAGE, ICON_PAGE])
+
+        optimized = optimize_pdf(pdf, image_dpi=300, jpeg_quality=90)
+
+        result = images(optimized)
+        # 20pt at 300 DPI is 83.3px, 40x30pt is 166.7x125px
+        assert result["Logo.png"].size == (84, 84)
+        assert result["Photo.jpg"].size == (167, 125)
+        assert len(optimized) < len(pdf) / 10
+        assert len(PdfReader(io.BytesIO(optimized)).pages) == 2
+
+    def test_transparency_and_jpeg_kept(self):
+        """Verify the logo keeps its soft mask and the photo stays a JPEG."""
+        optimized = optimize_pdf(build_pdf([ICON_PAGE]), image_dpi=150)
+
+        result = images(optimized)
+        assert result["Logo.png"].mode == "RGBA"
+        # Alpha is the radial gradient: transparent centre, opaque corners
+        alpha = result["Logo.png"].getchannel("A")
+        assert alpha.getpixel((0, 0)) > alpha.getpixel((21, 21))
+        assert "Photo.jpg" in result
+
+    def test_largest_placement_wins(self):
+        """Verify an image drawn large anywhere keeps that resolution."""
+        large = b"q 400 0 0 400 0 0 cm /Logo Do Q"
+
+        optimized = optimize_pdf(build_pdf([ICON_PAGE, large]))
+
+        assert images(optimized)["Logo.png"].size == (1000, 1000)
+
+    def test_unplaced_image_left_alone(self):
+        """Verify images no content stream draws are not resampled."""
+        optimized = optimize_pdf(build_pdf([b"q 20 0 0 20 50 700 cm /Logo Do Q"]))
+
+        assert images(optimized)["Photo.jpg"].size == PHOTO.size
+
+
+class TestMaybeOptimizePdf:
+    """Tests for maybe_optimize_pdf fallbacks."""
+
+    def test_off_returns_input(self):
+        """Verify the stage is a no-op unless a preset is configured."""
+        pdf = b"%PDF-1.4" + b"x" * 100_000
+
+        with patch.object(pdf_optimize, "optimize_pdf") as optimize:
+            assert maybe_optimize_pdf(pdf, "off") is pdf
+            assert maybe_optimize_pdf(pdf, "nope") is pdf
+
+        optimize.assert_not_called()
+
+    def test_small_pdf_sent_as_rendered(self):
+        """Verify PDFs under PDF_OPTIMIZE_MIN_KB skip the stage."""
+        with patch.object(pdf_optimize, "optimize_pdf") as optimize:
+            assert maybe_optimize_pdf(b"%PDF-1.4 tiny", "print") == b"%PDF-1.4 tiny"
+
+        optimize.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "error",
+        [PdfOptimizerUnavailableError("no pypdf"), ValueError("broken xref")],
+    )
+    def test_failures_fall_back(self, error):
+        """Verify a missing pypdf or a failed rewrite never fails the render."""
+        pdf = b"%PDF-1.4" + b"x" * 100_000
+
+        with patch.object(pdf_optimize, "optimize_pdf", side_effect=error):
+            assert maybe_optimize_pdf(pdf, "screen") is pdf
+
+    def test_larger_result_discarded(self):
+        """Verify the rewritten PDF is only used when it is smaller."""
+        pdf = b"%PDF-1.4" + b"x" * 100_000
+
+        with patch.object(pdf_optimize, "optimize_pdf", return_value=pdf + b"more"):
+            assert maybe_optimize_pdf(pdf, "print") is pdf
+        with patch.object(pdf_optimize, "optimize_pdf", return_value=b"%PDF small"):
+            assert maybe_optimize_pdf(pdf, "print") == b"%PDF small"
+
+    def test_preset_settings_passed(self):
+        """Verify the preset's DPI and JPEG quality reach optimize_pdf."""
+        pdf = b"%PDF-1.4" + b"x" * 100_000
+
+        with patch.object(pdf_optimize, "optimize_pdf", return_value=b"") as optimize:
+            maybe_optimize_pdf(pdf, "screen")
+
+        assert optimize.call_args.kwargs == {"image_dpi": 150, "jpeg_quality": 75}
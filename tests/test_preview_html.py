@@ -0,0 +1,248 @@
+"""
+Tests for the HTML live-preview endpoint (POST /api/preview/html).
+
+Tests cover:
+1. Self-contained HTML: stylesheet and icons inlined, no file:// references
+2. Uploaded icons embedded for modern-with-icons
+3. Paths outside the render's directories never embedded
+4. No PDF render; sandboxing headers on the response
+5. Validation: LaTeX templates, missing YAML
+6. utils/inline_assets.py font and stylesheet handling
+7. Process-wide asset memo and its mtime invalidation
+8. PDF renders receiving self-contained HTML without local file access
+
+Run tests:
+    pytest tests/test_preview_html.py -v
+"""
+import base64
+import io
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import resume_generator
+from utils import inline_assets
+from utils.inline_assets import inline_local_assets
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\nfake-icon"
+
+RESUME_YAML = b"""
+contact_info:
+  name: Jane Doe
+  email: jane@example.com
+  location: Berlin
+sections:
+  - name: Experience
+    type: experience
+    content:
+      - company: Acme
+        title: Engineer
+        dates: 2020 - Present
+        icon: company_acme.png
+        description: Builds things.
+"""
+
+
+def form(template="modern-with-icons", yaml_bytes=RESUME_YAML, icons=None):
+    data = {
+        "yaml_file": (io.BytesIO(yaml_bytes), "resume.yml"),
+        "session_id": "html-preview",
+        "template": template,
+    }
+    if icons:
+        data["icons"] = icons
+    return data
+
+
+class TestPreviewHtml:
+    """Tests for POST /api/preview/html."""
+
+    def test_returns_self_contained_html(self, flask_test_client):
+        """Verify CSS and icons are inlined and no local paths leak."""
+        client, _, _ = flask_test_client
+
+        response = client.post("/api/preview/html", data=form("modern-no-icons"))
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/html"
+        html = response.get_data(as_text=True)
+        assert "Jane Doe" in html
+        assert ".header h1" in html  # templates/modern/styles.css
+        assert "data:image/png;base64," in html  # contact icons
+        assert "file://" not in html
+
+    def test_uploaded_icon_is_embedded(self, flask_test_client):
+        """Verify icons uploaded with the request become data URIs."""
+        client, _, _ = flask_test_client
+
+        response = client.post(
+            "/api/preview/html",
+            data=form(icons=[(io.BytesIO(PNG_BYTES), "company_acme.png")]),
+        )
+
+        html = response.get_data(as_text=True)
+        assert base64.b64encode(PNG_BYTES).decode() in html
+
+    def test_paths_outside_render_dirs_not_embedded(self, flask_test_client):
+        """Verify icon names from YAML cannot pull in arbitrary files."""
+        client, _, _ = flask_test_client
+        secret = base64.b64encode(Path("/etc/hostname").read_bytes()).decode()
+        yaml_bytes = RESUME_YAML.replace(
+            b"company_acme.png", b"../../../../../../etc/hostname"
+        )
+
+        response = client.post("/api/preview/html", data=form(yaml_bytes=yaml_bytes))
+
+        assert response.status_code == 200
+        assert secret not in response.get_data(as_text=True)
+
+    def test_preview_skips_pdf_render_and_is_sandboxed(self, flask_test_client):
+        """Verify nothing goes to the render pool and scripts are disabled."""
+        client, _, flask_app = flask_test_client
+
+        with patch.object(flask_app, "render_resume_pdf") as render:
+            response = client.post("/api/preview/html", data=form())
+
+        render.assert_not_called()
+        assert "sandbox" in response.headers["Content-Security-Policy"]
+        assert response.headers["Cache-Control"] == "no-store"
+
+    def test_latex_template_rejected(self, flask_test_client):
+        """Verify LaTeX templates point callers at the PDF preview."""
+        client, _, _ = flask_test_client
+
+        response = client.post("/api/preview/html", data=form("classic"))
+
+        assert response.status_code == 400
+        assert "/api/generate" in response.get_json()["error"]
+
+    def test_missing_yaml_returns_400(self, flask_test_client):
+        """Verify the YAML upload is required."""
+        client, _, _ = flask_test_client
+
+        response = client.post("/api/preview/html", data={"template": "modern"})
+
+        assert response.status_code == 400
+
+
+class TestInlineLocalAssets:
+    """Tests for utils/inline_assets.inline_local_assets."""
+
+    def test_stylesheet_link_becomes_style_block(self, tmp_path):
+        """Verify the linked stylesheet is read into the page."""
+        css = tmp_path / "styles.css"
+        css.write_text("body { color: red; }")
+        html = f'<link rel="stylesheet" href="file://{css}">'
+
+        inlined = inline_local_assets(html, [tmp_path])
+
+        assert inlined == "<style>\nbody { color: red; }\n</style>"
+
+    def test_fonts_outside_allowed_dirs_are_dropped(self, tmp_path):
+        """Verify @font-face rules pointing at system fonts are removed."""
+        font = tmp_path / "font.ttf"
+        font.write_bytes(b"font")
+        html = (
+            "<style>@font-face { src: url('file:///usr/share/fonts/x.ttf'); }\n"
+            f"@font-face {{ src: url('file://{font}'); }}</style>"
+        )
+
+        inlined = inline_local_assets(html, [tmp_path])
+
+        assert "/usr/share/fonts" not in inlined
+        assert inlined.count("@font-face") == 1
+        assert 'url("data:font/ttf;base64,' in inlined
+
+    def test_assets_are_encoded_once_across_renders(self, tmp_path):
+        """Verify a second render reuses the memoised data URI."""
+        icon = tmp_path / "icon.png"
+        icon.write_bytes(PNG_BYTES)
+        html = f'<img src="file://{icon}">'
+        memo = inline_assets._AssetMemo(max_bytes=1024 * 1024)
+
+        with patch.object(inline_assets, "_memo", memo):
+            first = inline_local_assets(html, [tmp_path])
+            second = inline_local_assets(html, [tmp_path])
+
+        assert first == second
+        assert (memo.stats()["misses"], memo.stats()["hits"]) == (1, 1)
+
+    def test_changed_file_invalidates_memo(self, tmp_path):
+        """Verify an edited asset is re-read once its mtime changes."""
+        css = tmp_path / "styles.css"
+        css.write_text("body { color: red; }")
+        html = f'<link rel="stylesheet" href="file://{css}">'
+        memo = inline_assets._AssetMemo(max_bytes=1024 * 1024)
+
+        with patch.object(inline_assets, "_memo", memo):
+            inline_local_assets(html, [tmp_path])
+            css.write_text("body { color: blue; }")
+            os.utime(css, ns=(0, 0))
+            inlined = inline_local_assets(html, [tmp_path])
+
+        assert "blue" in inlined
+        assert memo.stats()["misses"] == 2
+
+    def test_transient_dirs_not_memoised(self, tmp_path):
+        """Verify per-session uploads are read per render, never kept."""
+        session_dir = tmp_path / "session"
+        session_dir.mkdir()
+        icon = session_dir / "upload.png"
+        icon.write_bytes(PNG_BYTES)
+        html = f'<img src="file://{icon}"><img src="file://{icon}">'
+        memo = inline_assets._AssetMemo(max_bytes=1024 * 1024)
+
+        with patch.object(inline_assets, "_memo", memo):
+            inlined = inline_local_assets(html, [tmp_path], [session_dir])
+
+        assert inlined.count("data:image/png;base64,") == 2
+        assert memo.stats()["entries"] == 0
+
+    def test_memo_is_size_bounded(self, tmp_path):
+        """Verify least recently used assets are evicted past the budget."""
+        memo = inline_assets._AssetMemo(max_bytes=100)
+        for i in range(3):
+            asset = tmp_path / f"{i}.css"
+            asset.write_text("x" * 40)
+            memo.get("text", asset, inline_assets._read_text)
+
+        assert memo.stats()["entries"] == 2
+        assert memo.stats()["bytes"] == 80
+
+
+class TestInlinedPdfRenders:
+    """Tests for self-contained HTML handed to the PDF backend."""
+
+    def test_pdf_html_has_no_file_references(self):
+        """Verify CSS, icons and fonts are embedded for wkhtmltopdf."""
+        rendered = {}
+
+        class CapturingBackend:
+            name = "capturing"
+
+            def render(self, html, offline=True):
+                rendered["html"] = html
+                return b"%PDF-1.4"
+
+        data = {
+            "contact_info": {"name": "Jane Doe", "email": "jane@example.com"},
+            "sections": [],
+        }
+        with patch.dict(
+            resume_generator._pdf_backends, {"capturing": CapturingBackend()}
+        ):
+            resume_generator.generate_pdf_bytes("modern", data, backend="capturing")
+
+        assert "file://" not in rendered["html"]
+        assert ".header h1" in rendered["html"]
+        assert "data:image/png;base64," in rendered["html"]
+
+    def test_local_file_access_not_enabled(self):
+        """Verify wkhtmltopdf no longer gets enable-local-file-access."""
+        for offline in (True, False):
+            options = resume_generator.get_pdfkit_options(offline)
+            assert "enable-local-file-access" not in options
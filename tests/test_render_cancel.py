@@ -0,0 +1,415 @@
+"""
+Tests for cancelling superseded preview renders (utils/render_cancel.py).
+
+Tests cover:
+1. CancelToken callbacks and SupersedeRegistry bookkeeping
+2. run_cancellable killing a running child process
+3. RendererPool killing and replacing a worker whose job was cancelled
+4. Queued renders dropped from the scheduler before they start
+5. /api/generate?preview=true answering 409 when a newer preview arrives
+6. Render deadlines: process groups killed, 504s, counters, scratch cleanup
+
+Run tests:
+    pytest tests/test_render_cancel.py -v
+"""
+import io
+import os
+import signal
+import sys
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_cancel import (
+    DEADLINES,
+    CancelToken,
+    RenderCancelledError,
+    RenderTimeoutError,
+    SupersedeRegistry,
+    run_cancellable,
+)
+from utils.render_pool import RendererPool
+from utils.render_scheduler import RenderScheduler
+
+# Renderer worker stand-in that never answers a "hang" job
+HANGING_WORKER_SCRIPT = textwrap.dedent(
+    """
+    import json, os, sys, time
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        if json.loads(line).get("hang"):
+            time.sleep(60)
+        header = {"success": True, "pid": os.getpid()}
+        out.write(json.dumps(header).encode() + b"\\n")
+        out.flush()
+    """
+)
+
+RESUME_YAML = b"""
+contact_info:
+  name: Jane Doe
+sections: []
+"""
+
+
+def cancel_soon(token, delay=0.2):
+    timer = threading.Timer(delay, token.cancel)
+    timer.start()
+    return timer
+
+
+class TestCancelToken:
+    """Tests for CancelToken and SupersedeRegistry."""
+
+    def test_callbacks_run_once_on_cancel(self):
+        """Verify callbacks fire once and late registrations fire immediately."""
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append("early"))
+
+        assert token.cancel() is True
+        assert token.cancel() is False
+        token.on_cancel(lambda: calls.append("late"))
+
+        assert calls == ["early", "late"]
+        with pytest.raises(RenderCancelledError):
+            token.raise_if_cancelled()
+
+    def test_unregistered_callback_is_skipped(self):
+        """Verify finished work is not killed by a later cancel."""
+        token = CancelToken()
+        calls = []
+        unregister = token.on_cancel(lambda: calls.append("kill"))
+
+        unregister()
+        token.cancel()
+
+        assert calls == []
+
+    def test_newer_render_supersedes_older(self):
+        """Verify begin() cancels the in-flight render for the same key only."""
+        registry = SupersedeRegistry()
+        first = registry.begin("session-a")
+        other = registry.begin("session-b")
+
+        second = registry.begin("session-a")
+
+        assert first.cancelled
+        assert not other.cancelled
+        assert not second.cancelled
+        registry.finish("session-a", first, cancelled=True)
+        assert registry.stats() == {
+            "in_flight": 2,
+            "started": 3,
+            "superseded": 1,
+            "cancelled": 1,
+        }
+
+    def test_finished_render_is_not_cancelled(self):
+        """Verify a completed render is forgotten and cannot be superseded."""
+        registry = SupersedeRegistry()
+        first = registry.begin("session-a")
+        registry.finish("session-a", first)
+
+        registry.begin("session-a")
+
+        assert not first.cancelled
+        assert registry.stats()["superseded"] == 0
+
+
+class TestCancellableProcesses:
+    """Tests for killing render child processes."""
+
+    def test_run_cancellable_kills_child(self):
+        """Verify a cancelled token stops a running subprocess promptly."""
+        token = CancelToken()
+        cancel_soon(token)
+        start = time.monotonic()
+
+        with pytest.raises(RenderCancelledError):
+            run_cancellable(
+                [sys.executable, "-c", "import time; time.sleep(30)"], token
+            )
+
+        assert time.monotonic() - start < 10
+
+    def test_run_cancellable_without_token(self):
+        """Verify the plain path behaves like subprocess.run."""
+        result = run_cancellable([sys.executable, "-c", "print('ok')"])
+
+        assert result.returncode == 0
+        assert result.stdout.strip() == "ok"
+
+    def test_pool_kills_and_replaces_cancelled_worker(self):
+        """Verify a cancelled job kills its worker and the pool stays usable."""
+        pool = RendererPool(
+            size=1, command=[sys.executable, "-c", HANGING_WORKER_SCRIPT]
+        )
+        try:
+            token = CancelToken()
+            cancel_soon(token)
+
+            result = pool.render({"hang": True}, cancel_token=token)
+
+            assert result["cancelled"] is True
+            assert pool.stats()["workers_recycled"] == 1
+            assert pool.render({})["success"] is True
+        finally:
+            pool.shutdown()
+
+    def test_queued_render_never_starts(self, flask_test_client):
+        """Verify cancelling drops a render still waiting for a scheduler slot."""
+        _, _, flask_app = flask_test_client
+        scheduler = RenderScheduler(max_workers=1, max_queue=2)
+        release = threading.Event()
+        ran = []
+        try:
+            scheduler.submit(release.wait, 5)
+            future = scheduler.submit(ran.append, "render")
+            token = CancelToken()
+            cancel_soon(token, delay=0.05)
+
+            with pytest.raises(RenderCancelledError):
+                flask_app.wait_for_render(future, token, timeout=5)
+        finally:
+            release.set()
+            scheduler.shutdown(wait=True)
+
+        assert ran == []
+
+
+class TestSupersededPreviews:
+    """Tests for preview supersession in /api/generate."""
+
+    def _post(self, client, preview=True):
+        url = "/api/generate?preview=true" if preview else "/api/generate"
+        return client.post(
+            url,
+            data={
+                "yaml_file": (io.BytesIO(RESUME_YAML), "resume.yml"),
+                "session_id": "cancel-session",
+                "template": "modern-no-icons",
+            },
+        )
+
+    def test_newer_preview_cancels_older(self, flask_test_client):
+        """Verify the older preview answers 409 and is counted."""
+        _, _, flask_app = flask_test_client
+        # One client per thread: the fixture's client keeps a pushed context
+        clients = [flask_app.app.test_client(), flask_app.app.test_client()]
+        first_started = threading.Event()
+
+        def fake_render(template, yaml_data, icons_dir, session_id, **kwargs):
+            token = kwargs["cancel_token"]
+            if not first_started.is_set():
+                first_started.set()
+                deadline = time.monotonic() + 5
+                while not token.cancelled and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                token.raise_if_cancelled()
+            return b"%PDF-1.4 latest"
+
+        registry = SupersedeRegistry()
+        with patch.object(
+            flask_app, "render_html_pdf", side_effect=fake_render
+        ), patch.object(flask_app, "PREVIEW_RENDERS", registry):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                older = executor.submit(self._post, clients[0])
+                assert first_started.wait(5)
+                newer = self._post(clients[1])
+                older = older.result(timeout=10)
+
+        assert newer.status_code == 200
+        assert newer.data == b"%PDF-1.4 latest"
+        assert older.status_code == 409
+        assert older.get_json()["superseded"] is True
+        assert registry.stats() == {
+            "in_flight": 0,
+            "started": 2,
+            "superseded": 1,
+            "cancelled": 1,
+        }
+
+    def test_downloads_are_not_tracked(self, flask_test_client):
+        """Verify only preview requests take part in supersession."""
+        client, _, flask_app = flask_test_client
+        registry = SupersedeRegistry()
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4"
+        ) as render, patch.object(flask_app, "PREVIEW_RENDERS", registry):
+            response = self._post(client, preview=False)
+
+        assert response.status_code == 200
+        # Downloads only get a deadline, not a supersedable registry token
+        token = render.call_args.kwargs["cancel_token"]
+        assert token.deadline is not None and not token.cancelled
+        assert registry.stats()["started"] == 0
+
+    def test_stats_endpoint_reports_cancellations(self, flask_test_client):
+        """Verify cancellation counters are served with the render stats."""
+        client, _, _ = flask_test_client
+
+        stats = client.get("/api/render/stats").get_json()["preview_renders"]
+
+        assert set(stats) == {"in_flight", "started", "superseded", "cancelled"}
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # Reaped zombies still answer kill(0); check their state
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestRenderDeadlines:
+    """Tests for request deadlines on renders."""
+
+    def test_deadline_cancels_token(self):
+        """Verify the watchdog fires and the token reports a timeout."""
+        token = CancelToken(deadline=time.monotonic() + 0.05)
+        start = time.monotonic()
+        while not token.cancelled and time.monotonic() - start < 5:
+            time.sleep(0.01)
+
+        assert token.timed_out
+        with pytest.raises(RenderTimeoutError):
+            token.raise_if_cancelled()
+
+    def test_earlier_deadline_wins(self):
+        """Verify a later deadline cannot extend an earlier one."""
+        token = CancelToken(deadline=time.monotonic() + 10)
+        token.set_deadline(time.monotonic() + 60)
+
+        assert token.remaining() <= 10
+
+    def test_process_group_killed_at_deadline(self, tmp_path):
+        """Verify the child and everything it spawned die at the deadline."""
+        pid_file = tmp_path / "grandchild.pid"
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', "
+            "'import time; time.sleep(30)'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(30)\n"
+        )
+        before = DEADLINES.stats()["timed_out"]
+        token = CancelToken(deadline=time.monotonic() + 1)
+        start = time.monotonic()
+
+        with pytest.raises(RenderTimeoutError):
+            run_cancellable([sys.executable, "-c", script], token)
+
+        assert time.monotonic() - start < 10
+        assert DEADLINES.stats()["timed_out"] == before + 1
+        grandchild = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while process_alive(grandchild) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if process_alive(grandchild):
+            os.kill(grandchild, signal.SIGKILL)
+            pytest.fail("grandchild survived the deadline")
+
+    def test_queued_render_dropped_at_deadline(self, flask_test_client):
+        """Verify a render stuck in the queue past its deadline never starts."""
+        _, _, flask_app = flask_test_client
+        scheduler = RenderScheduler(max_workers=1, max_queue=2)
+        release = threading.Event()
+        ran = []
+        try:
+            scheduler.submit(release.wait, 5)
+            future = scheduler.submit(ran.append, "render")
+            token = CancelToken(deadline=time.monotonic() + 0.1)
+
+            with pytest.raises(RenderTimeoutError):
+                flask_app.wait_for_render(future, token)
+        finally:
+            release.set()
+            scheduler.shutdown(wait=True)
+
+        assert ran == []
+
+    def test_unkillable_render_counted_as_orphaned(self, flask_test_client):
+        """Verify work finishing after its deadline is counted, not returned."""
+        _, _, flask_app = flask_test_client
+        token = CancelToken()
+        before = DEADLINES.stats()["orphaned"]
+
+        def slow_render():
+            token.cancel(timed_out=True)
+            return {"success": True, "pdf": b"%PDF-1.4"}
+
+        flask_app._count_orphaned_render(slow_render, token)()
+
+        assert DEADLINES.stats()["orphaned"] == before + 1
+
+    def test_generate_answers_504(self, flask_test_client):
+        """Verify a render past RENDER_TIMEOUT_SECONDS fails with 504."""
+        client, _, flask_app = flask_test_client
+
+        def hung_render(template, yaml_data, icons_dir, session_id, **kwargs):
+            token = kwargs["cancel_token"]
+            deadline = time.monotonic() + 5
+            while not token.cancelled and time.monotonic() < deadline:
+                time.sleep(0.01)
+            token.raise_if_cancelled()
+            return b"%PDF-1.4 too late"
+
+        with patch.object(flask_app, "RENDER_TIMEOUT_SECONDS", 0.1), patch.object(
+            flask_app, "render_html_pdf", side_effect=hung_render
+        ):
+            response = client.post(
+                "/api/generate",
+                data={
+                    "yaml_file": (io.BytesIO(RESUME_YAML), "resume.yml"),
+                    "session_id": "deadline-session",
+                    "template": "modern-no-icons",
+                },
+            )
+
+        assert response.status_code == 504
+        assert response.get_json()["retryable"] is True
+
+    def test_latex_scratch_files_removed_on_timeout(self, flask_test_client):
+        """Verify a killed xelatex run leaves no .tex/.pdf files behind."""
+        _, _, flask_app = flask_test_client
+        scratch = []
+
+        def killed_xelatex(command, cancel_token=None, cwd=None, **kwargs):
+            tex_file = command[-1]
+            scratch.append(tex_file)
+            open(tex_file.replace(".tex", ".aux"), "w").close()
+            raise RenderTimeoutError("Render exceeded its request deadline")
+
+        with patch.object(flask_app, "run_cancellable", side_effect=killed_xelatex):
+            with pytest.raises(RenderTimeoutError):
+                flask_app.generate_latex_pdf(
+                    {"contact_info": {"name": "Jane Doe"}, "sections": []},
+                    "/tmp",
+                    None,
+                )
+
+        assert scratch
+        assert not os.path.exists(scratch[0])
+        assert not os.path.exists(scratch[0].replace(".tex", ".aux"))
+
+    def test_stats_endpoint_reports_deadlines(self, flask_test_client):
+        """Verify deadline counters are served with the render stats."""
+        client, _, _ = flask_test_client
+
+        stats = client.get("/api/render/stats").get_json()["deadlines"]
+
+        assert set(stats) == {"pending", "timed_out", "orphaned"}
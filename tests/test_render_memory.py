@@ -0,0 +1,277 @@
+"""
+Tests for memory-aware render concurrency (utils/render_memory.py).
+
+Tests cover:
+1. cgroup v2/v1 memory limit and working-set headroom parsing
+2. Render slots derived from the limit, reserve and observed render peaks
+3. Admission waiting for memory, and giving up at the request deadline
+4. RLIMIT_AS on render children (a runaway child fails on its own)
+5. Renderer workers reporting their peak RSS to the pool
+6. Stress: a saturated render queue under a simulated 1G cgroup never goes
+   past the limit, and concurrency drops when memory gets tight
+
+Run tests:
+    pytest tests/test_render_memory.py -v
+"""
+import io
+import os
+import sys
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import render_memory
+from utils.render_cancel import CancelToken, RenderTimeoutError, run_cancellable
+from utils.render_memory import RenderMemoryBudget
+from utils.render_pool import RendererPool
+from utils.render_scheduler import RenderScheduler
+
+MB = 1024 * 1024
+
+RESUME_YAML = b"""
+contact_info:
+  name: Jane Doe
+sections: []
+"""
+
+
+@pytest.fixture
+def cgroup_root(tmp_path, monkeypatch):
+    v2 = tmp_path / "v2"
+    v1 = tmp_path / "v1"
+    v2.mkdir()
+    v1.mkdir()
+    monkeypatch.setattr(render_memory, "CGROUP_V2_ROOT", str(v2))
+    monkeypatch.setattr(render_memory, "CGROUP_V1_MEMORY_ROOT", str(v1))
+    return v2, v1
+
+
+class TestCgroupReading:
+    """Tests for reading the instance's memory limit and headroom."""
+
+    def test_cgroup_v2_limit_and_working_set(self, cgroup_root):
+        """Verify inactive page cache does not count against headroom."""
+        v2, _ = cgroup_root
+        (v2 / "memory.max").write_text(f"{1024 * MB}\n")
+        (v2 / "memory.current").write_text(f"{600 * MB}\n")
+        (v2 / "memory.stat").write_text(f"anon {400 * MB}\ninactive_file {200 * MB}\n")
+
+        assert render_memory.read_memory_limit_mb() == 1024
+        assert render_memory.read_memory_headroom_mb() == 624
+
+    def test_cgroup_v1_limit(self, cgroup_root):
+        """Verify v1 files are used when there is no v2 hierarchy."""
+        _, v1 = cgroup_root
+        (v1 / "memory.limit_in_bytes").write_text(f"{512 * MB}\n")
+        (v1 / "memory.usage_in_bytes").write_text(f"{128 * MB}\n")
+
+        assert render_memory.read_memory_limit_mb() == 512
+        assert render_memory.read_memory_headroom_mb() == 384
+
+    def test_unlimited_cgroup_falls_back_to_host(self, cgroup_root):
+        """Verify "max" means the host's memory is the limit."""
+        v2, _ = cgroup_root
+        (v2 / "memory.max").write_text("max\n")
+
+        with patch.object(render_memory, "_read_meminfo_mb", return_value=2048.0):
+            assert render_memory.read_memory_limit_mb() == 2048.0
+
+
+class TestRenderMemoryBudget:
+    """Tests for RenderMemoryBudget sizing and admission."""
+
+    def test_slots_from_limit_and_reserve(self):
+        """Verify a 1G container fits three 200MB renders next to Flask."""
+        budget = RenderMemoryBudget(limit_mb=1024, reserve_mb=320, render_mb=200)
+
+        assert budget.slots() == 3
+
+    def test_observed_peaks_shrink_slots(self):
+        """Verify renders heavier than the estimate lower concurrency."""
+        budget = RenderMemoryBudget(limit_mb=1024, reserve_mb=320, render_mb=200)
+
+        budget.observe(350)
+
+        assert budget.slots() == 2
+        assert budget.stats()["render_mb"] == 350
+
+    def test_at_least_one_slot(self):
+        """Verify a tiny container still renders, one at a time."""
+        budget = RenderMemoryBudget(limit_mb=256, reserve_mb=320, render_mb=200)
+        unknown = RenderMemoryBudget(limit_mb=None, max_slots=4)
+
+        assert budget.slots() == 1
+        assert unknown.slots() == 4
+
+    def test_waits_for_headroom(self):
+        """Verify a second render waits until memory is freed."""
+        headroom = {"mb": 100}
+        budget = RenderMemoryBudget(
+            limit_mb=4096, headroom_reader=lambda: headroom["mb"]
+        )
+        budget.acquire()  # the first render is always admitted
+        admitted = threading.Event()
+
+        def second():
+            budget.acquire(poll_interval=0.01)
+            admitted.set()
+
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not admitted.wait(0.1)
+
+        headroom["mb"] = 500
+        assert admitted.wait(2)
+        thread.join()
+        assert budget.stats()["throttled"] == 1
+
+    def test_deadline_while_waiting(self):
+        """Verify a render that never gets memory fails at its deadline."""
+        budget = RenderMemoryBudget(limit_mb=1024, max_slots=1)
+        budget.acquire()
+        token = CancelToken(deadline=time.monotonic() + 0.1)
+
+        with pytest.raises(RenderTimeoutError):
+            budget.acquire(token, poll_interval=0.01)
+        assert budget.active == 1
+
+
+class TestRenderProcessLimits:
+    """Tests for RLIMIT_AS on render children."""
+
+    def test_runaway_child_fails_alone(self):
+        """Verify an allocation past the cap kills only the child's render."""
+        command = [sys.executable, "-c", "x = bytearray(512 * 1024 * 1024)"]
+
+        result = run_cancellable(command, max_address_space_mb=256)
+
+        assert result.returncode != 0
+        assert "MemoryError" in result.stderr
+
+    def test_children_inherit_limit(self):
+        """Verify the cap applies to processes the render process spawns."""
+        script = textwrap.dedent(
+            """
+            import resource, subprocess, sys
+            from utils.render_memory import apply_render_process_limits
+            apply_render_process_limits(300)
+            child = "import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])"
+            subprocess.run([sys.executable, "-c", child])
+            """
+        )
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        result = run_cancellable([sys.executable, "-c", script], cwd=project_root)
+
+        assert result.stdout.strip() == str(300 * MB)
+
+
+class TestRendererPeakReporting:
+    """Tests for per-render peak RSS reaching the budget."""
+
+    def test_pool_forwards_worker_peaks(self):
+        """Verify peak_rss_mb is stripped from responses and observed."""
+        worker = textwrap.dedent(
+            """
+            import json, sys
+            for line in sys.stdin.buffer:
+                header = {"success": True, "size": 0, "peak_rss_mb": 180.5}
+                sys.stdout.buffer.write(json.dumps(header).encode() + b"\\n")
+                sys.stdout.buffer.flush()
+            """
+        )
+        budget = RenderMemoryBudget(limit_mb=1024, reserve_mb=320, render_mb=100)
+        pool = RendererPool(
+            size=1,
+            command=[sys.executable, "-c", worker],
+            on_render_peak=budget.observe,
+        )
+        try:
+            response = pool.render({"template": "modern"})
+        finally:
+            pool.shutdown()
+
+        assert "peak_rss_mb" not in response
+        assert pool.stats()["peak_rss_mb"] == 180.5
+        assert budget.render_mb == 180.5
+
+
+class TestSaturatedQueue:
+    """Stress test: the instance survives a saturated render queue."""
+
+    LIMIT_MB = 1024
+    RENDER_MB = 200
+
+    def test_saturated_queue_stays_within_memory(self, flask_test_client):
+        """Verify 40 concurrent previews never exceed a simulated 1G cgroup."""
+        _, _, flask_app = flask_test_client
+        # Flask and gunicorn; raised halfway through to simulate memory pressure
+        web_mb = {"value": 400}
+        usage = {"peak": 0, "over_limit": 0, "done": 0}
+        lock = threading.Lock()
+
+        budget = RenderMemoryBudget(
+            limit_mb=self.LIMIT_MB,
+            reserve_mb=320,
+            render_mb=self.RENDER_MB,
+            max_slots=5,
+            headroom_reader=lambda: (
+                self.LIMIT_MB - web_mb["value"] - budget.active * self.RENDER_MB
+            ),
+        )
+        # Five dispatch threads: the old, memory-blind configuration
+        scheduler = RenderScheduler(max_workers=5, max_queue=20)
+
+        def fake_worker(template, yaml_data, icons_dir, session_id, cancel_token=None):
+            with lock:
+                used = web_mb["value"] + budget.active * self.RENDER_MB
+                usage["peak"] = max(usage["peak"], used)
+                usage["over_limit"] += used > self.LIMIT_MB
+            time.sleep(0.02)
+            budget.observe(self.RENDER_MB)
+            with lock:
+                usage["done"] += 1
+                if usage["done"] == 10:
+                    web_mb["value"] = 700
+            return {"success": True, "pdf": b"%PDF-1.4"}
+
+        def post(i):
+            client = flask_app.app.test_client()
+            return client.post(
+                "/api/generate?preview=true",
+                data={
+                    "yaml_file": (io.BytesIO(RESUME_YAML), "resume.yml"),
+                    "session_id": f"stress-{i}",
+                    "template": "modern-no-icons",
+                },
+            ).status_code
+
+        try:
+            with patch.object(flask_app, "RENDER_MEMORY", budget), patch.object(
+                flask_app, "PDF_THREAD_POOL", scheduler
+            ), patch.object(flask_app, "PDF_RENDER_POOL", object()), patch.object(
+                flask_app, "PDF_RENDER_MODE", "memory"
+            ), patch.object(
+                flask_app, "pdf_bytes_generation_worker", side_effect=fake_worker
+            ):
+                with ThreadPoolExecutor(max_workers=40) as executor:
+                    statuses = list(executor.map(post, range(40)))
+                health = flask_app.app.test_client().get("/health")
+        finally:
+            scheduler.shutdown(wait=True)
+
+        assert set(statuses) <= {200, 429}
+        assert statuses.count(200) >= 10
+        assert usage["over_limit"] == 0
+        assert usage["peak"] <= self.LIMIT_MB
+        assert budget.peak_active <= 3
+        assert budget.throttled > 0
+        assert budget.active == 0
+        assert health.status_code == 200
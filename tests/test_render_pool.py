@@ -0,0 +1,317 @@
+"""
+Tests for the persistent renderer worker pool (utils/render_pool.py).
+
+Tests cover:
+1. Job round-trips through a pooled worker
+2. Worker reuse and recycling after N jobs
+3. Crash handling and replacement of dead workers
+4. resume_generator.py --serve protocol (error path, no wkhtmltopdf needed)
+5. pdf_generation_worker routing through the pool
+6. In-memory rendering (render_html_pdf) and its file-based fallback
+
+Run tests:
+    pytest tests/test_render_pool.py -v
+"""
+import os
+import sys
+import textwrap
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_pool import RendererPool, read_process_rss_mb
+
+
+# Minimal stand-in for `resume_generator.py --serve`: echoes its pid and
+# exits when asked to crash.
+FAKE_WORKER_SCRIPT = textwrap.dedent(
+    """
+    import json, os, sys
+    out = sys.stdout.buffer
+    for line in sys.stdin.buffer:
+        job = json.loads(line)
+        if job.get("crash"):
+            sys.exit(1)
+        body = job.get("echo", "").encode()
+        header = {"success": True, "pid": os.getpid(), "size": len(body)}
+        out.write(json.dumps(header).encode() + b"\\n" + body)
+        out.flush()
+    """
+)
+
+
+@pytest.fixture
+def fake_pool():
+    """Create a pool backed by the fake worker script."""
+    pools = []
+
+    def _make(**kwargs):
+        kwargs.setdefault("size", 1)
+        pool = RendererPool(
+            command=[sys.executable, "-c", FAKE_WORKER_SCRIPT], **kwargs
+        )
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.shutdown()
+
+
+class TestRendererPool:
+    """Tests for RendererPool mechanics."""
+
+    def test_pool_prefork_starts_workers(self, fake_pool):
+        """Verify workers are started up front."""
+        pool = fake_pool(size=2)
+
+        stats = pool.stats()
+        assert stats["live_workers"] == 2
+        assert stats["idle_workers"] == 2
+
+    def test_render_returns_worker_response(self, fake_pool):
+        """Verify a job round-trips through a worker."""
+        pool = fake_pool()
+
+        result = pool.render({"template": "modern"})
+
+        assert result["success"] is True
+
+    def test_render_returns_binary_payload(self, fake_pool):
+        """Verify in-memory payloads are read back after the header line."""
+        pool = fake_pool()
+
+        result = pool.render({"echo": "%PDF-1.4\nbody"})
+
+        assert result["pdf"] == b"%PDF-1.4\nbody"
+        assert "size" not in result
+
+    def test_render_serialises_dates(self, fake_pool):
+        """Verify YAML-parsed dates in inline data don't break the protocol."""
+        import datetime
+
+        pool = fake_pool()
+
+        result = pool.render({"data": {"dates": datetime.date(2020, 1, 1)}})
+
+        assert result["success"] is True
+
+    def test_worker_is_reused_between_jobs(self, fake_pool):
+        """Verify the same warm process serves consecutive jobs."""
+        pool = fake_pool(max_jobs_per_worker=10)
+
+        first = pool.render({})
+        second = pool.render({})
+
+        assert first["pid"] == second["pid"]
+
+    def test_worker_recycled_after_max_jobs(self, fake_pool):
+        """Verify a worker is replaced once it reaches its job budget."""
+        pool = fake_pool(max_jobs_per_worker=2)
+
+        pids = [pool.render({})["pid"] for _ in range(3)]
+
+        assert pids[0] == pids[1]
+        assert pids[2] != pids[0]
+        assert pool.stats()["workers_recycled"] == 1
+
+    def test_worker_crash_returns_error_and_is_replaced(self, fake_pool):
+        """Verify a crashed worker yields an error dict and a fresh worker."""
+        pool = fake_pool()
+
+        crashed = pool.render({"crash": True})
+        recovered = pool.render({})
+
+        assert crashed["success"] is False
+        assert "exited unexpectedly" in crashed["error"]
+        assert recovered["success"] is True
+        assert pool.stats()["live_workers"] == 1
+
+    def test_concurrent_renders_share_bounded_workers(self, fake_pool):
+        """Verify concurrent callers never use more workers than the pool size."""
+        pool = fake_pool(size=2, max_jobs_per_worker=100)
+        pids = set()
+        lock = threading.Lock()
+
+        def run():
+            result = pool.render({})
+            with lock:
+                pids.add(result["pid"])
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+
+        assert 1 <= len(pids) <= 2
+
+    def test_invalid_size_rejected(self):
+        """Verify a pool needs at least one worker."""
+        with pytest.raises(ValueError):
+            RendererPool(size=0, prefork=False)
+
+    def test_render_after_shutdown_raises(self, fake_pool):
+        """Verify the pool refuses work once shut down."""
+        pool = fake_pool()
+        pool.shutdown()
+
+        with pytest.raises(RuntimeError):
+            pool.render({})
+
+    def test_read_process_rss_for_current_process(self):
+        """Verify RSS probe returns a non-negative number."""
+        assert read_process_rss_mb(os.getpid()) >= 0.0
+
+
+class TestResumeGeneratorServeMode:
+    """Tests for the resume_generator.py --serve worker protocol."""
+
+    def test_serve_reports_missing_input_as_error(self, tmp_path):
+        """Verify a bad job is answered with an error, and the worker survives."""
+        pool = RendererPool(size=1)
+        try:
+            job = {
+                "template": "modern",
+                "input": "/nonexistent/resume.yml",
+                "output": str(tmp_path / "out.pdf"),
+                "session_icons_dir": str(tmp_path),
+                "session_id": "serve-test",
+            }
+
+            first = pool.render(job)
+            second = pool.render(job)
+
+            assert first["success"] is False
+            assert "No such file" in first["error"]
+            assert second["success"] is False
+            assert pool.stats()["workers_recycled"] == 0
+        finally:
+            pool.shutdown()
+
+    def test_serve_rejects_non_mapping_inline_data(self, tmp_path):
+        """Verify inline data must be a dictionary."""
+        pool = RendererPool(size=1)
+        try:
+            result = pool.render(
+                {
+                    "template": "modern",
+                    "data": ["not", "a", "resume"],
+                    "output": None,
+                    "session_icons_dir": str(tmp_path),
+                    "session_id": "serve-test",
+                }
+            )
+
+            assert result["success"] is False
+            assert "pdf" not in result
+        finally:
+            pool.shutdown()
+
+
+class TestPdfGenerationWorkerUsesPool:
+    """Tests for pdf_generation_worker routing through PDF_RENDER_POOL."""
+
+    def test_worker_dispatches_to_render_pool(self, monkeypatch, tmp_path):
+        """Verify the job is sent to the pool instead of a new subprocess."""
+        import app
+
+        output_path = tmp_path / "out.pdf"
+        jobs = []
+
+        class StubPool:
+            def render(self, job, cancel_token=None):
+                jobs.append(job)
+                Path(job["output"]).write_bytes(b"%PDF-1.4 stub")
+                return {"success": True}
+
+        monkeypatch.setattr(app, "PDF_RENDER_POOL", StubPool())
+
+        result = app.pdf_generation_worker(
+            "modern", tmp_path / "in.yml", output_path, tmp_path, "sess-1"
+        )
+
+        assert result == {"success": True, "output": str(output_path)}
+        assert jobs[0]["template"] == "modern"
+        assert jobs[0]["session_id"] == "sess-1"
+
+    def test_worker_reports_pool_failure(self, monkeypatch, tmp_path):
+        """Verify pool errors surface as error dicts."""
+        import app
+
+        class FailingPool:
+            def render(self, job, cancel_token=None):
+                return {"success": False, "error": "boom"}
+
+        monkeypatch.setattr(app, "PDF_RENDER_POOL", FailingPool())
+
+        result = app.pdf_generation_worker(
+            "modern", tmp_path / "in.yml", tmp_path / "out.pdf", tmp_path, "sess-2"
+        )
+
+        assert result["success"] is False
+        assert "boom" in result["error"]
+
+
+class TestRenderHtmlPdf:
+    """Tests for in-memory HTML rendering and the file-based fallback."""
+
+    def test_memory_mode_sends_inline_data(self, monkeypatch, tmp_path):
+        """Verify memory mode passes the data inline and returns the bytes."""
+        import app
+
+        jobs = []
+
+        class StubPool:
+            def render(self, job, cancel_token=None):
+                jobs.append(job)
+                return {"success": True, "pdf": b"%PDF-1.4 memory"}
+
+        monkeypatch.setattr(app, "PDF_RENDER_MODE", "memory")
+        monkeypatch.setattr(app, "PDF_RENDER_POOL", StubPool())
+
+        pdf = app.render_html_pdf("modern", {"contact_info": {}}, tmp_path, "sess-3")
+
+        assert pdf == b"%PDF-1.4 memory"
+        assert jobs[0]["data"] == {"contact_info": {}}
+        assert jobs[0]["output"] is None
+        assert "input" not in jobs[0]
+
+    def test_memory_mode_empty_pdf_raises(self, monkeypatch, tmp_path):
+        """Verify an empty payload is reported as a failure."""
+        import app
+
+        class EmptyPool:
+            def render(self, job, cancel_token=None):
+                return {"success": True}
+
+        monkeypatch.setattr(app, "PDF_RENDER_MODE", "memory")
+        monkeypatch.setattr(app, "PDF_RENDER_POOL", EmptyPool())
+
+        with pytest.raises(RuntimeError, match="empty PDF"):
+            app.render_html_pdf("modern", {}, tmp_path, "sess-4")
+
+    def test_file_mode_uses_yaml_and_output_paths(self, monkeypatch, tmp_path):
+        """Verify file mode falls back to the YAML-in, PDF-out worker path."""
+        import app
+
+        jobs = []
+
+        class StubPool:
+            def render(self, job, cancel_token=None):
+                jobs.append(job)
+                Path(job["output"]).write_bytes(b"%PDF-1.4 file")
+                return {"success": True}
+
+        monkeypatch.setattr(app, "PDF_RENDER_MODE", "file")
+        monkeypatch.setattr(app, "PDF_RENDER_POOL", StubPool())
+
+        pdf = app.render_html_pdf("modern", {"contact_info": {}}, tmp_path, "sess-5")
+
+        assert pdf == b"%PDF-1.4 file"
+        assert jobs[0]["input"].endswith("resume.yaml")
+        assert not Path(jobs[0]["output"]).exists()  # temp dir cleaned up
@@ -0,0 +1,222 @@
+"""
+Tests for the bounded render scheduler (utils/render_scheduler.py).
+
+Tests cover:
+1. Interactive jobs running ahead of queued background jobs
+2. Admission control: queue limit and the background lane cap
+3. Queue depth and wait-time stats
+4. 429 + Retry-After from the PDF endpoints when the queue is full
+5. Thumbnail renders submitted on the background lane
+
+Run tests:
+    pytest tests/test_render_scheduler.py -v
+"""
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import create_mock_response, TEST_USER_ID, TEST_RESUME_ID
+from utils.render_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RenderQueueFullError,
+    RenderScheduler,
+)
+
+
+@pytest.fixture
+def blocked_scheduler():
+    """A one-worker scheduler whose worker is held busy until released."""
+    scheduler = RenderScheduler(max_workers=1, max_queue=4, max_background_queue=2)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit(block)
+    assert started.wait(5)
+    yield scheduler, release
+    release.set()
+    scheduler.shutdown(wait=True)
+
+
+class TestRenderScheduler:
+    """Tests for RenderScheduler ordering, admission and stats."""
+
+    def test_submit_returns_future_result(self):
+        """Verify submitted callables run and resolve their future."""
+        scheduler = RenderScheduler(max_workers=2, max_queue=2)
+        try:
+            future = scheduler.submit(lambda a, b=0: a + b, 2, b=3)
+            assert future.result(timeout=5) == 5
+        finally:
+            scheduler.shutdown(wait=True)
+
+    def test_exceptions_propagate_through_future(self):
+        """Verify a failing job surfaces its exception to the caller."""
+        scheduler = RenderScheduler(max_workers=1, max_queue=1)
+
+        def fail():
+            raise ValueError("boom")
+
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                scheduler.submit(fail).result(timeout=5)
+        finally:
+            scheduler.shutdown(wait=True)
+
+    def test_interactive_runs_before_queued_background(self, blocked_scheduler):
+        """Verify interactive jobs jump ahead of background jobs already queued."""
+        scheduler, release = blocked_scheduler
+        order = []
+
+        background = scheduler.submit(
+            order.append, "thumb", priority=PRIORITY_BACKGROUND
+        )
+        interactive = scheduler.submit(order.append, "download")
+        release.set()
+        background.result(timeout=5)
+        interactive.result(timeout=5)
+
+        assert order == ["download", "thumb"]
+
+    def test_full_queue_rejects_with_retry_after(self, blocked_scheduler):
+        """Verify submissions beyond max_queue are refused."""
+        scheduler, _ = blocked_scheduler
+        for _ in range(4):
+            scheduler.submit(lambda: None)
+
+        with pytest.raises(RenderQueueFullError) as exc_info:
+            scheduler.submit(lambda: None)
+
+        assert exc_info.value.retry_after >= 1
+        assert scheduler.stats()["rejected"]["interactive"] == 1
+
+    def test_background_lane_cannot_fill_queue(self, blocked_scheduler):
+        """Verify thumbnails are capped while interactive jobs still get in."""
+        scheduler, _ = blocked_scheduler
+        scheduler.submit(lambda: None, priority=PRIORITY_BACKGROUND)
+        scheduler.submit(lambda: None, priority=PRIORITY_BACKGROUND)
+
+        with pytest.raises(RenderQueueFullError):
+            scheduler.submit(lambda: None, priority=PRIORITY_BACKGROUND)
+        scheduler.submit(lambda: None, priority=PRIORITY_INTERACTIVE)
+
+        stats = scheduler.stats()
+        assert stats["rejected"]["background"] == 1
+        assert stats["queued"] == {"interactive": 1, "background": 2}
+
+    def test_stats_report_depth_and_wait(self, blocked_scheduler):
+        """Verify queue depth, active count and wait times are exposed."""
+        scheduler, release = blocked_scheduler
+        # The scheduler's clock jumps 50ms before the worker is released, so
+        # the queued job's wait never rounds down to 0.0ms
+        skew = [0.0]
+        clock = MagicMock(monotonic=lambda: time.monotonic() + skew[0])
+        with patch("utils.render_scheduler.time", clock):
+            future = scheduler.submit(lambda: None)
+
+            stats = scheduler.stats()
+            assert stats["active"] == 1
+            assert stats["queue_depth"] == 1
+
+            skew[0] = 0.05
+            release.set()
+            future.result(timeout=5)
+        stats = scheduler.stats()
+        assert stats["completed"] >= 1
+        assert stats["wait_ms"]["max"] > 0
+
+    def test_shutdown_drains_queue_and_refuses_new_work(self):
+        """Verify shutdown(wait=True) finishes queued jobs first."""
+        scheduler = RenderScheduler(max_workers=1, max_queue=5)
+        results = []
+        futures = [scheduler.submit(results.append, i) for i in range(3)]
+
+        scheduler.shutdown(wait=True)
+
+        assert all(f.done() for f in futures)
+        assert results == [0, 1, 2]
+        with pytest.raises(RuntimeError):
+            scheduler.submit(lambda: None)
+
+
+class TestRenderQueueFullResponses:
+    """Tests for back-pressure in the PDF endpoints."""
+
+    def _mock_auth(self, mock_sb):
+        mock_user = MagicMock()
+        mock_user.id = TEST_USER_ID
+        mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+
+    def test_saved_resume_pdf_returns_429(
+        self, flask_test_client, auth_headers, sample_resume_data
+    ):
+        """Verify a rejected download answers 429 with Retry-After."""
+        client, mock_sb, flask_app = flask_test_client
+        self._mock_auth(mock_sb)
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app,
+            "render_html_pdf",
+            side_effect=RenderQueueFullError("Render queue is full", 7),
+        ):
+            response = client.post(
+                f"/api/resumes/{TEST_RESUME_ID}/pdf", headers=auth_headers
+            )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "7"
+        assert response.get_json()["retryable"] is True
+
+    def test_thumbnail_renders_on_background_lane(
+        self, flask_test_client, auth_headers, sample_resume_data
+    ):
+        """Verify thumbnails are submitted with background priority."""
+        client, mock_sb, flask_app = flask_test_client
+        self._mock_auth(mock_sb)
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response([sample_resume_data]),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app,
+            "render_html_pdf",
+            side_effect=RenderQueueFullError("Render queue is full", 3),
+        ) as render:
+            response = client.post(
+                f"/api/resumes/{TEST_RESUME_ID}/thumbnail", headers=auth_headers
+            )
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+        assert render.call_args.kwargs["priority"] == PRIORITY_BACKGROUND
+
+    def test_stats_endpoint_includes_scheduler(self, flask_test_client):
+        """Verify queue depth and wait stats are served for instance sizing."""
+        client, _, flask_app = flask_test_client
+        scheduler = RenderScheduler(max_workers=1, max_queue=3)
+        try:
+            with patch.object(flask_app, "PDF_THREAD_POOL", scheduler):
+                response = client.get("/api/render/stats")
+        finally:
+            scheduler.shutdown(wait=True)
+
+        stats = response.get_json()["scheduler"]
+        assert stats["max_queue"] == 3
+        assert stats["queue_depth"] == 0
+        assert "p95" in stats["wait_ms"]
@@ -0,0 +1,266 @@
+"""
+Tests for batch export of saved resumes (POST /api/resumes/export).
+
+Tests cover:
+1. Streaming a ZIP with one PDF per (resume, template) pair
+2. Template overrides, including several templates for one resume
+3. Icons downloaded once per resume across templates
+4. Failed items reported in export-errors.json
+5. Cached PDFs used without rendering; misses not linearized
+6. Request validation (missing resumes, bad templates, item limit)
+7. utils/zip_stream.py producing valid archives incrementally
+
+Run tests:
+    pytest tests/test_resume_export.py -v
+"""
+import io
+import json
+import os
+import sys
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import create_mock_response, TEST_USER_ID, TEST_RESUME_ID
+from utils.pdf_cache import PdfCache
+from utils.zip_stream import iter_zip
+
+SECOND_RESUME_ID = "660e8400-e29b-41d4-a716-446655440001"
+
+
+@pytest.fixture
+def export_client(flask_test_client, sample_resume_data):
+    """Authenticated client plus two saved resumes."""
+    client, mock_sb, flask_app = flask_test_client
+    mock_user = MagicMock()
+    mock_user.id = TEST_USER_ID
+    mock_sb.auth.get_user.return_value = MagicMock(user=mock_user)
+    second = {
+        **sample_resume_data,
+        "id": SECOND_RESUME_ID,
+        "title": "Second Resume",
+        "template_id": "classic",
+    }
+    return client, mock_sb, flask_app, [sample_resume_data, second]
+
+
+def read_zip(response):
+    return zipfile.ZipFile(io.BytesIO(response.get_data()))
+
+
+class TestExportResumes:
+    """Tests for POST /api/resumes/export."""
+
+    def test_exports_each_resume_in_its_template(self, export_client, auth_headers):
+        """Verify every requested resume is rendered into the archive."""
+        client, mock_sb, flask_app, resumes = export_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4 html"
+        ), patch.object(flask_app, "generate_latex_pdf", return_value=b"%PDF-1.4 tex"):
+            response = client.post(
+                "/api/resumes/export",
+                json={"resume_ids": [TEST_RESUME_ID, SECOND_RESUME_ID]},
+                headers=auth_headers,
+            )
+            archive = read_zip(response)
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/zip"
+        assert sorted(archive.namelist()) == [
+            "Second_Resume-classic.pdf",
+            "Test_Resume-modern-with-icons.pdf",
+        ]
+        assert archive.read("Second_Resume-classic.pdf") == b"%PDF-1.4 tex"
+
+    def test_template_overrides_render_several_templates(
+        self, export_client, auth_headers, sample_icon_data
+    ):
+        """Verify overrides fan one resume out and icons are fetched once."""
+        client, mock_sb, flask_app, resumes = export_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes[:1]),
+            create_mock_response([sample_icon_data]),
+        ]
+
+        with patch.object(
+            flask_app, "download_icon_from_storage", return_value=True
+        ) as download, patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4 html"
+        ), patch.object(
+            flask_app, "generate_latex_pdf", return_value=b"%PDF-1.4 tex"
+        ):
+            response = client.post(
+                "/api/resumes/export",
+                json={
+                    "resume_ids": [TEST_RESUME_ID],
+                    "template_overrides": {
+                        TEST_RESUME_ID: ["modern-no-icons", "classic"]
+                    },
+                },
+                headers=auth_headers,
+            )
+            archive = read_zip(response)
+
+        assert sorted(archive.namelist()) == [
+            "Test_Resume-classic.pdf",
+            "Test_Resume-modern-no-icons.pdf",
+        ]
+        assert download.call_count == 1
+
+    def test_cached_item_not_rendered(self, export_client, auth_headers, tmp_path):
+        """Verify a cached PDF goes into the archive without a render."""
+        client, mock_sb, flask_app, resumes = export_client
+        cache = PdfCache(tmp_path, max_bytes=1024 * 1024)
+        cache.put(
+            flask_app.saved_resume_cache_key(resumes[0], [], "modern"),
+            b"%PDF-1.4 cached",
+        )
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes),
+            create_mock_response([]),
+        ]
+
+        with patch.object(flask_app, "PDF_CACHE", cache), patch.object(
+            flask_app, "render_resume_pdf", return_value=b"%PDF-1.4 rendered"
+        ) as render, patch.object(flask_app, "linearize_pdf") as linearize:
+            response = client.post(
+                "/api/resumes/export",
+                json={"resume_ids": [TEST_RESUME_ID, SECOND_RESUME_ID]},
+                headers=auth_headers,
+            )
+            archive = read_zip(response)
+
+        assert archive.read("Test_Resume-modern-with-icons.pdf") == b"%PDF-1.4 cached"
+        assert archive.read("Second_Resume-classic.pdf") == b"%PDF-1.4 rendered"
+        # Only the uncached classic resume is rendered, and it is not linearized
+        assert render.call_count == 1
+        assert render.call_args.args[0] == "classic"
+        linearize.assert_not_called()
+
+    def test_failed_items_listed_in_error_file(self, export_client, auth_headers):
+        """Verify a failing render does not abort the rest of the export."""
+        client, mock_sb, flask_app, resumes = export_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes),
+            create_mock_response([]),
+        ]
+
+        with patch.object(
+            flask_app, "render_html_pdf", return_value=b"%PDF-1.4 html"
+        ), patch.object(
+            flask_app, "generate_latex_pdf", side_effect=RuntimeError("xelatex died")
+        ):
+            response = client.post(
+                "/api/resumes/export",
+                json={"resume_ids": [TEST_RESUME_ID, SECOND_RESUME_ID]},
+                headers=auth_headers,
+            )
+            archive = read_zip(response)
+
+        assert "Test_Resume-modern-with-icons.pdf" in archive.namelist()
+        errors = json.loads(archive.read("export-errors.json"))
+        assert errors == [
+            {
+                "resume_id": SECOND_RESUME_ID,
+                "template_id": "classic",
+                "error": "Failed to generate PDF",
+            }
+        ]
+
+    def test_missing_resume_returns_404(self, export_client, auth_headers):
+        """Verify unknown or foreign resume ids are reported."""
+        client, mock_sb, _, resumes = export_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes[:1]),
+        ]
+
+        response = client.post(
+            "/api/resumes/export",
+            json={"resume_ids": [TEST_RESUME_ID, SECOND_RESUME_ID]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 404
+        assert response.get_json()["missing_resume_ids"] == [SECOND_RESUME_ID]
+
+    def test_invalid_template_override_returns_400(self, export_client, auth_headers):
+        """Verify overrides must name known templates."""
+        client, mock_sb, _, resumes = export_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes[:1]),
+            create_mock_response([]),
+        ]
+
+        response = client.post(
+            "/api/resumes/export",
+            json={
+                "resume_ids": [TEST_RESUME_ID],
+                "template_overrides": {TEST_RESUME_ID: "nope"},
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    def test_item_limit_enforced(self, export_client, auth_headers):
+        """Verify exports larger than EXPORT_MAX_ITEMS are refused."""
+        client, mock_sb, flask_app, resumes = export_client
+        mock_sb.table.return_value.execute.side_effect = [
+            create_mock_response(resumes),
+            create_mock_response([]),
+        ]
+
+        with patch.object(flask_app, "EXPORT_MAX_ITEMS", 1):
+            response = client.post(
+                "/api/resumes/export",
+                json={"resume_ids": [TEST_RESUME_ID, SECOND_RESUME_ID]},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 400
+
+    def test_requires_resume_ids(self, export_client, auth_headers):
+        """Verify the request body is validated."""
+        client, _, _, _ = export_client
+
+        response = client.post(
+            "/api/resumes/export", json={"resume_ids": []}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+
+class TestZipStream:
+    """Tests for utils/zip_stream.iter_zip."""
+
+    def test_archive_is_valid(self):
+        """Verify the concatenated chunks form a readable ZIP."""
+        data = b"".join(iter_zip([("a.pdf", b"%PDF-1.4 a"), ("b.pdf", b"%PDF b")]))
+
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        assert archive.testzip() is None
+        assert archive.read("b.pdf") == b"%PDF b"
+
+    def test_members_are_streamed_incrementally(self):
+        """Verify a member is emitted before the next one is produced."""
+        produced = []
+
+        def members():
+            for name in ("one.pdf", "two.pdf"):
+                produced.append(name)
+                yield name, b"x" * 100
+
+        chunks = iter_zip(members())
+        first = next(chunks)
+
+        assert produced == ["one.pdf"]
+        assert b"one.pdf" in first
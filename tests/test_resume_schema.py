@@ -0,0 +1,203 @@
+"""
+Tests for the resume schema pre-flight (utils/resume_schema.py).
+
+Tests cover:
+1. Sample and template resumes passing validation
+2. Field-level errors for bad contact_info, section content and items
+3. Section types and social_links filled in by the same pass
+4. Render endpoints answering 400 with field errors before staging or rendering
+
+Run tests:
+    pytest tests/test_resume_schema.py -v
+"""
+import io
+import os
+import sys
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_schema import ResumeValidationError, validate_resume
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+CONTACT = {"name": "Jane Doe", "email": "jane@example.com"}
+
+
+def errors(data, **kwargs):
+    with pytest.raises(ResumeValidationError) as exc_info:
+        validate_resume(data, **kwargs)
+    return {error["field"]: error["message"] for error in exc_info.value.errors}
+
+
+class TestValidateResume:
+    """Tests for validate_resume."""
+
+    @pytest.mark.parametrize(
+        "path",
+        sorted(PROJECT_ROOT.glob("samples/*/*.yml"))
+        + sorted(PROJECT_ROOT.glob("templates/*.yml")),
+        ids=lambda path: path.name,
+    )
+    def test_shipped_resumes_valid(self, path):
+        """Verify every sample and template resume passes unchanged in shape."""
+        data = yaml.safe_load(path.read_text())
+        if "sections" not in data:
+            pytest.skip("not a resume")
+
+        assert validate_resume(data) is data
+
+    def test_scalars_accepted_as_text(self):
+        """Verify numbers and dates YAML parses from plain text are accepted."""
+        data = {
+            "contact_info": dict(CONTACT, phone=5551234),
+            "sections": [
+                {
+                    "type": "education",
+                    "content": [{"degree": "BSc", "year": 2020}],
+                },
+                {
+                    "type": "experience",
+                    "content": [{"dates": date(2020, 1, 1), "description": "One"}],
+                },
+                {"name": "Notes", "content": {"anything": ["goes"]}},
+            ],
+        }
+
+        validate_resume(data)
+
+    def test_field_level_errors(self):
+        """Verify each problem is reported with the path of its field."""
+        data = {
+            "contact_info": {"name": "Jane", "social_links": [{"url": 42}]},
+            "sections": [
+                {"name": "Experience", "content": "Worked at Acme"},
+                {"type": "dynamic-column-list", "content": "Python, SQL"},
+                {"type": "text", "content": ["not", "text"]},
+                "Skills",
+                {"type": "icon-list", "content": [{"certification": {"a": 1}}]},
+            ],
+        }
+
+        assert errors(data) == {
+            "contact_info.social_links.0.url": "Input should be a valid string",
+            "sections.0.content": "Input should be a valid list",
+            "sections.1.content": "Input should be a valid list",
+            "sections.2.content": "Input should be text, not a list",
+            "sections.3": "Input should be a valid dictionary",
+            "sections.4.content.0.certification": "Input should be text, not a mapping",
+        }
+
+    def test_contact_info_required_for_html_templates(self):
+        """Verify a missing contact_info only fails when it is required."""
+        assert errors({"sections": []}) == {
+            "contact_info": "No contact information provided"
+        }
+        assert errors({"contact_info": "Jane"}, require_contact_info=False) == {
+            "contact_info": "Input should be a valid dictionary"
+        }
+
+        validate_resume({"sections": []}, require_contact_info=False)
+
+    def test_document_upgraded_in_place(self):
+        """Verify section types and social_links are filled in by the same pass."""
+        data = {
+            "contact_info": dict(CONTACT, linkedin="linkedin.com/in/jane-doe"),
+            "sections": [
+                {"name": "EXPERIENCE", "content": []},
+                {"name": "Education", "type": "text", "content": "Self-taught"},
+            ],
+        }
+
+        validate_resume(data)
+
+        assert data["sections"][0]["type"] == "experience"
+        assert data["sections"][1]["type"] == "text"
+        assert data["contact_info"]["social_links"] == [
+            {
+                "platform": "linkedin",
+                "url": "linkedin.com/in/jane-doe",
+                "display_text": "",
+            }
+        ]
+
+    def test_error_message_summarizes(self):
+        """Verify the exception message names the first field and the count."""
+        sections = [{"type": "text", "content": [i]} for i in range(30)]
+
+        with pytest.raises(ResumeValidationError) as exc_info:
+            validate_resume({"contact_info": CONTACT, "sections": sections})
+
+        assert str(exc_info.value) == (
+            "Invalid resume: sections.0.content: Input should be text, not a list "
+            "(and 20 more)"
+        )
+        assert exc_info.value.errors[-1]["message"] == "10 more errors not shown"
+
+
+BAD_YAML = b"""
+contact_info:
+  name: Jane Doe
+sections:
+  - name: Skills
+    type: dynamic-column-list
+    content: Python, SQL
+"""
+
+
+class TestRenderPreflight:
+    """Tests for the pre-flight on the render endpoints."""
+
+    @pytest.mark.parametrize(
+        "url, fields",
+        [
+            ("/api/generate", {"template": "modern-with-icons"}),
+            ("/api/generate/multi", {"templates": "modern-no-icons,classic"}),
+            ("/api/preview/html", {"template": "modern-no-icons"}),
+            ("/api/layout/estimate", {"template": "classic"}),
+        ],
+    )
+    def test_rejected_before_staging(self, flask_test_client, url, fields):
+        """Verify malformed resumes get field errors without a render."""
+        client, _, flask_app = flask_test_client
+        data = dict(
+            fields,
+            yaml_file=(io.BytesIO(BAD_YAML), "resume.yml"),
+            session_id="preflight",
+        )
+
+        with patch.object(flask_app, "_stage_request_icons") as stage, patch.object(
+            flask_app, "render_resume_pdf"
+        ) as render:
+            response = client.post(url, data=data)
+
+        assert response.status_code == 400
+        body = response.get_json()
+        assert body["success"] is False
+        assert body["errors"] == [
+            {"field": "sections.0.content", "message": "Input should be a valid list"}
+        ]
+        stage.assert_not_called()
+        render.assert_not_called()
+
+    def test_classic_renders_without_contact_info(self, flask_test_client):
+        """Verify LaTeX-only renders do not require contact_info."""
+        client, _, flask_app = flask_test_client
+
+        with patch.object(flask_app, "render_resume_pdf", return_value=b"%PDF-1.4"):
+            response = client.post(
+                "/api/generate",
+                data={
+                    "yaml_file": (io.BytesIO(b"sections: []"), "resume.yml"),
+                    "session_id": "preflight",
+                    "template": "classic",
+                },
+            )
+
+        assert response.status_code == 200
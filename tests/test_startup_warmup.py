@@ -0,0 +1,100 @@
+"""
+Tests for startup timing and the optional warm-up render (STARTUP_WARMUP).
+
+Tests cover:
+1. Startup steps timed and reported in /api/render/stats
+2. The warm-up rendering one modern and one classic sample
+3. /health answering 503 until the warm-up is done, even when it fails
+
+Run tests:
+    pytest tests/test_startup_warmup.py -v
+"""
+import os
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def not_ready(flask_test_client):
+    """The app as it is while the warm-up is still running."""
+    _, _, flask_app = flask_test_client
+    with patch.object(flask_app, "STARTUP_READY", threading.Event()), patch.dict(
+        flask_app.STARTUP_TIMINGS
+    ):
+        yield flask_app
+
+
+class TestStartupTimings:
+    """Tests for run_startup_step."""
+
+    def test_step_timed(self, flask_test_client):
+        """Verify a step's result is returned and its duration recorded."""
+        _, _, flask_app = flask_test_client
+
+        with patch.dict(flask_app.STARTUP_TIMINGS):
+            assert flask_app.run_startup_step("test_step", lambda: 42) == 42
+            assert flask_app.STARTUP_TIMINGS["test_step"] >= 0
+
+    def test_init_steps_in_render_stats(self, flask_test_client):
+        """Verify the import-time steps are reported with the render stats."""
+        client, _, _ = flask_test_client
+
+        startup = client.get("/api/render/stats").get_json()["startup"]
+
+        assert startup["ready"] is True
+        assert {"pdf_pool", "renderer_pool", "latex_templates"} <= set(
+            startup["timings_ms"]
+        )
+
+
+class TestStartupWarmUp:
+    """Tests for warm_up_renders and /health."""
+
+    def test_health_warming_until_ready(self, flask_test_client, not_ready):
+        """Verify /health answers 503 while warming and 200 once ready."""
+        client, _, _ = flask_test_client
+
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert response.get_json() == {"status": "warming"}
+
+        not_ready.STARTUP_READY.set()
+        assert client.get("/health").status_code == 200
+
+    def test_renders_modern_and_classic_samples(self, not_ready):
+        """Verify one sample per template family is rendered in the background."""
+        with patch.object(not_ready, "render_resume_pdf") as render:
+            not_ready.warm_up_renders()
+
+        templates = [call.args[0] for call in render.call_args_list]
+        assert templates == ["modern", "classic"]
+        for call in render.call_args_list:
+            assert call.kwargs["priority"] == not_ready.PRIORITY_BACKGROUND
+        assert not_ready.STARTUP_READY.is_set()
+        assert {"warmup_modern", "warmup_classic"} <= set(not_ready.STARTUP_TIMINGS)
+
+    def test_failed_render_still_ready(self, not_ready):
+        """Verify a failing warm-up render does not keep the app unready."""
+        with patch.object(
+            not_ready, "render_resume_pdf", side_effect=RuntimeError("no xelatex")
+        ) as render:
+            not_ready.warm_up_renders()
+
+        assert render.call_count == 2
+        assert not_ready.STARTUP_READY.is_set()
+
+    def test_disabled_ready_immediately(self, not_ready):
+        """Verify nothing is rendered when STARTUP_WARMUP is off."""
+        with patch.object(not_ready, "STARTUP_WARMUP", False), patch.object(
+            not_ready, "render_resume_pdf"
+        ) as render:
+            not_ready.start_warm_up()
+
+        assert not_ready.STARTUP_READY.is_set()
+        render.assert_not_called()
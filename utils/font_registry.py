@@ -0,0 +1,195 @@
+"""
+Local font registry for the HTML (wkhtmltopdf) templates.
+
+The modern template used to pull the resume font from fonts.googleapis.com on
+every render. Fonts are now installed in the image (see the Dockerfile) and
+served to wkhtmltopdf through ``@font-face`` rules with ``file://`` URLs, so
+rendering never waits on the network.
+
+The ``font`` value from the resume YAML is looked up case-insensitively in
+FONT_REGISTRY. Proprietary families (Arial, Calibri, Tahoma, ...) map to
+metric-compatible open fonts under the name the resume asked for, so layout
+is unchanged.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_FONT = "Arial"
+
+# Where installed font files are searched for (os.pathsep separated)
+FONT_DIRS = os.getenv(
+    "FONT_DIRS", os.pathsep.join(["/usr/share/fonts", "/usr/local/share/fonts"])
+)
+
+# Font files per (weight, style); filenames are looked up in FONT_DIRS
+LIBERATION_SANS = {
+    ("normal", "normal"): "LiberationSans-Regular.ttf",
+    ("bold", "normal"): "LiberationSans-Bold.ttf",
+    ("normal", "italic"): "LiberationSans-Italic.ttf",
+    ("bold", "italic"): "LiberationSans-BoldItalic.ttf",
+}
+LIBERATION_SERIF = {
+    ("normal", "normal"): "LiberationSerif-Regular.ttf",
+    ("bold", "normal"): "LiberationSerif-Bold.ttf",
+    ("normal", "italic"): "LiberationSerif-Italic.ttf",
+    ("bold", "italic"): "LiberationSerif-BoldItalic.ttf",
+}
+LIBERATION_MONO = {
+    ("normal", "normal"): "LiberationMono-Regular.ttf",
+    ("bold", "normal"): "LiberationMono-Bold.ttf",
+    ("normal", "italic"): "LiberationMono-Italic.ttf",
+    ("bold", "italic"): "LiberationMono-BoldItalic.ttf",
+}
+DEJAVU_SANS = {
+    ("normal", "normal"): "DejaVuSans.ttf",
+    ("bold", "normal"): "DejaVuSans-Bold.ttf",
+    ("normal", "italic"): "DejaVuSans-Oblique.ttf",
+    ("bold", "italic"): "DejaVuSans-BoldOblique.ttf",
+}
+DEJAVU_SERIF = {
+    ("normal", "normal"): "DejaVuSerif.ttf",
+    ("bold", "normal"): "DejaVuSerif-Bold.ttf",
+    ("normal", "italic"): "DejaVuSerif-Italic.ttf",
+    ("bold", "italic"): "DejaVuSerif-BoldItalic.ttf",
+}
+CARLITO = {
+    ("normal", "normal"): "Carlito-Regular.ttf",
+    ("bold", "normal"): "Carlito-Bold.ttf",
+    ("normal", "italic"): "Carlito-Italic.ttf",
+    ("bold", "italic"): "Carlito-BoldItalic.ttf",
+}
+CALADEA = {
+    ("normal", "normal"): "Caladea-Regular.ttf",
+    ("bold", "normal"): "Caladea-Bold.ttf",
+    ("normal", "italic"): "Caladea-Italic.ttf",
+    ("bold", "italic"): "Caladea-BoldItalic.ttf",
+}
+SOURCE_SANS = {
+    ("normal", "normal"): "SourceSans3-Regular.otf",
+    ("bold", "normal"): "SourceSans3-Bold.otf",
+    ("normal", "italic"): "SourceSans3-It.otf",
+    ("bold", "italic"): "SourceSans3-BoldIt.otf",
+}
+OPEN_SANS = {
+    ("normal", "normal"): "OpenSans-Regular.ttf",
+    ("bold", "normal"): "OpenSans-Bold.ttf",
+    ("normal", "italic"): "OpenSans-Italic.ttf",
+    ("bold", "italic"): "OpenSans-BoldItalic.ttf",
+}
+LATO = {
+    ("normal", "normal"): "Lato-Regular.ttf",
+    ("bold", "normal"): "Lato-Bold.ttf",
+    ("normal", "italic"): "Lato-Italic.ttf",
+    ("bold", "italic"): "Lato-BoldItalic.ttf",
+}
+ROBOTO = {
+    ("normal", "normal"): "Roboto-Regular.ttf",
+    ("bold", "normal"): "Roboto-Bold.ttf",
+    ("normal", "italic"): "Roboto-Italic.ttf",
+    ("bold", "italic"): "Roboto-BoldItalic.ttf",
+}
+
+# Resume font name (lowercase) -> generic CSS fallback and font files
+FONT_REGISTRY = {
+    "arial": {"generic": "sans-serif", "files": LIBERATION_SANS},
+    "helvetica": {"generic": "sans-serif", "files": LIBERATION_SANS},
+    "liberation sans": {"generic": "sans-serif", "files": LIBERATION_SANS},
+    "times new roman": {"generic": "serif", "files": LIBERATION_SERIF},
+    "times": {"generic": "serif", "files": LIBERATION_SERIF},
+    "courier new": {"generic": "monospace", "files": LIBERATION_MONO},
+    "tahoma": {"generic": "sans-serif", "files": DEJAVU_SANS},
+    "verdana": {"generic": "sans-serif", "files": DEJAVU_SANS},
+    "dejavu sans": {"generic": "sans-serif", "files": DEJAVU_SANS},
+    "georgia": {"generic": "serif", "files": DEJAVU_SERIF},
+    "calibri": {"generic": "sans-serif", "files": CARLITO},
+    "cambria": {"generic": "serif", "files": CALADEA},
+    "source sans pro": {"generic": "sans-serif", "files": SOURCE_SANS},
+    "source sans 3": {"generic": "sans-serif", "files": SOURCE_SANS},
+    "open sans": {"generic": "sans-serif", "files": OPEN_SANS},
+    "lato": {"generic": "sans-serif", "files": LATO},
+    "roboto": {"generic": "sans-serif", "files": ROBOTO},
+}
+
+
+@lru_cache(maxsize=1)
+def _font_file_index():
+    """Map font file names to paths for every file under FONT_DIRS."""
+    index = {}
+    for font_dir in FONT_DIRS.split(os.pathsep):
+        if not font_dir or not os.path.isdir(font_dir):
+            continue
+        for root, _, files in os.walk(font_dir):
+            for filename in files:
+                index.setdefault(filename, Path(root) / filename)
+    logging.debug(f"Indexed {len(index)} font files from {FONT_DIRS}")
+    return index
+
+
+@lru_cache(maxsize=64)
+def _installed_faces(registry_key):
+    """Installed (weight, style, path) faces for a registry entry, memoised."""
+    index = _font_file_index()
+    faces = tuple(
+        (weight, style, index[filename])
+        for (weight, style), filename in FONT_REGISTRY[registry_key]["files"].items()
+        if filename in index
+    )
+    if not faces:
+        logging.warning(f"Font '{registry_key}' is registered but not installed")
+    return faces
+
+
+def resolve_font(font_name):
+    """
+    Resolve a resume font name against the registry.
+
+    Args:
+        font_name (str): Font family requested by the resume YAML
+
+    Returns:
+        dict: {"family", "generic", "faces": [(weight, style, path), ...]}, or
+        None when the font is unknown or none of its files are installed.
+    """
+    if not font_name or not isinstance(font_name, str):
+        return None
+
+    registry_key = font_name.strip().lower()
+    if registry_key not in FONT_REGISTRY:
+        return None
+
+    faces = _installed_faces(registry_key)
+    if not faces:
+        return None
+
+    return {
+        "family": font_name.strip(),
+        "generic": FONT_REGISTRY[registry_key]["generic"],
+        "faces": list(faces),
+    }
+
+
+def font_face_css(font):
+    """
+    Build @font-face rules that load a resolved font from local files.
+
+    Args:
+        font (dict): Result of resolve_font()
+
+    Returns:
+        str: CSS text
+    """
+    family = font["family"].replace("'", "")
+    rules = []
+    for weight, style, path in font["faces"]:
+        rules.append(
+            "@font-face {\n"
+            f"    font-family: '{family}';\n"
+            f"    src: url('file://{path.as_posix()}');\n"
+            f"    font-weight: {weight};\n"
+            f"    font-style: {style};\n"
+            "}"
+        )
+    return "\n".join(rules)
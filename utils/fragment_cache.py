@@ -0,0 +1,140 @@
+"""
+Per-section fragment cache for resume templates.
+
+The editor re-renders the whole resume on every keystroke, but an edit only
+ever touches one section. The modern (``section.html``) and classic
+(``section.tex``) templates therefore render each section on its own, and the
+page templates assemble the document from those fragments via
+``render_section(section)``. Fragments are kept in a process-wide LRU keyed
+by a hash of the template directory (name and fingerprint) and the section
+content, so a one-bullet edit re-renders one section, together with its
+markdown filters and LaTeX escaping, and reuses the rest.
+
+Fragments that looked up icons remember the URLs they were rendered with; an
+entry is only reused while every one of those names still resolves to the
+same URL for the current render (see utils/icon_resolver.py), so uploads and
+per-session icon directories can never leak between renders.
+
+Each process has its own cache: the Flask process for LaTeX renders and HTML
+previews, and every renderer worker for HTML PDFs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+# Entries, not bytes: a fragment is one section of markup, a few KB at most
+FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", "2048"))
+
+
+def section_key(namespace, section):
+    """
+    Hash a section together with the template it is rendered by.
+
+    Args:
+        namespace (str): Template kind, directory and fingerprint
+        section (dict): The section as handed to the template
+
+    Returns:
+        str: Hex sha256 key
+    """
+    # default=str keeps YAML-parsed dates hashable
+    payload = json.dumps(
+        [namespace, section], sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RecordingIconResolver:
+    """Wraps an IconResolver and records every URL a fragment asked for."""
+
+    def __init__(self, resolver):
+        self._resolver = resolver
+        self.lookups = {}
+
+    def url(self, name):
+        url = self._resolver.url(name)
+        self.lookups[name] = url
+        return url
+
+
+class SectionFragmentCache:
+    """
+    Thread-safe LRU of rendered section fragments.
+
+    ``render(key, render_fn, resolver)`` returns the cached fragment for key,
+    or calls ``render_fn(recording_resolver)`` and stores its result. Icon
+    lookups made through the recording resolver become part of the entry and
+    are revalidated against ``resolver`` on every hit.
+    """
+
+    def __init__(self, max_entries=FRAGMENT_CACHE_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (fragment, ((icon name, url), ...))
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, key, render_fn, resolver=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            fragment, icon_urls = entry
+            if resolver is None or all(
+                resolver.url(name) == url for name, url in icon_urls
+            ):
+                with self._lock:
+                    self.hits += 1
+                return fragment
+
+        recorder = RecordingIconResolver(resolver) if resolver is not None else None
+        fragment = render_fn(recorder)
+        icon_urls = tuple(recorder.lookups.items()) if recorder else ()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (fragment, icon_urls)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logging.debug(f"Evicted section fragment {evicted[:12]}")
+        return fragment
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_cache = SectionFragmentCache()
+
+
+def render_fragment(key, render_fn, resolver=None):
+    """Render a section through the process-wide cache (see SectionFragmentCache)."""
+    return _cache.render(key, render_fn, resolver)
+
+
+def fragment_cache_stats():
+    """Counters of the process-wide section fragment cache."""
+    return _cache.stats()
@@ -0,0 +1,81 @@
+"""
+Render-size derivatives of uploaded icons.
+
+Icons are drawn at 16-20 CSS px, but users upload logos and photos of up to
+500KB straight from their camera or a company site. Stored as is, every
+render makes wkhtmltopdf decode and downscale each of them again and embeds
+the full-resolution image in the PDF. make_render_derivative() is run once,
+when an icon is uploaded: it applies the EXIF orientation, strips metadata
+and scales the image to fit ICON_RENDER_SIZE px, keeping its format (PNG
+stays PNG with its transparency, JPEG stays JPEG) so the file still matches
+its extension. save_resume stores the derivative next to the original and
+renders download it instead of the original.
+
+icon_content_hash() identifies an upload by content, so an unchanged icon
+is not uploaded again even when a changed one happens to have the same size.
+"""
+
+import hashlib
+import io
+import logging
+import os
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # originals are rendered as uploaded
+    Image = None
+
+# Longest side of a derivative in px: 20 CSS px icons at print resolution
+# (~300 dpi) with headroom for zoomed previews. 0 disables derivatives.
+ICON_RENDER_SIZE = int(os.getenv("ICON_RENDER_SIZE", "128"))
+
+# Storage prefix of derivatives inside a resume's icon folder
+ICON_RENDER_PREFIX = "render"
+
+_FORMATS = {"png": "PNG", "jpg": "JPEG", "jpeg": "JPEG"}
+
+
+def icon_content_hash(data):
+    """Hex sha256 of an icon's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_render_derivative(data, filename, max_size=None):
+    """
+    Downscale an uploaded icon for rendering.
+
+    Args:
+        data (bytes): The uploaded file
+        filename (str): Its name; the extension picks the output format
+        max_size (int | None): Longest side in px (default ICON_RENDER_SIZE)
+
+    Returns:
+        bytes | None: The derivative, or None when the original should be
+        rendered as is (SVG, already small, Pillow missing, unreadable image)
+    """
+    max_size = ICON_RENDER_SIZE if max_size is None else max_size
+    image_format = _FORMATS.get(filename.rsplit(".", 1)[-1].lower())
+    if Image is None or max_size <= 0 or image_format is None:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if max(image.size) <= max_size:
+                return None
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            if image_format == "JPEG":
+                image.convert("RGB").save(output, "JPEG", quality=90, optimize=True)
+            else:
+                if image.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                    image = image.convert("RGBA")
+                image.save(output, "PNG", optimize=True)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logging.warning(f"Could not make a render derivative of {filename}: {e}")
+        return None
+
+    derivative = output.getvalue()
+    if len(derivative) >= len(data):
+        return None
+    return derivative
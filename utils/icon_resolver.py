@@ -0,0 +1,83 @@
+"""
+Icon lookup for HTML templates without staging copies of the base icons.
+
+Renders used to copy the 13 contact icons, plus every default icon the resume
+referenced, from ``icons/`` into a per-session directory so that templates
+could build ``{{ icon_path }}/<name>`` URLs against a single directory.
+IconResolver instead layers the session's uploaded icons over the read-only
+``icons/`` directory: a name is looked up in the user directory first, then in
+the base directory. Only user uploads are ever written to disk.
+
+Templates resolve icons with the ``icon_url`` filter::
+
+    <img src="{{ 'email.png' | icon_url }}">
+    <img src="{{ job.icon | icon_url }}">
+
+Icon names come from user YAML, so a name containing a path component never
+resolves; the filter returns an empty URL for it, as it does for an icon that
+exists in neither layer.
+"""
+
+from pathlib import Path
+
+from jinja2 import pass_context
+
+
+def normalize_icon_name(name):
+    """
+    Return the bare file name of an icon reference, or None if it is unusable.
+
+    Accepts the legacy "/icons/<name>" form the frontend used to send.
+    """
+    if not isinstance(name, str):
+        return None
+    if name.startswith("/icons/"):
+        name = name[len("/icons/") :]
+    if not name or name in (".", "..") or Path(name).name != name:
+        return None
+    return name
+
+
+class IconResolver:
+    """Resolves icon names against user uploads layered over the base icons."""
+
+    def __init__(self, base_dir, user_dir=None):
+        self.base_dir = Path(base_dir)
+        self.user_dir = Path(user_dir) if user_dir else None
+
+    @property
+    def layers(self):
+        """Directories searched, highest priority first."""
+        if self.user_dir is None:
+            return [self.base_dir]
+        return [self.user_dir, self.base_dir]
+
+    def resolve(self, name):
+        """Return the path an icon name resolves to, or None."""
+        name = normalize_icon_name(name)
+        if name is None:
+            return None
+        for layer in self.layers:
+            path = layer / name
+            if path.is_file():
+                return path
+        return None
+
+    def url(self, name):
+        """Return a file:// URL for an icon, or "" if it does not resolve."""
+        path = self.resolve(name)
+        return f"file://{path.as_posix()}" if path else ""
+
+
+@pass_context
+def icon_url_filter(context, name):
+    """
+    Jinja filter resolving an icon name through the render's IconResolver.
+
+    Falls back to joining onto ``icon_path`` for callers that render without
+    a resolver.
+    """
+    resolver = context.get("icon_resolver")
+    if resolver is None:
+        return f"{context.get('icon_path', '')}/{name}"
+    return resolver.url(name)
@@ -0,0 +1,191 @@
+"""
+Inline the local assets of a rendered resume into the HTML itself.
+
+resume_generator.render_html() links the stylesheet, icons and fonts by
+file:// URL. wkhtmltopdf can read those, but a browser showing the HTML
+cannot. inline_local_assets() rewrites the HTML so it is self-contained:
+
+- the stylesheet link becomes a <style> block,
+- <img src="file://..."> and CSS url(file://...) become data: URIs,
+- @font-face rules whose files cannot be inlined are dropped, so the
+  browser falls back to an installed font of that family.
+
+Only files inside the allowed directories are read. Resume data is not
+HTML-escaped by the templates, and icon names come from user YAML, so a
+path anywhere else (for example ``../../etc/passwd``) is never embedded.
+
+PDF renders inline their assets too, so wkhtmltopdf makes no file:// requests
+and runs without ``enable-local-file-access``. The stylesheet, base icons and
+font files are the same for every render, so encoded assets are memoised
+process-wide in an LRU bounded by INLINE_ASSET_MEMO_MAX_MB. An entry is
+reused only while the file's mtime and size are unchanged. Files in
+transient directories (a request's staged icon uploads) are read once per
+render and never memoised, so they do not outlive their session.
+"""
+
+import base64
+import logging
+import mimetypes
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import unquote
+
+STYLESHEET_LINK_PATTERN = re.compile(
+    r'<link\s+rel="stylesheet"\s+href="file://([^"]+)"\s*/?>'
+)
+IMG_SRC_PATTERN = re.compile(r'src="file://([^"]+)"')
+FONT_FACE_PATTERN = re.compile(r"@font-face\s*\{[^}]*\}")
+CSS_URL_PATTERN = re.compile(r"""url\(\s*(['"]?)file://([^'")]+)\1\s*\)""")
+
+INLINE_ASSET_MEMO_MAX_MB = int(os.getenv("INLINE_ASSET_MEMO_MAX_MB", "64"))
+
+
+class _AssetMemo:
+    """Process-wide LRU of file contents encoded for inlining."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # (kind, path) -> (mtime_ns, size, value)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, path, encode):
+        """Return encode(path) for the current version of path."""
+        stat = path.stat()
+        key = (kind, str(path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        value = encode(path)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous[2])
+            if len(value) <= self.max_bytes:
+                self._entries[key] = (stat.st_mtime_ns, stat.st_size, value)
+                self._total_bytes += len(value)
+            while self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted[2])
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_memo = _AssetMemo(INLINE_ASSET_MEMO_MAX_MB * 1024 * 1024)
+
+
+def _encode_data_uri(path):
+    mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    encoded = base64.b64encode(path.read_bytes()).decode("ascii")
+    return f"data:{mime};base64,{encoded}"
+
+
+def _read_text(path):
+    return path.read_text(encoding="utf-8")
+
+
+def asset_memo_stats():
+    """Counters of the process-wide inlined-asset memo."""
+    return _memo.stats()
+
+
+class _AssetReader:
+    """Reads files under the allowed roots, once per path and render."""
+
+    def __init__(self, allowed_dirs, transient_dirs=()):
+        self.roots = [Path(d).resolve() for d in allowed_dirs if d]
+        self.transient_roots = [Path(d).resolve() for d in transient_dirs if d]
+        self._cache = {}
+
+    def resolve(self, raw_path):
+        path = Path(unquote(raw_path)).resolve()
+        if not any(path.is_relative_to(root) for root in self.roots):
+            logging.warning(f"Not inlining asset outside allowed dirs: {path}")
+            return None
+        if not path.is_file():
+            logging.debug(f"Asset to inline not found: {path}")
+            return None
+        return path
+
+    def read(self, kind, path, encode):
+        if any(path.is_relative_to(root) for root in self.transient_roots):
+            return encode(path)
+        return _memo.get(kind, path, encode)
+
+    def data_uri(self, raw_path):
+        if raw_path not in self._cache:
+            path = self.resolve(raw_path)
+            self._cache[raw_path] = (
+                self.read("data_uri", path, _encode_data_uri) if path else None
+            )
+        return self._cache[raw_path]
+
+    def text(self, raw_path):
+        path = self.resolve(raw_path)
+        return self.read("text", path, _read_text) if path else None
+
+
+def inline_local_assets(html, allowed_dirs, transient_dirs=()):
+    """
+    Replace file:// references in rendered resume HTML with inline content.
+
+    Args:
+        html: Output of resume_generator.render_html()
+        allowed_dirs: Directories assets may be read from (the template
+            directory and the icons directory of the render)
+        transient_dirs: Allowed directories whose files are not memoised
+            (per-session icon staging)
+
+    Returns:
+        str: Self-contained HTML. References that cannot be inlined are left
+        empty rather than pointing at the server's filesystem.
+    """
+    reader = _AssetReader(allowed_dirs, transient_dirs)
+
+    def inline_stylesheet(match):
+        css = reader.text(match.group(1))
+        return f"<style>\n{css}\n</style>" if css is not None else ""
+
+    def inline_img(match):
+        return f'src="{reader.data_uri(match.group(1)) or ""}"'
+
+    def inline_font_face(match):
+        rule = match.group(0)
+        paths = [m.group(2) for m in CSS_URL_PATTERN.finditer(rule)]
+        if paths and not all(reader.data_uri(p) for p in paths):
+            return ""
+        return rule
+
+    def inline_css_url(match):
+        return f'url("{reader.data_uri(match.group(2)) or ""}")'
+
+    html = STYLESHEET_LINK_PATTERN.sub(inline_stylesheet, html)
+    html = IMG_SRC_PATTERN.sub(inline_img, html)
+    html = FONT_FACE_PATTERN.sub(inline_font_face, html)
+    html = CSS_URL_PATTERN.sub(inline_css_url, html)
+    return html
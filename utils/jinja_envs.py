@@ -0,0 +1,115 @@
+"""
+Shared Jinja environments with a persistent bytecode cache.
+
+Building an Environment per render throws away Jinja's in-memory template
+cache, so base.html / resume.tex were re-parsed and recompiled on every PDF.
+Environments are now created once per (template directory, options) and
+reused for the life of the process.
+
+Compiled template bytecode is also written to JINJA_BYTECODE_CACHE_DIR, so a
+freshly started process (a new renderer worker, a gunicorn restart) loads
+bytecode instead of compiling from source. The directory is shared by all
+processes on the host; Jinja writes entries atomically.
+
+Invalidation: environments use auto_reload, so a template whose mtime
+changes is recompiled on its next lookup, and bytecode entries are keyed by a
+checksum of the template source, so stale bytecode is never loaded.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR", "/tmp/.cache/jinja")
+
+_environments = {}
+_lock = threading.Lock()
+
+
+def _bytecode_cache(namespace):
+    """
+    Return a FileSystemBytecodeCache for one environment configuration.
+
+    Each configuration gets its own subdirectory: bytecode keys only cover the
+    template path, so two environments compiling the same file with different
+    options (delimiters, autoescape) must not share entries.
+    """
+    if not BYTECODE_CACHE_DIR:
+        return None
+    directory = Path(BYTECODE_CACHE_DIR) / namespace
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logging.warning(f"Jinja bytecode cache disabled ({directory}): {e}")
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
+def get_environment(template_dir, filters=None, **options):
+    """
+    Return the shared Environment for a template directory.
+
+    Args:
+        template_dir (str | Path): Directory passed to FileSystemLoader
+        filters (dict): Filters registered when the environment is created
+        **options: Extra Environment keyword arguments (delimiters, autoescape)
+
+    Returns:
+        Environment: The same instance for the same directory, options and
+            filter functions
+    """
+    template_dir = str(Path(template_dir).resolve())
+    signature = json.dumps(
+        {"template_dir": template_dir, "options": options},
+        sort_keys=True,
+        default=str,
+    )
+    # Filters are looked up by name at render time, so they are not part of
+    # the bytecode namespace; the cached environments are keyed on the
+    # functions themselves (each environment keeps its filters alive, so
+    # their ids are not reused)
+    key = (
+        signature,
+        tuple(sorted((name, id(func)) for name, func in (filters or {}).items())),
+    )
+
+    with _lock:
+        env = _environments.get(key)
+        if env is None:
+            namespace = hashlib.sha256(signature.encode("utf-8")).hexdigest()[:16]
+            env = Environment(
+                loader=FileSystemLoader(template_dir),
+                bytecode_cache=_bytecode_cache(namespace),
+                auto_reload=True,
+                **options,
+            )
+            env.filters.update(filters or {})
+            _environments[key] = env
+            logging.debug(f"Created shared Jinja environment for {template_dir}")
+    return env
+
+
+def warm_environment(env, extensions=None):
+    """
+    Compile every template of an environment ahead of the first request.
+
+    Args:
+        env (Environment): Environment to warm
+        extensions (list): Only warm templates with these extensions
+
+    Returns:
+        int: Number of templates compiled
+    """
+    warmed = 0
+    for name in env.list_templates(extensions=extensions):
+        try:
+            env.get_template(name)
+            warmed += 1
+        except Exception as e:
+            logging.warning(f"Could not precompile template {name}: {e}")
+    return warmed
@@ -0,0 +1,553 @@
+"""
+Page-count and overflow estimates for resumes without running the renderer.
+
+"Does it still fit on one page?" used to cost a full wkhtmltopdf or xelatex
+render. estimate_layout() lays the resume out with a box model of each
+template instead: text is wrapped word by word using the advance widths of
+the resume font (read with Pillow from the files in the font registry, or
+per-family average widths when the files or Pillow are missing), each
+section type is stacked the way its template and stylesheet stack it, and
+the blocks a template keeps together (experience and education entries,
+classic section headings with their first line) move to the next page whole.
+
+TEMPLATE_LAYOUTS holds each template's page size in its own units (CSS px
+for modern, TeX points for classic) and two factors fitted offline against
+real renders by scripts/calibrate_layout_estimate.py, which also reports the
+estimator's error. Re-run it after changing a template's spacing or fonts.
+"""
+
+import logging
+import math
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from utils.font_registry import DEFAULT_FONT, FONT_DIRS, resolve_font
+
+try:
+    from PIL import ImageFont
+except ImportError:  # widths fall back to per-family averages
+    ImageFont = None
+
+# Page geometry and calibration per template directory:
+# - page_width/page_height: the printable area, before page_scale
+# - page_scale: CSS px per page unit. wkhtmltopdf's smart shrinking lays
+#   pages out wider than 96 dpi; fitted per template
+# - height_scale: multiplies every estimated block height; absorbs spacing
+#   the box model leaves out (line-height rounding, list markers, struts)
+TEMPLATE_LAYOUTS = {
+    "modern": {
+        "unit": "px",
+        # A4 minus wkhtmltopdf's default 10mm margins, at 96 dpi
+        "page_width": 718.1,
+        "page_height": 1046.9,
+        "page_scale": 1.28,
+        "height_scale": 1.0,
+        # Fraction of the sheet above and below the printable area
+        "margins": (10 / 297, 10 / 297),
+    },
+    "classic": {
+        "unit": "pt",
+        # letterpaper minus the 0.75in geometry margins
+        "page_width": 504.0,
+        "page_height": 684.0,
+        "page_scale": 1.0,
+        "height_scale": 0.97,
+        "margins": (0.75 / 11, 0.75 / 11),
+    },
+}
+
+# Average advance width in em, per generic family, when a font's files or
+# Pillow are unavailable; bold text is about 8% wider
+AVERAGE_EM = {"sans-serif": 0.5, "serif": 0.46, "monospace": 0.6}
+BOLD_WIDENING = 1.08
+
+# Latin Modern, xelatex's default font for the classic template
+LATEX_FONT_FILES = {"regular": "lmroman10-regular.otf", "bold": "lmroman10-bold.otf"}
+LATEX_FONT_DIRS = os.getenv(
+    "LATEX_FONT_DIRS",
+    os.pathsep.join(
+        [
+            "/usr/share/texlive/texmf-dist/fonts/opentype/public/lm",
+            "/usr/share/texmf/fonts/opentype/public/lm",
+        ]
+    ),
+)
+
+MARKDOWN_LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+MARKDOWN_MARKER_PATTERN = re.compile(r"\*\*|__|~~|(?<!\w)[*_]|[*_](?!\w)")
+
+# "normal" line-height of the sans-serif fonts in the registry
+NORMAL_LINE_HEIGHT = 1.15
+MODERN_BODY_MARGIN = 10
+
+
+def plain_text(value):
+    """Resume markdown reduced to the text that is actually drawn."""
+    if value is None:
+        return ""
+    text = MARKDOWN_LINK_PATTERN.sub(r"\1", str(value))
+    return MARKDOWN_MARKER_PATTERN.sub("", text)
+
+
+class FontMetrics:
+    """Advance widths of one font family and greedy line wrapping with them."""
+
+    def __init__(self, faces, average_em):
+        self.average_em = average_em
+        self._fonts = {}
+        for weight, path in faces.items():
+            if ImageFont is None or path is None:
+                continue
+            try:
+                # Widths are read at 100px and scaled to the requested size
+                self._fonts[weight] = ImageFont.truetype(str(path), 100)
+            except OSError as e:
+                logging.debug(f"Cannot load {path} for layout estimates: {e}")
+        self._widths = {}
+
+    @property
+    def measured(self):
+        """Whether real font files back the widths (vs. averages)."""
+        return bool(self._fonts)
+
+    def em_width(self, text, bold=False):
+        key = (text, bold)
+        width = self._widths.get(key)
+        if width is None:
+            font = self._fonts.get("bold" if bold else "regular") or self._fonts.get(
+                "regular"
+            )
+            if font is not None:
+                width = font.getlength(text) / 100
+            else:
+                width = len(text) * self.average_em
+            if bold and "bold" not in self._fonts:
+                width *= BOLD_WIDENING
+            if len(self._widths) < 50000:
+                self._widths[key] = width
+        return width
+
+    def width(self, text, size, bold=False):
+        return self.em_width(text, bold) * size
+
+    def lines(self, text, size, max_width, bold=False):
+        """Number of lines text wraps to in a box max_width wide (0 if empty)."""
+        words = plain_text(text).split()
+        if not words:
+            return 0
+        space = self.em_width(" ", bold) * size
+        count, line = 1, 0.0
+        for word in words:
+            word_width = self.em_width(word, bold) * size
+            if line and line + space + word_width > max_width:
+                count += 1
+                line = word_width
+            else:
+                line += (space if line else 0.0) + word_width
+        return count
+
+
+@lru_cache(maxsize=32)
+def html_font_metrics(font_name):
+    """FontMetrics for a resume font, resolved like render_html resolves it."""
+    font = resolve_font(font_name) or resolve_font(DEFAULT_FONT)
+    faces = {}
+    generic = "sans-serif"
+    if font is not None:
+        generic = font["generic"]
+        for weight, style, path in font["faces"]:
+            if style == "normal":
+                faces["bold" if weight == "bold" else "regular"] = path
+    return FontMetrics(faces, AVERAGE_EM.get(generic, AVERAGE_EM["sans-serif"]))
+
+
+@lru_cache(maxsize=1)
+def latex_font_metrics():
+    """FontMetrics for Latin Modern Roman, looked up in the TeX and font dirs."""
+    faces = {}
+    for font_dir in (LATEX_FONT_DIRS + os.pathsep + FONT_DIRS).split(os.pathsep):
+        if not font_dir or not os.path.isdir(font_dir):
+            continue
+        for root, _, files in os.walk(font_dir):
+            for weight, filename in LATEX_FONT_FILES.items():
+                if filename in files and weight not in faces:
+                    faces[weight] = Path(root) / filename
+    return FontMetrics(faces, AVERAGE_EM["serif"])
+
+
+class _Blocks:
+    """Vertical list of one section: lines, unbreakable blocks and glue."""
+
+    def __init__(self):
+        self.items = []  # (height, glue)
+
+    def line(self, height, count=1):
+        self.items.extend([(height, False)] * count)
+
+    def block(self, height):
+        self.items.append((height, False))
+
+    def glue(self, height):
+        self.items.append((height, True))
+
+
+def _section_type(section):
+    section_type = str(section.get("type") or "").lower()
+    if not section_type:
+        name = str(section.get("name") or "").lower()
+        if name in ("experience", "education"):
+            section_type = name
+    return section_type
+
+
+def _list_content(section):
+    content = section.get("content")
+    return content if isinstance(content, list) else []
+
+
+def _certification_text(item):
+    if isinstance(item, dict):
+        return (
+            f"{plain_text(item.get('certification'))}, "
+            f"{plain_text(item.get('issuer'))} ({plain_text(item.get('date'))})"
+        )
+    return plain_text(item)
+
+
+# Modern template (templates/modern/styles.css), in CSS px. Vertical margins
+# are the collapsed values between neighbouring boxes.
+def _modern_header(contact, metrics, width):
+    width -= 2 * MODERN_BODY_MARGIN
+    name_lines = max(1, metrics.lines(contact.get("name"), 36, width, bold=True))
+    return (
+        0.67 * 36  # h1 margin-top, collapsed with the body margin
+        + name_lines * 36 * NORMAL_LINE_HEIGHT
+        + 14  # h1/.location margins
+        + 21  # .location line
+        + 5
+        + 16.1  # .contact-info row (icons are 16px)
+        + 15
+        + 1
+        + 15  # hr.divider
+    )
+
+
+def _modern_section(section, metrics, width, columns_for):
+    blocks = _Blocks()
+    width -= 2 * MODERN_BODY_MARGIN
+    line = 16 * NORMAL_LINE_HEIGHT
+    heading_lines = max(1, metrics.lines(section.get("name"), 20, width, bold=True))
+    blocks.block(heading_lines * 30 + 5 + 5 + 8)
+    section_type = _section_type(section)
+    items = _list_content(section)
+
+    if section_type == "text":
+        blocks.glue(8)
+        blocks.line(24, metrics.lines(section.get("content"), 16, width))
+        blocks.glue(4)
+    elif section_type == "bulleted-list":
+        blocks.glue(8)
+        for item in items:
+            blocks.line(line, max(1, metrics.lines(item, 16, width - 40)))
+        blocks.glue(4)
+    elif section_type == "inline-list":
+        separator = 8 + metrics.width("•", 16)
+        row, rows = 0.0, 1 if items else 0
+        for index, item in enumerate(items):
+            item_width = metrics.width(plain_text(item), 16) + 10
+            if index < len(items) - 1:
+                item_width += separator
+            if row and row + 8 + item_width > width:
+                rows += 1
+                row = item_width
+            else:
+                row += (8 if row else 0.0) + item_width
+        for index in range(rows):
+            blocks.line(line + (8 if index else 0))
+        blocks.glue(4)
+    elif section_type == "dynamic-column-list":
+        if items:
+            columns = max(1, section.get("num_cols") or columns_for(len(items)))
+            chunk = math.ceil(len(items) / columns)
+            column_width = width / columns - 20 - 20  # td padding, ul indent
+            tallest = max(
+                sum(
+                    max(1, metrics.lines(item, 16, column_width)) * line + 5
+                    for item in items[start : start + chunk]
+                )
+                for start in range(0, len(items), chunk)
+            )
+            blocks.block(tallest + 20)
+    elif section_type == "icon-list":
+        for item in items:
+            text = _certification_text(item)
+            text_lines = max(1, metrics.lines(text, 16, width - 30))
+            blocks.line(max(20, text_lines * line) + 10)
+    elif section_type == "experience":
+        for job in items:
+            if not isinstance(job, dict):
+                continue
+            text_width = width - (29 if job.get("icon") else 0)
+            height = (
+                max(1, metrics.lines(job.get("company"), 16, text_width, bold=True))
+                * line
+                + 2
+                + metrics.lines(job.get("title"), 15, text_width, bold=True) * 22.5
+                + 2
+                + metrics.lines(job.get("dates"), 14, text_width) * 21
+                + 8
+                + 2
+                + 5
+            )
+            description = job.get("description")
+            if isinstance(description, list):
+                for bullet in description:
+                    height += max(1, metrics.lines(bullet, 16, width - 32)) * line
+            # .experience-item is page-break-inside: avoid
+            blocks.block(height + 20)
+    elif section_type == "education":
+        for edu in items:
+            if not isinstance(edu, dict):
+                continue
+            text_width = width - (21 if edu.get("icon") else 0)
+            entry = (
+                f"{plain_text(edu.get('degree'))}, {plain_text(edu.get('school'))}"
+                f" - {plain_text(edu.get('year'))}"
+            )
+            # The 5px paragraph margins collapse into the item's 10px
+            height = max(1, metrics.lines(entry, 14, text_width)) * 21 + 10
+            if edu.get("field_of_study"):
+                field_lines = metrics.lines(edu.get("field_of_study"), 13, width)
+                height += 5 + field_lines * 19.5
+            # .education-item is page-break-inside: avoid
+            blocks.block(height)
+
+    blocks.glue(12)  # .section margins, collapsed between sections
+    return blocks
+
+
+# Classic template (templates/classic), in TeX points at 10pt: \normalsize
+# 10/12pt, \small 9/11pt, \Large 14.4/18pt, \Huge 24.88/30pt.
+def _classic_header(contact, metrics, width):
+    parts = [contact.get("location"), contact.get("phone"), contact.get("email")]
+    for social_link in contact.get("social_links") or []:
+        if isinstance(social_link, dict) and social_link.get("url"):
+            parts.append(
+                social_link.get("display_text")
+                or social_link.get("handle")
+                or social_link.get("platform")
+            )
+    # Each item is preceded by an icon and an \enspace on both sides
+    contact_line = " · ".join(f"MM {plain_text(part)}" for part in parts if part)
+    contact_lines = max(1, metrics.lines(contact_line, 10, width))
+    # The name's first line sits at \topskip, not a full \Huge baselineskip
+    return 24 + 3 + contact_lines * 12 + 9
+
+
+def _classic_section(section, metrics, width, columns_for):
+    blocks = _Blocks()
+    heading_lines = max(1, metrics.lines(section.get("name"), 14.4, width, bold=True))
+    # titlesec spacing before, the title, then the rule and spacing after
+    heading = 5.9 + heading_lines * 18 + 7.8
+    section_type = _section_type(section)
+    items = _list_content(section)
+    small = 11
+
+    if section_type == "text":
+        blocks.line(small, metrics.lines(section.get("content"), 9, width))
+        blocks.glue(5)
+    elif section_type in ("bulleted-list", "icon-list"):
+        if items:
+            blocks.glue(1)
+            for item in items:
+                text = _certification_text(item)
+                item_lines = max(1, metrics.lines(text, 9, width - 15))
+                blocks.line(small, item_lines - 1)
+                blocks.line(small + 1)  # itemsep
+            blocks.glue(1 + 5)
+    elif section_type == "inline-list":
+        joined = " • ".join(plain_text(item) for item in items)
+        blocks.line(small, metrics.lines(joined, 9, width))
+        blocks.glue(5)
+    elif section_type == "dynamic-column-list":
+        # The template always uses four p{0.22\linewidth} columns
+        rows = [items[start : start + 4] for start in range(0, len(items), 4)]
+        height = sum(
+            max(max(1, metrics.lines(item, 9, 0.22 * width - 12)) for item in row)
+            * small
+            for row in rows
+        )
+        blocks.block(height + 8 + 8)  # tabular* inside center
+        blocks.glue(5)
+    elif section_type == "experience":
+        jobs = [job for job in items if isinstance(job, dict)]
+        for index, job in enumerate(jobs):
+            company_line = (
+                f"{plain_text(job.get('company'))} · {plain_text(job.get('dates'))}"
+            )
+            blocks.block(
+                4
+                + max(1, metrics.lines(job.get("title"), 10, width, bold=True)) * 12
+                + max(1, metrics.lines(company_line, 10, width)) * 12
+                + 2
+            )
+            description = job.get("description")
+            if isinstance(description, list) and description:
+                blocks.glue(1)
+                for bullet in description:
+                    bullet_lines = max(1, metrics.lines(bullet, 9, width - 15))
+                    blocks.line(small, bullet_lines - 1)
+                    blocks.line(small + 1.5)  # itemsep
+                blocks.glue(1)
+            if index < len(jobs) - 1:
+                blocks.glue(4)
+        blocks.glue(5)
+    elif section_type == "education":
+        entries = [edu for edu in items if isinstance(edu, dict)]
+        for index, edu in enumerate(entries):
+            entry = (
+                f"{plain_text(edu.get('degree'))}, {plain_text(edu.get('school'))}"
+                f" - {plain_text(edu.get('year'))}"
+            )
+            height = 4 + max(1, metrics.lines(entry, 10, width)) * 12
+            if edu.get("field_of_study"):
+                height += metrics.lines(edu.get("field_of_study"), 9, width) * small + 1
+            # \needspace{2\baselineskip} keeps an entry together
+            blocks.block(height)
+            if index < len(entries) - 1:
+                blocks.glue(4)
+        blocks.glue(5)
+    else:
+        blocks.line(small)  # "Unsupported section type" note
+        blocks.glue(5)
+
+    # titlesec never leaves a heading alone at the bottom of a page
+    first_content = next(
+        (i for i, (_, glue) in enumerate(blocks.items) if not glue), None
+    )
+    if first_content is None:
+        blocks.items.insert(0, (heading, False))
+    else:
+        first_height = blocks.items[first_content][0]
+        del blocks.items[: first_content + 1]
+        blocks.items.insert(0, (heading + first_height, False))
+    return blocks
+
+
+TEMPLATE_MODELS = {
+    "modern": (_modern_header, _modern_section),
+    "classic": (_classic_header, _classic_section),
+}
+
+
+def _paginate(items, page_height):
+    """
+    Stack (height, glue) items onto pages.
+
+    A line or block that does not fit moves to the next page whole; glue at
+    the bottom of a page is dropped. A block taller than a page spills over.
+
+    Returns:
+        tuple: (page count, height used on the last page, start page per item)
+    """
+    page, y = 1, 0.0
+    starts = []
+    for height, glue in items:
+        if glue:
+            starts.append(page)
+            y = min(y + height, page_height)
+            continue
+        if y > 0 and y + height > page_height:
+            page += 1
+            y = 0.0
+        starts.append(page)
+        y += height
+        while y > page_height:
+            page += 1
+            y -= page_height
+    return page, y, starts
+
+
+def estimate_layout(template_name, data, columns_for, layout=None):
+    """
+    Estimate the page count and section heights of a resume.
+
+    Args:
+        template_name (str): Template directory ("modern" or "classic")
+        data (dict): Resume data after normalize_sections
+        columns_for (callable): Column count for a dynamic-column list of
+            n items (resume_generator.calculate_columns)
+        layout (dict | None): Overrides for TEMPLATE_LAYOUTS[template_name]
+            (used by the calibration script)
+
+    Returns:
+        dict: pages, fits_on_one_page, last_page_fill (0-1), overflow (height
+        past the first page), unit, page_height, header_height and per-section
+        {"name", "type", "height", "page"}, heights in the template's unit
+
+    Raises:
+        ValueError: Unknown template or malformed resume data
+    """
+    if template_name not in TEMPLATE_MODELS:
+        raise ValueError(f"No layout model for template '{template_name}'")
+    settings = dict(TEMPLATE_LAYOUTS[template_name], **(layout or {}))
+    header_model, section_model = TEMPLATE_MODELS[template_name]
+
+    contact = data.get("contact_info") or {}
+    sections = data.get("sections") or []
+    if not isinstance(contact, dict):
+        raise ValueError(f"Invalid contact_info: {contact}")
+    if not isinstance(sections, list):
+        raise ValueError("sections must be a list")
+
+    if template_name == "classic":
+        metrics = latex_font_metrics()
+    else:
+        metrics = html_font_metrics(data.get("font") or DEFAULT_FONT)
+    width = settings["page_width"] * settings["page_scale"]
+    page_height = settings["page_height"] * settings["page_scale"]
+    scale = settings["height_scale"]
+
+    header = header_model(contact, metrics, width) * scale
+    items = [(header, False)]
+    owners = [None]
+    for index, section in enumerate(sections):
+        if not isinstance(section, dict):
+            raise ValueError(f"Invalid section: {section}")
+        blocks = section_model(section, metrics, width, columns_for)
+        items.extend((height * scale, glue) for height, glue in blocks.items)
+        owners.extend([index] * len(blocks.items))
+
+    pages, last_page_height, starts = _paginate(items, page_height)
+
+    section_heights = [0.0] * len(sections)
+    section_pages = [None] * len(sections)
+    for (height, glue), owner, start in zip(items, owners, starts):
+        if owner is None:
+            continue
+        section_heights[owner] += height
+        if section_pages[owner] is None and not glue:
+            section_pages[owner] = start
+
+    total_height = sum(height for height, _ in items)
+    return {
+        "pages": pages,
+        "fits_on_one_page": pages == 1,
+        "last_page_fill": round(last_page_height / page_height, 3),
+        "overflow": round(max(0.0, total_height - page_height), 1),
+        "unit": settings["unit"],
+        "page_height": round(page_height, 1),
+        "header_height": round(header, 1),
+        "measured_fonts": metrics.measured,
+        "sections": [
+            {
+                "name": section.get("name"),
+                "type": _section_type(section),
+                "height": round(height, 1),
+                "page": page or pages,
+            }
+            for section, height, page in zip(sections, section_heights, section_pages)
+        ],
+    }
@@ -0,0 +1,411 @@
+"""
+Single-page PNG previews of rendered resumes for mobile viewers.
+
+``/api/generate?format=png&page=N&width=W`` returns one page as an image so a
+phone does not have to download the PDF and run PDF.js. The PDF bytes come
+straight from the renderer and are piped through ``pdftoppm`` on
+stdin/stdout; nothing is written to disk.
+
+Mobile viewers flip back and forth between pages of the same resume, so
+PageImageCache keeps the rendered PDF and every page image produced from it
+under the resume's content key. Once a resume is cached, other pages skip the
+render and pages that were already shown are served from memory.
+
+An edit produces a new content key, but usually changes one page of a long
+resume. page_content_hashes() hashes what each page draws (its content
+streams and the resources they name), and when a new PDF is stored for the
+same scope (session and template, or saved resume) the images of pages whose
+hash did not change are carried over from the previous version. Only edited
+pages go through pdftoppm again.
+"""
+
+import hashlib
+import logging
+import re
+import subprocess
+import threading
+import zlib
+from collections import OrderedDict
+
+# Page objects in the PDFs produced by wkhtmltopdf and Chromium; neither
+# writer packs them into compressed object streams
+PAGE_OBJECT_PATTERN = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+
+OBJECT_HEADER_PATTERN = re.compile(rb"(?:^|[\r\n])(\d+)\s+\d+\s+obj\b")
+REFERENCE_PATTERN = re.compile(rb"(\d+)\s+\d+\s+R\b")
+PARENT_PATTERN = re.compile(rb"/Parent\s+\d+\s+\d+\s+R\b")
+STREAM_PATTERN = re.compile(rb"stream\r?\n")
+NAME_PATTERN = re.compile(rb"/([^\s/\[\]()<>{}%]+)")
+RESOURCE_ENTRY_PATTERN = re.compile(
+    rb"/([^\s/\[\]()<>{}%]+)\s*(\d+)\s+\d+\s+R\b"
+)
+
+# Resource dictionaries whose entries change how a page looks. Fonts are left
+# out on purpose: subsets are shared by all pages and grow with every edit,
+# while the glyph codes a page shows are already part of its content stream.
+DRAWING_RESOURCES = (
+    b"XObject",
+    b"ExtGState",
+    b"Pattern",
+    b"Shading",
+    b"ColorSpace",
+)
+
+
+class PageRasterizationError(RuntimeError):
+    """Raised when pdftoppm cannot turn a PDF page into an image."""
+
+
+def count_pdf_pages(pdf_bytes):
+    """Return the number of pages in a PDF produced by one of our renderers."""
+    return len(PAGE_OBJECT_PATTERN.findall(pdf_bytes))
+
+
+def rasterize_pdf_page(pdf_bytes, page, width, timeout=30):
+    """
+    Rasterize one page of a PDF to PNG bytes without touching the disk.
+
+    Args:
+        pdf_bytes (bytes): The PDF
+        page (int): 1-based page number
+        width (int): Output width in pixels; height keeps the page aspect ratio
+        timeout (float): Seconds before pdftoppm is killed
+
+    Returns:
+        bytes: PNG data
+
+    Raises:
+        PageRasterizationError: pdftoppm is missing, failed or timed out
+    """
+    command = [
+        "pdftoppm",
+        "-png",
+        "-f",
+        str(page),
+        "-l",
+        str(page),
+        "-scale-to-x",
+        str(width),
+        "-scale-to-y",
+        "-1",
+        "-singlefile",
+        "-",  # PDF on stdin; with no output root the PNG goes to stdout
+    ]
+    try:
+        result = subprocess.run(
+            command, input=pdf_bytes, capture_output=True, timeout=timeout
+        )
+    except FileNotFoundError as e:
+        raise PageRasterizationError("pdftoppm is not installed") from e
+    except subprocess.TimeoutExpired as e:
+        raise PageRasterizationError(f"pdftoppm timed out after {timeout}s") from e
+
+    if result.returncode != 0 or not result.stdout:
+        stderr = result.stderr.decode("utf-8", errors="replace").strip()
+        raise PageRasterizationError(
+            f"pdftoppm failed (exit {result.returncode}): {stderr}"
+        )
+    return result.stdout
+
+
+def _split_objects(pdf_bytes):
+    """Map object number -> raw bytes between ``N 0 obj`` and ``endobj``."""
+    headers = list(OBJECT_HEADER_PATTERN.finditer(pdf_bytes))
+    objects = {}
+    for header, following in zip(headers, headers[1:] + [None]):
+        end = following.start() if following else len(pdf_bytes)
+        body = pdf_bytes[header.end() : end]
+        endobj = body.rfind(b"endobj")
+        objects[int(header.group(1))] = body[:endobj] if endobj >= 0 else body
+    return objects
+
+
+def _split_stream(body):
+    """Split an object into its dictionary and stream data (None if no stream)."""
+    match = STREAM_PATTERN.search(body)
+    if match is None:
+        return body, None
+    data = body[match.end() :]
+    endstream = data.rfind(b"endstream")
+    return body[: match.start()], data[:endstream] if endstream >= 0 else data
+
+
+def _entry(dictionary, key):
+    """
+    Raw value of /key in a dictionary: a reference, an array or a dictionary.
+
+    Only handles what our renderers write (dictionaries nest one level deep).
+    """
+    match = re.search(
+        rb"/" + key + rb"(?![A-Za-z])\s*"
+        rb"(\d+\s+\d+\s+R\b|\[[^\]]*\]|<<(?:[^<>]|<[^<>]*>|<<[^<>]*>>)*>>)",
+        dictionary,
+    )
+    return match.group(1) if match else b""
+
+
+def _resolve(value, objects):
+    """Follow a reference to the dictionary of the object it points at."""
+    reference = REFERENCE_PATTERN.fullmatch(value)
+    if reference is None:
+        return value
+    return _split_stream(objects[int(reference.group(1))])[0]
+
+
+def _inherited(dictionary, key, objects):
+    """Value of a page attribute, looked up the page tree if not set on the page."""
+    for _ in range(32):
+        value = _entry(dictionary, key)
+        parent = _entry(dictionary, b"Parent")
+        if value or not parent:
+            return _resolve(value, objects)
+        dictionary = _resolve(parent, objects)
+    return b""
+
+
+def _object_digest(number, objects, memo):
+    """Hash an object and everything it references, except /Parent links."""
+    if number not in memo:
+        memo[number] = b""  # breaks reference cycles
+        dictionary, stream = _split_stream(objects[number])
+        digest = hashlib.sha256(PARENT_PATTERN.sub(b"", dictionary))
+        for reference in REFERENCE_PATTERN.finditer(dictionary):
+            digest.update(_object_digest(int(reference.group(1)), objects, memo))
+        digest.update(stream or b"")
+        memo[number] = digest.digest()
+    return memo[number]
+
+
+def _page_objects(objects, catalog):
+    """Page object numbers in document order, walking the page tree."""
+    pages = []
+    seen = set()
+    pending = [int(n) for n in REFERENCE_PATTERN.findall(_entry(catalog, b"Pages"))]
+    while pending:
+        number = pending.pop(0)
+        if number in seen:
+            continue
+        seen.add(number)
+        node = _split_stream(objects[number])[0]
+        kids = _resolve(_entry(node, b"Kids"), objects)
+        if kids:
+            pending[:0] = [int(n) for n in REFERENCE_PATTERN.findall(kids)]
+        elif PAGE_OBJECT_PATTERN.search(node):
+            pages.append(number)
+    return pages
+
+
+def _page_content(dictionary, objects):
+    """Decompressed content streams of a page, or None if one is unreadable."""
+    content = b""
+    # A single reference or an array of them
+    for number in REFERENCE_PATTERN.findall(_entry(dictionary, b"Contents")):
+        stream_dictionary, stream = _split_stream(objects[int(number)])
+        if stream is None:
+            return None
+        if b"/FlateDecode" in stream_dictionary:
+            try:
+                stream = zlib.decompress(stream)
+            except zlib.error:
+                return None
+        content += stream
+    return content
+
+
+def page_content_hashes(pdf_bytes):
+    """
+    Hash what each page of a PDF draws, in page order.
+
+    A page hash covers its size, its decompressed content streams and the
+    drawing resources those streams name, so a page that looks the same
+    hashes the same even when an edit elsewhere renumbered the objects.
+
+    Args:
+        pdf_bytes (bytes): The PDF
+
+    Returns:
+        list[str] | None: Hex sha256 per page, or None if the page tree could
+        not be read (e.g. xdvipdfmx packing pages into object streams)
+    """
+    objects = _split_objects(pdf_bytes)
+    root = re.search(rb"/Root\s+(\d+)\s+\d+\s+R", pdf_bytes)
+    if root is None:
+        return None
+
+    hashes = []
+    memo = {}
+    try:
+        catalog = _split_stream(objects[int(root.group(1))])[0]
+        for number in _page_objects(objects, catalog):
+            dictionary = _split_stream(objects[number])[0]
+            content = _page_content(dictionary, objects)
+            if content is None:
+                return None
+            digest = hashlib.sha256(_inherited(dictionary, b"MediaBox", objects))
+            digest.update(content)
+
+            names = set(NAME_PATTERN.findall(content))
+            resources = _inherited(dictionary, b"Resources", objects)
+            for category in DRAWING_RESOURCES:
+                entries = _resolve(_entry(resources, category), objects)
+                for name, reference in RESOURCE_ENTRY_PATTERN.findall(entries):
+                    if name in names:
+                        digest.update(category + b"/" + name)
+                        digest.update(_object_digest(int(reference), objects, memo))
+            hashes.append(digest.hexdigest())
+    except KeyError:
+        # A referenced object lives in a compressed object stream
+        return None
+    return hashes or None
+
+
+class PageImageCache:
+    """
+    Size-bounded in-memory LRU of rendered PDFs and their page images.
+
+    Entries are keyed by content key (see utils/pdf_cache.make_cache_key);
+    each holds the PDF, its page count and the PNGs rendered from it by
+    (page, width). A whole entry is evicted at once, least recently used first.
+
+    A PDF stored with a scope replaces the previous version stored for that
+    scope, taking over the images of every page whose content hash (see
+    page_content_hashes) is unchanged, so each scope holds one version.
+    """
+
+    def __init__(self, max_bytes):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> {"pdf": bytes, "page_count": int, "pages": {(page, width): png},
+        #         "page_hashes": [str] | None, "scope": str | None}
+        self._entries = OrderedDict()
+        # scope -> key of the latest version stored for it
+        self._scopes = {}
+        self._total_bytes = 0
+        self.pdf_hits = 0
+        self.page_hits = 0
+        self.pages_reused = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_pdf(self, key):
+        """Return (pdf_bytes, page_count) for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.pdf_hits += 1
+            return entry["pdf"], entry["page_count"]
+
+    def get_page(self, key, page, width):
+        """Return (png_bytes, page_count) for a page already rendered, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            png = entry["pages"].get((page, width)) if entry else None
+            if png is None:
+                return None
+            self._entries.move_to_end(key)
+            self.page_hits += 1
+            return png, entry["page_count"]
+
+    def put_pdf(self, key, pdf_bytes, page_count, page_hashes=None, scope=None):
+        """
+        Store a rendered PDF, replacing any entry (and its pages) for key.
+
+        Args:
+            key (str): Content key of the PDF
+            pdf_bytes (bytes): The PDF
+            page_count (int): Number of pages
+            page_hashes (list[str] | None): page_content_hashes(pdf_bytes)
+            scope (str | None): Session or resume the PDF is a version of;
+                unchanged pages of the previous version are carried over
+        """
+        if len(pdf_bytes) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove_locked(key)
+            pages = {}
+            previous_key = self._scopes.get(scope) if scope is not None else None
+            previous = self._entries.get(previous_key)
+            if previous is not None:
+                pages = self._unchanged_pages(previous, page_hashes)
+                self.pages_reused += len(pages)
+                self._remove_locked(previous_key)
+            self._entries[key] = {
+                "pdf": pdf_bytes,
+                "page_count": page_count,
+                "pages": pages,
+                "page_hashes": page_hashes,
+                "scope": scope,
+            }
+            if scope is not None:
+                self._scopes[scope] = key
+            self._total_bytes += self._entry_size(self._entries[key])
+            self._evict_locked()
+
+    @staticmethod
+    def _unchanged_pages(previous, page_hashes):
+        """Images of the previous version for pages that hash the same now."""
+        old_hashes = previous["page_hashes"]
+        if not old_hashes or not page_hashes:
+            return {}
+        pages = {}
+        for (page, width), png in previous["pages"].items():
+            if page > len(old_hashes):
+                continue
+            # A page moved by an edit above it keeps its image too
+            for new_page, page_hash in enumerate(page_hashes, start=1):
+                if page_hash == old_hashes[page - 1]:
+                    pages[(new_page, width)] = png
+        return pages
+
+    def put_page(self, key, page, width, png_bytes):
+        """Store a page image; ignored if the PDF entry was evicted meanwhile."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (page, width) in entry["pages"]:
+                return
+            entry["pages"][(page, width)] = png_bytes
+            self._total_bytes += len(png_bytes)
+            self._entries.move_to_end(key)
+            self._evict_locked()
+
+    def _entry_size(self, entry):
+        return len(entry["pdf"]) + sum(len(png) for png in entry["pages"].values())
+
+    def _remove_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= self._entry_size(entry)
+            self._forget_scope_locked(key, entry)
+
+    def _forget_scope_locked(self, key, entry):
+        if entry["scope"] is not None and self._scopes.get(entry["scope"]) == key:
+            del self._scopes[entry["scope"]]
+
+    def _evict_locked(self):
+        # The newest entry is kept even if it alone exceeds the budget
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, entry = self._entries.popitem(last=False)
+            self._total_bytes -= self._entry_size(entry)
+            self._forget_scope_locked(key, entry)
+            self.evictions += 1
+            logging.debug(f"Evicted page images for {key}")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "pages": sum(len(e["pages"]) for e in self._entries.values()),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "pdf_hits": self.pdf_hits,
+                "page_hits": self.page_hits,
+                "pages_reused": self.pages_reused,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
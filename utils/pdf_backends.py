@@ -0,0 +1,348 @@
+"""
+PDF rendering backends.
+
+A backend turns an already rendered resume HTML string into PDF bytes.
+resume_generator.py renders the Jinja template once and hands the HTML to the
+backend selected by PDF_RENDER_BACKEND, so the engine can be swapped without
+touching template or data preparation:
+
+- "wkhtmltopdf" (default): pdfkit pipes the HTML through a fresh wkhtmltopdf
+  process for every render.
+- "chromium": one headless Chromium (via Playwright) per process, with a pool
+  of warm pages. A render loads the HTML into an idle page and prints it with
+  ``page.pdf()``, so there is no browser start-up or page creation on the
+  request path. Playwright is an optional dependency and is only imported
+  when this backend is started.
+
+Both backends are safe to call from several threads at once.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+import pdfkit
+
+# Matches wkhtmltopdf's default page setup (A4, 10mm margins) so both
+# backends paginate templates the same way unless the CSS sets @page
+CHROMIUM_PDF_OPTIONS = {
+    "format": "A4",
+    "print_background": True,
+    "prefer_css_page_size": True,
+    "margin": {"top": "10mm", "right": "10mm", "bottom": "10mm", "left": "10mm"},
+}
+
+# Sandbox needs user namespaces, which Cloud Run containers do not grant;
+# /dev/shm is only 64MB in Docker
+CHROMIUM_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+
+REMOTE_URL_PATTERN = re.compile(r"^https?://")
+
+
+class PdfBackendUnavailableError(RuntimeError):
+    """Raised when a backend's engine cannot be started in this environment."""
+
+
+class PdfBackend:
+    """Interface shared by all backends."""
+
+    name = None
+
+    def start(self):
+        """Start the engine ahead of the first render (optional)."""
+
+    def render(self, html, offline=True):
+        """
+        Convert an HTML string to PDF bytes.
+
+        Args:
+            html: Complete HTML document; assets are referenced by file:// URL
+            offline: Refuse to fetch http(s) resources while rendering
+
+        Returns:
+            bytes: The PDF
+        """
+        raise NotImplementedError
+
+    def stats(self):
+        return {"backend": self.name}
+
+    def close(self):
+        """Release the engine's resources."""
+
+
+class WkhtmltopdfBackend(PdfBackend):
+    """One wkhtmltopdf process per render, driven through pdfkit."""
+
+    name = "wkhtmltopdf"
+
+    def __init__(self, options_for=None):
+        """
+        Args:
+            options_for: Callable mapping ``offline`` to wkhtmltopdf options
+        """
+        self.options_for = options_for or (lambda offline: {})
+
+    def render(self, html, offline=True):
+        options = self.options_for(offline)
+        try:
+            pdf_bytes = pdfkit.from_string(html, False, options=options)
+        except Exception as e:
+            logging.error(f"pdfkit failed to generate PDF: {str(e)}")
+            logging.error(f"pdfkit options: {options}")
+            raise
+
+        if not pdf_bytes:
+            raise RuntimeError("wkhtmltopdf produced an empty PDF")
+        return pdf_bytes
+
+
+def _import_async_playwright():
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError as e:
+        raise PdfBackendUnavailableError(
+            "The chromium backend needs the playwright package and a Chromium "
+            "build (pip install playwright && playwright install chromium)"
+        ) from e
+    return async_playwright
+
+
+class ChromiumBackend(PdfBackend):
+    """
+    Headless Chromium with a pool of warm pages.
+
+    Playwright's API is bound to the event loop it was started on, so the
+    browser lives on a dedicated loop thread and render() hands work to it
+    with run_coroutine_threadsafe. Up to ``pages`` renders run concurrently;
+    further callers wait for an idle page. A page is replaced after
+    ``max_renders_per_page`` renders or after any failure, and the browser is
+    relaunched if it has died.
+    """
+
+    name = "chromium"
+
+    def __init__(
+        self,
+        pages=4,
+        max_renders_per_page=100,
+        timeout=30,
+        playwright_factory=None,
+    ):
+        """
+        Args:
+            pages: Number of warm pages (concurrent renders)
+            max_renders_per_page: Renders before a page is replaced
+            timeout: Seconds a render may take, including waiting for a page
+            playwright_factory: ``async_playwright`` replacement (tests)
+        """
+        if pages < 1:
+            raise ValueError("pages must be at least 1")
+        self.pages = pages
+        self.max_renders_per_page = max_renders_per_page
+        self.timeout = timeout
+        self._playwright_factory = playwright_factory
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._browser = None
+        self._idle = None
+        self._page_state = {}
+        self._scratch_dir = None
+
+        self._renders = 0
+        self._failures = 0
+        self._recycled = 0
+        self._browser_launches = 0
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self):
+        """Launch Chromium and open the page pool; a no-op once running."""
+        with self._lock:
+            if self._loop is not None:
+                return
+            factory = self._playwright_factory or _import_async_playwright()
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="chromium-pdf", daemon=True
+            )
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._launch(factory), loop).result(
+                    timeout=60
+                )
+            except Exception as e:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout=5)
+                raise PdfBackendUnavailableError(
+                    f"Failed to start Chromium: {e}"
+                ) from e
+
+            self._loop = loop
+            self._thread = thread
+            self._scratch_dir = Path(tempfile.mkdtemp(prefix="chromium-pdf-"))
+            logging.info(f"Chromium PDF backend ready with {self.pages} warm pages")
+
+    async def _launch(self, factory):
+        self._playwright = await factory().start()
+        await self._launch_browser()
+        self._idle = asyncio.Queue()
+        for _ in range(self.pages):
+            self._idle.put_nowait(await self._new_page())
+
+    async def _launch_browser(self):
+        self._browser = await self._playwright.chromium.launch(
+            args=CHROMIUM_LAUNCH_ARGS
+        )
+        self._browser_launches += 1
+
+    async def _new_page(self):
+        if not self._browser.is_connected():
+            logging.warning("Chromium disconnected, relaunching browser")
+            await self._launch_browser()
+        # A context per page keeps renders from sharing cookies or storage
+        context = await self._browser.new_context()
+        page = await context.new_page()
+        state = {"context": context, "renders": 0, "offline": True}
+
+        async def block_remote(route):
+            if state["offline"]:
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route(REMOTE_URL_PATTERN, block_remote)
+        self._page_state[page] = state
+        return page
+
+    async def _replace_page(self, page):
+        """Close a page and return a fresh one (or the old one if that fails)."""
+        state = self._page_state.pop(page, None)
+        try:
+            if state:
+                await state["context"].close()
+        except Exception as e:
+            logging.debug(f"Closing Chromium page failed: {e}")
+        try:
+            fresh = await self._new_page()
+        except Exception as e:
+            logging.error(f"Could not open a new Chromium page: {e}")
+            if state:
+                self._page_state[page] = state
+            return page
+        self._recycled += 1
+        return fresh
+
+    def close(self):
+        """Close the browser and stop the loop thread."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(
+                    timeout=10
+                )
+            except Exception as e:
+                logging.warning(f"Chromium shutdown failed: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+            if self._scratch_dir:
+                shutil.rmtree(self._scratch_dir, ignore_errors=True)
+                self._scratch_dir = None
+
+    async def _shutdown(self):
+        self._page_state.clear()
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+    # -- rendering ---------------------------------------------------------
+
+    def render(self, html, offline=True):
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(
+            self._render(html, offline), self._loop
+        )
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError as e:
+            future.cancel()
+            raise TimeoutError(
+                f"Chromium render exceeded {self.timeout} seconds"
+            ) from e
+
+    async def _render(self, html, offline):
+        page = await self._idle.get()
+        state = self._page_state[page]
+        # Loaded from a file:// URL so the template's file:// CSS, icons and
+        # fonts resolve exactly as they do for wkhtmltopdf
+        html_path = self._scratch_dir / f"{uuid.uuid4().hex}.html"
+        try:
+            html_path.write_text(html, encoding="utf-8")
+            state["offline"] = offline
+            await page.goto(
+                html_path.as_uri(), wait_until="load", timeout=self.timeout * 1000
+            )
+            pdf_bytes = await page.pdf(**CHROMIUM_PDF_OPTIONS)
+            state["renders"] += 1
+            self._renders += 1
+        except BaseException:
+            self._failures += 1
+            page = await self._replace_page(page)
+            raise
+        finally:
+            html_path.unlink(missing_ok=True)
+            if self._page_state.get(page, {}).get("renders", 0) >= (
+                self.max_renders_per_page
+            ):
+                page = await self._replace_page(page)
+            self._idle.put_nowait(page)
+
+        if not pdf_bytes:
+            raise RuntimeError("Chromium produced an empty PDF")
+        return pdf_bytes
+
+    def stats(self):
+        return {
+            "backend": self.name,
+            "running": self._loop is not None,
+            "pages": self.pages,
+            "idle_pages": self._idle.qsize() if self._idle is not None else 0,
+            "renders": self._renders,
+            "failures": self._failures,
+            "pages_recycled": self._recycled,
+            "browser_launches": self._browser_launches,
+        }
+
+
+BACKENDS = {
+    WkhtmltopdfBackend.name: WkhtmltopdfBackend,
+    ChromiumBackend.name: ChromiumBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """Instantiate a backend by name; kwargs go to its constructor."""
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown PDF backend '{name}' (expected one of: "
+            f"{', '.join(sorted(BACKENDS))})"
+        ) from None
+    return backend_class(**kwargs)
@@ -0,0 +1,238 @@
+"""
+Content-addressed on-disk cache of rendered PDFs.
+
+Saved resumes are re-rendered on every download, preview refresh and thumbnail
+request even when nothing has changed. This cache stores the rendered bytes
+under a key derived from everything that affects the output (template
+directory and its files, resume content hash, icon identities and the renderer
+version), so an unchanged resume is served without downloading icons or
+starting a render.
+
+Entries are plain files named ``<key>.pdf``. The cache is bounded by total size
+and evicts least recently used entries first; recency survives restarts via
+file mtimes, which are bumped on every hit.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+# Memo of directory fingerprints, keyed by path and revalidated via mtimes;
+# least recently used first, bounded by FINGERPRINT_MEMO_MAX
+FINGERPRINT_MEMO_MAX = 256
+_fingerprint_memo = OrderedDict()
+_fingerprint_lock = threading.Lock()
+
+
+def directory_fingerprint(directory, memoize=True):
+    """
+    Return a sha256 over the names and contents of all files in a directory.
+
+    Results are memoised per directory and recomputed only when a file's
+    mtime or size changes, so calling this per request is cheap. Pass
+    memoize=False for transient directories (per-session icon staging), which
+    would only fill the memo with paths that are never seen again.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return ""
+
+    files = sorted(p for p in directory.rglob("*") if p.is_file())
+    stamp = tuple(
+        (str(p.relative_to(directory)), p.stat().st_mtime_ns, p.stat().st_size)
+        for p in files
+    )
+
+    if memoize:
+        with _fingerprint_lock:
+            cached = _fingerprint_memo.get(str(directory))
+            if cached and cached[0] == stamp:
+                _fingerprint_memo.move_to_end(str(directory))
+                return cached[1]
+
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.relative_to(directory)).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    fingerprint = digest.hexdigest()
+
+    if memoize:
+        with _fingerprint_lock:
+            _fingerprint_memo[str(directory)] = (stamp, fingerprint)
+            _fingerprint_memo.move_to_end(str(directory))
+            while len(_fingerprint_memo) > FINGERPRINT_MEMO_MAX:
+                _fingerprint_memo.popitem(last=False)
+    return fingerprint
+
+
+def make_cache_key(template_dir, content_hash, icon_hashes, renderer_version):
+    """
+    Build a cache key from the inputs that determine a rendered PDF.
+
+    Args:
+        template_dir (str): Template directory name plus its fingerprint
+        content_hash (str): Hash of the resume content
+        icon_hashes (list): Hashes/identities of the icons the render can use
+        renderer_version (str): Bumped whenever rendering output changes
+
+    Returns:
+        str: Hex sha256 key
+    """
+    payload = json.dumps(
+        {
+            "template_dir": template_dir,
+            "content_hash": content_hash,
+            "icon_hashes": sorted(icon_hashes),
+            "renderer_version": renderer_version,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    """Size-bounded LRU cache of rendered PDFs stored on local disk."""
+
+    def __init__(self, cache_dir, max_bytes):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be positive")
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_existing_entries()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.pdf"
+
+    def _load_existing_entries(self):
+        """Rebuild the LRU index from files left by a previous process."""
+        # Half-written entries from a crashed process
+        for tmp_path in self.cache_dir.glob("*.tmp"):
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+        existing = []
+        for path in self.cache_dir.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            existing.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict_locked()
+
+        if self._entries:
+            logging.info(
+                f"PDF cache loaded {len(self._entries)} entries "
+                f"({self._total_bytes / 1024 / 1024:.1f}MB) from {self.cache_dir}"
+            )
+
+    def get(self, key):
+        """Return cached PDF bytes for key, or None on a miss."""
+        with self._lock:
+            known = key in self._entries
+            if known:
+                self._entries.move_to_end(key)
+
+        if known:
+            path = self._path(key)
+            try:
+                pdf_bytes = path.read_bytes()
+                os.utime(path)
+            except OSError:
+                # Removed underneath us (e.g. /tmp cleaner); treat as a miss
+                with self._lock:
+                    size = self._entries.pop(key, None)
+                    if size is not None:
+                        self._total_bytes -= size
+            else:
+                with self._lock:
+                    self.hits += 1
+                return pdf_bytes
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, pdf_bytes):
+        """Store PDF bytes under key, evicting old entries to stay in budget."""
+        size = len(pdf_bytes)
+        if not size or size > self.max_bytes:
+            return
+
+        # Write to a temp file and rename so readers never see partial PDFs
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logging.warning(f"Failed to write PDF cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict_locked()
+
+    def _evict_locked(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every entry (counters are kept)."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,209 @@
+"""
+Local store for asynchronous PDF render jobs.
+
+With a single sync gunicorn worker, a slow render in the synchronous
+``/api/resumes/<id>/pdf`` endpoint holds the only request slot for its whole
+duration. The job API instead returns a job id right away, renders in a
+background thread and lets the client poll (or listen on a server-sent event
+stream) until the PDF is ready to download.
+
+Job state lives in process memory; finished PDFs are written to ``jobs_dir``
+as ``<job_id>.pdf``. Jobs are owned by the user that created them and expire
+``ttl_seconds`` after they finish. Every state change bumps the job's
+``version`` and wakes waiters, which is what the event stream blocks on.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+TERMINAL_STATES = {JOB_DONE, JOB_FAILED}
+
+
+class PdfJobStoreFullError(RuntimeError):
+    """Raised by create() when too many jobs are already pending."""
+
+
+class PdfJobStore:
+    """Thread-safe in-memory job table with finished PDFs kept on disk."""
+
+    def __init__(self, jobs_dir, ttl_seconds=900, max_active=50):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_active = max_active
+
+        self._jobs = {}
+        self._changed = threading.Condition()
+        self.created = 0
+        self.completed = 0
+        self.failed = 0
+
+        # Job state does not survive a restart, so neither do its files
+        for stale in self.jobs_dir.glob("*"):
+            if stale.suffix in (".pdf", ".tmp"):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+
+    def _path(self, job_id):
+        return self.jobs_dir / f"{job_id}.pdf"
+
+    def _active_count_locked(self):
+        return sum(
+            1 for job in self._jobs.values() if job["status"] not in TERMINAL_STATES
+        )
+
+    def _purge_expired_locked(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["status"] in TERMINAL_STATES and job["updated_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            try:
+                self._path(job_id).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.warning(f"Failed to remove expired PDF job {job_id}: {e}")
+
+    def create(self, owner, resume_id, download_name):
+        """
+        Register a new queued job and return a copy of it.
+
+        Raises:
+            PdfJobStoreFullError: max_active jobs are already queued or running
+        """
+        now = time.time()
+        with self._changed:
+            self._purge_expired_locked()
+            if self._active_count_locked() >= self.max_active:
+                raise PdfJobStoreFullError(
+                    f"Too many PDF jobs in progress ({self.max_active})"
+                )
+            job = {
+                "id": str(uuid.uuid4()),
+                "owner": owner,
+                "resume_id": resume_id,
+                "download_name": download_name,
+                "status": JOB_QUEUED,
+                "stage": "queued",
+                "progress": 0,
+                "error": None,
+                "details": {},
+                "retryable": False,
+                "size": 0,
+                "created_at": now,
+                "updated_at": now,
+                "version": 0,
+            }
+            self._jobs[job["id"]] = job
+            self.created += 1
+            return dict(job)
+
+    def update(self, job_id, **fields):
+        """Apply field changes to a job and wake anyone waiting on it."""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job["updated_at"] = time.time()
+            job["version"] += 1
+            self._changed.notify_all()
+
+    def complete(self, job_id, pdf_bytes):
+        """Store a job's finished PDF and mark it done."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.jobs_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, self._path(job_id))
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._changed:
+            self.completed += 1
+        self.update(
+            job_id, status=JOB_DONE, stage="done", progress=100, size=len(pdf_bytes)
+        )
+
+    def fail(self, job_id, error, retryable=False, details=None):
+        """Mark a job failed with a user-facing error message."""
+        with self._changed:
+            self.failed += 1
+        self.update(
+            job_id,
+            status=JOB_FAILED,
+            stage="failed",
+            error=error,
+            retryable=retryable,
+            details=details or {},
+        )
+
+    def get(self, job_id, owner):
+        """Return a copy of a job, or None if it is unknown, expired or not owner's."""
+        with self._changed:
+            self._purge_expired_locked()
+            job = self._jobs.get(job_id)
+            if job is None or job["owner"] != owner:
+                return None
+            return dict(job)
+
+    def pdf_path(self, job_id, owner):
+        """Path of a finished job's PDF, or None if it is not downloadable."""
+        job = self.get(job_id, owner)
+        if job is None or job["status"] != JOB_DONE:
+            return None
+        path = self._path(job_id)
+        return path if path.exists() else None
+
+    def wait(self, job_id, owner, after_version, timeout):
+        """
+        Block until a job's version moves past after_version or timeout expires.
+
+        Returns:
+            dict: The job (possibly unchanged after a timeout), or None if gone
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job["owner"] != owner:
+                    return None
+                remaining = deadline - time.monotonic()
+                if job["version"] > after_version or remaining <= 0:
+                    return dict(job)
+                self._changed.wait(remaining)
+
+    def stats(self):
+        with self._changed:
+            by_status = {
+                state: 0 for state in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED)
+            }
+            for job in self._jobs.values():
+                by_status[job["status"]] += 1
+            return {
+                "jobs": by_status,
+                "max_active": self.max_active,
+                "created": self.created,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
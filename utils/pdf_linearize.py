@@ -0,0 +1,79 @@
+"""
+Linearize ("fast web view") rendered PDFs with qpdf.
+
+wkhtmltopdf and xelatex write the page tree, fonts and cross-reference
+table at the end of the file, so a viewer has to download the whole PDF
+before it can paint anything. A linearized PDF starts with a hint table and
+everything page 1 needs; pdf.js reads that, paints page 1 and fetches the
+rest with HTTP range requests, which the PDF endpoints answer (send_file
+with an ETag, see app._send_pdf). Only cached PDFs served for viewing by
+GET /api/resumes/<id>/pdf are linearized, once each.
+
+qpdf reads the PDF from stdin and writes to stdout; nothing touches disk.
+
+qpdf is a system dependency (installed in the Docker image). Without it, or
+with PDF_LINEARIZE=false, PDFs are sent as rendered; a failed or timed-out
+qpdf run never fails the render.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+
+PDF_LINEARIZE = os.getenv("PDF_LINEARIZE", "true").lower() == "true"
+QPDF_BINARY = os.getenv("QPDF_BINARY", "qpdf")
+# qpdf linearizes a resume in tens of ms; a stuck run must not hold a render
+LINEARIZE_TIMEOUT_SECONDS = float(os.getenv("LINEARIZE_TIMEOUT_SECONDS", "10"))
+
+# qpdf exit status 3: succeeded with warnings (the output is usable)
+QPDF_WARNINGS = 3
+
+# The linearization dictionary must be the first object in the file
+LINEARIZED_MARKER = b"/Linearized"
+HEADER_BYTES = 1024
+
+_warned_missing = False
+
+
+def is_linearized(pdf_bytes):
+    """True when the PDF starts with a linearization dictionary."""
+    return LINEARIZED_MARKER in pdf_bytes[:HEADER_BYTES]
+
+
+def linearize_pdf(pdf_bytes):
+    """
+    Return a linearized copy of pdf_bytes, or pdf_bytes itself.
+
+    The input is returned unchanged when linearization is disabled, qpdf is
+    not installed, the PDF is already linearized, or qpdf fails.
+    """
+    global _warned_missing
+
+    if not PDF_LINEARIZE or is_linearized(pdf_bytes):
+        return pdf_bytes
+    qpdf = shutil.which(QPDF_BINARY)
+    if qpdf is None:
+        if not _warned_missing:
+            logging.warning(f"{QPDF_BINARY} not found; PDFs are sent unlinearized")
+            _warned_missing = True
+        return pdf_bytes
+
+    # "-" for both files: qpdf buffers stdin in memory and writes to stdout
+    try:
+        result = subprocess.run(
+            [qpdf, "--linearize", "-", "-"],
+            input=pdf_bytes,
+            capture_output=True,
+            timeout=LINEARIZE_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logging.warning(f"qpdf linearization failed, sending as rendered: {e}")
+        return pdf_bytes
+    if result.returncode not in (0, QPDF_WARNINGS) or not result.stdout:
+        logging.warning(
+            f"qpdf linearization failed (exit {result.returncode}), sending "
+            f"as rendered: {result.stderr.decode(errors='replace').strip()}"
+        )
+        return pdf_bytes
+    return result.stdout
@@ -0,0 +1,283 @@
+"""
+Optional size optimizer for rendered PDFs.
+
+wkhtmltopdf and xelatex embed every image at the resolution it was uploaded
+in, whatever size it is drawn at, and write some streams uncompressed or
+twice (the same icon used in several places, identical font descriptors).
+optimize_pdf() rewrites a PDF locally, without changing what it shows:
+
+- images are downsampled to the preset's DPI at the largest size they are
+  drawn at on any page (found by following the content streams' transforms),
+  and JPEGs re-encoded at the preset's quality; lossless images stay lossless
+- identical objects are merged and unreferenced ones dropped
+- page content streams are recompressed at the highest zlib level
+
+The stage is off unless PDF_OPTIMIZE names a preset ("print" keeps 300 DPI
+for paper, "screen" trades detail for size), PDFs smaller than
+PDF_OPTIMIZE_MIN_KB are sent as rendered, and the rewritten file is only
+used when it is actually smaller. It needs pypdf, an optional dependency
+(Docker: --build-arg INSTALL_PDF_OPTIMIZER=true); without it PDFs are sent as
+rendered. scripts/benchmark_pdf_optimize.py reports the byte savings against
+the CPU time it adds.
+"""
+
+import io
+import logging
+import math
+import os
+import time
+import zlib
+
+try:
+    from PIL import Image
+except ImportError:  # streams are still deduplicated and recompressed
+    Image = None
+
+PDF_OPTIMIZE_PRESETS = {
+    "print": {"image_dpi": 300, "jpeg_quality": 90},
+    "screen": {"image_dpi": 150, "jpeg_quality": 75},
+}
+PDF_OPTIMIZE = os.getenv("PDF_OPTIMIZE", "off").lower()
+PDF_OPTIMIZE_MIN_KB = int(os.getenv("PDF_OPTIMIZE_MIN_KB", "32"))
+
+# Images are only resampled when that shrinks them by at least this factor;
+# re-encoding an image for a few percent costs more CPU than it saves bytes
+MIN_DOWNSAMPLE = 0.8
+
+# Form XObjects nested deeper than this are not searched for images
+MAX_FORM_DEPTH = 8
+
+_IDENTITY = (1, 0, 0, 1, 0, 0)
+_warned_unavailable = False
+
+
+class PdfOptimizerUnavailableError(RuntimeError):
+    """Raised when pypdf, which the optimizer needs, is not installed."""
+
+
+def _multiply(m, n):
+    """The PDF matrix product m x n of two (a, b, c, d, e, f) matrices."""
+    a, b, c, d, e, f = m
+    a2, b2, c2, d2, e2, f2 = n
+    return (
+        a * a2 + b * c2,
+        a * b2 + b * d2,
+        c * a2 + d * c2,
+        c * b2 + d * d2,
+        e * a2 + f * c2 + e2,
+        e * b2 + f * d2 + f2,
+    )
+
+
+def _image_placements(content, resources, pdf, ctm, sizes, depth=0):
+    """
+    Record the largest size (width, height in points) each image is drawn at.
+
+    sizes maps image object numbers to sizes; images drawn from form
+    XObjects are followed through the form's matrix.
+    """
+    from pypdf.generic import ContentStream
+
+    xobjects = resources.get("/XObject", {}) if resources else {}
+    if hasattr(xobjects, "get_object"):
+        xobjects = xobjects.get_object()
+    stack = []
+    for operands, operator in ContentStream(content, pdf).operations:
+        if operator == b"q":
+            stack.append(ctm)
+        elif operator == b"Q" and stack:
+            ctm = stack.pop()
+        elif operator == b"cm" and len(operands) == 6:
+            ctm = _multiply(tuple(float(x) for x in operands), ctm)
+        elif operator == b"Do" and operands and operands[0] in xobjects:
+            reference = xobjects.raw_get(operands[0])
+            xobject = reference.get_object()
+            subtype = xobject.get("/Subtype")
+            if subtype == "/Image" and hasattr(reference, "idnum"):
+                a, b, c, d, _, _ = ctm
+                size = (math.hypot(a, b), math.hypot(c, d))
+                drawn = sizes.get(reference.idnum, (0, 0))
+                sizes[reference.idnum] = (
+                    max(drawn[0], size[0]),
+                    max(drawn[1], size[1]),
+                )
+            elif subtype == "/Form" and depth < MAX_FORM_DEPTH:
+                matrix = xobject.get("/Matrix", _IDENTITY)
+                _image_placements(
+                    xobject,
+                    xobject.get("/Resources", resources),
+                    pdf,
+                    _multiply(tuple(float(x) for x in matrix), ctm),
+                    sizes,
+                    depth + 1,
+                )
+
+
+def _set_stream(stream, data, width, height, color_space, image_filter):
+    """Replace an image stream's data and the keys that describe it."""
+    from pypdf.generic import NameObject, NumberObject, StreamObject
+
+    for key in ("/DecodeParms", "/Decode"):
+        stream.pop(key, None)
+    stream[NameObject("/Width")] = NumberObject(width)
+    stream[NameObject("/Height")] = NumberObject(height)
+    stream[NameObject("/ColorSpace")] = NameObject(color_space)
+    stream[NameObject("/BitsPerComponent")] = NumberObject(8)
+    stream[NameObject("/Filter")] = NameObject(image_filter)
+    # StreamObject.set_data stores encoded bytes as they are; the encoded
+    # stream classes would re-run their own filter over them
+    StreamObject.set_data(stream, data)
+    stream.decoded_self = None
+
+
+def _downsample_image(image_file, drawn, image_dpi, jpeg_quality):
+    """
+    Downsample one image XObject in place; return the bytes saved.
+
+    Only plain 8-bit gray and RGB images (with or without a soft mask) are
+    rewritten. Images with decode arrays, stencil masks or other colour
+    spaces are left alone.
+    """
+    stream = image_file.indirect_reference.get_object()
+    if stream.get("/ImageMask") or "/Decode" in stream or "/Mask" in stream:
+        return 0
+    width, height = int(stream["/Width"]), int(stream["/Height"])
+    target = (drawn[0] / 72 * image_dpi, drawn[1] / 72 * image_dpi)
+    scale = max(target[0] / width, target[1] / height)
+    if scale > MIN_DOWNSAMPLE:
+        return 0
+
+    image = image_file.image
+    if image.mode not in ("L", "LA", "RGB", "RGBA"):
+        return 0
+    size = (max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale)))
+    image = image.resize(size, Image.Resampling.LANCZOS)
+
+    smask = stream.get("/SMask")
+    smask = smask.get_object() if smask is not None else None
+    before = len(stream._data) + (len(smask._data) if smask is not None else 0)
+    if image.mode in ("LA", "RGBA"):
+        if smask is None:
+            return 0
+        alpha = image.getchannel("A")
+        image = image.convert(image.mode[:-1])
+        _set_stream(
+            smask,
+            zlib.compress(alpha.tobytes(), 9),
+            *size,
+            "/DeviceGray",
+            "/FlateDecode",
+        )
+
+    color_space = "/DeviceRGB" if image.mode == "RGB" else "/DeviceGray"
+    if stream.get("/Filter") == "/DCTDecode":
+        output = io.BytesIO()
+        image.save(output, "JPEG", quality=jpeg_quality, optimize=True)
+        _set_stream(stream, output.getvalue(), *size, color_space, "/DCTDecode")
+    else:
+        data = zlib.compress(image.tobytes(), 9)
+        _set_stream(stream, data, *size, color_space, "/FlateDecode")
+    after = len(stream._data) + (len(smask._data) if smask is not None else 0)
+    return before - after
+
+
+def optimize_pdf(pdf_bytes, image_dpi=300, jpeg_quality=90):
+    """
+    Rewrite a PDF to be smaller without changing how it looks.
+
+    Args:
+        pdf_bytes (bytes): The rendered PDF
+        image_dpi (int): Resolution images are downsampled to, at the size
+            they are drawn at
+        jpeg_quality (int): Quality JPEG images are re-encoded at (1-95)
+
+    Returns:
+        bytes: The rewritten PDF (not necessarily smaller; see
+        maybe_optimize_pdf)
+
+    Raises:
+        PdfOptimizerUnavailableError: pypdf is not installed
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError as e:
+        raise PdfOptimizerUnavailableError(
+            "The PDF optimizer needs pypdf (pip install pypdf)"
+        ) from e
+
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf_bytes)))
+
+    if Image is not None:
+        sizes = {}
+        for page in writer.pages:
+            contents = page.get_contents()
+            if contents is not None:
+                _image_placements(
+                    contents, page.get("/Resources"), writer, _IDENTITY, sizes
+                )
+        done = set()
+        for page in writer.pages:
+            for image_file in page.images:
+                reference = image_file.indirect_reference
+                if reference is None or reference.idnum in done:
+                    continue
+                done.add(reference.idnum)
+                if reference.idnum in sizes:
+                    _downsample_image(
+                        image_file, sizes[reference.idnum], image_dpi, jpeg_quality
+                    )
+
+    writer.compress_identical_objects()
+    for page in writer.pages:
+        if page.get_contents() is not None:
+            page.compress_content_streams(level=9)
+
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def maybe_optimize_pdf(pdf_bytes, preset=None):
+    """
+    Run optimize_pdf() with the configured preset, if it is worth it.
+
+    Returns pdf_bytes unchanged when the stage is off, the PDF is smaller than
+    PDF_OPTIMIZE_MIN_KB, pypdf is missing, the rewrite fails or is not smaller.
+    Never raises: a PDF that was rendered is always sent.
+
+    Args:
+        pdf_bytes (bytes): The rendered PDF
+        preset (str | None): Key of PDF_OPTIMIZE_PRESETS, "off", or None for
+            PDF_OPTIMIZE
+    """
+    global _warned_unavailable
+
+    preset = (preset or PDF_OPTIMIZE).lower()
+    if preset not in PDF_OPTIMIZE_PRESETS:
+        if preset != "off":
+            logging.warning(f"Unknown PDF_OPTIMIZE preset '{preset}', sending as is")
+        return pdf_bytes
+    if len(pdf_bytes) < PDF_OPTIMIZE_MIN_KB * 1024:
+        return pdf_bytes
+
+    start = time.perf_counter()
+    try:
+        optimized = optimize_pdf(pdf_bytes, **PDF_OPTIMIZE_PRESETS[preset])
+    except PdfOptimizerUnavailableError as e:
+        if not _warned_unavailable:
+            logging.warning(f"{e}; PDFs are sent as rendered")
+            _warned_unavailable = True
+        return pdf_bytes
+    except Exception as e:
+        logging.warning(f"PDF optimization failed, sending as rendered: {e}")
+        return pdf_bytes
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if len(optimized) >= len(pdf_bytes):
+        logging.debug(f"PDF optimization saved nothing ({elapsed:.0f}ms)")
+        return pdf_bytes
+    logging.info(
+        f"PDF optimized ({preset}): {len(pdf_bytes)} -> {len(optimized)} bytes "
+        f"in {elapsed:.0f}ms"
+    )
+    return optimized
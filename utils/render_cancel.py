@@ -0,0 +1,290 @@
+"""
+Cancellation of renders that have been superseded by a newer request.
+
+The editor asks for a fresh preview PDF (``/api/generate?preview=true``) as
+the user types, always with the same ``session_id``. Only the newest of those
+renders is ever shown, so SupersedeRegistry keeps one CancelToken per key
+(the editor session): starting a render for a key cancels the token of the
+render already in flight for it.
+
+A token cancels in two ways:
+- work still waiting in the render queue never starts (the waiting Future
+  is cancelled), and
+- child processes that are already running (a renderer worker and its
+  wkhtmltopdf, or xelatex) are killed together with their process group via
+  callbacks registered with on_cancel().
+
+The superseded request then fails with RenderCancelledError.
+
+Tokens also carry the deadline of the request they belong to. When it
+passes, the DEADLINES watchdog cancels the token through the same callbacks:
+queued work is dropped, and renderer workers, wkhtmltopdf and xelatex are
+killed with their whole process group instead of running on after the
+request gave up. The request then fails with RenderTimeoutError.
+"""
+
+import heapq
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+import weakref
+
+from utils.render_memory import apply_render_process_limits
+
+
+class RenderCancelledError(RuntimeError):
+    """Raised when a render was cancelled because a newer one replaced it."""
+
+
+class RenderTimeoutError(RuntimeError):
+    """Raised when a render ran past the deadline of its request."""
+
+
+class CancelToken:
+    """Thread-safe cancellation flag with callbacks to stop running work."""
+
+    def __init__(self, deadline=None):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._timed_out = False
+        self._callbacks = []
+        self.deadline = None
+        if deadline is not None:
+            self.set_deadline(deadline)
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    @property
+    def timed_out(self):
+        """True if the token was cancelled because its deadline passed."""
+        return self._timed_out
+
+    def set_deadline(self, deadline):
+        """
+        Cancel the token at a time.monotonic() deadline.
+
+        An earlier deadline replaces a later one; a later one is ignored.
+        """
+        with self._lock:
+            if self.deadline is not None and self.deadline <= deadline:
+                return
+            self.deadline = deadline
+        DEADLINES.schedule(self, deadline)
+
+    def remaining(self):
+        """Seconds left before the deadline (never negative), or None."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self, timed_out=False):
+        """Cancel and run every registered callback; False if already cancelled."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._cancelled = True
+            self._timed_out = timed_out
+            callbacks, self._callbacks = self._callbacks, []
+        if timed_out and callbacks:
+            DEADLINES.record_timed_out()
+            logging.warning("Render deadline passed; stopping its work")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logging.warning(f"Render cancel callback failed: {e}")
+        return True
+
+    def on_cancel(self, callback):
+        """
+        Call callback() when the token is cancelled (right away if it already is).
+
+        Returns:
+            callable: Unregisters the callback; call it once the work is done
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        if self._timed_out:
+            raise RenderTimeoutError("Render exceeded its request deadline")
+        if self._cancelled:
+            raise RenderCancelledError("Render superseded by a newer request")
+
+
+class DeadlineWatchdog:
+    """
+    One background thread that cancels tokens when their deadlines pass.
+
+    Tokens are held weakly, so a finished render whose token has been
+    dropped costs nothing when its deadline comes around.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []
+        self._sequence = 0
+        self._thread = None
+        self.timed_out = 0
+        self.orphaned = 0
+
+    def schedule(self, token, deadline):
+        with self._cond:
+            self._sequence += 1
+            heapq.heappush(self._heap, (deadline, self._sequence, weakref.ref(token)))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="render-deadlines", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                deadline, _, token_ref = self._heap[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+            token = token_ref()
+            # Skip tokens already gone, or whose deadline was moved earlier
+            if token is not None and token.deadline == deadline:
+                token.cancel(timed_out=True)
+
+    def record_timed_out(self):
+        """Count a render stopped (dequeued or killed) at its deadline."""
+        with self._cond:
+            self.timed_out += 1
+
+    def record_orphaned(self):
+        """Count a render that finished after its request had timed out."""
+        with self._cond:
+            self.orphaned += 1
+
+    def stats(self):
+        with self._cond:
+            return {
+                "pending": len(self._heap),
+                "timed_out": self.timed_out,
+                "orphaned": self.orphaned,
+            }
+
+
+DEADLINES = DeadlineWatchdog()
+
+
+class SupersedeRegistry:
+    """Tracks the newest in-flight render per key and cancels older ones."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self.started = 0
+        self.superseded = 0
+        self.cancelled = 0
+
+    def begin(self, key):
+        """Register a new render for key, cancelling the one it replaces."""
+        token = CancelToken()
+        with self._lock:
+            previous = self._tokens.get(key)
+            self._tokens[key] = token
+            self.started += 1
+        if previous is not None and previous.cancel():
+            with self._lock:
+                self.superseded += 1
+            logging.info(f"Superseded in-flight render for session {key}")
+        return token
+
+    def finish(self, key, token, cancelled=False):
+        """
+        Forget a finished render.
+
+        Args:
+            cancelled: The render was stopped by its token before completing
+        """
+        with self._lock:
+            if self._tokens.get(key) is token:
+                del self._tokens[key]
+            if cancelled:
+                self.cancelled += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._tokens),
+                "started": self.started,
+                "superseded": self.superseded,
+                "cancelled": self.cancelled,
+            }
+
+
+def kill_process_group(process):
+    """SIGKILL a process started with start_new_session=True and its children."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def run_cancellable(command, cancel_token=None, cwd=None, max_address_space_mb=0):
+    """
+    subprocess.run(command, capture_output=True, text=True) that a token can kill.
+
+    The command runs in its own session so cancelling also kills anything it
+    spawned. A non-zero max_address_space_mb caps the command's RLIMIT_AS and
+    marks it as the OOM killer's first choice (utils/render_memory.py).
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        RenderCancelledError: The token was cancelled before or during the run
+    """
+    if cancel_token is None and not max_address_space_mb:
+        return subprocess.run(command, capture_output=True, text=True, cwd=cwd)
+
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=cwd,
+        start_new_session=True,
+    )
+    if max_address_space_mb:
+        apply_render_process_limits(max_address_space_mb, pid=process.pid)
+    if cancel_token is None:
+        stdout, stderr = process.communicate()
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    unregister = cancel_token.on_cancel(lambda: kill_process_group(process))
+    try:
+        stdout, stderr = process.communicate()
+    finally:
+        unregister()
+    cancel_token.raise_if_cancelled()
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
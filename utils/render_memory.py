@@ -0,0 +1,276 @@
+"""
+Memory-aware render concurrency.
+
+Every render is a renderer worker plus its wkhtmltopdf (or an xelatex run),
+and peaks at roughly 100-200MB. Five of them next to Flask do not fit in a
+1G container, and the kernel's OOM killer then takes out the whole instance.
+
+RenderMemoryBudget sizes render concurrency from the memory the instance
+actually has:
+
+- the limit comes from the cgroup (v2 ``memory.max`` or v1
+  ``memory.limit_in_bytes``), falling back to MemTotal outside a container;
+- the per-render cost starts at a configured estimate and then follows the
+  peak RSS renderer workers report for their jobs (worker plus wkhtmltopdf);
+- ``slots()`` is how many renders fit next to the reserve kept for the web
+  process, never more than ``max_slots`` and never fewer than one.
+
+At run time ``acquire()`` only admits a render while fewer than ``slots()``
+are running and the cgroup still has room for one more. Otherwise the render
+waits in its dispatch thread until one finishes, so a memory squeeze lowers
+throughput instead of getting the instance killed. One render is always
+admitted, so the queue keeps moving however tight memory is.
+
+Render processes additionally get an address-space limit (RLIMIT_AS) and a
+high OOM score from ``apply_render_process_limits()``: a runaway render fails
+on its own allocation, and if the kernel must kill something it picks a
+render rather than the web process.
+"""
+
+import logging
+import resource
+import threading
+from collections import deque
+
+CGROUP_V2_ROOT = "/sys/fs/cgroup"
+CGROUP_V1_MEMORY_ROOT = "/sys/fs/cgroup/memory"
+
+# cgroup v1 reports "no limit" as a huge page-aligned number
+UNLIMITED_THRESHOLD_BYTES = 1 << 60
+
+MB = 1024 * 1024
+
+
+def _read_int(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    if value == "max":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _read_stat(path, field):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                name, _, value = line.partition(" ")
+                if name == field:
+                    return int(value)
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _read_meminfo_mb(field):
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024.0
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def read_memory_limit_mb():
+    """
+    Return the memory this instance may use in MB, or None if unknown.
+
+    Prefers the cgroup limit (v2, then v1) and falls back to MemTotal.
+    """
+    limit = _read_int(f"{CGROUP_V2_ROOT}/memory.max")
+    if limit is None:
+        limit = _read_int(f"{CGROUP_V1_MEMORY_ROOT}/memory.limit_in_bytes")
+    if limit is not None and limit < UNLIMITED_THRESHOLD_BYTES:
+        return limit / MB
+    return _read_meminfo_mb("MemTotal")
+
+
+def read_memory_headroom_mb():
+    """
+    Return the memory still available to this instance in MB, or None.
+
+    Inside a cgroup this is the limit minus the working set (usage without
+    inactive page cache, which the kernel reclaims before OOM-killing);
+    otherwise MemAvailable.
+    """
+    for limit_file, usage_file, stat_file, inactive_field in (
+        (
+            f"{CGROUP_V2_ROOT}/memory.max",
+            f"{CGROUP_V2_ROOT}/memory.current",
+            f"{CGROUP_V2_ROOT}/memory.stat",
+            "inactive_file",
+        ),
+        (
+            f"{CGROUP_V1_MEMORY_ROOT}/memory.limit_in_bytes",
+            f"{CGROUP_V1_MEMORY_ROOT}/memory.usage_in_bytes",
+            f"{CGROUP_V1_MEMORY_ROOT}/memory.stat",
+            "total_inactive_file",
+        ),
+    ):
+        limit = _read_int(limit_file)
+        usage = _read_int(usage_file)
+        if limit is None or usage is None or limit >= UNLIMITED_THRESHOLD_BYTES:
+            continue
+        working_set = max(0, usage - _read_stat(stat_file, inactive_field))
+        return (limit - working_set) / MB
+    return _read_meminfo_mb("MemAvailable")
+
+
+def apply_render_process_limits(max_address_space_mb, pid=0):
+    """
+    Limit a render process (default: the caller); its children inherit it.
+
+    Sets RLIMIT_AS (skipped when max_address_space_mb is 0) and raises the
+    process's OOM score so the kernel prefers it over the web process.
+    """
+    if max_address_space_mb > 0:
+        limit = int(max_address_space_mb * MB)
+        try:
+            _, hard = resource.prlimit(pid, resource.RLIMIT_AS)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.prlimit(pid, resource.RLIMIT_AS, (limit, hard))
+        except (ValueError, OSError) as e:
+            logging.warning(f"Could not set RLIMIT_AS for render process: {e}")
+    try:
+        with open(f"/proc/{pid or 'self'}/oom_score_adj", "w", encoding="utf-8") as f:
+            f.write("1000")
+    except OSError:
+        pass
+
+
+def read_children_peak_rss_mb():
+    """Peak RSS in MB of the largest child this process has waited for."""
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024.0
+
+
+class RenderMemoryBudget:
+    """
+    Admission control for renders based on the instance's memory.
+
+    Args:
+        limit_mb: Memory available to the instance; None means unknown, in
+            which case max_slots renders may run
+        reserve_mb: Memory kept for the web process when sizing
+        render_mb: Initial per-render estimate until peaks are observed
+        max_slots: Upper bound on concurrent renders
+        headroom_reader: Callable returning current headroom in MB or None
+        window: Number of recent render peaks the estimate is taken from
+    """
+
+    def __init__(
+        self,
+        limit_mb=None,
+        reserve_mb=320,
+        render_mb=200,
+        max_slots=5,
+        headroom_reader=read_memory_headroom_mb,
+        window=20,
+    ):
+        if max_slots < 1:
+            raise ValueError("max_slots must be at least 1")
+        if render_mb <= 0:
+            raise ValueError("render_mb must be positive")
+
+        self.limit_mb = limit_mb
+        self.reserve_mb = reserve_mb
+        self.initial_render_mb = render_mb
+        self.max_slots = max_slots
+        self._headroom_reader = headroom_reader
+        self._peaks = deque(maxlen=window)
+        self._cond = threading.Condition()
+        self._active = 0
+        self.peak_active = 0
+        self.throttled = 0
+
+    @property
+    def active(self):
+        """Number of renders currently admitted."""
+        return self._active
+
+    @property
+    def render_mb(self):
+        """Current per-render estimate: the largest recent observed peak."""
+        with self._cond:
+            return max(self._peaks) if self._peaks else self.initial_render_mb
+
+    def observe(self, peak_mb):
+        """Record the peak memory of a finished render."""
+        if not peak_mb or peak_mb <= 0:
+            return
+        with self._cond:
+            self._peaks.append(float(peak_mb))
+            # A smaller estimate may admit a waiting render
+            self._cond.notify_all()
+
+    def slots(self):
+        """Number of renders that fit next to the reserve, 1..max_slots."""
+        if self.limit_mb is None:
+            return self.max_slots
+        fitting = int((self.limit_mb - self.reserve_mb) // self.render_mb)
+        return max(1, min(self.max_slots, fitting))
+
+    def _admissible_locked(self):
+        if self._active == 0:
+            return True
+        if self._active >= self.slots():
+            return False
+        headroom = self._headroom_reader() if self._headroom_reader else None
+        return headroom is None or headroom >= self.render_mb
+
+    def acquire(self, cancel_token=None, poll_interval=0.25):
+        """
+        Block until a render may start.
+
+        Headroom is re-read every poll_interval while waiting, since memory
+        can be freed by something other than a finishing render.
+
+        Raises:
+            RenderCancelledError (or RenderTimeoutError): cancel_token was
+                cancelled or reached its deadline while waiting
+        """
+        with self._cond:
+            waited = False
+            while not self._admissible_locked():
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                if not waited:
+                    waited = True
+                    self.throttled += 1
+                    logging.info(
+                        f"Render waiting for memory ({self._active} running, "
+                        f"~{self.render_mb:.0f}MB each)"
+                    )
+                self._cond.wait(poll_interval)
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+            self._active += 1
+            self.peak_active = max(self.peak_active, self._active)
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        headroom = self._headroom_reader() if self._headroom_reader else None
+        return {
+            "limit_mb": round(self.limit_mb) if self.limit_mb else None,
+            "reserve_mb": self.reserve_mb,
+            "headroom_mb": round(headroom) if headroom is not None else None,
+            "render_mb": round(self.render_mb),
+            "slots": self.slots(),
+            "max_slots": self.max_slots,
+            "active": self._active,
+            "peak_active": self.peak_active,
+            "throttled": self.throttled,
+        }
+
@@ -0,0 +1,319 @@
+"""
+Persistent renderer worker pool.
+
+HTML PDF generation used to spawn a fresh ``python resume_generator.py``
+process for every request: a cold interpreter start, a re-import of
+jinja2/pdfkit/yaml and a ``wkhtmltopdf -V`` probe each time. This module keeps
+a small pool of long-lived ``resume_generator.py --serve`` processes warm
+instead. Every render still runs outside the Flask process (and wkhtmltopdf
+still gets its own process per job), so the Qt isolation is unchanged; only
+the spawn-and-import cost disappears from the request path.
+
+Workers are recycled after a configurable number of jobs, or once their
+resident memory crosses a threshold, to contain slow leaks.
+
+Protocol (one job at a time per worker):
+    parent -> worker: one JSON object per line (the job)
+    worker -> parent: one JSON header line ({"success": bool, "size": int,
+                      "error": str, "peak_rss_mb": float}) followed by
+                      ``size`` raw PDF bytes when the job was rendered in
+                      memory
+"""
+
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from utils.render_cancel import kill_process_group
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
+DEFAULT_WORKER_COMMAND = [sys.executable, "resume_generator.py", "--serve"]
+
+
+def read_process_rss_mb(pid):
+    """
+    Return the resident set size of a process in MB, or 0.0 if unknown.
+
+    Reads /proc, so it only reports on Linux (which is what we deploy on).
+    """
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0.0
+
+
+class RendererWorkerError(RuntimeError):
+    """Raised when a worker dies or answers with something unparseable."""
+
+
+class RendererWorker:
+    """A single long-lived renderer process speaking the JSON-lines protocol."""
+
+    def __init__(self, command, cwd):
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=str(cwd),
+            # Own process group, so kill() also takes down wkhtmltopdf
+            start_new_session=True,
+        )
+        self.jobs_completed = 0
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def request(self, job):
+        """
+        Send one job and block until the worker answers.
+
+        In-memory renders come back with the PDF bytes under ``"pdf"``.
+        """
+        # default=str keeps YAML-parsed dates serialisable
+        payload = json.dumps(job, default=str).encode("utf-8") + b"\n"
+        try:
+            self.process.stdin.write(payload)
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise RendererWorkerError(f"Renderer worker {self.pid} pipe error: {e}")
+
+        if not line:
+            raise RendererWorkerError(
+                f"Renderer worker {self.pid} exited unexpectedly "
+                f"(return code {self.process.poll()})"
+            )
+
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise RendererWorkerError(
+                f"Renderer worker {self.pid} sent an invalid response: {e}"
+            )
+
+        size = response.pop("size", 0) or 0
+        if size:
+            pdf_bytes = self.process.stdout.read(size)
+            if len(pdf_bytes) != size:
+                raise RendererWorkerError(
+                    f"Renderer worker {self.pid} sent a truncated PDF "
+                    f"({len(pdf_bytes)}/{size} bytes)"
+                )
+            response["pdf"] = pdf_bytes
+
+        self.jobs_completed += 1
+        return response
+
+    def rss_mb(self):
+        return read_process_rss_mb(self.pid)
+
+    def kill(self):
+        """Kill the worker and the render it is running, e.g. to cancel a job."""
+        kill_process_group(self.process)
+
+    def terminate(self, timeout=5):
+        """Close stdin (graceful exit) and fall back to kill if it lingers."""
+        try:
+            if self.process.stdin:
+                self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        if self.process.stdout:
+            self.process.stdout.close()
+
+
+class RendererPool:
+    """
+    Fixed-size pool of warm renderer workers.
+
+    Workers are pre-forked on construction; a worker that dies or misbehaves is
+    discarded and lazily replaced on the next checkout. The peak memory a
+    worker reports for each job is passed to on_render_peak (see
+    utils/render_memory.RenderMemoryBudget.observe).
+    """
+
+    def __init__(
+        self,
+        size=5,
+        max_jobs_per_worker=50,
+        max_rss_mb=300,
+        command=None,
+        cwd=None,
+        prefork=True,
+        on_render_peak=None,
+    ):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.command = list(command or DEFAULT_WORKER_COMMAND)
+        self.cwd = Path(cwd or PROJECT_ROOT)
+        self.on_render_peak = on_render_peak
+        self.peak_rss_mb = 0.0
+
+        # LIFO keeps the most recently used (hottest) workers in rotation
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._live_workers = 0
+        self._closed = False
+        self.workers_recycled = 0
+
+        if prefork:
+            for _ in range(size):
+                with self._lock:
+                    self._live_workers += 1
+                try:
+                    self._idle.put(self._spawn())
+                except Exception:
+                    with self._lock:
+                        self._live_workers -= 1
+                    raise
+
+        logging.info(
+            f"Renderer pool started: size={size}, "
+            f"max_jobs_per_worker={max_jobs_per_worker}, max_rss_mb={max_rss_mb}"
+        )
+
+    def _spawn(self):
+        worker = RendererWorker(self.command, self.cwd)
+        logging.debug(f"Spawned renderer worker pid={worker.pid}")
+        return worker
+
+    def _acquire(self):
+        if self._closed:
+            raise RuntimeError("Renderer pool is shut down")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_spawn = self._live_workers < self.size
+            if can_spawn:
+                self._live_workers += 1
+
+        if can_spawn:
+            try:
+                return self._spawn()
+            except Exception:
+                with self._lock:
+                    self._live_workers -= 1
+                raise
+
+        return self._idle.get()
+
+    def _release(self, worker, healthy):
+        recycle_reason = None
+        if not healthy or not worker.is_alive():
+            recycle_reason = "unhealthy"
+        elif self._closed:
+            recycle_reason = "pool shut down"
+        elif worker.jobs_completed >= self.max_jobs_per_worker:
+            recycle_reason = f"served {worker.jobs_completed} jobs"
+        elif self.max_rss_mb and worker.rss_mb() > self.max_rss_mb:
+            recycle_reason = f"rss above {self.max_rss_mb}MB"
+
+        if recycle_reason is None:
+            self._idle.put(worker)
+            return
+
+        logging.info(f"Recycling renderer worker pid={worker.pid}: {recycle_reason}")
+        worker.terminate()
+        with self._lock:
+            self.workers_recycled += 1
+
+        # Replace the worker right away so callers blocked in _acquire() are
+        # woken up and the pool stays warm at full size.
+        if not self._closed:
+            try:
+                self._idle.put(self._spawn())
+                return
+            except Exception as e:
+                logging.error(f"Failed to respawn renderer worker: {e}")
+
+        with self._lock:
+            self._live_workers -= 1
+
+    def render(self, job, cancel_token=None):
+        """
+        Run one job on a pooled worker.
+
+        Returns the worker's response dict; worker crashes are reported as
+        ``{"success": False, "error": ...}`` rather than raised, matching
+        ``pdf_generation_worker``. Cancelling ``cancel_token`` (see
+        utils/render_cancel.py) kills the worker mid-job; the response then
+        carries ``"cancelled": True`` and the worker is replaced.
+        """
+        worker = self._acquire()
+        healthy = False
+        unregister = cancel_token.on_cancel(worker.kill) if cancel_token else None
+        try:
+            response = worker.request(job)
+            healthy = True
+            self._record_peak(response.pop("peak_rss_mb", None))
+            return response
+        except RendererWorkerError as e:
+            if cancel_token is not None and cancel_token.cancelled:
+                logging.info(f"Renderer worker {worker.pid} killed: job cancelled")
+                return {
+                    "success": False,
+                    "error": "Render cancelled",
+                    "cancelled": True,
+                }
+            logging.error(str(e))
+            return {"success": False, "error": str(e)}
+        finally:
+            if unregister:
+                unregister()
+            self._release(worker, healthy)
+
+    def _record_peak(self, peak_mb):
+        if not peak_mb:
+            return
+        with self._lock:
+            self.peak_rss_mb = max(self.peak_rss_mb, peak_mb)
+        if self.on_render_peak:
+            self.on_render_peak(peak_mb)
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "live_workers": self._live_workers,
+            "idle_workers": self._idle.qsize(),
+            "workers_recycled": self.workers_recycled,
+        }
+
+    def shutdown(self):
+        """Stop all idle workers; busy ones are stopped when released."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.terminate()
+            with self._lock:
+                self._live_workers -= 1
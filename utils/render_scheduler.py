@@ -0,0 +1,216 @@
+"""
+Bounded render scheduler with priority lanes and admission control.
+
+PDF renders used to go straight into a ThreadPoolExecutor whose queue is
+unbounded: a burst of requests (or a dashboard full of thumbnail refreshes)
+piled up behind the five dispatch threads until gunicorn timed the requests
+out. This scheduler keeps the same submit()/shutdown() surface but:
+
+- holds at most ``max_queue`` waiting jobs; further submissions raise
+  RenderQueueFullError, which the API turns into ``429`` + ``Retry-After``
+- runs two lanes, PRIORITY_INTERACTIVE (downloads, previews) ahead of
+  PRIORITY_BACKGROUND (thumbnails), FIFO within a lane
+- caps the background lane at ``max_background_queue`` so thumbnails can
+  never fill the queue and lock out interactive requests
+- records queue depth, time spent waiting and render time for stats()
+"""
+
+import itertools
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# Sorts after every real job, so shutdown(wait=True) drains the queue first
+_STOP_PRIORITY = max(LANE_NAMES) + 1
+
+# Number of recent jobs kept for the wait/render time percentiles
+STATS_WINDOW = 500
+
+# Bounds for the Retry-After hint, in seconds
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+
+class RenderQueueFullError(RuntimeError):
+    """Raised by submit() when the job's lane has no room left."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of floats (0.0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RenderScheduler:
+    """Fixed set of dispatch threads fed from a bounded two-lane queue."""
+
+    def __init__(self, max_workers=5, max_queue=20, max_background_queue=None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_queue = max(0, max_queue)
+        if max_background_queue is None:
+            max_background_queue = self.max_queue // 2
+        self.max_background_queue = min(max_background_queue, self.max_queue)
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+        self._queued = {lane: 0 for lane in LANE_NAMES}
+        self._active = 0
+        self.submitted = {lane: 0 for lane in LANE_NAMES}
+        self.rejected = {lane: 0 for lane in LANE_NAMES}
+        self.completed = 0
+        self._wait_ms = deque(maxlen=STATS_WINDOW)
+        self._run_ms = deque(maxlen=STATS_WINDOW)
+
+        self._threads = []
+        for index in range(max_workers):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"render-scheduler-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        logging.info(
+            f"Render scheduler started: {max_workers} workers, queue limit "
+            f"{self.max_queue} ({self.max_background_queue} background)"
+        )
+
+    def _lane_limit(self, priority):
+        if priority == PRIORITY_BACKGROUND:
+            return self.max_background_queue
+        return self.max_queue
+
+    def submit(self, fn, *args, priority=PRIORITY_INTERACTIVE, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return a concurrent.futures.Future.
+
+        Raises:
+            RenderQueueFullError: The queue (or the background lane) is full
+            RuntimeError: The scheduler has been shut down
+        """
+        if priority not in LANE_NAMES:
+            raise ValueError(f"Unknown render priority: {priority}")
+
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new renders after shutdown")
+
+            queued_total = sum(self._queued.values())
+            if (
+                queued_total >= self.max_queue
+                or self._queued[priority] >= self._lane_limit(priority)
+            ):
+                self.rejected[priority] += 1
+                retry_after = self._retry_after_locked(queued_total)
+                raise RenderQueueFullError(
+                    f"Render queue is full ({queued_total} waiting, "
+                    f"{LANE_NAMES[priority]} lane)",
+                    retry_after,
+                )
+
+            self._queued[priority] += 1
+            self.submitted[priority] += 1
+            self._queue.put(
+                (
+                    priority,
+                    next(self._sequence),
+                    (time.monotonic(), future, fn, args, kwargs),
+                )
+            )
+        return future
+
+    def _worker_loop(self):
+        while True:
+            priority, _, item = self._queue.get()
+            if priority == _STOP_PRIORITY:
+                return
+
+            enqueued_at, future, fn, args, kwargs = item
+            started_at = time.monotonic()
+            with self._lock:
+                self._queued[priority] -= 1
+                self._active += 1
+                self._wait_ms.append((started_at - enqueued_at) * 1000)
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        result = fn(*args, **kwargs)
+                    except BaseException as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(result)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self.completed += 1
+                    self._run_ms.append((time.monotonic() - started_at) * 1000)
+
+    def _retry_after_locked(self, queued_total):
+        """Seconds until a slot is likely free: queued jobs per worker x render time."""
+        render_s = (_percentile(list(self._run_ms), 50) / 1000) or 1.0
+        estimate = math.ceil((queued_total / self.max_workers + 1) * render_s)
+        return max(MIN_RETRY_AFTER, min(MAX_RETRY_AFTER, estimate))
+
+    def retry_after(self):
+        """Current Retry-After hint in seconds."""
+        with self._lock:
+            return self._retry_after_locked(sum(self._queued.values()))
+
+    def stats(self):
+        with self._lock:
+            wait_ms = list(self._wait_ms)
+            run_ms = list(self._run_ms)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "max_background_queue": self.max_background_queue,
+                "active": self._active,
+                "queue_depth": sum(self._queued.values()),
+                "queued": {LANE_NAMES[k]: v for k, v in self._queued.items()},
+                "submitted": {LANE_NAMES[k]: v for k, v in self.submitted.items()},
+                "rejected": {LANE_NAMES[k]: v for k, v in self.rejected.items()},
+                "completed": self.completed,
+                "wait_ms": {
+                    "p50": round(_percentile(wait_ms, 50), 1),
+                    "p95": round(_percentile(wait_ms, 95), 1),
+                    "max": round(max(wait_ms, default=0.0), 1),
+                },
+                "render_ms": {
+                    "p50": round(_percentile(run_ms, 50), 1),
+                    "p95": round(_percentile(run_ms, 95), 1),
+                },
+            }
+
+    def shutdown(self, wait=True):
+        """Stop accepting work; with wait=True, finish queued jobs first."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        for _ in self._threads:
+            self._queue.put((_STOP_PRIORITY, next(self._sequence), None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
@@ -0,0 +1,311 @@
+"""
+Schema for resume documents, checked in-process before anything is rendered.
+
+A malformed resume (contact_info that is not a mapping, an experience section
+whose content is a string, a dynamic-column-list without a list) used to
+surface as a ValueError or TypeError from inside the renderer, after the
+request had already staged icons and waited for a renderer worker.
+validate_resume() checks the document against pydantic models that are built
+(and their validators compiled) once at import, in tens of microseconds, and
+reports every problem with the field it is in:
+
+    sections.2.content: Input should be a valid list
+
+The same pass upgrades older documents in place, so they need no separate
+walk: sections named "Experience"/"Education" without a type get one
+(normalize_section_type), and a legacy contact_info.linkedin field becomes a
+social_links entry (migrate_linkedin_to_social_links).
+
+Only what the templates rely on is checked. Unknown keys are allowed, and
+sections with no type or an unknown one (which the templates skip) may hold
+anything.
+"""
+
+import logging
+from typing import Annotated, Any, List, Literal, Optional, Union
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    BeforeValidator,
+    ConfigDict,
+    Discriminator,
+    Field,
+    StrictStr,
+    Tag,
+    ValidationError,
+    ValidationInfo,
+    field_validator,
+)
+from pydantic_core import PydanticCustomError
+
+# Section types old documents imply by section name alone
+SECTION_TYPES_BY_NAME = {"experience": "experience", "education": "education"}
+
+# Errors reported per rejected document; the rest are counted
+MAX_REPORTED_ERRORS = 20
+
+# Tag for sections without a (known) type
+OTHER_SECTION = "other"
+
+
+class ResumeValidationError(ValueError):
+    """
+    Raised when a resume document does not match the schema.
+
+    errors is a list of {"field": "sections.1.content", "message": ...} dicts,
+    one per problem found.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        first = errors[0]
+        message = f"Invalid resume: {first['field'] or 'document'}: {first['message']}"
+        if len(errors) > 1:
+            message += f" (and {len(errors) - 1} more)"
+        super().__init__(message)
+
+
+def normalize_section_type(section):
+    """
+    Give a section its type from its name if it has none (backward compatibility).
+
+    Sections named "Experience" or "Education" (case-insensitive) predate
+    section types; the type lets documents have several such sections with
+    custom names. Updates the section in place and returns it.
+    """
+    if not isinstance(section, dict) or section.get("type"):
+        return section
+    name = section.get("name")
+    if not isinstance(name, str):
+        return section
+    section_type = SECTION_TYPES_BY_NAME.get(name.lower())
+    if section_type:
+        section["type"] = section_type
+        logging.debug(f"Normalized section '{name}' to type='{section_type}'")
+    return section
+
+
+def migrate_linkedin_to_social_links(contact_info):
+    """
+    Migrate old 'linkedin' field to new 'social_links' array format.
+
+    Args:
+        contact_info (dict): Contact information dictionary
+
+    Returns:
+        dict: Updated contact_info with social_links array
+    """
+    # If already has social_links, no migration needed
+    if contact_info.get("social_links"):
+        return contact_info
+
+    # Check if old linkedin field exists
+    linkedin_url = contact_info.get("linkedin", "")
+    if isinstance(linkedin_url, str) and linkedin_url.strip():
+        # Create social_links array with migrated LinkedIn
+        contact_info["social_links"] = [
+            {
+                "platform": "linkedin",
+                "url": linkedin_url,
+                "display_text": contact_info.get("linkedin_display", ""),
+            }
+        ]
+        logging.info("Migrated old 'linkedin' field to 'social_links' array")
+    else:
+        # Initialize empty social_links array
+        contact_info["social_links"] = []
+
+    return contact_info
+
+
+def _text(value):
+    """Accept any scalar as text (YAML gives numbers and dates), not lists."""
+    if isinstance(value, (list, dict)):
+        kind = "a list" if isinstance(value, list) else "a mapping"
+        raise PydanticCustomError(
+            "text_type", "Input should be text, not {kind}", {"kind": kind}
+        )
+    return value
+
+
+Text = Annotated[Any, AfterValidator(_text)]
+
+
+class _Model(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class SocialLink(_Model):
+    platform: Optional[StrictStr] = None
+    url: Optional[StrictStr] = None
+    display_text: Optional[StrictStr] = None
+
+
+class ContactInfo(_Model):
+    name: Text = None
+    location: Text = None
+    email: Text = None
+    phone: Text = None
+    linkedin: Optional[StrictStr] = None
+    linkedin_display: Optional[StrictStr] = None
+    social_links: List[SocialLink] = []
+
+
+class ExperienceItem(_Model):
+    company: Text = None
+    title: Text = None
+    dates: Text = None
+    # Some older uploads have one description string instead of bullets
+    description: Annotated[
+        List[Text], BeforeValidator(lambda v: [v] if isinstance(v, str) else v)
+    ] = []
+    icon: Text = None
+
+
+class EducationItem(_Model):
+    degree: Text = None
+    school: Text = None
+    year: Text = None
+    field_of_study: Text = None
+    icon: Text = None
+
+
+class IconListItem(_Model):
+    certification: Text = None
+    issuer: Text = None
+    date: Text = None
+    icon: Text = None
+
+
+class TextSection(_Model):
+    name: Text = None
+    type: Literal["text"]
+    content: Text = None
+
+
+class ListSection(_Model):
+    name: Text = None
+    type: Literal["bulleted-list", "inline-list", "dynamic-column-list"]
+    content: List[Text] = []
+
+
+class ExperienceSection(_Model):
+    name: Text = None
+    type: Literal["experience"]
+    content: List[ExperienceItem] = []
+
+
+class EducationSection(_Model):
+    name: Text = None
+    type: Literal["education"]
+    content: List[EducationItem] = []
+
+
+class IconListSection(_Model):
+    name: Text = None
+    type: Literal["icon-list"]
+    content: List[IconListItem] = []
+
+
+class OtherSection(_Model):
+    name: Text = None
+
+
+SECTION_MODELS = {
+    "text": TextSection,
+    "bulleted-list": ListSection,
+    "inline-list": ListSection,
+    "dynamic-column-list": ListSection,
+    "icon-list": IconListSection,
+    "experience": ExperienceSection,
+    "education": EducationSection,
+}
+
+
+def _section_tag(section):
+    """Section model tag: the type if it is known, else OTHER_SECTION."""
+    section_type = section.get("type") if isinstance(section, dict) else None
+    if isinstance(section_type, str) and section_type in SECTION_MODELS:
+        return section_type
+    return OTHER_SECTION
+
+
+Section = Annotated[
+    Union[
+        tuple(
+            Annotated[model, Tag(tag)]
+            for tag, model in [*SECTION_MODELS.items(), (OTHER_SECTION, OtherSection)]
+        )
+    ],
+    Discriminator(_section_tag),
+    BeforeValidator(normalize_section_type),
+]
+
+
+class ResumeDocument(_Model):
+    contact_info: Optional[ContactInfo] = Field(None, validate_default=True)
+    sections: List[Section] = []
+
+    @field_validator("contact_info", mode="before")
+    @classmethod
+    def _migrate_contact_info(cls, value, info: ValidationInfo):
+        if not value and (info.context or {}).get("require_contact_info"):
+            raise PydanticCustomError(
+                "contact_info_missing", "No contact information provided"
+            )
+        if isinstance(value, dict):
+            migrate_linkedin_to_social_links(value)
+        return value
+
+
+# Tagged-union members add their tag to error locations; fields never do
+_UNION_TAGS = set(SECTION_MODELS) | {OTHER_SECTION}
+
+
+def _error_field(loc):
+    """Dotted path of an error location, e.g. sections.2.content.0.company."""
+    return ".".join(
+        str(part)
+        for index, part in enumerate(loc)
+        if not (index == 2 and loc[0] == "sections" and part in _UNION_TAGS)
+    )
+
+
+def _error_message(error):
+    if error["type"] == "model_type":
+        return "Input should be a valid dictionary"
+    return error["msg"]
+
+
+def validate_resume(data, require_contact_info=True):
+    """
+    Check a parsed resume document and upgrade it in place.
+
+    Args:
+        data (dict): The parsed resume YAML
+        require_contact_info (bool): Reject documents without contact_info
+            (HTML templates need it for the header)
+
+    Returns:
+        dict: data itself, with section types and social_links filled in
+
+    Raises:
+        ResumeValidationError: The document does not match the schema
+    """
+    try:
+        ResumeDocument.model_validate(
+            data, context={"require_contact_info": require_contact_info}
+        )
+    except ValidationError as e:
+        errors = [
+            {"field": _error_field(error["loc"]), "message": _error_message(error)}
+            for error in e.errors(include_url=False)
+        ]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            omitted = len(errors) - MAX_REPORTED_ERRORS
+            errors = errors[:MAX_REPORTED_ERRORS] + [
+                {"field": "", "message": f"{omitted} more errors not shown"}
+            ]
+        raise ResumeValidationError(errors) from None
+    return data
@@ -0,0 +1,68 @@
+"""
+Stream a ZIP archive without building it in memory.
+
+zipfile can write to an unseekable file object: it then emits each member's
+sizes and CRC in a data descriptor after the member instead of seeking back
+to patch the local header. iter_zip() exploits that by writing into a buffer
+that is drained after every member, so a response can send the first PDF
+while later ones are still rendering and never holds more than one member
+plus the central directory.
+"""
+
+import io
+import time
+import zipfile
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Write-only, unseekable sink that hands written bytes back in chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(members, compression=zipfile.ZIP_STORED):
+    """
+    Yield the bytes of a ZIP archive built from (name, data) pairs.
+
+    Args:
+        members: Iterable of (archive name, bytes); consumed lazily
+        compression: zipfile compression method. PDFs are already compressed,
+            so the default stores them as-is.
+
+    Yields:
+        bytes: Consecutive pieces of the archive
+    """
+    sink = _ChunkWriter()
+    date_time = time.localtime()[:6]
+    members = iter(members)
+    try:
+        with zipfile.ZipFile(sink, mode="w", compression=compression) as archive:
+            for name, data in members:
+                info = zipfile.ZipInfo(name, date_time=date_time)
+                info.compress_type = compression
+                archive.writestr(info, data)
+                chunk = sink.drain()
+                if chunk:
+                    yield chunk
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    finally:
+        # Stop a generator source (and its renders) if the client goes away
+        close = getattr(members, "close", None)
+        if close:
+            close()